@@ -0,0 +1,48 @@
+import os
+import statistics
+import time
+from typing import Callable
+
+from src.types import DataManager
+from src.web.ioc import ServiceLocator
+
+
+def configure_environment():
+    # enough configuration for the real service locator to wire itself up without aws/mysql
+    os.environ.setdefault("AWS_DEFAULT_REGION", "eu-west-2")
+    os.environ.setdefault("USER_POOL_ID", "eu-west-2_benchmark")
+    os.environ.setdefault("DB_USER", "benchmark")
+    os.environ.setdefault("DB_PASSWORD", "benchmark")
+    os.environ.setdefault("DB_URL", "localhost")
+    os.environ.setdefault("DB_NAME", "benchmark")
+
+
+def measure(action: Callable[[], object], repeat: int, warmup: int = 1) -> list[float]:
+    for _ in range(warmup):
+        action()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(name: str, timings: list[float]) -> None:
+    timings = sorted(timings)
+    p50 = statistics.median(timings)
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(f"{name:<48} n={len(timings):<6} p50={p50 * 1000:10.4f}ms  p99={p99 * 1000:10.4f}ms")
+
+
+class BenchmarkServiceLocator(ServiceLocator):
+    """
+    the real container with the mysql data manager swapped for one the benchmark provides
+    """
+
+    def __init__(self, data_manager: DataManager):
+        super().__init__()
+        self.__data_manager = data_manager
+
+    def get_data_manager(self) -> DataManager:
+        return self._resolve('data_manager', lambda: self.__data_manager)
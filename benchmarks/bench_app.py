@@ -0,0 +1,41 @@
+"""
+cold vs warm invocation cost of the lambda handler
+
+    python -m benchmarks.bench_app
+"""
+from mapper.object_mapper import ObjectMapper
+
+from benchmarks import configure_environment, measure, report, BenchmarkServiceLocator
+from src.app import PinfluencerApplication
+from src.data.entities import create_mappings
+from tests import InMemorySqliteDataManager, campaign_dto_generator, campaign_generator
+
+REPEAT = 50
+
+
+def main():
+    configure_environment()
+    data_manager = InMemorySqliteDataManager()
+    mapper = ObjectMapper()
+    create_mappings(mapper=mapper)
+    campaign = campaign_dto_generator(num=1)
+    data_manager.create_fake_data([campaign_generator(dto=campaign, mapper=mapper)])
+    data_manager.session.commit()
+    event = {"routeKey": "GET /campaigns/{campaign_id}",
+             "pathParameters": {"campaign_id": campaign.id}}
+
+    def cold():
+        PinfluencerApplication(service_locator=BenchmarkServiceLocator(data_manager=data_manager)).handle(event=event,
+                                                                                                         context={})
+
+    application = PinfluencerApplication(service_locator=BenchmarkServiceLocator(data_manager=data_manager))
+
+    def warm():
+        application.handle(event=event, context={})
+
+    report("cold invocation (build application + handle)", measure(cold, repeat=REPEAT))
+    report("warm invocation (handle only)", measure(warm, repeat=REPEAT))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+auth user claims for a collection response: one admin_get_user per item, a single batched lookup,
+and per item lookups fanned out on a bounded pool, against an in memory cognito with a fixed round trip latency
+
+    python -m benchmarks.bench_cognito_batch
+"""
+from benchmarks import configure_environment, measure, report
+from src.crosscutting import ConcurrentExecutor, FailurePolicy
+from src.data.repositories import CognitoAuthUserRepository, CognitoAuthService
+from src.web import PinfluencerContext, PinfluencerResponse
+from src.web.hooks import UserAfterHooks
+from tests import StubCognitoClient, page_body, user_dto_generator
+
+POOL_SIZE = 2000
+LATENCY_SECONDS = 0.002
+MAX_WORKERS = 16
+
+
+def tag_collection(hooks: UserAfterHooks, ids: list[str]):
+    response = PinfluencerResponse(body=page_body(items=[{"auth_user_id": _id} for _id in ids]))
+    hooks.tag_auth_user_claims_to_response_collection(context=PinfluencerContext(response=response, event={}))
+
+
+def main():
+    configure_environment()
+    users = {f"auth_user_{num}": user_dto_generator(num=num) for num in range(POOL_SIZE)}
+    for n in [10, 100, 1000]:
+        ids = [f"auth_user_{num}" for num in range(0, POOL_SIZE, POOL_SIZE // n)]
+
+        client = StubCognitoClient(users=users, latency_seconds=LATENCY_SECONDS)
+        repository = CognitoAuthUserRepository(auth_service=CognitoAuthService(client=client))
+        report(f"get_by_id per item n={n}", measure(lambda: [repository.get_by_id(_id=_id) for _id in ids],
+                                                    repeat=3, warmup=0))
+        print(f"    calls per response: {dict(client.calls)['admin_get_user'] // 3}")
+
+        client = StubCognitoClient(users=users, latency_seconds=LATENCY_SECONDS)
+        repository = CognitoAuthUserRepository(auth_service=CognitoAuthService(client=client))
+        report(f"get_by_ids n={n}", measure(lambda: repository.get_by_ids(ids=ids), repeat=3))
+        print(f"    calls over 4 responses: {dict(client.calls)}")
+
+        client = StubCognitoClient(users=users, latency_seconds=LATENCY_SECONDS)
+        hooks = UserAfterHooks(
+            auth_user_repository=CognitoAuthUserRepository(auth_service=CognitoAuthService(client=client)),
+            executor=ConcurrentExecutor(max_workers=MAX_WORKERS, failure_policy=FailurePolicy.SKIP))
+        report(f"concurrent get_by_id workers={MAX_WORKERS} n={n}", measure(lambda: tag_collection(hooks, ids),
+                                                                            repeat=3))
+
+
+if __name__ == '__main__':
+    main()
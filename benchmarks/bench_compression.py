@@ -0,0 +1,35 @@
+"""
+compressing a GET /brands page of 100 brands: size on the wire and the cpu it costs at each level
+
+    python -m benchmarks.bench_compression
+"""
+from benchmarks import measure, report
+from src.crosscutting import JsonSnakeToCamelSerializer
+from src.web import PinfluencerResponse
+from src.web.compression import ResponseCompressor, brotli
+from src.web.serialization import serialize_collection, serialize_brand
+from tests import brand_dto_generator, page_body
+
+BRANDS = 100
+
+
+def main():
+    response = PinfluencerResponse(body=serialize_collection(body=page_body([brand_dto_generator(num=num).__dict__
+                                                                             for num in range(BRANDS)]),
+                                                             serialize=serialize_brand))
+    serializer = JsonSnakeToCamelSerializer()
+    size = len(response.as_json(serializer=serializer)["body"])
+    print(f"uncompressed brands={BRANDS} bytes={size}")
+    variants = [("gzip", level, ResponseCompressor(gzip_level=level)) for level in (1, 6, 9)]
+    if brotli is not None:
+        variants += [("br", quality, ResponseCompressor(brotli_quality=quality)) for quality in (1, 4, 11)]
+    for name, level, compressor in variants:
+        as_json = response.as_json(serializer=serializer, compressor=compressor, accept_encoding=name)
+        print(f"{name} level={level} base64 bytes={len(as_json['body'])} ({len(as_json['body']) / size:.1%})")
+        report(f"as_json {name} level={level} brands={BRANDS}",
+               measure(lambda: response.as_json(serializer=serializer, compressor=compressor,
+                                                 accept_encoding=name), repeat=100))
+
+
+if __name__ == '__main__':
+    main()
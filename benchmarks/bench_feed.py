@@ -0,0 +1,87 @@
+"""
+scoring 100k active campaigns against one influencer: the vectorised ranking should stay well under 50ms,
+next to the per-row python loop it replaces and the cost of reading the masks out of the database.
+the feed path ranks from the warm candidate index and only reads the winning rows
+
+    python -m benchmarks.bench_feed
+"""
+import random
+import uuid
+from datetime import datetime
+
+import numpy as np
+from mapper.object_mapper import ObjectMapper
+
+from benchmarks import measure, report
+from src.data.entities import SqlAlchemyCampaignEntity
+from src.data.repositories import SqlAlchemyCampaignRepository
+from src.domain.matching import MatchCandidates, rank, to_bitmask
+from src.domain.models import ValueEnum, CategoryEnum, CampaignStateEnum
+from tests import InMemorySqliteDataManager
+
+ROWS = 100_000
+LIMIT = 20
+
+
+def random_members(enum_type, rng: random.Random) -> list:
+    return rng.sample(list(enum_type), rng.randint(1, 5))
+
+
+def rank_per_row(value_mask: int, category_mask: int, candidates: MatchCandidates, k: int) -> list:
+    scores = [(bin(int(values) & value_mask).count('1') + bin(int(categories) & category_mask).count('1'), id_)
+              for id_, values, categories in zip(candidates.ids, candidates.value_masks, candidates.category_masks)]
+    return sorted((score for score in scores if score[0] > 0), key=lambda x: -x[0])[:k]
+
+
+TEXT_COLUMNS = ["objective", "success_description", "campaign_title", "campaign_description",
+                "campaign_product_link", "campaign_hashtag", "campaign_discount_code", "product_title",
+                "product_description", "product_image1", "product_image2", "product_image3"]
+
+
+def seed(data_manager: InMemorySqliteDataManager, rng: random.Random) -> None:
+    rows = [{
+        **{column: column for column in TEXT_COLUMNS},
+        "id": str(uuid.uuid4()),
+        "created": datetime(2022, 1, 1),
+        "brand_id": "brand",
+        "campaign_values": random_members(ValueEnum, rng),
+        "campaign_categories": random_members(CategoryEnum, rng),
+        "campaign_state": CampaignStateEnum.ACTIVE
+    } for _ in range(ROWS)]
+    data_manager.session.bulk_insert_mappings(SqlAlchemyCampaignEntity, rows)
+    data_manager.session.commit()
+
+
+def main():
+    rng = random.Random(1)
+    candidates = MatchCandidates(
+        ids=[str(uuid.uuid4()) for _ in range(ROWS)],
+        value_masks=np.array([to_bitmask(random_members(ValueEnum, rng)) for _ in range(ROWS)], dtype=np.uint16),
+        category_masks=np.array([to_bitmask(random_members(CategoryEnum, rng)) for _ in range(ROWS)],
+                                dtype=np.uint16))
+    value_mask = to_bitmask([ValueEnum.VEGAN, ValueEnum.SUSTAINABLE, ValueEnum.RECYCLED])
+    category_mask = to_bitmask([CategoryEnum.FOOD, CategoryEnum.FASHION])
+
+    report(f"rank rows={ROWS} k={LIMIT}",
+           measure(lambda: rank(value_mask=value_mask, category_mask=category_mask, candidates=candidates, k=LIMIT),
+                   repeat=100))
+    report(f"rank per row python rows={ROWS} k={LIMIT}",
+           measure(lambda: rank_per_row(value_mask=value_mask, category_mask=category_mask,
+                                        candidates=candidates, k=LIMIT), repeat=5))
+
+    data_manager = InMemorySqliteDataManager()
+    seed(data_manager=data_manager, rng=rng)
+    repository = SqlAlchemyCampaignRepository(data_manager=data_manager,
+                                              image_repository=None,
+                                              object_mapper=ObjectMapper())
+    report(f"load_active_candidates rows={ROWS}", measure(repository.load_active_candidates, repeat=5))
+
+    def feed():
+        ranked = repository.rank_active_candidates(value_mask=value_mask, category_mask=category_mask, k=LIMIT)
+        return repository.load_by_ids(ids=[id_ for id_, _ in ranked])
+
+    report(f"warm feed (rank index + load top {LIMIT}) rows={ROWS}", measure(feed, repeat=100))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+filtering 1M campaigns through the inverted index: a common filter, a rare one that has to look through every
+chunk, a page deep into the results and the per-row python scan it replaces
+
+    python -m benchmarks.bench_filtering
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from benchmarks import measure, report
+from src.domain.filtering import CampaignIndex, CampaignIndexRows, CampaignFilter
+from src.domain.models import ValueEnum, CategoryEnum, CampaignStateEnum
+
+ROWS = 1_000_000
+LIMIT = 20
+
+
+def rows(rng: np.random.Generator) -> CampaignIndexRows:
+    start = np.datetime64(datetime(2022, 1, 1), 'us')
+    states = list(CampaignStateEnum)
+    return CampaignIndexRows(ids=[f"{num:012d}" for num in range(ROWS)],
+                             created=start + np.arange(ROWS).astype('timedelta64[s]'),
+                             value_masks=rng.integers(0, 1 << len(ValueEnum), ROWS, dtype=np.uint16),
+                             category_masks=rng.integers(0, 1 << len(CategoryEnum), ROWS, dtype=np.uint16),
+                             states=[states[ordinal] for ordinal in rng.choice(len(states), ROWS, p=[.2, .6, .1, .1])])
+
+
+def query_per_row(index_rows: CampaignIndexRows, campaign_filter: CampaignFilter, limit: int) -> list:
+    value_mask = sum(1 << list(ValueEnum).index(member) for member in campaign_filter.values)
+    category_mask = sum(1 << list(CategoryEnum).index(member) for member in campaign_filter.categories)
+    def matches(mask: int, wanted: int) -> bool:
+        return mask & wanted == wanted if campaign_filter.match_all else mask & wanted != 0
+
+    found = []
+    for row in range(ROWS - 1, -1, -1):
+        if index_rows.states[row] in campaign_filter.states \
+                and matches(int(index_rows.value_masks[row]), value_mask) \
+                and matches(int(index_rows.category_masks[row]), category_mask):
+            found.append(index_rows.ids[row])
+            if len(found) == limit:
+                break
+    return found
+
+
+def main():
+    index_rows = rows(rng=np.random.default_rng(1))
+    index = CampaignIndex(loader=lambda: index_rows, max_age_seconds=float('inf'))
+    report(f"build rows={ROWS}", measure(lambda: CampaignIndex(loader=lambda: index_rows,
+                                                                 max_age_seconds=0).query(CampaignFilter(), 1),
+                                          repeat=3, warmup=0))
+
+    common = CampaignFilter(categories=(CategoryEnum.FASHION,), values=(ValueEnum.VEGAN,))
+    # every value and every category, about one campaign in a million, so every chunk is looked at
+    rare = CampaignFilter(categories=tuple(CategoryEnum), values=tuple(ValueEnum), match_all=True)
+    deep = (datetime(2022, 1, 1) + timedelta(seconds=ROWS // 10), f"{ROWS // 10:012d}")
+    report(f"query common rows={ROWS} limit={LIMIT}",
+           measure(lambda: index.query(campaign_filter=common, limit=LIMIT + 1), repeat=200))
+    report(f"query common deep page rows={ROWS} limit={LIMIT}",
+           measure(lambda: index.query(campaign_filter=common, limit=LIMIT + 1, before=deep), repeat=200))
+    report(f"query rare rows={ROWS} limit={LIMIT}",
+           measure(lambda: index.query(campaign_filter=rare, limit=LIMIT + 1), repeat=50))
+    report(f"query common per row python rows={ROWS} limit={LIMIT}",
+           measure(lambda: query_per_row(index_rows=index_rows, campaign_filter=common, limit=LIMIT + 1),
+                   repeat=50))
+    report(f"query rare per row python rows={ROWS} limit={LIMIT}",
+           measure(lambda: query_per_row(index_rows=index_rows, campaign_filter=rare, limit=LIMIT + 1),
+                   repeat=1, warmup=0))
+
+
+if __name__ == '__main__':
+    main()
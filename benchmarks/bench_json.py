@@ -0,0 +1,25 @@
+"""
+encoding a serialized page of 1,000 campaigns, the part of a large list response left after the compiled
+serializers: the standard library encoder against orjson
+
+    python -m benchmarks.bench_json
+"""
+from benchmarks import measure, report
+from benchmarks.bench_responses import page
+from src.crosscutting import StdlibJsonEncoder, OrjsonJsonEncoder, orjson
+from src.web.serialization import serialize_collection, serialize_campaign
+
+
+def main():
+    body = serialize_collection(body=page(), serialize=serialize_campaign)
+    encoders = [("stdlib", StdlibJsonEncoder())]
+    if orjson is not None:
+        encoders.append(("orjson", OrjsonJsonEncoder()))
+    assert len({encoder.encode(body) for _, encoder in encoders}) == 1
+
+    for name, encoder in encoders:
+        report(f"encode {name} campaigns={len(body['items'])}", measure(lambda: encoder.encode(body), repeat=200))
+
+
+if __name__ == '__main__':
+    main()
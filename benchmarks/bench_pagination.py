@@ -0,0 +1,53 @@
+"""
+keyset pages over 100k brands: the first page, a page half way through and the last page
+should cost the same, while loading the whole collection grows with the table
+
+    python -m benchmarks.bench_pagination
+"""
+import uuid
+from datetime import datetime, timedelta
+
+from mapper.object_mapper import ObjectMapper
+
+from benchmarks import measure, report
+from src.data.entities import SqlAlchemyBrandEntity
+from src.data.repositories import SqlAlchemyBrandRepository, encode_cursor
+from src.domain.models import ValueEnum, CategoryEnum
+from tests import InMemorySqliteDataManager
+
+ROWS = 100_000
+LIMIT = 20
+
+
+def seed(data_manager: InMemorySqliteDataManager) -> list[tuple[datetime, str]]:
+    start = datetime(2022, 1, 1)
+    rows = [{
+        "id": str(uuid.uuid4()),
+        "created": start + timedelta(seconds=num),
+        "auth_user_id": f"auth_user_{num}",
+        "brand_name": f"brand{num}",
+        "brand_description": "description",
+        "website": "website",
+        "values": [ValueEnum.VEGAN],
+        "categories": [CategoryEnum.FOOD]
+    } for num in range(ROWS)]
+    data_manager.session.bulk_insert_mappings(SqlAlchemyBrandEntity, rows)
+    data_manager.session.commit()
+    return sorted(((row["created"], row["id"]) for row in rows), reverse=True)
+
+
+def main():
+    data_manager = InMemorySqliteDataManager()
+    keys = seed(data_manager=data_manager)
+    repository = SqlAlchemyBrandRepository(data_manager=data_manager,
+                                           image_repository=None,
+                                           object_mapper=ObjectMapper())
+    for name, position in [("first", None), ("middle", ROWS // 2), ("last", ROWS - LIMIT - 1)]:
+        cursor = encode_cursor(*keys[position]) if position is not None else None
+        report(f"load_page limit={LIMIT} {name} page", measure(lambda: repository.load_page(limit=LIMIT, cursor=cursor),
+                                                               repeat=50))
+    report(f"load_collection rows={ROWS}", measure(repository.load_collection, repeat=1, warmup=0))
+
+
+if __name__ == '__main__':
+    main()
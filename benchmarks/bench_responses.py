@@ -0,0 +1,60 @@
+"""
+after hooks plus serializer for a page of 1,000 campaigns: the enum, state and url hooks followed by the generic
+key walk, against the serializer compiled from the Campaign fields
+
+    python -m benchmarks.bench_responses
+"""
+import json
+
+from benchmarks import measure, report
+from src.crosscutting import JsonSnakeToCamelSerializer
+from src.domain.models import Campaign, ValueEnum, CategoryEnum, CampaignStateEnum
+from src.web.serialization import S3_URL, serialize_collection, serialize_campaign
+
+CAMPAIGNS = 1_000
+
+
+def hooked_response(body: dict) -> str:
+    for campaign in body["items"]:
+        campaign["campaign_values"] = list(map(lambda x: x.name, campaign["campaign_values"]))
+        campaign["campaign_categories"] = list(map(lambda x: x.name, campaign["campaign_categories"]))
+    for campaign in body["items"]:
+        campaign["product_image1"] = f"{S3_URL}/{campaign['product_image1']}"
+        campaign["product_image2"] = f"{S3_URL}/{campaign['product_image2']}"
+        campaign["product_image3"] = f"{S3_URL}/{campaign['product_image3']}"
+    for campaign in body["items"]:
+        campaign["campaign_state"] = campaign["campaign_state"].name
+    return JsonSnakeToCamelSerializer().serialize(body)
+
+
+def compiled_response(body: dict) -> str:
+    return JsonSnakeToCamelSerializer().serialize(serialize_collection(body=body, serialize=serialize_campaign))
+
+
+def page() -> dict:
+    # the controllers hand over a fresh page of __dict__s every request
+    return {"items": [Campaign(brand_id=str(num),
+                               campaign_title=f"campaign {num}",
+                               campaign_values=list(ValueEnum)[:num % 4 + 1],
+                               campaign_categories=list(CategoryEnum)[:num % 3 + 1],
+                               campaign_state=CampaignStateEnum.ACTIVE,
+                               product_image1=f"{num}/image1.png").__dict__ for num in range(CAMPAIGNS)],
+            "next_cursor": None}
+
+
+def main():
+    hooked, compiled = json.loads(hooked_response(page())), json.loads(compiled_response(page()))
+    for item in hooked["items"]:
+        # str() of a datetime against isoformat, the only difference in the output
+        item["created"] = item["created"].replace(" ", "T")
+    # the srcsets of uploaded images are only in the compiled response
+    assert [sorted(item) for item in hooked["items"]] == \
+           [sorted(key for key in item if not key.endswith("Srcset")) for item in compiled["items"]]
+
+    for name, respond in [("hooks and generic walk", hooked_response), ("compiled serializer", compiled_response)]:
+        pages = [page() for _ in range(51)]
+        report(f"{name} campaigns={CAMPAIGNS}", measure(lambda: respond(pages.pop()), repeat=50))
+
+
+if __name__ == '__main__':
+    main()
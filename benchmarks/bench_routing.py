@@ -0,0 +1,35 @@
+"""
+route resolution + middleware pipeline assembly, per request
+
+before: the dispatcher rebuilt every Route through the hooks facade and the pipeline list was concatenated
+after: routes are compiled once with the pipeline flattened into a tuple
+
+    python -m benchmarks.bench_routing
+"""
+from benchmarks import configure_environment, measure, report, BenchmarkServiceLocator
+from src.web.routing import Dispatcher
+from tests import InMemorySqliteDataManager
+
+REPEAT = 2000
+ROUTE_KEY = 'PUT /brands/me/campaigns/{campaign_id}'
+
+
+def main():
+    configure_environment()
+    service_locator = BenchmarkServiceLocator(data_manager=InMemorySqliteDataManager())
+    dispatcher = Dispatcher(service_locator=service_locator)
+    dispatcher.dispatch_route_to_ctr
+
+    def rebuilt_per_request():
+        route = Dispatcher(service_locator=service_locator).dispatch_route_to_ctr[ROUTE_KEY]
+        return [*route.before_hooks, route.action, *route.after_hooks]
+
+    def compiled_once():
+        return dispatcher.get_route(ROUTE_KEY).pipeline
+
+    report("before: rebuild route table + assemble", measure(rebuilt_per_request, repeat=REPEAT))
+    report("after: compiled route pipeline", measure(compiled_once, repeat=REPEAT))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+serializing a page of 1,000 brands and deserializing it back: the recursive transform that translated every key
+from scratch against the cached, iterative one
+
+    python -m benchmarks.bench_serialization
+"""
+import json
+import re
+
+from benchmarks import measure, report
+from src.crosscutting import JsonSnakeToCamelSerializer, JsonCamelToSnakeCaseDeserializer
+from tests import brand_dto_generator
+
+BRANDS = 1_000
+
+
+class RecursiveSnakeToCamelSerializer:
+
+    def serialize(self, data):
+        return json.dumps(self.__transform(data), default=str, separators=(",", ":"), ensure_ascii=False)
+
+    def __transform(self, d):
+        if isinstance(d, list):
+            return [self.__transform(i) if isinstance(i, (dict, list)) else i for i in d]
+        return {self.__key(a): self.__transform(b) if isinstance(b, (dict, list)) else b for a, b in d.items()}
+
+    @staticmethod
+    def __key(key: str) -> str:
+        components = key.split('_')
+        return components[0] + ''.join(x.title() for x in components[1:])
+
+
+class RecursiveCamelToSnakeDeserializer:
+
+    def deserialize(self, data: str):
+        return self.__transform(json.loads(data))
+
+    def __transform(self, d):
+        if isinstance(d, list):
+            return [self.__transform(i) if isinstance(i, (dict, list)) else i for i in d]
+        return {self.__key(a): self.__transform(b) if isinstance(b, (dict, list)) else b for a, b in d.items()}
+
+    @staticmethod
+    def __key(key: str) -> str:
+        words = re.findall(r'[A-Z]?[a-z]+|[A-Z]{2,}(?=[A-Z][a-z]|\d|\W|$)|\d+', key)
+        return '_'.join(map(str.lower, words))
+
+
+def main():
+    brands = []
+    for num in range(BRANDS):
+        brand = brand_dto_generator(num=num).__dict__
+        brand["values"] = [value.name for value in brand["values"]]
+        brand["categories"] = [category.name for category in brand["categories"]]
+        brands.append(brand)
+    body = {"items": brands, "next_cursor": None}
+    serialized = JsonSnakeToCamelSerializer().serialize(body)
+    assert serialized == RecursiveSnakeToCamelSerializer().serialize(body)
+
+    for name, serializer in [("recursive", RecursiveSnakeToCamelSerializer()),
+                             ("cached iterative", JsonSnakeToCamelSerializer())]:
+        report(f"serialize {name} brands={BRANDS}", measure(lambda: serializer.serialize(body), repeat=50))
+    for name, deserializer in [("recursive", RecursiveCamelToSnakeDeserializer()),
+                               ("cached iterative", JsonCamelToSnakeCaseDeserializer())]:
+        report(f"deserialize {name} brands={BRANDS}", measure(lambda: deserializer.deserialize(serialized),
+                                                              repeat=50))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+nearest influencers by audience over 100k rows: a query against the float32 matrix, the per-row python loop it
+replaces, a single row refresh after an update and the full rebuild from the database
+
+    python -m benchmarks.bench_similarity
+"""
+import uuid
+from datetime import datetime
+
+import numpy as np
+from mapper.object_mapper import ObjectMapper
+
+from benchmarks import measure, report
+from src.data.entities import SqlAlchemyInfluencerEntity
+from src.data.repositories import SqlAlchemyInfluencerRepository
+from src.domain.similarity import AudienceIndex, SimilarityMetric, AUDIENCE_FIELDS
+from tests import InMemorySqliteDataManager
+
+ROWS = 100_000
+LIMIT = 20
+
+
+def random_vectors(rng: np.random.Generator, rows: int) -> np.ndarray:
+    ages = rng.dirichlet(np.ones(7), size=rows)
+    genders = rng.dirichlet(np.ones(2), size=rows)
+    return np.hstack((ages, genders)).astype(np.float32)
+
+
+def nearest_per_row(ids: list[str], vectors: np.ndarray, vector: np.ndarray, k: int) -> list:
+    distances = [(sum(abs(float(a) - float(b)) for a, b in zip(row, vector)), id_) for id_, row in zip(ids, vectors)]
+    return sorted(distances)[:k]
+
+
+def seed(data_manager: InMemorySqliteDataManager, ids: list[str], vectors: np.ndarray) -> None:
+    rows = [{
+        "id": id_,
+        "created": datetime(2022, 1, 1),
+        "auth_user_id": id_,
+        "bio": "bio",
+        "website": "website",
+        "values": [],
+        "categories": [],
+        **dict(zip(AUDIENCE_FIELDS, map(float, vector)))
+    } for id_, vector in zip(ids, vectors)]
+    data_manager.session.bulk_insert_mappings(SqlAlchemyInfluencerEntity, rows)
+    data_manager.session.commit()
+
+
+def main():
+    rng = np.random.default_rng(1)
+    ids = [str(uuid.uuid4()) for _ in range(ROWS)]
+    vectors = random_vectors(rng=rng, rows=ROWS)
+    index = AudienceIndex(loader=lambda: (ids, vectors), max_age_seconds=float('inf'))
+    query = vectors[0]
+
+    for metric in SimilarityMetric:
+        report(f"nearest {metric.value} rows={ROWS} k={LIMIT}",
+               measure(lambda: index.nearest(vector=query, k=LIMIT, metric=metric, exclude=ids[0]), repeat=100))
+    report(f"nearest l1 per row python rows={ROWS} k={LIMIT}",
+           measure(lambda: nearest_per_row(ids=ids, vectors=vectors, vector=query, k=LIMIT), repeat=3, warmup=0))
+    report("upsert existing row", measure(lambda: index.upsert(id_=ids[1], vector=vectors[2]), repeat=1000))
+
+    data_manager = InMemorySqliteDataManager()
+    seed(data_manager=data_manager, ids=ids, vectors=vectors)
+    repository = SqlAlchemyInfluencerRepository(data_manager=data_manager,
+                                                image_repository=None,
+                                                object_mapper=ObjectMapper())
+    report(f"load_audience_vectors rows={ROWS}", measure(repository.load_audience_vectors, repeat=3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""
+validating a brand payload: jsonschema.validate, which checks the schema and picks a validator class every call,
+against the validator compiled once per schema
+
+    python -m benchmarks.bench_validation
+"""
+from jsonschema import ValidationError
+from jsonschema.validators import validate
+
+from benchmarks import measure, report
+from src.domain.validation import brand_payload_schema, SchemaValidator
+
+VALID = {"brand_name": "my brand", "brand_description": "this is my brand", "website": "https://brand.com",
+         "email": "brand@brand.com", "insta_handle": "@brand", "values": ["VEGAN"], "categories": ["FOOD"]}
+INVALID = {**VALID, "website": "invalid website", "brand_name": ""}
+CALLS = 1_000
+
+
+def per_call(action):
+    def run():
+        for _ in range(CALLS):
+            action()
+    return run
+
+
+def validate_every_call(payload):
+    try:
+        validate(instance=payload, schema=brand_payload_schema)
+    except ValidationError:
+        pass
+
+
+def main():
+    validator = SchemaValidator(schema=brand_payload_schema)
+    assert validator.errors(VALID) == [] and len(validator.errors(INVALID)) == 2
+
+    for name, payload in [("valid", VALID), ("invalid", INVALID)]:
+        report(f"jsonschema.validate {name} x{CALLS}",
+               measure(per_call(lambda: validate_every_call(payload)), repeat=20))
+        report(f"compiled {name} x{CALLS}", measure(per_call(lambda: validator.errors(payload)), repeat=20))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+"""
+per route dependency report: what each endpoint builds the first time it is dispatched in a cold container
+
+    python -m benchmarks.route_dependencies
+"""
+import time
+
+from benchmarks import configure_environment, BenchmarkServiceLocator
+from src.web.routing import Dispatcher
+from tests import InMemorySqliteDataManager
+
+
+def main():
+    configure_environment()
+    data_manager = InMemorySqliteDataManager()
+    for route_key in Dispatcher(service_locator=BenchmarkServiceLocator(data_manager=data_manager)).route_keys:
+        service_locator = BenchmarkServiceLocator(data_manager=data_manager)
+        dispatcher = Dispatcher(service_locator=service_locator)
+        start = time.perf_counter()
+        dispatcher.get_route(route_key)
+        total = time.perf_counter() - start
+        resolutions = service_locator.get_resolutions()
+        print(f"{route_key}  ({len(resolutions)} services, {total * 1000:.2f}ms)")
+        # timings are inclusive of the nested dependencies built on the way
+        for name, seconds in resolutions:
+            print(f"    {name:<28} {seconds * 1000:8.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
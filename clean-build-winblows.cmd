@@ -1 +1 @@
-sam build && cd .aws-sam/build/PinfluencerFunction && rm -fr clean-build.sh tests events env.json README.md samconfig.toml template.yaml requirements.txt
\ No newline at end of file
+sam build && cd .aws-sam/build/PinfluencerFunction && rm -fr clean-build.sh tests benchmarks events env.json README.md samconfig.toml template.yaml requirements.txt
\ No newline at end of file
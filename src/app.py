@@ -1,43 +1,83 @@
+from typing import Optional
+
 from src.crosscutting import print_exception
-from src.web import PinfluencerResponse, PinfluencerContext, Route, PinfluencerAction
+from src.web import PinfluencerResponse, PinfluencerContext, Route, get_header
 from src.web.ioc import ServiceLocator
 from src.web.routing import Dispatcher
 
 
+class PinfluencerApplication:
+    """
+    built once per lambda container and reused by warm invocations,
+    all per request state is confined to the PinfluencerContext created in handle
+    """
+
+    def __init__(self, service_locator: ServiceLocator):
+        self.__service_locator = service_locator
+        self.__dispatcher = Dispatcher(service_locator=service_locator)
+        self.__middleware_pipeline = service_locator.get_middlware_pipeline()
+        self.__serializer = service_locator.get_serializer()
+        self.__compressor = service_locator.get_response_compressor()
+
+    def handle(self, event: dict, context: dict) -> dict:
+        accept_encoding = None
+        try:
+            accept_encoding = get_header(event=event, name='Accept-Encoding')
+            route = event['routeKey']
+            print(f'Route: {route}')
+            response = PinfluencerResponse()
+            route_desc: Optional[Route] = self.__dispatcher.get_route(route)
+            if route_desc is None:
+                response = PinfluencerResponse(status_code=404, body={"message": f"route: {route} not found"})
+            else:
+
+                # initialize context which holds state for request/response through middlware
+                pinfluencer_context = PinfluencerContext(response=response,
+                                                         short_circuit=False,
+                                                         event=event,
+                                                         body={},
+                                                         auth_user_id="")
+
+                # middleware execution
+                self.__middleware_pipeline.execute_middleware(context=pinfluencer_context,
+                                                              middleware=route_desc.pipeline)
+                if route_desc.cache_control is not None and (response.is_ok() or response.status_code == 304):
+                    response.headers["Cache-Control"] = route_desc.cache_control
+        except Exception as e:
+            print_exception(e)
+            response = PinfluencerResponse.as_500_error()
+        finally:
+            self.__end_request()
+        print(f"output body: {response.body}")
+        return response.as_json(serializer=self.__serializer,
+                                compressor=self.__compressor,
+                                accept_encoding=accept_encoding)
+
+    def __end_request(self):
+        # the data manager outlives the invocation, so release the session's transaction and connection
+        # otherwise the next warm invocation would read through a stale snapshot
+        try:
+            self.__service_locator.end_request()
+        except Exception as e:
+            print_exception(e)
+
+
+_application: Optional[PinfluencerApplication] = None
+
+
+def get_application() -> PinfluencerApplication:
+    global _application
+    if _application is None:
+        print("cold start: building application")
+        _application = PinfluencerApplication(service_locator=ServiceLocator())
+    return _application
+
+
 def lambda_handler(event, context):
-    return bootstrap(event=event,
-                     context=context,
-                     service_locator=ServiceLocator())
+    return get_application().handle(event=event, context=context)
 
 
 def bootstrap(event: dict,
               context: dict,
               service_locator: ServiceLocator) -> dict:
-    dispatcher = Dispatcher(service_locator=service_locator)
-    try:
-        route = event['routeKey']
-        print(f'Route: {route}')
-        print(f'Event: {event}')
-        routes = dispatcher.dispatch_route_to_ctr
-        response = PinfluencerResponse()
-        if route not in routes:
-            response = PinfluencerResponse(status_code=404, body={"message": f"route: {route} not found"})
-        else:
-
-            # initialize context which holds state for request/response through middlware
-            pinfluencer_context = PinfluencerContext(response=response,
-                                                     short_circuit=False,
-                                                     event=event,
-                                                     body={},
-                                                     auth_user_id="")
-            route_desc: Route = routes[route]
-
-            # middleware execution
-            middleware_pipeline: list[PinfluencerAction] = [*route_desc.before_hooks, route_desc.action, *route_desc.after_hooks]
-            service_locator.get_new_middlware_pipeline().execute_middleware(context=pinfluencer_context,
-                                                                            middleware=middleware_pipeline)
-    except Exception as e:
-        print_exception(e)
-        response = PinfluencerResponse.as_500_error()
-    print(f"output body: {response.body}")
-    return response.as_json(serializer=service_locator.get_new_serializer())
+    return PinfluencerApplication(service_locator=service_locator).handle(event=event, context=context)
@@ -1,7 +1,21 @@
 import json
 import re
+import threading
+import time
 import uuid
-from typing import Union
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields
+from enum import Enum
+from typing import Union, Callable, Iterable, TypeVar, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+T = TypeVar('T')
+R = TypeVar('R')
 
 
 def print_exception(e):
@@ -9,37 +23,252 @@ def print_exception(e):
     print(''.join(['Exception ', str(e)]))
 
 
-class JsonSnakeToCamelSerializer:
+class FailurePolicy(Enum):
+    RAISE = "raise"
+    SKIP = "skip"
 
-    def serialize(self, data: Union[dict, list]) -> str:
-        return json.dumps(self.__snake_case_to_camel_case_dict(d=data), default=str)
 
-    def __snake_case_to_camel_case_dict(self, d):
-        if isinstance(d, list):
-            return [self.__snake_case_to_camel_case_dict(i) if isinstance(i, (dict, list)) else i for i in d]
-        return {self.__snake_case_key_to_camel_case(a): self.__snake_case_to_camel_case_dict(b) if isinstance(b, (dict, list)) else b for a, b in d.items()}
+class ConcurrentExecutor:
+    """
+    bounded thread pool for fanning out blocking io, the pool is created on first use
+    and kept for the life of the container
+    """
+
+    def __init__(self, max_workers: int,
+                 timeout_seconds: Optional[float] = None,
+                 failure_policy: FailurePolicy = FailurePolicy.RAISE,
+                 clock: Callable[[], float] = time.monotonic):
+        self.__max_workers = max_workers
+        self.__timeout_seconds = timeout_seconds
+        self.__failure_policy = failure_policy
+        self.__clock = clock
+        self.__pool = None
+
+    @property
+    def max_workers(self) -> int:
+        return self.__max_workers
+
+    def map(self, action: Callable[[T], R], items: Iterable[T]) -> list[Optional[R]]:
+        """
+        results come back in the order of items; with the skip policy a call that fails
+        or runs past the timeout gives None in its place instead of failing the whole batch.
+        the timeout is one deadline for the whole batch, not a wait per call
+        """
+        if self.__pool is None:
+            self.__pool = ThreadPoolExecutor(max_workers=self.__max_workers)
+        futures = [self.__pool.submit(action, item) for item in items]
+        deadline = None if self.__timeout_seconds is None else self.__clock() + self.__timeout_seconds
+        results = []
+        for future in futures:
+            try:
+                remaining = None if deadline is None else max(0.0, deadline - self.__clock())
+                results.append(future.result(timeout=remaining))
+            except Exception as e:
+                if self.__failure_policy == FailurePolicy.RAISE:
+                    for pending in futures:
+                        pending.cancel()
+                    raise
+                print_exception(e)
+                results.append(None)
+        return results
+
+
+class TtlLruCache:
+    """
+    bounded by both age and size: entries expire ttl_seconds after they were put,
+    and once max_size is reached the least recently used entry is evicted.
+    safe to share between threads
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.__max_size = max_size
+        self.__ttl_seconds = ttl_seconds
+        self.__clock = clock
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] > self.__clock():
+                self.__entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self.__entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value) -> None:
+        with self.__lock:
+            self.__entries[key] = (self.__clock() + self.__ttl_seconds, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+
+    def invalidate(self, key) -> None:
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def get_stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.__entries)}
+
+
+def snake_case_key_to_camel_case(key: str) -> str:
+    components = key.split('_')
+    return components[0] + ''.join(x.title() for x in components[1:])
+
+
+def camel_case_key_to_snake_case(key: str) -> str:
+    words = re.findall(r'[A-Z]?[a-z]+|[A-Z]{2,}(?=[A-Z][a-z]|\d|\W|$)|\d+', key)
+    return '_'.join(map(str.lower, words))
+
+
+class KeyTranslationCache:
+    """
+    remembers up to max_size translated keys, keys beyond that are translated every time so a request
+    full of unexpected keys cannot grow it. reads and writes are single dict operations, safe between threads
+    """
+
+    def __init__(self, translate: Callable[[str], str], max_size: int, seed: Iterable[str] = ()):
+        self.__translate = translate
+        self.__max_size = max_size
+        self.__translations: dict[str, str] = {}
+        for key in seed:
+            self(key)
+
+    def __call__(self, key: str) -> str:
+        translation = self.__translations.get(key)
+        if translation is None:
+            translation = self.__translate(key)
+            if len(self.__translations) < self.__max_size:
+                self.__translations[key] = translation
+        return translation
+
+    def __len__(self):
+        return len(self.__translations)
+
+
+def transform_keys(data, translate: Callable[[str], str]):
+    """
+    copy of nested dicts and lists with every dict key translated, walked with a stack rather than recursion
+    """
+    if not isinstance(data, (dict, list)):
+        return data
+    root = {} if isinstance(data, dict) else []
+    stack = [(data, root)]
+    pop, push = stack.pop, stack.append
+    while stack:
+        source, target = pop()
+        if isinstance(source, dict):
+            for key, value in source.items():
+                if isinstance(value, (dict, list)):
+                    child = {} if isinstance(value, dict) else []
+                    push((value, child))
+                    value = child
+                target[translate(key)] = value
+        else:
+            for value in source:
+                if isinstance(value, (dict, list)):
+                    child = {} if isinstance(value, dict) else []
+                    push((value, child))
+                    value = child
+                target.append(value)
+    return root
+
 
-    @staticmethod
-    def __snake_case_key_to_camel_case(key: str) -> str:
-        components = key.split('_')
-        return components[0] + ''.join(x.title() for x in components[1:])
+def _model_keys() -> list[str]:
+    from src.domain.models import Brand, Influencer, Campaign
+    return [model_field.name for model in (Brand, Influencer, Campaign) for model_field in fields(model)]
+
+
+KEY_TRANSLATION_CACHE_MAX_SIZE = 1024
+_MODEL_KEYS = _model_keys()
+_SNAKE_TO_CAMEL_KEYS = KeyTranslationCache(translate=snake_case_key_to_camel_case,
+                                           max_size=KEY_TRANSLATION_CACHE_MAX_SIZE,
+                                           seed=_MODEL_KEYS)
+_CAMEL_TO_SNAKE_KEYS = KeyTranslationCache(translate=camel_case_key_to_snake_case,
+                                           max_size=KEY_TRANSLATION_CACHE_MAX_SIZE,
+                                           seed=map(snake_case_key_to_camel_case, _MODEL_KEYS))
+translate_snake_case_key = _SNAKE_TO_CAMEL_KEYS
+
+
+class CamelCaseBody(dict):
+    """
+    a response body that is already in its final shape, the serializer dumps it without walking it again
+    """
+
+
+def _json_default(value):
+    # orjson writes enums as their value and has no hook for them, so the stdlib encoder does the same
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+class StdlibJsonEncoder:
+    """
+    compact utf-8 json, byte for byte what OrjsonJsonEncoder writes for the values a response holds.
+    the two only differ on values that are not json to begin with, like nan
+    """
+
+    def encode(self, data) -> str:
+        return json.dumps(data, default=_json_default, separators=(",", ":"), ensure_ascii=False)
+
+
+class OrjsonJsonEncoder:
+    """
+    orjson writes datetimes and dataclasses itself, they are passed through so they come out as str() like
+    they do from StdlibJsonEncoder
+    """
+
+    def __init__(self):
+        self.__options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+
+    def encode(self, data) -> str:
+        return orjson.dumps(data, default=_json_default, option=self.__options).decode()
+
+
+JsonEncoder = Union[StdlibJsonEncoder, OrjsonJsonEncoder]
+
+
+class JsonEncoderEnum(Enum):
+    STDLIB = "stdlib"
+    ORJSON = "orjson"
+
+
+def new_json_encoder(preferred: Optional[JsonEncoderEnum] = None) -> JsonEncoder:
+    """
+    orjson when it is installed, unless stdlib is preferred
+    """
+    if preferred != JsonEncoderEnum.STDLIB and orjson is not None:
+        return OrjsonJsonEncoder()
+    if preferred == JsonEncoderEnum.ORJSON:
+        print("orjson is not installed, encoding json with the standard library")
+    return StdlibJsonEncoder()
+
+
+class JsonSnakeToCamelSerializer:
+
+    def __init__(self, encoder: JsonEncoder = None):
+        self.__encoder = encoder if encoder is not None else StdlibJsonEncoder()
+
+    def serialize(self, data: Union[dict, list]) -> str:
+        if isinstance(data, CamelCaseBody):
+            return self.__encoder.encode(data)
+        return self.__encoder.encode(transform_keys(data=data, translate=_SNAKE_TO_CAMEL_KEYS))
 
 
 class JsonCamelToSnakeCaseDeserializer:
 
     def deserialize(self, data: str) -> Union[dict, list]:
         data_dict = json.loads(data)
-        return self.__camel_case_to_snake_case_dict(d=data_dict)
-
-    def __camel_case_to_snake_case_dict(self, d):
-        if isinstance(d, list):
-            return [self.__camel_case_to_snake_case_dict(i) if isinstance(i, (dict, list)) else i for i in d]
-        return {self.__camel_case_key_to_snake_case(a): self.__camel_case_to_snake_case_dict(b) if isinstance(b, (dict, list)) else b for a, b in d.items()}
-
-    @staticmethod
-    def __camel_case_key_to_snake_case(key: str) -> str:
-        words = re.findall(r'[A-Z]?[a-z]+|[A-Z]{2,}(?=[A-Z][a-z]|\d|\W|$)|\d+', key)
-        return '_'.join(map(str.lower, words))
+        return transform_keys(data=data_dict, translate=_CAMEL_TO_SNAKE_KEYS)
 
 
 def valid_uuid(id_):
@@ -7,15 +7,45 @@ from sqlalchemy.orm import sessionmaker
 Base = declarative_base()
 
 
+_engines = {}
+
+
+def get_engine(url: str, **engine_options):
+    """
+    engines are process wide and keyed by url, so every data manager in a warm container
+    draws connections from the same pool instead of opening its own
+    """
+    engine = _engines.get(url)
+    if engine is None:
+        engine = create_engine(url, **engine_options)
+        _engines[url] = engine
+    return engine
+
+
+def get_mysql_url() -> str:
+    return f"mysql+mysqlconnector://{os.environ['DB_USER']}:{os.environ['DB_PASSWORD']}" \
+           f"@{os.environ['DB_URL']}/{os.environ['DB_NAME']}"
+
+
+def get_pool_options() -> dict:
+    return {
+        "pool_size": int(os.environ.get('DB_POOL_SIZE', 1)),
+        "max_overflow": int(os.environ.get('DB_POOL_MAX_OVERFLOW', 2)),
+        "pool_recycle": int(os.environ.get('DB_POOL_RECYCLE_SECONDS', 280)),
+        "pool_pre_ping": os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    }
+
+
 class SqlAlchemyDataManager:
-    def __init__(self):
+    def __init__(self, engine=None):
         print("new data manager constructed")
-        engine = create_engine(
-            f"mysql+mysqlconnector://{os.environ['DB_USER']}:{os.environ['DB_PASSWORD']}"
-            f"@{os.environ['DB_URL']}/{os.environ['DB_NAME']}")
+        if engine is None:
+            engine = get_engine(get_mysql_url(), **get_pool_options())
         self.__engine = engine
-        session = sessionmaker(bind=self.__engine, autocommit=False)
-        self.__session = session()
+        # a session lasts one request, so what it wrote is still what is stored when it commits.
+        # not expiring it saves reloading every entity that is read back after a commit
+        self.__session_factory = sessionmaker(bind=self.__engine, autocommit=False, expire_on_commit=False)
+        self.__session = None
 
     @property
     def engine(self):
@@ -23,8 +53,16 @@ class SqlAlchemyDataManager:
 
     @property
     def session(self):
+        # one session per request, opened on first use and shared by every repository
+        if self.__session is None:
+            self.__session = self.__session_factory()
         return self.__session
 
+    def end_session(self) -> None:
+        if self.__session is not None:
+            self.__session.close()
+            self.__session = None
+
 
 class DataManageFactory:
     @staticmethod
@@ -42,4 +80,5 @@ DEFAULT_BRAND_HEADER_IMAGE = "default_brand_header_image.png"
 DEFAULT_INFLUENCER_PROFILE_IMAGE = "default_influencer_profile_image.png"
 DEFAULT_CAMPAIGN_PRODUCT_IMAGE1 = "default_product_image1.png"
 DEFAULT_CAMPAIGN_PRODUCT_IMAGE2 = "default_product_image2.png"
-DEFAULT_CAMPAIGN_PRODUCT_IMAGE3 = "default_product_image3.png"
\ No newline at end of file
+DEFAULT_CAMPAIGN_PRODUCT_IMAGE3 = "default_product_image3.png"
+CAMPAIGN_PRODUCT_IMAGE_FIELDS = ("product_image1", "product_image2", "product_image3")
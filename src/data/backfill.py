@@ -0,0 +1,75 @@
+"""
+copies first name, last name and email from cognito into the brand and influencer tables,
+adding the columns first if the tables predate them. safe to run more than once
+
+    python -m src.data.backfill
+"""
+from sqlalchemy import inspect, or_, text
+
+from src.data import SqlAlchemyDataManager
+from src.data.entities import SqlAlchemyBrandEntity, SqlAlchemyInfluencerEntity
+from src.data.repositories import CognitoAuthUserRepository, CognitoAuthService
+from src.types import DataManager, AuthUserRepository
+
+USER_ENTITIES = [SqlAlchemyBrandEntity, SqlAlchemyInfluencerEntity]
+CLAIM_COLUMNS = ['first_name', 'last_name', 'email']
+
+
+def add_claim_columns(engine) -> list[str]:
+    inspector = inspect(engine)
+    added = []
+    with engine.begin() as connection:
+        for entity in USER_ENTITIES:
+            table = entity.__tablename__
+            existing = {column['name'] for column in inspector.get_columns(table)}
+            for name in CLAIM_COLUMNS:
+                if name not in existing:
+                    column_type = entity.__table__.columns[name].type.compile(dialect=engine.dialect)
+                    connection.execute(text(f'ALTER TABLE {table} ADD COLUMN {name} {column_type} NULL'))
+                    added.append(f'{table}.{name}')
+    return added
+
+
+def backfill_claims(data_manager: DataManager, auth_user_repository: AuthUserRepository,
+                    batch_size: int = 60) -> int:
+    """
+    walks each table in id order so users missing from cognito are passed over instead of fetched forever
+    """
+    updated = 0
+    session = data_manager.session
+    for entity in USER_ENTITIES:
+        last_id = ''
+        while True:
+            users = session.query(entity) \
+                .filter(or_(entity.first_name.is_(None), entity.last_name.is_(None), entity.email.is_(None))) \
+                .filter(entity.id > last_id) \
+                .order_by(entity.id) \
+                .limit(batch_size) \
+                .all()
+            if not users:
+                break
+            last_id = users[-1].id
+            auth_users = auth_user_repository.get_by_ids(ids=[user.auth_user_id for user in users])
+            for user in users:
+                auth_user = auth_users.get(user.auth_user_id)
+                if auth_user is None:
+                    print(f'{entity.__tablename__} {user.id} has no auth user {user.auth_user_id}')
+                    continue
+                user.first_name = auth_user.first_name
+                user.last_name = auth_user.last_name
+                user.email = auth_user.email
+                updated += 1
+            session.commit()
+    return updated
+
+
+def main():
+    data_manager = SqlAlchemyDataManager()
+    print(f'added columns: {add_claim_columns(engine=data_manager.engine)}')
+    auth_user_repository = CognitoAuthUserRepository(auth_service=CognitoAuthService())
+    print(f'backfilled users: {backfill_claims(data_manager=data_manager, auth_user_repository=auth_user_repository)}')
+    data_manager.end_session()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,54 @@
-from typing import Union
+from enum import Enum as PyEnum
+from typing import Union, Iterable
 
-from sqlalchemy import Column, String, DateTime, Float, PickleType
+from sqlalchemy import Column, String, DateTime, Float, Index, Integer, Enum, TypeDecorator, literal, event
 
 from src.data import Base
-from src.domain.models import Brand, Influencer, Campaign
+from src.domain.models import Brand, Influencer, Campaign, ValueEnum, CategoryEnum, CampaignStateEnum
 from src.types import ObjectMapperAdapter
 
 
+class EnumBitmask(TypeDecorator):
+    """
+    a list of enum members stored as an integer, one bit per member in declaration order.
+    lists come back in declaration order without duplicates, and the column can be filtered in sql
+    with contains_any/contains_all instead of unpickling every row
+    """
+    impl = Integer
+    cache_ok = True
+
+    def __init__(self, enum_type: type[PyEnum]):
+        super().__init__()
+        self.enum_type = enum_type
+        self.__members = list(enum_type)
+        self.__bits = {member: 1 << index for index, member in enumerate(self.__members)}
+
+    def to_bitmask(self, members: Iterable[PyEnum]) -> int:
+        mask = 0
+        for member in members:
+            mask |= self.__bits[member]
+        return mask
+
+    def from_bitmask(self, mask: int) -> list[PyEnum]:
+        return [member for member in self.__members if mask & self.__bits[member]]
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else self.to_bitmask(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else self.from_bitmask(value)
+
+    class comparator_factory(Integer.Comparator):
+
+        def contains_any(self, members: Iterable[PyEnum]):
+            mask = literal(self.type.to_bitmask(members), type_=Integer)
+            return self.expr.op('&', return_type=Integer)(mask) != 0
+
+        def contains_all(self, members: Iterable[PyEnum]):
+            mask = literal(self.type.to_bitmask(members), type_=Integer)
+            return self.expr.op('&', return_type=Integer)(mask) == mask
+
+
 class SqlAlchemyBaseEntity:
     id = Column(String(length=36), primary_key=True, nullable=False)
     created = Column(DateTime, nullable=False)
@@ -14,16 +56,21 @@ class SqlAlchemyBaseEntity:
 
 class SqlAlchemyBaseUserEntity(SqlAlchemyBaseEntity):
     auth_user_id = Column(type_=String(length=64), nullable=False, unique=True)
+    # copies of the cognito claims so reads do not need cognito, nullable until backfilled
+    first_name = Column(type_=String(length=120), nullable=True)
+    last_name = Column(type_=String(length=120), nullable=True)
+    email = Column(type_=String(length=254), nullable=True)
 
 
 class SqlAlchemyBrandEntity(Base, SqlAlchemyBaseUserEntity):
     __tablename__ = 'brand'
+    __table_args__ = (Index('ix_brand_created_id', 'created', 'id'),)
 
     brand_name = Column(type_=String(length=120), nullable=False)
     brand_description = Column(type_=String(length=500), nullable=False)
     header_image = Column(type_=String(length=360), nullable=True)
-    values = Column(type_=PickleType, nullable=False)
-    categories = Column(type_=PickleType, nullable=False)
+    values = Column(type_=EnumBitmask(ValueEnum), nullable=False)
+    categories = Column(type_=EnumBitmask(CategoryEnum), nullable=False)
     insta_handle = Column(type_=String(length=30), nullable=True)
     website = Column(type_=String(length=120), nullable=False)
     logo = Column(type_=String(length=360), nullable=True)
@@ -31,6 +78,7 @@ class SqlAlchemyBrandEntity(Base, SqlAlchemyBaseUserEntity):
 
 class SqlAlchemyInfluencerEntity(Base, SqlAlchemyBaseUserEntity):
     __tablename__ = 'influencer'
+    __table_args__ = (Index('ix_influencer_created_id', 'created', 'id'),)
 
     website = Column(type_=String(length=120), nullable=False)
     bio = Column(type_=String(length=500), nullable=False)
@@ -45,21 +93,22 @@ class SqlAlchemyInfluencerEntity(Base, SqlAlchemyBaseUserEntity):
     audience_male_split = Column(type_=Float, nullable=True)
     audience_female_split = Column(type_=Float, nullable=True)
     insta_handle = Column(type_=String(length=30), nullable=True)
-    values = Column(type_=PickleType, nullable=False)
-    categories = Column(type_=PickleType, nullable=False)
+    values = Column(type_=EnumBitmask(ValueEnum), nullable=False)
+    categories = Column(type_=EnumBitmask(CategoryEnum), nullable=False)
 
 
 class SqlAlchemyCampaignEntity(Base, SqlAlchemyBaseEntity):
     __tablename__ = 'campaign'
+    __table_args__ = (Index('ix_campaign_brand_id_created_id', 'brand_id', 'created', 'id'),)
 
     brand_id = Column(type_=String(length=360), nullable=False)
     objective = Column(type_=String(length=120), nullable=False)
     success_description = Column(type_=String(length=500), nullable=False)
     campaign_title = Column(type_=String(length=120), nullable=False)
     campaign_description = Column(type_=String(length=500), nullable=False)
-    campaign_categories = Column(type_=PickleType, nullable=False)
-    campaign_values = Column(type_=PickleType, nullable=False)
-    campaign_state = Column(type_=PickleType, nullable=False)
+    campaign_categories = Column(type_=EnumBitmask(CategoryEnum), nullable=False)
+    campaign_values = Column(type_=EnumBitmask(ValueEnum), nullable=False)
+    campaign_state = Column(type_=Enum(CampaignStateEnum, name='campaign_state'), nullable=False)
     campaign_product_link = Column(type_=String(length=120), nullable=False)
     campaign_hashtag = Column(type_=String(length=120), nullable=False)
     campaign_discount_code = Column(type_=String(length=120), nullable=False)
@@ -70,6 +119,35 @@ class SqlAlchemyCampaignEntity(Base, SqlAlchemyBaseEntity):
     product_image3 = Column(type_=String(length=360), nullable=False)
 
 
+
+def _keep_enum_bitmasks_in_order(entity) -> None:
+    """
+    lists set on an entity are put in the order they load in, sessions do not expire on commit
+    so an entity written in a request is returned as it is rather than read back
+    """
+    for column in entity.__table__.columns:
+        if isinstance(column.type, EnumBitmask):
+            bitmask = column.type
+            event.listen(getattr(entity, column.key), 'set',
+                         lambda target, value, old_value, initiator, bitmask=bitmask:
+                         None if value is None else bitmask.from_bitmask(bitmask.to_bitmask(value)),
+                         retval=True)
+
+
+def _keep_created_to_whole_seconds(entity) -> None:
+    """
+    mysql DATETIME drops the microseconds, so an entity that is not read back holds what a later read would load
+    """
+    event.listen(entity.created, 'set',
+                 lambda target, value, old_value, initiator: None if value is None else value.replace(microsecond=0),
+                 retval=True)
+
+
+for _entity in (SqlAlchemyBrandEntity, SqlAlchemyInfluencerEntity, SqlAlchemyCampaignEntity):
+    _keep_enum_bitmasks_in_order(entity=_entity)
+    _keep_created_to_whole_seconds(entity=_entity)
+
+
 def create_mappings(mapper: Union[ObjectMapperAdapter, object]):
     mapper.create_map(Brand, SqlAlchemyBrandEntity)
     mapper.create_map(SqlAlchemyBrandEntity, Brand)
@@ -0,0 +1,27 @@
+from sqlalchemy import inspect, text
+
+
+def existing_columns(engine, table_name: str) -> set[str]:
+    """
+    mysql is asked through information_schema, other databases through the inspector
+    """
+    if engine.dialect.name == 'mysql':
+        with engine.connect() as connection:
+            rows = connection.execute(text('SELECT column_name FROM information_schema.columns '
+                                           'WHERE table_schema = DATABASE() AND table_name = :table_name'),
+                                      {'table_name': table_name}).fetchall()
+        return {row[0] for row in rows}
+    return {column['name'] for column in inspect(engine).get_columns(table_name)}
+
+
+def existing_indexes(engine, table_name: str) -> set[str]:
+    """
+    mysql is asked through information_schema, other databases through the inspector
+    """
+    if engine.dialect.name == 'mysql':
+        with engine.connect() as connection:
+            rows = connection.execute(text('SELECT DISTINCT index_name FROM information_schema.statistics '
+                                           'WHERE table_schema = DATABASE() AND table_name = :table_name'),
+                                      {'table_name': table_name}).fetchall()
+        return {row[0] for row in rows}
+    return {index['name'] for index in inspect(engine).get_indexes(table_name)}
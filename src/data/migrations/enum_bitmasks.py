@@ -0,0 +1,120 @@
+"""
+moves values, categories and campaign state off pickled blobs: the enum lists become integer bitmasks
+and the campaign state is stored by name.
+mysql commits each ALTER TABLE on its own, so every step checks the columns first and a run that stopped
+part way resumes where it left off. the swap is a CHANGE COLUMN on mysql, which 5.7 supports as well as 8
+
+    python -m src.data.migrations.enum_bitmasks upgrade
+    python -m src.data.migrations.enum_bitmasks downgrade
+"""
+import pickle
+import sys
+from typing import Callable
+
+from sqlalchemy import inspect, table, column, text, Integer, String, LargeBinary, PickleType
+
+from src.data import SqlAlchemyDataManager
+from src.data.entities import SqlAlchemyBrandEntity, SqlAlchemyInfluencerEntity, SqlAlchemyCampaignEntity
+from src.data.migrations import existing_columns
+from src.domain.models import CampaignStateEnum
+
+BITMASK_COLUMNS = [(SqlAlchemyBrandEntity, 'values'),
+                   (SqlAlchemyBrandEntity, 'categories'),
+                   (SqlAlchemyInfluencerEntity, 'values'),
+                   (SqlAlchemyInfluencerEntity, 'categories'),
+                   (SqlAlchemyCampaignEntity, 'campaign_values'),
+                   (SqlAlchemyCampaignEntity, 'campaign_categories')]
+STATE_COLUMN = (SqlAlchemyCampaignEntity, 'campaign_state')
+
+
+def upgrade(engine) -> list[str]:
+    converted = []
+    for entity, name in BITMASK_COLUMNS:
+        bitmask = entity.__table__.columns[name].type
+        if _replace_column(engine=engine,
+                            entity=entity,
+                            name=name,
+                            old_type=LargeBinary,
+                            new_type=bitmask,
+                            convert=lambda value: bitmask.to_bitmask(pickle.loads(value))):
+            converted.append(f'{entity.__tablename__}.{name}')
+    entity, name = STATE_COLUMN
+    if _replace_column(engine=engine,
+                        entity=entity,
+                        name=name,
+                        old_type=LargeBinary,
+                        new_type=entity.__table__.columns[name].type,
+                        convert=lambda value: pickle.loads(value).name):
+        converted.append(f'{entity.__tablename__}.{name}')
+    return converted
+
+
+def downgrade(engine) -> list[str]:
+    converted = []
+    for entity, name in BITMASK_COLUMNS:
+        bitmask = entity.__table__.columns[name].type
+        if _replace_column(engine=engine,
+                            entity=entity,
+                            name=name,
+                            old_type=Integer,
+                            new_type=PickleType(),
+                            convert=lambda value: pickle.dumps(bitmask.from_bitmask(value))):
+            converted.append(f'{entity.__tablename__}.{name}')
+    entity, name = STATE_COLUMN
+    if _replace_column(engine=engine,
+                        entity=entity,
+                        name=name,
+                        old_type=String,
+                        new_type=PickleType(),
+                        convert=lambda value: pickle.dumps(CampaignStateEnum[value])):
+        converted.append(f'{entity.__tablename__}.{name}')
+    return converted
+
+
+def _replace_column(engine, entity, name: str, old_type: type, new_type, convert: Callable) -> bool:
+    """
+    adds the column under a temporary name, copies every row across converted, then swaps it in.
+    columns that are not of old_type have already been migrated and are left alone
+    """
+    table_name = entity.__tablename__
+    temporary = f'{name}_migrating'
+    if name in existing_columns(engine=engine, table_name=table_name):
+        current = next(c for c in inspect(engine).get_columns(table_name) if c['name'] == name)
+        if not isinstance(current['type'], old_type):
+            return False
+    elif temporary not in existing_columns(engine=engine, table_name=table_name):
+        return False
+    quote = engine.dialect.identifier_preparer.quote
+    column_type = new_type.compile(dialect=engine.dialect)
+    if temporary not in existing_columns(engine=engine, table_name=table_name):
+        with engine.begin() as connection:
+            connection.execute(text(f'ALTER TABLE {quote(table_name)} ADD COLUMN {quote(temporary)} '
+                                    f'{column_type} NULL'))
+    if name in existing_columns(engine=engine, table_name=table_name):
+        old_table = table(table_name, column('id'), column(name, old_type))
+        new_table = table(table_name, column('id'), column(temporary))
+        with engine.begin() as connection:
+            for id_, value in connection.execute(old_table.select()).fetchall():
+                connection.execute(new_table.update()
+                                   .where(new_table.c.id == id_)
+                                   .values({temporary: None if value is None else convert(value)}))
+        with engine.begin() as connection:
+            connection.execute(text(f'ALTER TABLE {quote(table_name)} DROP COLUMN {quote(name)}'))
+    with engine.begin() as connection:
+        if engine.dialect.name == 'mysql':
+            connection.execute(text(f'ALTER TABLE {quote(table_name)} CHANGE COLUMN {quote(temporary)} {quote(name)} '
+                                    f'{column_type} NOT NULL'))
+        else:
+            connection.execute(text(f'ALTER TABLE {quote(table_name)} RENAME COLUMN {quote(temporary)} '
+                                    f'TO {quote(name)}'))
+    return True
+
+
+def main(direction: str):
+    engine = SqlAlchemyDataManager().engine
+    migrate = {'upgrade': upgrade, 'downgrade': downgrade}[direction]
+    print(f'{direction} converted columns: {migrate(engine=engine)}')
+
+
+if __name__ == '__main__':
+    main(direction=sys.argv[1] if len(sys.argv) > 1 else 'upgrade')
@@ -0,0 +1,31 @@
+"""
+creates the (created, id) indexes keyset pagination seeks on, for tables that were created before them.
+indexes that are already there are left alone, so it is safe to run more than once
+
+    python -m src.data.migrations.pagination_indexes
+"""
+from src.data import SqlAlchemyDataManager
+from src.data.entities import SqlAlchemyBrandEntity, SqlAlchemyInfluencerEntity, SqlAlchemyCampaignEntity
+from src.data.migrations import existing_indexes
+
+PAGINATED_ENTITIES = [SqlAlchemyBrandEntity, SqlAlchemyInfluencerEntity, SqlAlchemyCampaignEntity]
+
+
+def create_pagination_indexes(engine) -> list[str]:
+    created = []
+    for entity in PAGINATED_ENTITIES:
+        existing = existing_indexes(engine=engine, table_name=entity.__tablename__)
+        for index in entity.__table__.indexes:
+            if index.name not in existing:
+                index.create(bind=engine)
+                created.append(index.name)
+    return created
+
+
+def main():
+    engine = SqlAlchemyDataManager().engine
+    print(f'created indexes: {create_pagination_indexes(engine=engine)}')
+
+
+if __name__ == '__main__':
+    main()
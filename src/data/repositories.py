@@ -1,19 +1,65 @@
 import base64
-import io
+import binascii
+import hashlib
+import json
 import os
+import re
 import uuid
-from typing import Callable, Union
+from datetime import datetime
+from typing import Callable, Union, Iterator, Optional
 
 import boto3
 from botocore.exceptions import ClientError
+import numpy as np
+from sqlalchemy import or_, and_, Integer, type_coerce
 from filetype import filetype
 
 from src.data.entities import SqlAlchemyBrandEntity, SqlAlchemyInfluencerEntity, create_mappings, \
     SqlAlchemyCampaignEntity
-from src.domain.models import Brand, Influencer, Campaign, CampaignStateEnum
+from src.domain.filtering import CampaignIndex, CampaignIndexRows, CampaignFilter
+from src.domain.images import content_key
+from src.domain.matching import MatchCandidates, CandidateIndex, to_bitmask
+from src.domain.similarity import AudienceIndex, AUDIENCE_FIELDS, SimilarityMetric, audience_vector
+from src.domain.models import Brand, Influencer, Campaign, CampaignStateEnum, Page
 from src.domain.models import User as UserModel
-from src.exceptions import AlreadyExistsException, ImageException, NotFoundException
-from src.types import DataManager, ImageRepository, Model, User, ObjectMapperAdapter
+from src.exceptions import AlreadyExistsException, ImageException, NotFoundException, InvalidCursorException, \
+    ImageTooLargeException
+from src.crosscutting import TtlLruCache, ConcurrentExecutor
+from src.types import DataManager, ImageRepository, Model, User, ObjectMapperAdapter, AuthUserRepository, \
+    ImageVariantQueue
+
+COGNITO_LIST_USERS_PAGE_SIZE = 60
+COGNITO_USER_CLAIMS = ['given_name', 'family_name', 'email']
+AUDIENCE_INDEX_MAX_AGE_SECONDS = 300
+CAMPAIGN_INDEX_MAX_AGE_SECONDS = 60
+IMAGE_MAX_SIZE_BYTES = 10 * 1024 * 1024
+IMAGE_MULTIPART_THRESHOLD_BYTES = 8 * 1024 * 1024
+# s3 wants every part but the last to be at least 5 MiB
+IMAGE_PART_SIZE_BYTES = 8 * 1024 * 1024
+# filetype never looks past the first 8 KiB
+IMAGE_SNIFF_BYTES = 8192
+IMAGE_UPLOAD_EXPIRES_SECONDS = 300
+IMAGE_UPLOAD_MAX_WORKERS = 3
+IMAGE_UPLOAD_CONTENT_TYPES = {'image/jpeg': 'jpg', 'image/png': 'png', 'image/gif': 'gif', 'image/webp': 'webp'}
+# the same public=yes tag put_object sets, in the form a presigned post takes it
+_PUBLIC_TAGGING = '<Tagging><TagSet><Tag><Key>public</Key><Value>yes</Value></Tag></TagSet></Tagging>'
+# variants are written once under a key that is never reused
+IMAGE_VARIANT_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+_UPLOAD_KEY = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\.[a-z]+')
+_BASE64 = re.compile(r'[A-Za-z0-9+/]*={0,2}')
+_NOT_BASE64 = re.compile(r'[^A-Za-z0-9+/=]')
+
+
+def encode_cursor(created: datetime, id_: str) -> str:
+    return base64.urlsafe_b64encode(f"{created.isoformat()}|{id_}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        created, id_ = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(created), id_
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise InvalidCursorException(f'cursor {cursor} is not valid') from e
 
 
 class BaseSqlAlchemyRepository:
@@ -35,6 +81,46 @@ class BaseSqlAlchemyRepository:
         return list(map(lambda x: self._object_mapper.map(from_obj=x, to_type=self._resource_dto),
                         self._data_manager.session.query(self._resource_entity).all()))
 
+    def load_page(self, limit: int, cursor: str = None) -> Page:
+        return self._load_page(query=self._data_manager.session.query(self._resource_entity),
+                               limit=limit,
+                               cursor=cursor)
+
+    def _load_page(self, query, limit: int, cursor: str = None) -> Page:
+        """
+        newest first, keyed on (created, id) so a page costs the same however deep it is
+        """
+        entity = self._resource_entity
+        if cursor:
+            created, id_ = decode_cursor(cursor)
+            # the leading created <= bound gives the index a range to seek to on mysql and sqlite alike
+            query = query.filter(and_(entity.created <= created,
+                                      or_(entity.created < created, entity.id < id_)))
+        entities = query.order_by(entity.created.desc(), entity.id.desc()).limit(limit + 1).all()
+        next_cursor = None
+        if len(entities) > limit:
+            entities = entities[:limit]
+            next_cursor = encode_cursor(created=entities[-1].created, id_=entities[-1].id)
+        return Page(items=list(map(lambda x: self._object_mapper.map(from_obj=x, to_type=self._resource_dto), entities)),
+                    next_cursor=next_cursor)
+
+    def load_by_ids(self, ids: list[str]) -> list[Model]:
+        """
+        in the order of ids, ids that do not exist are left out
+        """
+        if not ids:
+            return []
+        entities = self._data_manager.session.query(self._resource_entity).filter(self._resource_entity.id.in_(ids)).all()
+        by_id = {entity.id: entity for entity in entities}
+        return [self._object_mapper.map(from_obj=by_id[id_], to_type=self._resource_dto) for id_ in ids if id_ in by_id]
+
+    def _load_candidates(self, query) -> MatchCandidates:
+        # the raw bitmask integers straight into arrays, no entities are built
+        rows = query.all()
+        return MatchCandidates(ids=[row[0] for row in rows],
+                               value_masks=np.fromiter((row[1] for row in rows), dtype=np.uint16, count=len(rows)),
+                               category_masks=np.fromiter((row[2] for row in rows), dtype=np.uint16, count=len(rows)))
+
     def load_by_id(self, id_) -> Model:
         entity = self._data_manager.session.query(self._resource_entity).filter(self._resource_entity.id == id_).first()
         if entity:
@@ -45,22 +131,41 @@ class BaseSqlAlchemyRepository:
     def _update_image_by_id(self, id: str,
                             image_bytes: str,
                             field_setter: Callable[[str, Model], None]):
+        return self.__set_image_by_id(id=id,
+                                      image=lambda path: self._image_repository.upload(
+                                          path=path,
+                                          image_base64_encoded=image_bytes),
+                                      field_setter=field_setter)
+
+    def _confirm_image_by_id(self, id: str,
+                             image_key: str,
+                             field_setter: Callable[[str, Model], None]):
+        return self.__set_image_by_id(id=id,
+                                      image=lambda path: self._image_repository.confirm_upload(path=path,
+                                                                                               key=image_key),
+                                      field_setter=field_setter)
+
+    def _create_image_upload_by_id(self, id: str, content_type: str) -> dict:
+        model = self._data_manager.session.query(self._resource_entity).filter(
+            self._resource_entity.id == id).first()
+        if model:
+            return self._image_repository.create_upload(path=model.id, content_type=content_type)
+        else:
+            raise NotFoundException(f'{self._resource_dto.__name__} {id} could not be found')
+
+    def __set_image_by_id(self, id: str,
+                          image: Callable[[str], str],
+                          field_setter: Callable[[str, Model], None]):
         print(f"query: <update_image_by_id> for <{self._resource_dto.__name__}||{id}>")
         model = self._data_manager.session.query(self._resource_entity).filter(
             self._resource_entity.id == id).first()
         if model:
-            image = self._image_repository.upload(path=model.id,
-                                                  image_base64_encoded=image_bytes)
+            image = image(model.id)
             print(f'setting entity {self._resource_dto.__name__}|{id} image to {image}')
             field_setter(image, model)
             self._data_manager.session.commit()
-            print(
-                f'Repository Event: user after image set \n{self._object_mapper.map(from_obj=model, to_type=self._resource_dto).__dict__}')
-            first = self._data_manager.session \
-                .query(self._resource_entity) \
-                .filter(self._resource_entity.id == id) \
-                .first()
-            return self._object_mapper.map(from_obj=first, to_type=self._resource_dto)
+            # the session keeps its state on commit, the entity already holds what was written
+            return self._object_mapper.map(from_obj=model, to_type=self._resource_dto)
         else:
             raise NotFoundException(f'{self._resource_dto.__name__} {id} could not be found')
 
@@ -105,24 +210,46 @@ class BaseSqlAlchemyUserRepository(BaseSqlAlchemyRepository):
                 raise e
 
     def _update_image(self, auth_user_id, image_bytes, field_setter: Callable[[str, Model], None]):
+        return self.__set_image(auth_user_id=auth_user_id,
+                                image=lambda path: self._image_repository.upload(path=path,
+                                                                                 image_base64_encoded=image_bytes),
+                                field_setter=field_setter)
+
+    def _confirm_image(self, auth_user_id, image_key, field_setter: Callable[[str, Model], None]):
+        return self.__set_image(auth_user_id=auth_user_id,
+                                image=lambda path: self._image_repository.confirm_upload(path=path, key=image_key),
+                                field_setter=field_setter)
+
+    def create_image_upload_for_auth_user(self, auth_user_id: str, content_type: str) -> dict:
         user = self._data_manager.session.query(self._resource_entity).filter(
             self._resource_entity.auth_user_id == auth_user_id).first()
         if user:
-            image = self._image_repository.upload(path=user.id,
-                                                  image_base64_encoded=image_bytes)
+            return self._image_repository.create_upload(path=user.id, content_type=content_type)
+        else:
+            raise NotFoundException(f'user {auth_user_id} could not be found')
+
+    def __set_image(self, auth_user_id, image: Callable[[str], str], field_setter: Callable[[str, Model], None]):
+        user = self._data_manager.session.query(self._resource_entity).filter(
+            self._resource_entity.auth_user_id == auth_user_id).first()
+        if user:
+            image = image(user.id)
             print(f'setting user {auth_user_id} image to {image}')
             field_setter(image, user)
             self._data_manager.session.commit()
-            print(
-                f'Repository Event: user after image set \n{self._object_mapper.map(from_obj=user, to_type=self._resource_dto).__dict__}')
-            first = self._data_manager.session \
-                .query(self._resource_entity) \
-                .filter(self._resource_entity.auth_user_id == auth_user_id) \
-                .first()
-            return self._object_mapper.map(from_obj=first, to_type=self._resource_dto)
+            return self._object_mapper.map(from_obj=user, to_type=self._resource_dto)
         else:
             raise NotFoundException(f'brand {auth_user_id} could not be found')
 
+    @staticmethod
+    def _update_claims(entity, payload: User):
+        # claims are only sent on create, an update without them keeps the stored copy
+        if payload.first_name:
+            entity.first_name = payload.first_name
+        if payload.last_name:
+            entity.last_name = payload.last_name
+        if payload.email:
+            entity.email = payload.email
+
 
 class SqlAlchemyBrandRepository(BaseSqlAlchemyUserRepository):
     def __init__(self,
@@ -145,6 +272,7 @@ class SqlAlchemyBrandRepository(BaseSqlAlchemyUserRepository):
             entity.values = payload.values
             entity.categories = payload.categories
             entity.website = payload.website
+            self._update_claims(entity=entity, payload=payload)
             self._data_manager.session.commit()
             return self._object_mapper.map(from_obj=entity, to_type=self._resource_dto)
         else:
@@ -160,6 +288,16 @@ class SqlAlchemyBrandRepository(BaseSqlAlchemyUserRepository):
                                   image_bytes=image_bytes,
                                   field_setter=self.__header_image_setter)
 
+    def confirm_logo_for_auth_user(self, auth_user_id: str, image_key: str) -> Brand:
+        return self._confirm_image(auth_user_id=auth_user_id,
+                                   image_key=image_key,
+                                   field_setter=self.__logo_setter)
+
+    def confirm_header_image_for_auth_user(self, auth_user_id: str, image_key: str) -> Brand:
+        return self._confirm_image(auth_user_id=auth_user_id,
+                                   image_key=image_key,
+                                   field_setter=self.__header_image_setter)
+
     @staticmethod
     def __logo_setter(logo, brand):
         brand.logo = logo
@@ -173,12 +311,46 @@ class SqlAlchemyInfluencerRepository(BaseSqlAlchemyUserRepository):
     def __init__(self,
                  data_manager: DataManager,
                  image_repository: ImageRepository,
-                 object_mapper: Union[object, ObjectMapperAdapter]):
+                 object_mapper: Union[object, ObjectMapperAdapter],
+                 audience_index_max_age_seconds: float = AUDIENCE_INDEX_MAX_AGE_SECONDS):
         super().__init__(data_manager=data_manager,
                          resource_entity=SqlAlchemyInfluencerEntity,
                          image_repository=image_repository,
                          object_mapper=object_mapper,
                          resource_dto=Influencer)
+        self.__audience_index = AudienceIndex(loader=self.load_audience_vectors,
+                                              max_age_seconds=audience_index_max_age_seconds)
+        self.__candidate_index = CandidateIndex(loader=self.load_candidates,
+                                                max_age_seconds=audience_index_max_age_seconds)
+
+    def __index(self, influencer: Influencer) -> None:
+        self.__audience_index.upsert(id_=influencer.id, vector=audience_vector(influencer))
+        self.__candidate_index.upsert(id_=influencer.id,
+                                      value_mask=to_bitmask(influencer.values),
+                                      category_mask=to_bitmask(influencer.categories))
+
+    def write_new_for_auth_user(self, auth_user_id, payload) -> Influencer:
+        influencer = super().write_new_for_auth_user(auth_user_id=auth_user_id, payload=payload)
+        self.__index(influencer=influencer)
+        return influencer
+
+    def load_audience_vectors(self) -> tuple[list[str], np.ndarray]:
+        rows = self._data_manager.session.query(
+            SqlAlchemyInfluencerEntity.id,
+            *[getattr(SqlAlchemyInfluencerEntity, field) for field in AUDIENCE_FIELDS]).all()
+        vectors = np.array([row[1:] for row in rows], dtype=np.float32).reshape(len(rows), len(AUDIENCE_FIELDS))
+        # splits that were never filled in count as an empty share of the audience
+        return [row[0] for row in rows], np.nan_to_num(vectors, copy=False)
+
+    def load_similar(self, id_: str, limit: int,
+                     metric: SimilarityMetric = SimilarityMetric.COSINE) -> list[tuple[Influencer, float]]:
+        influencer = self.load_by_id(id_=id_)
+        nearest = self.__audience_index.nearest(vector=audience_vector(influencer),
+                                                k=limit,
+                                                metric=metric,
+                                                exclude=id_)
+        scores = dict(nearest)
+        return [(similar, scores[similar.id]) for similar in self.load_by_ids(ids=[similar_id for similar_id, _ in nearest])]
 
     def update_for_auth_user(self, auth_user_id: str, payload: Influencer) -> Influencer:
         entity: SqlAlchemyInfluencerEntity = self._data_manager.session \
@@ -200,15 +372,32 @@ class SqlAlchemyInfluencerRepository(BaseSqlAlchemyUserRepository):
             entity.audience_age_45_to_54_split = payload.audience_age_45_to_54_split
             entity.audience_age_55_to_64_split = payload.audience_age_55_to_64_split
             entity.audience_age_65_plus_split = payload.audience_age_65_plus_split
+            self._update_claims(entity=entity, payload=payload)
             self._data_manager.session.commit()
-            return self._object_mapper.map(from_obj=entity, to_type=Influencer)
+            influencer = self._object_mapper.map(from_obj=entity, to_type=Influencer)
+            self.__index(influencer=influencer)
+            return influencer
         raise NotFoundException(f"influencer auth_user_id:<{auth_user_id}> not found")
 
+    def load_candidates(self) -> MatchCandidates:
+        return self._load_candidates(query=self._data_manager.session.query(
+            SqlAlchemyInfluencerEntity.id,
+            type_coerce(SqlAlchemyInfluencerEntity.values, Integer),
+            type_coerce(SqlAlchemyInfluencerEntity.categories, Integer)))
+
+    def rank_candidates(self, value_mask: int, category_mask: int, k: int) -> list[tuple[str, int]]:
+        return self.__candidate_index.rank(value_mask=value_mask, category_mask=category_mask, k=k)
+
     def update_image_for_auth_user(self, auth_user_id: str, image_bytes: str) -> Influencer:
         return self._update_image(auth_user_id=auth_user_id,
                                   image_bytes=image_bytes,
                                   field_setter=self.__header_image_setter)
 
+    def confirm_image_for_auth_user(self, auth_user_id: str, image_key: str) -> Influencer:
+        return self._confirm_image(auth_user_id=auth_user_id,
+                                   image_key=image_key,
+                                   field_setter=self.__header_image_setter)
+
     @staticmethod
     def __header_image_setter(profile_image, influencer):
         influencer.image = profile_image
@@ -218,12 +407,63 @@ class SqlAlchemyCampaignRepository(BaseSqlAlchemyRepository):
 
     def __init__(self, data_manager: DataManager,
                  object_mapper: ObjectMapperAdapter,
-                 image_repository: ImageRepository):
+                 image_repository: ImageRepository,
+                 campaign_index_max_age_seconds: float = CAMPAIGN_INDEX_MAX_AGE_SECONDS,
+                 image_executor: Optional[ConcurrentExecutor] = None):
         super().__init__(data_manager,
                          SqlAlchemyCampaignEntity,
                          object_mapper,
                          Campaign,
                          image_repository=image_repository)
+        self.__image_executor = image_executor
+        self.__product_image_setters = {"product_image1": self.__product_image1_setter,
+                                        "product_image2": self.__product_image2_setter,
+                                        "product_image3": self.__product_image3_setter}
+        self.__campaign_index = CampaignIndex(loader=self.load_index_rows,
+                                              max_age_seconds=campaign_index_max_age_seconds)
+        self.__candidate_index = CandidateIndex(loader=self.load_active_candidates,
+                                                max_age_seconds=campaign_index_max_age_seconds)
+
+    def __index(self, campaign: Campaign) -> None:
+        self.__campaign_index.upsert(id_=campaign.id,
+                                     created=campaign.created,
+                                     values=campaign.campaign_values,
+                                     categories=campaign.campaign_categories,
+                                     state=campaign.campaign_state)
+        if campaign.campaign_state == CampaignStateEnum.ACTIVE:
+            self.__candidate_index.upsert(id_=campaign.id,
+                                          value_mask=to_bitmask(campaign.campaign_values),
+                                          category_mask=to_bitmask(campaign.campaign_categories))
+        else:
+            self.__candidate_index.remove(id_=campaign.id)
+
+    def load_index_rows(self) -> CampaignIndexRows:
+        rows = self._data_manager.session.query(
+            SqlAlchemyCampaignEntity.id,
+            SqlAlchemyCampaignEntity.created,
+            type_coerce(SqlAlchemyCampaignEntity.campaign_values, Integer),
+            type_coerce(SqlAlchemyCampaignEntity.campaign_categories, Integer),
+            SqlAlchemyCampaignEntity.campaign_state) \
+            .order_by(SqlAlchemyCampaignEntity.created, SqlAlchemyCampaignEntity.id) \
+            .all()
+        return CampaignIndexRows(ids=[row[0] for row in rows],
+                                 created=np.array([row[1] for row in rows], dtype='datetime64[us]'),
+                                 value_masks=np.fromiter((row[2] for row in rows), dtype=np.uint16, count=len(rows)),
+                                 category_masks=np.fromiter((row[3] for row in rows), dtype=np.uint16,
+                                                            count=len(rows)),
+                                 states=[row[4] for row in rows])
+
+    def load_page_filtered(self, campaign_filter: CampaignFilter, limit: int, cursor: str = None) -> Page:
+        """
+        newest first like load_page, the filter is answered by the in memory index and only the page is read
+        """
+        before = decode_cursor(cursor) if cursor else None
+        matches = self.__campaign_index.query(campaign_filter=campaign_filter, limit=limit + 1, before=before)
+        next_cursor = None
+        if len(matches) > limit:
+            matches = matches[:limit]
+            next_cursor = encode_cursor(created=matches[-1][1], id_=matches[-1][0])
+        return Page(items=self.load_by_ids(ids=[id_ for id_, _ in matches]), next_cursor=next_cursor)
 
     def write_new_for_brand(self, payload: Campaign,
                             auth_user_id: str) -> Campaign:
@@ -239,6 +479,7 @@ class SqlAlchemyCampaignRepository(BaseSqlAlchemyRepository):
                 .map(from_obj=payload, to_type=SqlAlchemyCampaignEntity)
             self._data_manager.session.add(campaign_entity)
             self._data_manager.session.commit()
+            self.__index(campaign=payload)
             return payload
         else:
             error_message = f"brand <{auth_user_id}> not found"
@@ -261,6 +502,31 @@ class SqlAlchemyCampaignRepository(BaseSqlAlchemyRepository):
         else:
             raise NotFoundException("brand not found")
 
+    def load_active_candidates(self) -> MatchCandidates:
+        return self._load_candidates(query=self._data_manager.session.query(
+            SqlAlchemyCampaignEntity.id,
+            type_coerce(SqlAlchemyCampaignEntity.campaign_values, Integer),
+            type_coerce(SqlAlchemyCampaignEntity.campaign_categories, Integer))
+                                     .filter(SqlAlchemyCampaignEntity.campaign_state == CampaignStateEnum.ACTIVE))
+
+    def rank_active_candidates(self, value_mask: int, category_mask: int, k: int) -> list[tuple[str, int]]:
+        return self.__candidate_index.rank(value_mask=value_mask, category_mask=category_mask, k=k)
+
+    def load_page_for_auth_brand(self, auth_user_id: str, limit: int, cursor: str = None) -> Page:
+        brand = self._data_manager \
+            .session \
+            .query(SqlAlchemyBrandEntity) \
+            .filter(SqlAlchemyBrandEntity.auth_user_id == auth_user_id) \
+            .first()
+        if brand is None:
+            raise NotFoundException("brand not found")
+        return self._load_page(query=self._data_manager
+                               .session
+                               .query(SqlAlchemyCampaignEntity)
+                               .filter(SqlAlchemyCampaignEntity.brand_id == brand.id),
+                               limit=limit,
+                               cursor=cursor)
+
     def update_product_image1(self, id: str, image_bytes: str) -> Campaign:
         return self._update_image_by_id(id=id,
                                         image_bytes=image_bytes,
@@ -276,6 +542,51 @@ class SqlAlchemyCampaignRepository(BaseSqlAlchemyRepository):
                                         image_bytes=image_bytes,
                                         field_setter=self.__product_image3_setter)
 
+    def update_product_images(self, id: str, images: dict[str, str]) -> Campaign:
+        """
+        images are base64 encoded and keyed by product image field. they are uploaded side by side and set in one
+        commit, the campaign is left as it was when any of them fails
+        """
+        print(f"query: <update_product_images> for <{self._resource_dto.__name__}||{id}>")
+        campaign = self._data_manager.session.query(SqlAlchemyCampaignEntity).filter(
+            SqlAlchemyCampaignEntity.id == id).first()
+        if campaign is None:
+            raise NotFoundException(f'{self._resource_dto.__name__} {id} could not be found')
+        fields = list(images)
+        keys = self.__upload_all(path=campaign.id, images=[images[field] for field in fields])
+        for field, key in zip(fields, keys):
+            print(f'setting entity {self._resource_dto.__name__}|{id} {field} to {key}')
+            self.__product_image_setters[field](key, campaign)
+        self._data_manager.session.commit()
+        return self._object_mapper.map(from_obj=campaign, to_type=Campaign)
+
+    def __upload_all(self, path: str, images: list[str]) -> list[str]:
+        def upload(image: str) -> str:
+            return self._image_repository.upload(path=path, image_base64_encoded=image)
+
+        # an image already stored when another fails is left for the sweep, nothing points at it
+        if self.__image_executor is None or len(images) < 2:
+            return list(map(upload, images))
+        return self.__image_executor.map(upload, images)
+
+    def create_image_upload(self, id: str, content_type: str) -> dict:
+        return self._create_image_upload_by_id(id=id, content_type=content_type)
+
+    def confirm_product_image1(self, id: str, image_key: str) -> Campaign:
+        return self._confirm_image_by_id(id=id,
+                                         image_key=image_key,
+                                         field_setter=self.__product_image1_setter)
+
+    def confirm_product_image2(self, id: str, image_key: str) -> Campaign:
+        return self._confirm_image_by_id(id=id,
+                                         image_key=image_key,
+                                         field_setter=self.__product_image2_setter)
+
+    def confirm_product_image3(self, id: str, image_key: str) -> Campaign:
+        return self._confirm_image_by_id(id=id,
+                                         image_key=image_key,
+                                         field_setter=self.__product_image3_setter)
+
     @staticmethod
     def __product_image1_setter(product_image1, campaign):
         campaign.product_image1 = product_image1
@@ -309,7 +620,9 @@ class SqlAlchemyCampaignRepository(BaseSqlAlchemyRepository):
             self._data_manager\
                 .session\
                 .commit()
-            return self._object_mapper.map(from_obj=campaign, to_type=Campaign)
+            updated = self._object_mapper.map(from_obj=campaign, to_type=Campaign)
+            self.__index(campaign=updated)
+            return updated
         else:
             raise NotFoundException(f"{self._resource_dto.__name__}||{_id} not found")
 
@@ -322,46 +635,231 @@ class SqlAlchemyCampaignRepository(BaseSqlAlchemyRepository):
         if campaign is not None:
             campaign.campaign_state = payload
             self._data_manager.session.commit()
-            return self._object_mapper.map(from_obj=campaign, to_type=Campaign)
+            updated = self._object_mapper.map(from_obj=campaign, to_type=Campaign)
+            self.__index(campaign=updated)
+            return updated
         else:
             raise NotFoundException(f"cannot find campaign {_id}")
 
 
+def base64_decoded_size(data: str) -> int:
+    return len(data) // 4 * 3 - (len(data) - len(data.rstrip("=")))
+
+
+def iter_base64_decode(data: str, chunk_size_bytes: int) -> Iterator[bytes]:
+    """
+    decodes chunk_size_bytes at a time, so only one decoded chunk is held on top of the encoded string
+    """
+    chunk_chars = max(4, chunk_size_bytes // 3 * 4)
+    for start in range(0, len(data), chunk_chars):
+        yield base64.b64decode(data[start:start + chunk_chars], validate=True)
+
+
 class S3ImageRepository:
+    """
+    images arrive base64 encoded in the request, the size is known from the encoded length so an image that is
+    too big is refused before anything is decoded. they are stored under the hash of their bytes, an image that
+    is already stored is not uploaded again. the type is sniffed from the first decoded bytes and the rest
+    is decoded a part at a time, straight into a multipart upload once the image is past the threshold.
 
-    def __init__(self):
+    clients can instead post the image straight to s3 with create_upload, and hand the key back to confirm_upload.
+    every stored image is queued on variant_queue, when there is one, to have its resized variants made
+    """
+
+    def __init__(self, max_size_bytes: int = IMAGE_MAX_SIZE_BYTES,
+                 multipart_threshold_bytes: int = IMAGE_MULTIPART_THRESHOLD_BYTES,
+                 part_size_bytes: int = IMAGE_PART_SIZE_BYTES,
+                 s3_client=None,
+                 variant_queue: Optional[ImageVariantQueue] = None):
         self.__bucket_name = 'pinfluencer-product-images'
-        self.__s3_client = boto3.client('s3')
+        self.__variant_queue = variant_queue
+        self.__max_size_bytes = max_size_bytes
+        self.__multipart_threshold_bytes = multipart_threshold_bytes
+        self.__part_size_bytes = part_size_bytes
+        # S3_ENDPOINT_URL points the client at a local stand-in like minio or localstack
+        self.__s3_client = s3_client if s3_client is not None \
+            else boto3.client('s3', endpoint_url=os.environ.get('S3_ENDPOINT_URL'))
 
     def upload(self, path, image_base64_encoded):
-        image = base64.b64decode(image_base64_encoded)
-        f = io.BytesIO(image)
-        file_type = filetype.guess(f)
-        print(f'image uploading to {path}/ of {file_type}')
+        data = image_base64_encoded
+        if not _BASE64.fullmatch(data):
+            # line breaks and the like are ignored by a whole string decode, without them chunks stay aligned
+            data = _NOT_BASE64.sub('', data)
+        if len(data) % 4:
+            raise ImageException('image is not valid base64')
+        size = base64_decoded_size(data)
+        if size > self.__max_size_bytes:
+            raise ImageTooLargeException(f'image of {size} bytes is over the limit of {self.__max_size_bytes}')
+        try:
+            head = base64.b64decode(data[:IMAGE_SNIFF_BYTES // 3 * 4], validate=True)
+        except binascii.Error as e:
+            raise ImageException('image is not valid base64') from e
+        file_type = filetype.guess(head)
+        print(f'image uploading for {path} of {file_type}, {size} bytes')
         if file_type is not None:
             mime = file_type.MIME
+            extension = file_type.EXTENSION
         else:
             mime = 'image/jpg'
-        image_id = str(uuid.uuid4())
-        file = f'{image_id}.{file_type.EXTENSION}'
-        print(f'image {file}')
-        key = f'{path}/{file}'
-        print(f'key {key}')
+            extension = 'jpg'
+        try:
+            body = base64.b64decode(data, validate=True) if size <= self.__multipart_threshold_bytes else None
+            digest = hashlib.sha256(body) if body is not None else self.__digest(data=data)
+            key = content_key(digest=digest.hexdigest(), extension=extension)
+            print(f'key {key}')
+            if self.__exists(key=key):
+                # the same image is already stored, and queued for its variants when it was. it is touched so the
+                # orphan sweep sees it as new, it may have been an orphan until now
+                print(f'{key} is already stored')
+                self.__touch(key=key, mime=mime)
+                return key
+            if body is not None:
+                self.__s3_client.put_object(Bucket=self.__bucket_name,
+                                            Key=key, Body=body,
+                                            ContentType=mime,
+                                            ChecksumSHA256=base64.b64encode(digest.digest()).decode(),
+                                            Tagging='public=yes')
+            else:
+                self.__upload_multipart(key=key, data=data, mime=mime)
+        except (ClientError, binascii.Error) as e:
+            raise ImageException(str(e)) from e
+        self.__queue_variants(key=key)
+        return key
+
+    def create_upload(self, path: str, content_type: str) -> dict:
+        """
+        a presigned post for one image under path, s3 itself refuses a body of another type or over the size limit
+        """
+        extension = IMAGE_UPLOAD_CONTENT_TYPES.get(content_type)
+        if extension is None:
+            raise ImageException(f'cannot upload images of type {content_type}')
+        key = f'{path}/{uuid.uuid4()}.{extension}'
+        fields = {'Content-Type': content_type, 'tagging': _PUBLIC_TAGGING}
+        try:
+            post = self.__s3_client.generate_presigned_post(Bucket=self.__bucket_name,
+                                                            Key=key,
+                                                            Fields=fields,
+                                                            Conditions=[
+                                                                {'Content-Type': content_type},
+                                                                {'tagging': _PUBLIC_TAGGING},
+                                                                ['content-length-range', 1, self.__max_size_bytes]
+                                                            ],
+                                                            ExpiresIn=IMAGE_UPLOAD_EXPIRES_SECONDS)
+        except ClientError as e:
+            raise ImageException(str(e)) from e
+        return {'url': post['url'], 'fields': post['fields'], 'key': key}
+
+    def confirm_upload(self, path: str, key: str) -> str:
+        """
+        the key of an image posted with create_upload for path, once it is in the bucket
+        """
+        if not key or not key.startswith(f'{path}/') or not _UPLOAD_KEY.fullmatch(key[len(path) + 1:]):
+            raise ImageException(f'{key} is not an image upload of {path}')
+        try:
+            self.__s3_client.head_object(Bucket=self.__bucket_name, Key=key)
+        except ClientError as e:
+            raise ImageException(f'{key} has not been uploaded') from e
+        self.__queue_variants(key=key)
+        return key
+
+    def download(self, key: str) -> bytes:
+        return self.__s3_client.get_object(Bucket=self.__bucket_name, Key=key)['Body'].read()
+
+    def upload_variant(self, key: str, data: bytes, content_type: str) -> None:
+        self.__s3_client.put_object(Bucket=self.__bucket_name,
+                                    Key=key,
+                                    Body=data,
+                                    ContentType=content_type,
+                                    CacheControl=IMAGE_VARIANT_CACHE_CONTROL,
+                                    Tagging='public=yes')
+
+    def list_images(self) -> Iterator[tuple[str, datetime]]:
+        """
+        the key and last modified time of every object in the bucket
+        """
+        for page in self.__s3_client.get_paginator('list_objects_v2').paginate(Bucket=self.__bucket_name):
+            for item in page.get('Contents', []):
+                yield item['Key'], item['LastModified']
+
+    def delete(self, keys: list[str]) -> None:
+        # s3 deletes at most a thousand keys a request
+        for start in range(0, len(keys), 1000):
+            self.__s3_client.delete_objects(Bucket=self.__bucket_name,
+                                            Delete={'Objects': [{'Key': key} for key in keys[start:start + 1000]],
+                                                    'Quiet': True})
+
+    def __exists(self, key: str) -> bool:
+        try:
+            self.__s3_client.head_object(Bucket=self.__bucket_name, Key=key)
+            return True
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+
+    def __touch(self, key: str, mime: str) -> None:
+        # s3 only copies an object onto itself when something changes, replacing the metadata is enough
+        self.__s3_client.copy_object(Bucket=self.__bucket_name,
+                                     Key=key,
+                                     CopySource={'Bucket': self.__bucket_name, 'Key': key},
+                                     MetadataDirective='REPLACE',
+                                     ContentType=mime,
+                                     TaggingDirective='COPY')
+
+    @staticmethod
+    def __digest(data: str):
+        # a first pass over the image a part at a time, the key has to be known before the upload starts
+        digest = hashlib.sha256()
+        for part in iter_base64_decode(data=data, chunk_size_bytes=IMAGE_PART_SIZE_BYTES):
+            digest.update(part)
+        return digest
+
+    def __queue_variants(self, key: str) -> None:
+        # the image is stored either way, until its variants exist clients fall back to the original
+        if self.__variant_queue is None:
+            return
+        try:
+            self.__variant_queue.enqueue(key=key)
+        except ClientError as e:
+            print(f'could not queue variants of {key}: {e}')
+
+    def __upload_multipart(self, key: str, data: str, mime: str) -> None:
+        upload_id = self.__s3_client.create_multipart_upload(Bucket=self.__bucket_name,
+                                                             Key=key,
+                                                             ContentType=mime,
+                                                             Tagging='public=yes')['UploadId']
         try:
-            self.__s3_client.put_object(Bucket=self.__bucket_name,
-                                        Key=key, Body=image,
-                                        ContentType=mime,
-                                        Tagging='public=yes')
-            return key
-        except ClientError:
-            raise ImageException
+            parts = []
+            for number, part in enumerate(iter_base64_decode(data=data, chunk_size_bytes=self.__part_size_bytes),
+                                          start=1):
+                response = self.__s3_client.upload_part(Bucket=self.__bucket_name, Key=key,
+                                                        UploadId=upload_id, PartNumber=number, Body=part)
+                parts.append({"ETag": response["ETag"], "PartNumber": number})
+            self.__s3_client.complete_multipart_upload(Bucket=self.__bucket_name, Key=key, UploadId=upload_id,
+                                                       MultipartUpload={"Parts": parts})
+        except Exception:
+            # parts of an upload that is never completed are kept, and billed, until it is aborted
+            self.__s3_client.abort_multipart_upload(Bucket=self.__bucket_name, Key=key, UploadId=upload_id)
+            raise
+
+
+class SqsImageVariantQueue:
+
+    def __init__(self, queue_url: str, sqs_client=None):
+        self.__queue_url = queue_url
+        # SQS_ENDPOINT_URL points the client at a local stand-in like elasticmq or localstack
+        self.__sqs_client = sqs_client if sqs_client is not None \
+            else boto3.client('sqs', endpoint_url=os.environ.get('SQS_ENDPOINT_URL'))
+
+    def enqueue(self, key: str) -> None:
+        self.__sqs_client.send_message(QueueUrl=self.__queue_url, MessageBody=json.dumps({'key': key}))
 
 
 class CognitoAuthService:
 
-    def __init__(self):
+    def __init__(self, client=None):
         print(f"user pool id: {os.environ['USER_POOL_ID']}")
-        self.__client = boto3.client('cognito-idp')
+        self.__client = client if client is not None else boto3.client('cognito-idp')
 
     def update_user_claims(self, username: str, attributes: list[dict]) -> None:
         self.__client.admin_update_user_attributes(
@@ -376,26 +874,88 @@ class CognitoAuthService:
             Username=username
         )
 
+    def list_users(self, attributes: list[str], pagination_token: str = None) -> dict:
+        kwargs = {"PaginationToken": pagination_token} if pagination_token else {}
+        return self.__client.list_users(
+            UserPoolId=os.environ["USER_POOL_ID"],
+            AttributesToGet=attributes,
+            Limit=COGNITO_LIST_USERS_PAGE_SIZE,
+            **kwargs
+        )
+
+    def get_estimated_number_of_users(self) -> int:
+        return self.__client.describe_user_pool(
+            UserPoolId=os.environ["USER_POOL_ID"]
+        )['UserPool']['EstimatedNumberOfUsers']
+
 
 class CognitoAuthUserRepository:
 
     def __init__(self, auth_service: CognitoAuthService):
         self.__auth_service = auth_service
+        self.__estimated_number_of_users = None
 
     def get_by_id(self, _id: str) -> User:
         auth_user = self.__auth_service.get_user(username=_id)
-        first_name = self.__get_cognito_attribute(user=auth_user,
+        return self.__to_user(attributes=auth_user['UserAttributes'])
+
+    def get_by_ids(self, ids: list[str]) -> dict[str, User]:
+        """
+        users that cannot be found are left out of the result.
+        list users cannot filter on more than one username, so a batch is resolved by paging through the pool,
+        which is only worth it when it takes fewer round trips than looking each user up
+        """
+        remaining = set(ids)
+        if not remaining:
+            return {}
+        if len(remaining) <= self.__get_number_of_list_users_pages():
+            return self.__get_each_by_id(ids=remaining)
+        users = {}
+        pagination_token = None
+        while remaining:
+            page = self.__auth_service.list_users(attributes=COGNITO_USER_CLAIMS,
+                                                  pagination_token=pagination_token)
+            for auth_user in page['Users']:
+                if auth_user['Username'] in remaining:
+                    remaining.discard(auth_user['Username'])
+                    users[auth_user['Username']] = self.__to_user(attributes=auth_user['Attributes'])
+            pagination_token = page.get('PaginationToken')
+            if not pagination_token:
+                break
+        if remaining:
+            print(f'auth users not found {remaining}')
+        return users
+
+    def __get_each_by_id(self, ids: set[str]) -> dict[str, User]:
+        users = {}
+        for _id in ids:
+            try:
+                users[_id] = self.get_by_id(_id=_id)
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'UserNotFoundException':
+                    raise
+                print(f'auth user not found {_id}')
+        return users
+
+    def __get_number_of_list_users_pages(self) -> int:
+        # only used to pick a lookup strategy, so an estimate fetched once per container is good enough
+        if self.__estimated_number_of_users is None:
+            self.__estimated_number_of_users = self.__auth_service.get_estimated_number_of_users()
+        return -(-self.__estimated_number_of_users // COGNITO_LIST_USERS_PAGE_SIZE)
+
+    def __to_user(self, attributes: list[dict]) -> User:
+        first_name = self.__get_cognito_attribute(attributes=attributes,
                                                   attribute_name='given_name')
-        last_name = self.__get_cognito_attribute(user=auth_user,
+        last_name = self.__get_cognito_attribute(attributes=attributes,
                                                  attribute_name='family_name')
-        email = self.__get_cognito_attribute(user=auth_user,
+        email = self.__get_cognito_attribute(attributes=attributes,
                                              attribute_name='email')
         return UserModel(first_name=first_name,
                          last_name=last_name,
                          email=email)
 
-    def __get_cognito_attribute(self, user: dict, attribute_name: str) -> str:
-        return next(filter(lambda x: x['Name'] == attribute_name, user['UserAttributes']))['Value']
+    def __get_cognito_attribute(self, attributes: list[dict], attribute_name: str) -> str:
+        return next(filter(lambda x: x['Name'] == attribute_name, attributes))['Value']
 
     def update_brand_claims(self, user: Brand):
         self.__update_user_claims(user=user, type='brand')
@@ -422,3 +982,49 @@ class CognitoAuthUserRepository:
                 'Value': user.first_name
             }
         ])
+
+
+class CachingAuthUserRepository:
+    """
+    keeps auth user claims between warm invocations, claims written through this repository
+    are dropped from the cache so the next read goes back to cognito
+    """
+
+    def __init__(self, auth_user_repository: AuthUserRepository, cache: TtlLruCache):
+        self.__auth_user_repository = auth_user_repository
+        self.__cache = cache
+
+    @property
+    def cache(self) -> TtlLruCache:
+        return self.__cache
+
+    def get_by_id(self, _id: str) -> User:
+        user = self.__cache.get(_id)
+        if user is None:
+            user = self.__auth_user_repository.get_by_id(_id=_id)
+            self.__cache.put(_id, user)
+        return user
+
+    def get_by_ids(self, ids: list[str]) -> dict[str, User]:
+        users = {}
+        misses = []
+        for _id in dict.fromkeys(ids):
+            user = self.__cache.get(_id)
+            if user is None:
+                misses.append(_id)
+            else:
+                users[_id] = user
+        if misses:
+            found = self.__auth_user_repository.get_by_ids(ids=misses)
+            for _id, user in found.items():
+                self.__cache.put(_id, user)
+            users.update(found)
+        return users
+
+    def update_brand_claims(self, user: Brand):
+        self.__auth_user_repository.update_brand_claims(user=user)
+        self.__cache.invalidate(user.auth_user_id)
+
+    def update_influencer_claims(self, user: Influencer):
+        self.__auth_user_repository.update_influencer_claims(user=user)
+        self.__cache.invalidate(user.auth_user_id)
@@ -0,0 +1,90 @@
+"""
+deletes uploaded images, and their variants, that no brand, influencer or campaign points at any more.
+images are shared by every row with the same bytes, so one is only an orphan when no row at all refers to it.
+lists the orphans unless --delete is given
+
+    python -m src.data.sweep [--delete]
+"""
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+
+from src.data import SqlAlchemyDataManager
+from src.data.entities import SqlAlchemyBrandEntity, SqlAlchemyInfluencerEntity, SqlAlchemyCampaignEntity
+from src.data.repositories import S3ImageRepository
+from src.domain.images import image_stem
+from src.types import DataManager, ImageRepository
+
+IMAGE_COLUMNS = [SqlAlchemyBrandEntity.logo,
+                 SqlAlchemyBrandEntity.header_image,
+                 SqlAlchemyInfluencerEntity.image,
+                 SqlAlchemyCampaignEntity.product_image1,
+                 SqlAlchemyCampaignEntity.product_image2,
+                 SqlAlchemyCampaignEntity.product_image3]
+# a presigned upload is in the bucket a little before it is confirmed, and so before anything points at it
+ORPHAN_GRACE_PERIOD = timedelta(days=1)
+# what s3 deletes in one request
+SWEEP_BATCH_KEYS = 1000
+
+
+def referenced_stems(data_manager: DataManager) -> set[str]:
+    stems = set()
+    for column in IMAGE_COLUMNS:
+        for (key,) in data_manager.session.query(column).distinct():
+            stem = image_stem(key=key)
+            if stem is not None:
+                stems.add(stem)
+    return stems
+
+
+def orphaned_keys(images: Iterable[tuple[str, datetime]], referenced: set[str],
+                  now: datetime, grace_period: timedelta = ORPHAN_GRACE_PERIOD) -> list[str]:
+    """
+    keys of uploaded images and variants whose image nothing refers to, the default images and anything else
+    in the bucket are left alone. an image and its variants go together, and only once all of them are older
+    than the grace period
+    """
+    keys: dict[str, list[str]] = {}
+    newest: dict[str, datetime] = {}
+    for key, last_modified in images:
+        stem = image_stem(key=key)
+        if stem is None or stem in referenced:
+            continue
+        keys.setdefault(stem, []).append(key)
+        newest[stem] = max(newest.get(stem, last_modified), last_modified)
+    return [key for stem, stem_keys in keys.items() if now - newest[stem] > grace_period for key in stem_keys]
+
+
+def sweep(data_manager: DataManager, image_repository: ImageRepository, delete: bool = False) -> list[str]:
+    """
+    the orphans found, or the ones deleted when delete is set
+    """
+    # a stored image that is uploaded again is touched, so one reused after the rows are read is listed as new
+    orphans = orphaned_keys(images=image_repository.list_images(),
+                            referenced=referenced_stems(data_manager=data_manager),
+                            now=datetime.now(timezone.utc))
+    if not delete:
+        return orphans
+    deleted = []
+    for start in range(0, len(orphans), SWEEP_BATCH_KEYS):
+        # the rows are read again right before each batch goes, in a new transaction so the read is not stale
+        data_manager.session.rollback()
+        referenced = referenced_stems(data_manager=data_manager)
+        batch = [key for key in orphans[start:start + SWEEP_BATCH_KEYS] if image_stem(key=key) not in referenced]
+        image_repository.delete(keys=batch)
+        deleted.extend(batch)
+    return deleted
+
+
+def main():
+    delete = '--delete' in sys.argv[1:]
+    data_manager = SqlAlchemyDataManager()
+    orphans = sweep(data_manager=data_manager, image_repository=S3ImageRepository(), delete=delete)
+    for key in orphans:
+        print(key)
+    print(f'{"deleted" if delete else "found"} {len(orphans)} orphaned images and variants')
+    data_manager.end_session()
+
+
+if __name__ == '__main__':
+    main()
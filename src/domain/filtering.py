@@ -0,0 +1,174 @@
+import bisect
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Callable, Optional, Iterable
+
+import numpy as np
+
+from src.domain.models import ValueEnum, CategoryEnum, CampaignStateEnum
+
+# filters are evaluated a chunk at a time from the newest rows back, a page is usually filled by the first chunk
+# and every chunk after it is twice as big, so a rare filter still gets through the index in a few passes
+FIRST_CHUNK_ROWS = 1 << 12
+
+
+@dataclass(frozen=True)
+class CampaignFilter:
+    """
+    any of the categories and any of the values (all of them when match_all) in one of the states
+    """
+    categories: tuple[CategoryEnum, ...] = ()
+    values: tuple[ValueEnum, ...] = ()
+    states: tuple[CampaignStateEnum, ...] = (CampaignStateEnum.ACTIVE,)
+    match_all: bool = False
+
+
+@dataclass
+class CampaignIndexRows:
+    """
+    what the index is built from, sorted oldest first by created and then id
+    """
+    ids: list[str] = field(default_factory=list)
+    created: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype='datetime64[us]'))
+    value_masks: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.uint16))
+    category_masks: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.uint16))
+    states: list[CampaignStateEnum] = field(default_factory=list)
+
+
+class CampaignIndex:
+    """
+    inverted index from every category, value and state to a bitmap of the campaigns that have it, packed eight
+    campaigns to a byte so a filter over a million campaigns combines a few hundred kilobytes.
+    rows are kept oldest first so new campaigns are appended, and built like the audience index: on first use
+    and again once older than max_age_seconds, writes through this container are applied straight away
+    """
+
+    def __init__(self, loader: Callable[[], CampaignIndexRows],
+                 max_age_seconds: float,
+                 clock: Callable[[], float] = time.monotonic):
+        self.__loader = loader
+        self.__max_age_seconds = max_age_seconds
+        self.__clock = clock
+        self.__lock = threading.Lock()
+        self.__built_at: Optional[float] = None
+        self.__size = 0
+        self.__ids: list[str] = []
+        self.__rows: dict[str, int] = {}
+        self.__created = np.zeros(0, dtype='datetime64[us]')
+        self.__bitmaps: dict[Enum, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def __build(self) -> None:
+        rows = self.__loader()
+        self.__ids = list(rows.ids)
+        self.__rows = {id_: row for row, id_ in enumerate(self.__ids)}
+        self.__created = np.asarray(rows.created, dtype='datetime64[us]').copy()
+        self.__bitmaps = {}
+        for enum_type, masks in ((ValueEnum, rows.value_masks), (CategoryEnum, rows.category_masks)):
+            masks = np.asarray(masks, dtype=np.uint16)
+            for bit, member in enumerate(enum_type):
+                self.__bitmaps[member] = np.packbits((masks >> bit) & 1, bitorder='little')
+        ordinals = {member: ordinal for ordinal, member in enumerate(CampaignStateEnum)}
+        states = np.fromiter((ordinals[state] for state in rows.states), dtype=np.uint8, count=len(rows.states))
+        for member, ordinal in ordinals.items():
+            self.__bitmaps[member] = np.packbits(states == ordinal, bitorder='little')
+        self.__size = len(self.__ids)
+        self.__built_at = self.__clock()
+
+    def __ensure_fresh(self) -> None:
+        if self.__built_at is None or self.__clock() - self.__built_at >= self.__max_age_seconds:
+            self.__build()
+
+    def __grow(self) -> None:
+        # whole bytes so every bitmap covers every row of created
+        capacity = max(64, (2 * len(self.__created) + 7) & ~7)
+        self.__created = np.resize(self.__created, capacity)
+        for member, bitmap in self.__bitmaps.items():
+            grown = np.zeros(capacity // 8, dtype=np.uint8)
+            grown[:len(bitmap)] = bitmap
+            self.__bitmaps[member] = grown
+
+    def upsert(self, id_: str, created: datetime,
+               values: Iterable[ValueEnum],
+               categories: Iterable[CategoryEnum],
+               state: CampaignStateEnum) -> None:
+        with self.__lock:
+            if self.__built_at is None:
+                return
+            row = self.__rows.get(id_)
+            if row is None:
+                created = np.datetime64(created, 'us')
+                if self.__size and (created, id_) < (self.__created[self.__size - 1], self.__ids[-1]):
+                    # would not go at the end, cheaper to read it in order with the next build
+                    self.__built_at = None
+                    return
+                if self.__size == len(self.__created):
+                    self.__grow()
+                row = self.__size
+                self.__ids.append(id_)
+                self.__rows[id_] = row
+                self.__created[row] = created
+                self.__size += 1
+            members = {*values, *categories, state}
+            byte, bit = row >> 3, np.uint8(1 << (row & 7))
+            for member, bitmap in self.__bitmaps.items():
+                if member in members:
+                    bitmap[byte] |= bit
+                else:
+                    bitmap[byte] &= ~bit
+
+    def query(self, campaign_filter: CampaignFilter,
+              limit: int,
+              before: Optional[tuple[datetime, str]] = None) -> list[tuple[str, datetime]]:
+        """
+        ids and created of up to limit matching campaigns, newest first, all older than before when given
+        """
+        with self.__lock:
+            self.__ensure_fresh()
+            end = self.__size if before is None else self.__position(*before)
+            found: list[np.ndarray] = []
+            count = 0
+            chunk_rows = FIRST_CHUNK_ROWS
+            while end > 0 and count < limit:
+                start = max(0, end - chunk_rows)
+                matches = self.__matching_rows(campaign_filter, start, end)[::-1]
+                found.append(matches[:limit - count])
+                count += len(found[-1])
+                end = start
+                chunk_rows *= 2
+            rows = np.concatenate(found) if found else np.zeros(0, dtype=np.intp)
+            return [(self.__ids[row], self.__created[row].astype(datetime)) for row in rows]
+
+    def __position(self, created: datetime, id_: str) -> int:
+        created = np.datetime64(created, 'us')
+        start = int(np.searchsorted(self.__created[:self.__size], created, side='left'))
+        end = int(np.searchsorted(self.__created[:self.__size], created, side='right'))
+        return start + bisect.bisect_left(self.__ids[start:end], id_)
+
+    def __matching_rows(self, campaign_filter: CampaignFilter, start: int, end: int) -> np.ndarray:
+        """
+        matching rows in [start, end) in ascending order
+        """
+        first_byte, last_byte = start >> 3, (end + 7) >> 3
+        result = np.full(last_byte - first_byte, 0xFF, dtype=np.uint8)
+        for members, match_all in ((campaign_filter.categories, campaign_filter.match_all),
+                                   (campaign_filter.values, campaign_filter.match_all),
+                                   (campaign_filter.states, False)):
+            if not members:
+                continue
+            combine = np.bitwise_and if match_all else np.bitwise_or
+            combined = self.__bitmaps[members[0]][first_byte:last_byte].copy()
+            for member in members[1:]:
+                combine(combined, self.__bitmaps[member][first_byte:last_byte], out=combined)
+            result &= combined
+        # only the bytes with a match set are unpacked
+        bytes_ = np.flatnonzero(result)
+        bits = np.unpackbits(result[bytes_], bitorder='little').reshape(-1, 8).astype(bool)
+        rows = ((bytes_ + first_byte) * 8)[:, None] + np.arange(8)
+        rows = rows[bits]
+        return rows[(rows >= start) & (rows < end)]
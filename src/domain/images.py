@@ -0,0 +1,105 @@
+import io
+import re
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+    ImageOps = None
+
+IMAGE_VARIANT_WIDTHS = (64, 256, 1024)
+IMAGE_VARIANT_QUALITY = 80
+CONTENT_KEY_PREFIX = "images"
+# only uploaded images get variants, the default images and the variants themselves do not. an uploaded image is
+# images/<sha-256>.<extension> when it came through the api, <owner id>/<uuid>.<extension> when posted to s3
+_STEM = r'[^/]+/(?:[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|[0-9a-f]{64})'
+_VARIANT_SOURCE = re.compile(rf'{_STEM}\.[a-z]+')
+_VARIANT = re.compile(rf'({_STEM})-[0-9]+w\.(?:webp|jpeg)')
+
+
+class ImageVariantFormatEnum(Enum):
+    WEBP = "webp"
+    JPEG = "jpeg"
+
+    @property
+    def content_type(self) -> str:
+        return f"image/{self.value}"
+
+
+@dataclass
+class ImageVariant:
+    width: int
+    format: ImageVariantFormatEnum
+    data: bytes
+
+
+def has_variants(key: str) -> bool:
+    return bool(key) and _VARIANT_SOURCE.fullmatch(key) is not None
+
+
+def content_key(digest: str, extension: str) -> str:
+    """
+    where an image is stored, by the hex sha-256 of its bytes so the same image is only ever stored once
+    """
+    return f"{CONTENT_KEY_PREFIX}/{digest}.{extension}"
+
+
+def image_stem(key: str) -> Optional[str]:
+    """
+    the key of an uploaded image without its extension, shared by the image and all of its variants.
+    None for every other key
+    """
+    if has_variants(key=key):
+        return key.rpartition('.')[0]
+    match = _VARIANT.fullmatch(key or "")
+    return match.group(1) if match is not None else None
+
+
+def variant_key(key: str, width: int, variant_format: ImageVariantFormatEnum) -> str:
+    """
+    where the variant of the image at key is stored, worked out from the key alone so responses need no lookup
+    """
+    return f"{key.rpartition('.')[0]}-{width}w.{variant_format.value}"
+
+
+def _has_alpha(image) -> bool:
+    return image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+
+
+def _for_format(image, variant_format: ImageVariantFormatEnum):
+    if image.mode == "RGB" or variant_format == ImageVariantFormatEnum.WEBP:
+        return image
+    # jpeg has no alpha, transparent pixels go white rather than whatever colour they hide
+    flattened = Image.new("RGB", image.size, (255, 255, 255))
+    flattened.paste(image, mask=image.getchannel("A"))
+    return flattened
+
+
+def render_variants(data: bytes, widths: tuple[int, ...] = IMAGE_VARIANT_WIDTHS) -> list[ImageVariant]:
+    """
+    every width in every format, an image narrower than a width keeps its own size so every variant key exists.
+    each width is scaled down from the one above it rather than from the full size original
+    """
+    if Image is None:
+        raise RuntimeError("pillow is needed to render image variants")
+    variants = []
+    with Image.open(io.BytesIO(data)) as original:
+        widest = max(widths)
+        # a jpeg can be decoded straight at a fraction of its size, far cheaper than decoding it whole.
+        # square so the image is still wide enough when its exif orientation turns it on its side
+        original.draft("RGB", (widest, widest))
+        image = ImageOps.exif_transpose(original)
+        image = image.convert("RGBA" if _has_alpha(image) else "RGB")
+        for width in sorted(widths, reverse=True):
+            if image.width > width:
+                image = image.resize((width, max(1, round(image.height * width / image.width))),
+                                     Image.LANCZOS, reducing_gap=3.0)
+            for variant_format in ImageVariantFormatEnum:
+                buffer = io.BytesIO()
+                _for_format(image, variant_format).save(buffer, format=variant_format.name,
+                                                        quality=IMAGE_VARIANT_QUALITY, optimize=True)
+                variants.append(ImageVariant(width=width, format=variant_format, data=buffer.getvalue()))
+    return variants
@@ -0,0 +1,150 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Iterable, Callable, Optional
+
+import numpy as np
+
+from src.domain.models import ValueEnum, CategoryEnum
+
+# every value/category bitmask fits in the lookup table, so a popcount is one gather
+_MASK_BITS = max(len(ValueEnum), len(CategoryEnum))
+_POPCOUNT = np.array([bin(mask).count('1') for mask in range(1 << _MASK_BITS)], dtype=np.uint8)
+
+
+@dataclass
+class MatchCandidates:
+    """
+    everything the scorer needs about a set of rows, one array slot per row
+    """
+    ids: list[str] = field(default_factory=list)
+    value_masks: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.uint16))
+    category_masks: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.uint16))
+
+
+def to_bitmask(members: Iterable[Enum]) -> int:
+    """
+    same layout as the database bitmask columns: one bit per member in declaration order
+    """
+    mask = 0
+    for member in members:
+        mask |= 1 << list(type(member)).index(member)
+    return mask
+
+
+def popcount(masks: np.ndarray) -> np.ndarray:
+    return _POPCOUNT[masks]
+
+
+def score_overlap(value_mask: int, category_mask: int, candidates: MatchCandidates) -> np.ndarray:
+    """
+    number of values plus number of categories each candidate shares with the given masks
+    """
+    return popcount(candidates.value_masks & np.uint16(value_mask)) \
+        + popcount(candidates.category_masks & np.uint16(category_mask))
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    indexes of the k best scores, best first. argpartition keeps this linear in the number of candidates,
+    only the k winners get sorted
+    """
+    if k <= 0 or scores.size == 0:
+        return np.zeros(0, dtype=np.intp)
+    # overlap scores are unsigned, widen before negating so they do not wrap around
+    negated = -scores.astype(np.result_type(scores.dtype, np.int32))
+    if k < scores.size:
+        best = np.argpartition(negated, k - 1)[:k]
+    else:
+        best = np.arange(scores.size)
+    # ties broken by position so the order is deterministic
+    return best[np.lexsort((best, negated[best]))]
+
+
+def rank(value_mask: int, category_mask: int, candidates: MatchCandidates, k: int) -> list[tuple[str, int]]:
+    """
+    the k best matching candidate ids with their scores, candidates sharing nothing are left out
+    """
+    scores = score_overlap(value_mask=value_mask, category_mask=category_mask, candidates=candidates)
+    best = top_k(scores=scores, k=k)
+    return [(candidates.ids[index], int(scores[index])) for index in best if scores[index] > 0]
+
+
+class CandidateIndex:
+    """
+    ids and masks of every candidate in two arrays, one slot per candidate, so a feed request scores them without
+    reading them from the database. built like the audience index: on first use and again once older than
+    max_age_seconds, writes through this container are applied straight away
+    """
+
+    def __init__(self, loader: Callable[[], MatchCandidates],
+                 max_age_seconds: float,
+                 clock: Callable[[], float] = time.monotonic):
+        self.__loader = loader
+        self.__max_age_seconds = max_age_seconds
+        self.__clock = clock
+        self.__lock = threading.Lock()
+        self.__built_at: Optional[float] = None
+        self.__ids: list[str] = []
+        self.__rows: dict[str, int] = {}
+        self.__value_masks = np.zeros(0, dtype=np.uint16)
+        self.__category_masks = np.zeros(0, dtype=np.uint16)
+
+    def __len__(self) -> int:
+        return len(self.__ids)
+
+    def __build(self) -> None:
+        candidates = self.__loader()
+        self.__ids = list(candidates.ids)
+        self.__rows = {id_: row for row, id_ in enumerate(self.__ids)}
+        self.__value_masks = np.asarray(candidates.value_masks, dtype=np.uint16).copy()
+        self.__category_masks = np.asarray(candidates.category_masks, dtype=np.uint16).copy()
+        self.__built_at = self.__clock()
+
+    def __ensure_fresh(self) -> None:
+        if self.__built_at is None or self.__clock() - self.__built_at >= self.__max_age_seconds:
+            self.__build()
+
+    def upsert(self, id_: str, value_mask: int, category_mask: int) -> None:
+        with self.__lock:
+            if self.__built_at is None:
+                return
+            row = self.__rows.get(id_)
+            if row is None:
+                row = len(self.__ids)
+                if row == len(self.__value_masks):
+                    capacity = max(64, 2 * row)
+                    self.__value_masks = np.resize(self.__value_masks, capacity)
+                    self.__category_masks = np.resize(self.__category_masks, capacity)
+                self.__ids.append(id_)
+                self.__rows[id_] = row
+            self.__value_masks[row] = value_mask
+            self.__category_masks[row] = category_mask
+
+    def remove(self, id_: str) -> None:
+        with self.__lock:
+            if self.__built_at is None:
+                return
+            row = self.__rows.pop(id_, None)
+            if row is None:
+                return
+            # the last candidate moves into the gap so the slots stay contiguous
+            last = len(self.__ids) - 1
+            last_id = self.__ids.pop()
+            if row != last:
+                self.__ids[row] = last_id
+                self.__rows[last_id] = row
+                self.__value_masks[row] = self.__value_masks[last]
+                self.__category_masks[row] = self.__category_masks[last]
+
+    def rank(self, value_mask: int, category_mask: int, k: int) -> list[tuple[str, int]]:
+        with self.__lock:
+            self.__ensure_fresh()
+            size = len(self.__ids)
+            return rank(value_mask=value_mask,
+                        category_mask=category_mask,
+                        candidates=MatchCandidates(ids=self.__ids,
+                                                   value_masks=self.__value_masks[:size],
+                                                   category_masks=self.__category_masks[:size]),
+                        k=k)
@@ -2,6 +2,7 @@ import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from typing import Optional
 
 from src.data import DEFAULT_BRAND_HEADER_IMAGE, DEFAULT_BRAND_LOGO, DEFAULT_INFLUENCER_PROFILE_IMAGE
 
@@ -10,6 +11,14 @@ def uuid4_str():
     return str(uuid.uuid4())
 
 
+def utcnow_seconds():
+    """
+    the created column is a mysql DATETIME which keeps whole seconds, a model written in a request is returned
+    as it is rather than read back so it has to carry the value the database stores
+    """
+    return datetime.utcnow().replace(microsecond=0)
+
+
 class ValueEnum(Enum):
     SUSTAINABLE = "SUSTAINABLE"
     ORGANIC = "ORGANIC"
@@ -39,7 +48,7 @@ class CategoryEnum(Enum):
 @dataclass
 class Model:
     id: str = field(default_factory=uuid4_str)
-    created: datetime = field(default_factory=datetime.utcnow)
+    created: datetime = field(default_factory=utcnow_seconds)
 
 
 @dataclass
@@ -106,3 +115,9 @@ class Campaign(Model):
     product_image1: str = ""
     product_image2: str = ""
     product_image3: str = ""
+
+
+@dataclass
+class Page:
+    items: list = field(default_factory=list)
+    next_cursor: Optional[str] = None
@@ -0,0 +1,108 @@
+import threading
+import time
+from enum import Enum
+from typing import Callable, Optional
+
+import numpy as np
+
+from src.domain.matching import top_k
+from src.domain.models import Influencer
+
+AUDIENCE_FIELDS = ("audience_age_13_to_17_split",
+                   "audience_age_18_to_24_split",
+                   "audience_age_25_to_34_split",
+                   "audience_age_35_to_44_split",
+                   "audience_age_45_to_54_split",
+                   "audience_age_55_to_64_split",
+                   "audience_age_65_plus_split",
+                   "audience_male_split",
+                   "audience_female_split")
+
+
+class SimilarityMetric(Enum):
+    COSINE = "cosine"
+    L1 = "l1"
+
+
+def audience_vector(influencer: Influencer) -> np.ndarray:
+    return np.array([getattr(influencer, field) or 0.0 for field in AUDIENCE_FIELDS], dtype=np.float32)
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    # an influencer without any audience data stays a zero vector and is similar to nobody
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+class AudienceIndex:
+    """
+    audience splits of every influencer as one contiguous float32 matrix, one row per influencer.
+    built from the loader on first use and rebuilt once older than max_age_seconds, so changes made by other
+    containers show up eventually, changes made through this container are applied to their row straight away
+    """
+
+    def __init__(self, loader: Callable[[], tuple[list[str], np.ndarray]],
+                 max_age_seconds: float,
+                 clock: Callable[[], float] = time.monotonic):
+        self.__loader = loader
+        self.__max_age_seconds = max_age_seconds
+        self.__clock = clock
+        self.__lock = threading.Lock()
+        self.__built_at: Optional[float] = None
+        self.__ids: list[str] = []
+        self.__rows: dict[str, int] = {}
+        self.__vectors = np.zeros((0, len(AUDIENCE_FIELDS)), dtype=np.float32)
+        self.__unit_vectors = np.zeros((0, len(AUDIENCE_FIELDS)), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.__ids)
+
+    def __build(self) -> None:
+        ids, vectors = self.__loader()
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(len(ids), len(AUDIENCE_FIELDS))
+        self.__ids = list(ids)
+        self.__rows = {id_: row for row, id_ in enumerate(self.__ids)}
+        self.__vectors = vectors
+        self.__unit_vectors = _unit(vectors)
+        self.__built_at = self.__clock()
+
+    def __ensure_fresh(self) -> None:
+        if self.__built_at is None or self.__clock() - self.__built_at >= self.__max_age_seconds:
+            self.__build()
+
+    def upsert(self, id_: str, vector: np.ndarray) -> None:
+        with self.__lock:
+            if self.__built_at is None:
+                # the first build reads the row from the database anyway
+                return
+            vector = np.asarray(vector, dtype=np.float32)
+            row = self.__rows.get(id_)
+            if row is None:
+                row = len(self.__ids)
+                self.__ids.append(id_)
+                self.__rows[id_] = row
+                self.__vectors = np.vstack((self.__vectors, vector))
+                self.__unit_vectors = np.vstack((self.__unit_vectors, _unit(vector)))
+            else:
+                self.__vectors[row] = vector
+                self.__unit_vectors[row] = _unit(vector)
+
+    def nearest(self, vector: np.ndarray, k: int,
+                metric: SimilarityMetric = SimilarityMetric.COSINE,
+                exclude: Optional[str] = None) -> list[tuple[str, float]]:
+        """
+        the k ids closest to vector, closest first. cosine is reported as a similarity, l1 as a distance
+        """
+        with self.__lock:
+            self.__ensure_fresh()
+            vector = np.asarray(vector, dtype=np.float32)
+            if metric == SimilarityMetric.COSINE:
+                scores = self.__unit_vectors @ _unit(vector)
+            else:
+                scores = -np.abs(self.__vectors - vector).sum(axis=1)
+            excluded_row = self.__rows.get(exclude)
+            best = [row for row in top_k(scores=scores, k=k + (excluded_row is not None))
+                    if row != excluded_row][:k]
+            if metric == SimilarityMetric.COSINE:
+                return [(self.__ids[row], float(scores[row])) for row in best]
+            return [(self.__ids[row], float(-scores[row])) for row in best]
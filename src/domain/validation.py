@@ -1,4 +1,10 @@
-from jsonschema.validators import validate
+import re
+from typing import Callable, Optional
+
+from jsonschema.validators import Draft7Validator
+
+from src.crosscutting import translate_snake_case_key
+from src.exceptions import PayloadValidationException
 
 # TODO: do actual validation and write tests for it
 
@@ -69,19 +75,89 @@ campaign_payload_schema = {
 }
 
 
+def _field(error) -> str:
+    path = [str(part) for part in error.absolute_path]
+    if error.validator == "required":
+        # required is reported against the object, the missing property is only named in the message
+        path.append(error.message.split("'")[1])
+    # the client sent camelCase, so that is what it gets back
+    return ".".join(map(translate_snake_case_key, path))
+
+
+def _compile_fast_check(schema: dict) -> Optional[Callable[[object], bool]]:
+    """
+    the schemas here are flat objects of string properties with patterns, for those a payload is checked with
+    precompiled regexes and no jsonschema machinery. None for a schema using anything else
+    """
+    if schema.get("type") != "object" or set(schema) - {"type", "properties", "required"}:
+        return None
+    checks = []
+    for name, property_schema in schema.get("properties", {}).items():
+        if property_schema.get("type") != "string" or set(property_schema) - {"type", "pattern"}:
+            return None
+        pattern = property_schema.get("pattern")
+        # jsonschema matches patterns with re.search too
+        checks.append((name, re.compile(pattern).search if pattern is not None else None))
+    required = tuple(schema.get("required", ()))
+
+    def check(payload) -> bool:
+        if not isinstance(payload, dict):
+            return False
+        for name in required:
+            if name not in payload:
+                return False
+        for name, search in checks:
+            if name not in payload:
+                continue
+            value = payload[name]
+            if not isinstance(value, str) or (search is not None and search(value) is None):
+                return False
+        return True
+
+    return check
+
+
+class SchemaValidator:
+    """
+    compiled once per schema: the schema is checked and its validator class picked up front, valid payloads
+    go through the fast check and only invalid ones through jsonschema, which reports every error at once
+    """
+
+    def __init__(self, schema: dict):
+        Draft7Validator.check_schema(schema)
+        self.__validator = Draft7Validator(schema)
+        self.__fast_check = _compile_fast_check(schema)
+
+    def errors(self, payload) -> list[dict]:
+        if self.__fast_check is not None and self.__fast_check(payload):
+            return []
+        return [{"field": _field(error), "message": error.message}
+                for error in sorted(self.__validator.iter_errors(payload), key=lambda e: list(e.absolute_path))]
+
+    def validate(self, payload) -> None:
+        errors = self.errors(payload)
+        if errors:
+            raise PayloadValidationException(errors=errors)
+
+
+_campaign_validator = SchemaValidator(schema=campaign_payload_schema)
+_brand_validator = SchemaValidator(schema=brand_payload_schema)
+_influencer_validator = SchemaValidator(schema=influencer_payload_schema)
+
+
 class CampaignValidator:
 
     def validate_campaign(self, payload):
-        validate(instance=payload, schema=campaign_payload_schema)
+        _campaign_validator.validate(payload=payload)
 
 
 class BrandValidator:
 
     def validate_brand(self, payload):
-        validate(instance=payload, schema=brand_payload_schema)
+        _brand_validator.validate(payload=payload)
 
 
 class InfluencerValidator:
 
     def validate_influencer(self, payload):
-        validate(instance=payload, schema=influencer_payload_schema)
+        _influencer_validator.validate(payload=payload)
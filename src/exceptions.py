@@ -8,3 +8,18 @@ class NotFoundException(Exception):
 
 class ImageException(Exception):
     pass
+
+
+class ImageTooLargeException(ImageException):
+    pass
+
+
+class InvalidCursorException(Exception):
+    pass
+
+
+class PayloadValidationException(Exception):
+
+    def __init__(self, errors: list[dict]):
+        super().__init__(f"{len(errors)} validation error(s)")
+        self.errors = errors
@@ -1,6 +1,10 @@
-from typing import Protocol, Optional, Union
+from datetime import datetime
+from typing import Protocol, Optional, Union, Iterator
 
-from src.domain.models import Brand, Influencer, User, Campaign, CampaignStateEnum
+from src.domain.filtering import CampaignFilter
+from src.domain.matching import MatchCandidates
+from src.domain.models import Brand, Influencer, User, Campaign, CampaignStateEnum, Page
+from src.domain.similarity import SimilarityMetric
 
 
 class AuthUserRepository(Protocol):
@@ -14,12 +18,18 @@ class AuthUserRepository(Protocol):
     def get_by_id(self, _id: str) -> User:
         ...
 
+    def get_by_ids(self, ids: list[str]) -> dict[str, User]:
+        ...
+
 
 class CampaignRepository(Protocol):
 
     def load_collection(self) -> list[Campaign]:
         ...
 
+    def load_page(self, limit: int, cursor: str = None) -> Page:
+        ...
+
     def load_by_id(self, id_: str) -> Campaign:
         ...
 
@@ -30,6 +40,21 @@ class CampaignRepository(Protocol):
     def load_for_auth_brand(self, auth_user_id: str) -> list[Campaign]:
         ...
 
+    def load_page_for_auth_brand(self, auth_user_id: str, limit: int, cursor: str = None) -> Page:
+        ...
+
+    def load_by_ids(self, ids: list[str]) -> list[Campaign]:
+        ...
+
+    def load_active_candidates(self) -> MatchCandidates:
+        ...
+
+    def rank_active_candidates(self, value_mask: int, category_mask: int, k: int) -> list[tuple[str, int]]:
+        ...
+
+    def load_page_filtered(self, campaign_filter: CampaignFilter, limit: int, cursor: str = None) -> Page:
+        ...
+
     def update_product_image1(self, id: str, image_bytes: str) -> Campaign:
         ...
 
@@ -39,6 +64,21 @@ class CampaignRepository(Protocol):
     def update_product_image3(self, id: str, image_bytes: str) -> Campaign:
         ...
 
+    def update_product_images(self, id: str, images: dict[str, str]) -> Campaign:
+        ...
+
+    def create_image_upload(self, id: str, content_type: str) -> dict:
+        ...
+
+    def confirm_product_image1(self, id: str, image_key: str) -> Campaign:
+        ...
+
+    def confirm_product_image2(self, id: str, image_key: str) -> Campaign:
+        ...
+
+    def confirm_product_image3(self, id: str, image_key: str) -> Campaign:
+        ...
+
     def update_campaign(self, _id: str, payload: Campaign) -> Campaign:
         ...
 
@@ -51,6 +91,9 @@ class BrandRepository(Protocol):
     def load_collection(self) -> list[Brand]:
         ...
 
+    def load_page(self, limit: int, cursor: str = None) -> Page:
+        ...
+
     def load_by_id(self, id_: str) -> Brand:
         ...
 
@@ -69,12 +112,24 @@ class BrandRepository(Protocol):
     def update_header_image_for_auth_user(self, auth_user_id: str, image_bytes: str) -> Brand:
         ...
 
+    def create_image_upload_for_auth_user(self, auth_user_id: str, content_type: str) -> dict:
+        ...
+
+    def confirm_logo_for_auth_user(self, auth_user_id: str, image_key: str) -> Brand:
+        ...
+
+    def confirm_header_image_for_auth_user(self, auth_user_id: str, image_key: str) -> Brand:
+        ...
+
 
 class InfluencerRepository(Protocol):
 
     def load_collection(self) -> list[Influencer]:
         ...
 
+    def load_page(self, limit: int, cursor: str = None) -> Page:
+        ...
+
     def load_by_id(self, id_: str) -> Influencer:
         ...
 
@@ -90,6 +145,25 @@ class InfluencerRepository(Protocol):
     def update_image_for_auth_user(self, auth_user_id: str, image_bytes: str) -> Influencer:
         ...
 
+    def create_image_upload_for_auth_user(self, auth_user_id: str, content_type: str) -> dict:
+        ...
+
+    def confirm_image_for_auth_user(self, auth_user_id: str, image_key: str) -> Influencer:
+        ...
+
+    def load_by_ids(self, ids: list[str]) -> list[Influencer]:
+        ...
+
+    def load_candidates(self) -> MatchCandidates:
+        ...
+
+    def rank_candidates(self, value_mask: int, category_mask: int, k: int) -> list[tuple[str, int]]:
+        ...
+
+    def load_similar(self, id_: str, limit: int,
+                     metric: SimilarityMetric = SimilarityMetric.COSINE) -> list[tuple[Influencer, float]]:
+        ...
+
 
 Repository = Union[BrandRepository,
                    InfluencerRepository,
@@ -127,6 +201,9 @@ class SessionAdapter(Protocol):
     def flush(self) -> None:
         ...
 
+    def close(self) -> None:
+        ...
+
 
 class DataManager(Protocol):
 
@@ -138,12 +215,39 @@ class DataManager(Protocol):
     def session(self) -> SessionAdapter:
         ...
 
+    def end_session(self) -> None:
+        ...
+
 
 class ImageRepository(Protocol):
 
     def upload(self, path: str, image_base64_encoded: str) -> str:
         pass
 
+    def create_upload(self, path: str, content_type: str) -> dict:
+        pass
+
+    def confirm_upload(self, path: str, key: str) -> str:
+        pass
+
+    def download(self, key: str) -> bytes:
+        pass
+
+    def upload_variant(self, key: str, data: bytes, content_type: str) -> None:
+        pass
+
+    def list_images(self) -> Iterator[tuple[str, datetime]]:
+        pass
+
+    def delete(self, keys: list[str]) -> None:
+        pass
+
+
+class ImageVariantQueue(Protocol):
+
+    def enqueue(self, key: str) -> None:
+        pass
+
 
 User = Union[Brand, Influencer]
 
@@ -1,11 +1,18 @@
+import base64
 from dataclasses import dataclass, field
-from typing import Union, Callable
+from typing import Union, Callable, Optional
 
 from src.crosscutting import valid_uuid
+from src.domain.filtering import CampaignFilter
+from src.domain.models import CategoryEnum, ValueEnum, CampaignStateEnum
 from src.types import Serializer
+from src.web.caching import encoded_etag
+from src.web.compression import ResponseCompressor
 
 BRAND_ID_PATH_KEY = 'brand_id'
 INFLUENCER_ID_PATH_KEY = 'influencer_id'
+DEFAULT_PAGE_LIMIT = 20
+MAX_PAGE_LIMIT = 100
 
 @dataclass
 class PinfluencerRequest:
@@ -14,22 +21,66 @@ class PinfluencerRequest:
     auth_user_id: str = ""
 
 class PinfluencerResponse:
-    def __init__(self, status_code: int = 200, body: Union[dict, list] = {}) -> None:
+    def __init__(self, status_code: int = 200, body: Union[dict, list] = None, headers: dict = None) -> None:
         self.status_code = status_code
-        self.body = body
+        self.body = body if body is not None else {}
+        self.headers = headers if headers is not None else {}
+        # set by a hook that had to serialize the body already, so it is not serialized twice,
+        # a 304 keeps the body it stands in for to answer with the same representation headers
+        self.serialized_body: Optional[str] = None
 
     def is_ok(self):
         return 200 <= self.status_code < 300
 
-    def as_json(self, serializer: Serializer) -> dict:
-        return {
+    def as_json(self, serializer: Serializer,
+                compressor: Optional[ResponseCompressor] = None,
+                accept_encoding: Optional[str] = None) -> dict:
+        if self.status_code == 304:
+            body = ""
+        elif self.serialized_body is not None:
+            body = self.serialized_body
+        else:
+            body = serializer.serialize(self.body)
+        response = {
             "statusCode": self.status_code,
-            "body": serializer.serialize(self.body),
+            "body": body,
             "headers": {"Content-Type": "application/json",
                         'Access-Control-Allow-Origin': "*",
                         "Access-Control-Allow-Headers": "*",
-                        "Access-Control-Allow-Methods": "*"},
+                        "Access-Control-Allow-Methods": "*",
+                        **self.headers},
         }
+        if compressor is None:
+            return response
+        if self.status_code == 304:
+            return self.__as_not_modified(response=response, compressor=compressor, accept_encoding=accept_encoding)
+        body = response["body"].encode()
+        if not compressor.is_compressible(body=body):
+            return response
+        # large enough that the encoding depends on who asked, caches have to keep the variants apart
+        response["headers"]["Vary"] = "Accept-Encoding"
+        compressed = compressor.compress(body=body, accept_encoding=accept_encoding)
+        if compressed is not None:
+            response["body"] = base64.b64encode(compressed.data).decode()
+            response["headers"]["Content-Encoding"] = compressed.encoding.value
+            response["isBase64Encoded"] = True
+            if "ETag" in self.headers:
+                response["headers"]["ETag"] = encoded_etag(etag=self.headers["ETag"],
+                                                           encoding=compressed.encoding.value)
+        return response
+
+    def __as_not_modified(self, response: dict, compressor: ResponseCompressor,
+                          accept_encoding: Optional[str]) -> dict:
+        """
+        the etag and vary of the 200 this stands in for, without paying to compress a body that is not sent
+        """
+        if self.serialized_body is None or not compressor.is_compressible(body=self.serialized_body.encode()):
+            return response
+        response["headers"]["Vary"] = "Accept-Encoding"
+        encoding = compressor.negotiate(accept_encoding=accept_encoding)
+        if encoding is not None and "ETag" in self.headers:
+            response["headers"]["ETag"] = encoded_etag(etag=self.headers["ETag"], encoding=encoding.value)
+        return response
 
     @staticmethod
     def as_500_error(message="unexpected server error, please try later :("):
@@ -40,16 +91,21 @@ class PinfluencerResponse:
         return PinfluencerResponse(400, {"message": message})
 
 
+def get_header(event: dict, name: str) -> Optional[str]:
+    # http api events carry header names in lower case
+    return (event.get('headers') or {}).get(name.lower())
+
+
 def get_cognito_user(event):
     return event['requestContext']['authorizer']['jwt']['claims']['cognito:username']
 
 
 @dataclass
 class PinfluencerContext:
-    response: PinfluencerResponse = None,
-    short_circuit: bool = False,
-    event: Union[list, dict] = field(default_factory=dict),
-    auth_user_id: str = "",
+    response: PinfluencerResponse = None
+    short_circuit: bool = False
+    event: Union[list, dict] = field(default_factory=dict)
+    auth_user_id: str = ""
     body: dict = field(default_factory=dict)
     id: str = ""
 
@@ -60,11 +116,20 @@ class PinfluencerContext:
 PinfluencerAction = Callable[[PinfluencerContext], None]
 
 
-@dataclass
+@dataclass(frozen=True)
 class Route:
     action: PinfluencerAction
-    before_hooks: list[PinfluencerAction] = field(default_factory=list)
-    after_hooks: list[PinfluencerAction] = field(default_factory=list)
+    before_hooks: tuple[PinfluencerAction, ...] = ()
+    after_hooks: tuple[PinfluencerAction, ...] = ()
+    # sent with the successful and not modified responses of the route
+    cache_control: Optional[str] = None
+    pipeline: tuple[PinfluencerAction, ...] = field(init=False)
+
+    def __post_init__(self):
+        # compiled once when the route is built, so dispatching a request does not assemble the middleware
+        object.__setattr__(self, 'before_hooks', tuple(self.before_hooks))
+        object.__setattr__(self, 'after_hooks', tuple(self.after_hooks))
+        object.__setattr__(self, 'pipeline', (*self.before_hooks, self.action, *self.after_hooks))
 
 
 def valid_path_resource_id(event, resource_key):
@@ -77,4 +142,45 @@ def valid_path_resource_id(event, resource_key):
     except KeyError:
         print(f'Missing key in event pathParameters.{resource_key}')
 
-    return None
\ No newline at end of file
+    return None
+
+
+def page_parameters(event) -> Optional[tuple[int, Optional[str]]]:
+    """
+    limit and cursor from the query string, None when the limit is not a number between 1 and MAX_PAGE_LIMIT
+    """
+    query = event.get('queryStringParameters') or {}
+    try:
+        limit = int(query.get('limit', DEFAULT_PAGE_LIMIT))
+    except ValueError:
+        print(f'limit is not a number {query.get("limit")}')
+        return None
+    if not 1 <= limit <= MAX_PAGE_LIMIT:
+        print(f'limit out of range {limit}')
+        return None
+    return limit, query.get('cursor') or None
+
+
+def campaign_filter_parameters(event) -> Optional[CampaignFilter]:
+    """
+    comma separated categories, values and state from the query string, None when a name is not a member
+    or match is neither any nor all
+    """
+    query = event.get('queryStringParameters') or {}
+
+    def members(key: str, enum_type) -> tuple:
+        names = [name for name in (query.get(key) or '').split(',') if name]
+        return tuple(enum_type[name] for name in names)
+
+    try:
+        states = members('state', CampaignStateEnum)
+        match = query.get('match', 'any')
+        if match not in ('any', 'all'):
+            raise KeyError(match)
+        return CampaignFilter(categories=members('categories', CategoryEnum),
+                              values=members('values', ValueEnum),
+                              states=states or (CampaignStateEnum.ACTIVE,),
+                              match_all=match == 'all')
+    except KeyError as e:
+        print(f'invalid campaign filter {e}')
+        return None
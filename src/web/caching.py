@@ -0,0 +1,37 @@
+import hashlib
+from typing import Optional
+
+# public reads can be served from a shared cache for a minute, anything about the caller stays private
+# and is revalidated with its etag every time
+PUBLIC_CACHE_CONTROL = "public, max-age=60"
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def strong_etag(body: str) -> str:
+    return f'"{hashlib.blake2b(body.encode(), digest_size=16).hexdigest()}"'
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """
+    a compressed body is a different representation, so it gets its own etag
+    """
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    weak comparison as If-None-Match asks for, the tag of any compressed variant of etag matches too
+    """
+    if not if_none_match:
+        return False
+    opaque = etag[1:-1]
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        candidate = candidate.strip('"')
+        if candidate == opaque or candidate.rpartition("-")[0] == opaque:
+            return True
+    return False
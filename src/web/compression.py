@@ -0,0 +1,93 @@
+import gzip
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_MIN_SIZE_BYTES = 1024
+DEFAULT_GZIP_LEVEL = 6
+# brotli above 5 costs far more cpu than it saves bytes on a json page
+DEFAULT_BROTLI_QUALITY = 4
+
+
+class ContentEncodingEnum(Enum):
+    BROTLI = "br"
+    GZIP = "gzip"
+
+
+@dataclass
+class CompressedBody:
+    encoding: ContentEncodingEnum
+    data: bytes
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> dict[str, float]:
+    """
+    quality of every coding listed in an Accept-Encoding header, codings without a q are 1
+    """
+    qualities = {}
+    for coding in (accept_encoding or "").split(","):
+        name, _, parameters = coding.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for parameter in parameters.split(";"):
+            key, _, value = parameter.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name] = quality
+    return qualities
+
+
+class ResponseCompressor:
+    """
+    compresses response bodies of at least min_size_bytes with the best coding the client accepts,
+    brotli when the client takes it as readily as gzip, smaller bodies are not worth the cpu
+    """
+
+    def __init__(self, min_size_bytes: int = DEFAULT_MIN_SIZE_BYTES,
+                 gzip_level: int = DEFAULT_GZIP_LEVEL,
+                 brotli_quality: int = DEFAULT_BROTLI_QUALITY):
+        self.__min_size_bytes = min_size_bytes
+        self.__gzip_level = gzip_level
+        self.__brotli_quality = brotli_quality
+        self.__supported = [ContentEncodingEnum.BROTLI, ContentEncodingEnum.GZIP] if brotli is not None \
+            else [ContentEncodingEnum.GZIP]
+
+    def is_compressible(self, body: bytes) -> bool:
+        return len(body) >= self.__min_size_bytes
+
+    def negotiate(self, accept_encoding: Optional[str]) -> Optional[ContentEncodingEnum]:
+        qualities = accepted_encodings(accept_encoding=accept_encoding)
+        wildcard = qualities.get("*", 0.0)
+        best, best_quality = None, 0.0
+        for encoding in self.__supported:
+            quality = qualities.get(encoding.value, wildcard)
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def compress(self, body: bytes, accept_encoding: Optional[str]) -> Optional[CompressedBody]:
+        """
+        None when the body is left as it is: too small, no coding in common, or not any smaller compressed
+        """
+        if not self.is_compressible(body=body):
+            return None
+        encoding = self.negotiate(accept_encoding=accept_encoding)
+        if encoding is None:
+            return None
+        if encoding == ContentEncodingEnum.BROTLI:
+            data = brotli.compress(body, mode=brotli.MODE_TEXT, quality=self.__brotli_quality)
+        else:
+            data = gzip.compress(body, compresslevel=self.__gzip_level, mtime=0)
+        if len(data) >= len(body):
+            return None
+        return CompressedBody(encoding=encoding, data=data)
@@ -1,11 +1,21 @@
 from typing import Callable
 
 from src.crosscutting import print_exception
-from src.data import DEFAULT_CAMPAIGN_PRODUCT_IMAGE1, DEFAULT_CAMPAIGN_PRODUCT_IMAGE2, DEFAULT_CAMPAIGN_PRODUCT_IMAGE3
+from src.data import DEFAULT_CAMPAIGN_PRODUCT_IMAGE1, DEFAULT_CAMPAIGN_PRODUCT_IMAGE2, \
+    DEFAULT_CAMPAIGN_PRODUCT_IMAGE3, CAMPAIGN_PRODUCT_IMAGE_FIELDS
+from src.domain.matching import to_bitmask
 from src.domain.models import ValueEnum, CategoryEnum, Brand, Influencer, Campaign, CampaignStateEnum
-from src.exceptions import AlreadyExistsException, NotFoundException
-from src.types import BrandRepository, UserRepository, InfluencerRepository, Repository
-from src.web import PinfluencerResponse, BRAND_ID_PATH_KEY, INFLUENCER_ID_PATH_KEY, PinfluencerContext
+from src.domain.models import Page
+from src.domain.similarity import SimilarityMetric
+from src.exceptions import AlreadyExistsException, NotFoundException, InvalidCursorException, ImageException, \
+    ImageTooLargeException
+from src.types import BrandRepository, UserRepository, InfluencerRepository, Repository, CampaignRepository, Model
+from src.web import PinfluencerResponse, BRAND_ID_PATH_KEY, INFLUENCER_ID_PATH_KEY, PinfluencerContext, \
+    page_parameters, campaign_filter_parameters
+
+# the deserializer splits the digit off camel case keys, productImage1 arrives as product_image_1
+_PRODUCT_IMAGE_BODY_KEYS = dict(zip(("product_image_1", "product_image_2", "product_image_3"),
+                                    CAMPAIGN_PRODUCT_IMAGE_FIELDS))
 
 
 class BaseController:
@@ -14,9 +24,31 @@ class BaseController:
         self._repository = repository
 
     def get_all(self, context: PinfluencerContext) -> None:
-        users = self._repository.load_collection()
+        self._get_page(context=context,
+                       loader=lambda limit, cursor: self._repository.load_page(limit=limit, cursor=cursor))
+
+    @staticmethod
+    def _get_page(context: PinfluencerContext, loader: Callable[[int, str], Page]) -> None:
+        parameters = page_parameters(event=context.event)
+        if parameters is None:
+            context.short_circuit = True
+            context.response.status_code = 400
+            context.response.body = {}
+            return
+        [limit, cursor] = parameters
+        try:
+            page = loader(limit, cursor)
+        except InvalidCursorException as e:
+            print_exception(e)
+            context.short_circuit = True
+            context.response.status_code = 400
+            context.response.body = {}
+            return
         context.response.status_code = 200
-        context.response.body = list(map(lambda x: x.__dict__, users))
+        context.response.body = {
+            "items": list(map(lambda x: x.__dict__, page.items)),
+            "next_cursor": page.next_cursor
+        }
 
     def _update_image(self,
                       context: PinfluencerContext,
@@ -31,6 +63,39 @@ class BaseController:
         except NotFoundException as e:
             print_exception(e)
             return [PinfluencerResponse(status_code=404, body={}), True]
+        except ImageTooLargeException as e:
+            print_exception(e)
+            return [PinfluencerResponse(status_code=413, body={}), True]
+
+    @staticmethod
+    def _create_image_upload(context: PinfluencerContext, id: str, creator: Callable[[str, str], dict]) -> None:
+        try:
+            context.response.body = creator(id, context.body.get('content_type', ''))
+            context.response.status_code = 201
+            return
+        except NotFoundException as e:
+            print_exception(e)
+            context.response.status_code = 404
+        except ImageException as e:
+            print_exception(e)
+            context.response.status_code = 400
+        context.short_circuit = True
+        context.response.body = {}
+
+    @staticmethod
+    def _confirm_image(context: PinfluencerContext, id: str, confirmer: Callable[[str, str], Model]) -> None:
+        try:
+            context.response.body = confirmer(id, context.body.get('image_key', '')).__dict__
+            context.response.status_code = 200
+            return
+        except NotFoundException as e:
+            print_exception(e)
+            context.response.status_code = 404
+        except ImageException as e:
+            print_exception(e)
+            context.response.status_code = 400
+        context.short_circuit = True
+        context.response.body = {}
 
     def get_by_id(self, context: PinfluencerContext) -> None:
         try:
@@ -65,6 +130,11 @@ class BaseUserController(BaseController):
         context.response.status_code = 404
         context.response.body = {}
 
+    def create_image_upload(self, context: PinfluencerContext) -> None:
+        self._create_image_upload(context=context,
+                                  id=context.auth_user_id,
+                                  creator=self._repository.create_image_upload_for_auth_user)
+
 
 class BrandController(BaseUserController):
     def __init__(self, brand_repository: BrandRepository):
@@ -74,7 +144,10 @@ class BrandController(BaseUserController):
         auth_user_id = context.auth_user_id
         payload_dict = context.body
         try:
-            brand = Brand(brand_name=payload_dict["brand_name"],
+            brand = Brand(first_name=payload_dict["first_name"],
+                          last_name=payload_dict["last_name"],
+                          email=payload_dict["email"],
+                          brand_name=payload_dict["brand_name"],
                           brand_description=payload_dict["brand_description"],
                           website=payload_dict["website"],
                           insta_handle=payload_dict["insta_handle"],
@@ -94,7 +167,10 @@ class BrandController(BaseUserController):
         auth_user_id = context.auth_user_id
         payload_dict = context.body
         try:
-            brand = Brand(brand_name=payload_dict["brand_name"],
+            brand = Brand(first_name=payload_dict.get("first_name", ""),
+                          last_name=payload_dict.get("last_name", ""),
+                          email=payload_dict.get("email", ""),
+                          brand_name=payload_dict["brand_name"],
                           brand_description=payload_dict["brand_description"],
                           website=payload_dict["website"],
                           insta_handle=payload_dict["insta_handle"],
@@ -132,6 +208,16 @@ class BrandController(BaseUserController):
         context.response.status_code = response.status_code
         context.response.body = response.body
 
+    def confirm_logo(self, context: PinfluencerContext) -> None:
+        self._confirm_image(context=context,
+                            id=context.auth_user_id,
+                            confirmer=self._repository.confirm_logo_for_auth_user)
+
+    def confirm_header_image(self, context: PinfluencerContext) -> None:
+        self._confirm_image(context=context,
+                            id=context.auth_user_id,
+                            confirmer=self._repository.confirm_header_image_for_auth_user)
+
 
 class InfluencerController(BaseUserController):
 
@@ -181,6 +267,11 @@ class InfluencerController(BaseUserController):
         context.response.status_code = response.status_code
         context.response.body = response.body
 
+    def confirm_profile_image(self, context: PinfluencerContext) -> None:
+        self._confirm_image(context=context,
+                            id=context.auth_user_id,
+                            confirmer=self._repository.confirm_image_for_auth_user)
+
     def update(self, context: PinfluencerContext) -> None:
         auth_user_id = context.auth_user_id
         payload_dict = context.body
@@ -188,6 +279,11 @@ class InfluencerController(BaseUserController):
             influencer_from_db = self._repository.update_for_auth_user(auth_user_id=auth_user_id,
                                                                        payload=Influencer(
                                                                            auth_user_id=auth_user_id,
+                                                                           first_name=payload_dict.get(
+                                                                               "first_name", ""),
+                                                                           last_name=payload_dict.get(
+                                                                               "last_name", ""),
+                                                                           email=payload_dict.get("email", ""),
                                                                            insta_handle=payload_dict[
                                                                                'insta_handle'],
                                                                            website=payload_dict["website"],
@@ -232,6 +328,29 @@ class InfluencerController(BaseUserController):
             context.response.status_code = 404
             context.response.body = {}
 
+    def get_similar(self, context: PinfluencerContext) -> None:
+        parameters = page_parameters(event=context.event)
+        metric = (context.event.get('queryStringParameters') or {}).get('metric', SimilarityMetric.COSINE.value)
+        if parameters is None or metric not in {member.value for member in SimilarityMetric}:
+            context.short_circuit = True
+            context.response.status_code = 400
+            context.response.body = {}
+            return
+        [limit, _] = parameters
+        try:
+            similar = self._repository.load_similar(id_=context.id, limit=limit, metric=SimilarityMetric(metric))
+        except NotFoundException as e:
+            print_exception(e)
+            context.short_circuit = True
+            context.response.status_code = 404
+            context.response.body = {}
+            return
+        context.response.status_code = 200
+        context.response.body = {
+            "items": [{**influencer.__dict__, "similarity": score} for influencer, score in similar],
+            "next_cursor": None
+        }
+
 
 class CampaignController(BaseController):
 
@@ -265,11 +384,25 @@ class CampaignController(BaseController):
             context.response.status_code = 404
             context.short_circuit = True
 
+    def get_all(self, context: PinfluencerContext) -> None:
+        campaign_filter = campaign_filter_parameters(event=context.event)
+        if campaign_filter is None:
+            context.short_circuit = True
+            context.response.status_code = 400
+            context.response.body = {}
+            return
+        self._get_page(context=context,
+                       loader=lambda limit, cursor: self._repository.load_page_filtered(campaign_filter=campaign_filter,
+                                                                                        limit=limit,
+                                                                                        cursor=cursor))
+
     def get_for_brand(self, context: PinfluencerContext) -> None:
         try:
-            campaigns = self._repository.load_for_auth_brand(auth_user_id=context.auth_user_id)
-            context.response.status_code = 200
-            context.response.body = list(map(lambda x: x.__dict__, campaigns))
+            self._get_page(context=context,
+                           loader=lambda limit, cursor: self._repository.load_page_for_auth_brand(
+                               auth_user_id=context.auth_user_id,
+                               limit=limit,
+                               cursor=cursor))
         except NotFoundException as e:
             print_exception(e)
             context.response.status_code = 404
@@ -346,3 +479,112 @@ class CampaignController(BaseController):
 
     def product_image3_updater(self, id: str, bytes: str) -> dict:
         return self._repository.update_product_image3(id=id, image_bytes=bytes).__dict__
+
+    def update_product_images(self, context: PinfluencerContext) -> None:
+        """
+        any of the product images in one request, base64 encoded under productImage1..3
+        """
+        images = {field: context.body[key] for key, field in _PRODUCT_IMAGE_BODY_KEYS.items() if key in context.body}
+        if not images or len(images) != len(context.body) or \
+                not all(isinstance(image, str) and image for image in images.values()):
+            context.short_circuit = True
+            context.response.status_code = 400
+            context.response.body = {}
+            return
+        try:
+            context.response.body = self._repository.update_product_images(id=context.id, images=images).__dict__
+            context.response.status_code = 201
+            return
+        except NotFoundException as e:
+            print_exception(e)
+            context.response.status_code = 404
+        except ImageTooLargeException as e:
+            print_exception(e)
+            context.response.status_code = 413
+        except ImageException as e:
+            print_exception(e)
+            context.response.status_code = 400
+        context.short_circuit = True
+        context.response.body = {}
+
+    def create_image_upload(self, context: PinfluencerContext) -> None:
+        self._create_image_upload(context=context,
+                                  id=context.id,
+                                  creator=self._repository.create_image_upload)
+
+    def confirm_product_image1(self, context: PinfluencerContext) -> None:
+        self._confirm_image(context=context, id=context.id, confirmer=self._repository.confirm_product_image1)
+
+    def confirm_product_image2(self, context: PinfluencerContext) -> None:
+        self._confirm_image(context=context, id=context.id, confirmer=self._repository.confirm_product_image2)
+
+    def confirm_product_image3(self, context: PinfluencerContext) -> None:
+        self._confirm_image(context=context, id=context.id, confirmer=self._repository.confirm_product_image3)
+
+
+FEED_CAMPAIGNS = "campaigns"
+FEED_INFLUENCERS = "influencers"
+
+
+class FeedController:
+    """
+    influencers are shown the active campaigns that share the most values and categories with them,
+    brands the influencers that share the most with the brand
+    """
+
+    def __init__(self, campaign_repository: CampaignRepository,
+                 brand_repository: BrandRepository,
+                 influencer_repository: InfluencerRepository):
+        self.__campaign_repository = campaign_repository
+        self.__brand_repository = brand_repository
+        self.__influencer_repository = influencer_repository
+
+    def get(self, context: PinfluencerContext) -> None:
+        parameters = page_parameters(event=context.event)
+        if parameters is None:
+            context.short_circuit = True
+            context.response.status_code = 400
+            context.response.body = {}
+            return
+        [limit, _] = parameters
+        try:
+            influencer = self.__influencer_repository.load_for_auth_user(auth_user_id=context.auth_user_id)
+            items = self.__rank(values=influencer.values,
+                                categories=influencer.categories,
+                                ranker=self.__campaign_repository.rank_active_candidates,
+                                loader=self.__campaign_repository.load_by_ids,
+                                limit=limit)
+            feed = FEED_CAMPAIGNS
+        except NotFoundException:
+            try:
+                brand = self.__brand_repository.load_for_auth_user(auth_user_id=context.auth_user_id)
+            except NotFoundException as e:
+                print_exception(e)
+                context.short_circuit = True
+                context.response.status_code = 404
+                context.response.body = {}
+                return
+            items = self.__rank(values=brand.values,
+                                categories=brand.categories,
+                                ranker=self.__influencer_repository.rank_candidates,
+                                loader=self.__influencer_repository.load_by_ids,
+                                limit=limit)
+            feed = FEED_INFLUENCERS
+        context.response.status_code = 200
+        context.response.body = {
+            "feed": feed,
+            "items": items,
+            "next_cursor": None
+        }
+
+    @staticmethod
+    def __rank(values: list, categories: list,
+               ranker: Callable[[int, int, int], list[tuple[str, int]]],
+               loader: Callable[[list[str]], list],
+               limit: int) -> list[dict]:
+        # candidates are scored in the repository's in memory index
+        ranked = ranker(to_bitmask(values), to_bitmask(categories), limit)
+        scores = dict(ranked)
+        # only the winners are loaded as full rows
+        return [{**model.__dict__, "match_score": scores[model.id]}
+                for model in loader([id_ for id_, _ in ranked])]
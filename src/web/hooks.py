@@ -1,13 +1,14 @@
-from jsonschema.exceptions import ValidationError
+from typing import Callable, Optional
 
-from src.crosscutting import print_exception
+from src.crosscutting import print_exception, ConcurrentExecutor, CamelCaseBody
 from src.domain.models import Brand, Influencer
 from src.domain.validation import BrandValidator, InfluencerValidator, CampaignValidator
-from src.exceptions import NotFoundException
-from src.types import AuthUserRepository, Deserializer, BrandRepository
-from src.web import PinfluencerContext, valid_path_resource_id
-
-S3_URL = "https://pinfluencer-product-images.s3.eu-west-2.amazonaws.com"
+from src.exceptions import NotFoundException, PayloadValidationException
+from src.types import AuthUserRepository, Deserializer, BrandRepository, Serializer
+from src.web import PinfluencerContext, valid_path_resource_id, get_header
+from src.web.caching import strong_etag, etag_matches
+from src.web.controllers import FEED_CAMPAIGNS
+from src.web.serialization import serialize_brand, serialize_influencer, serialize_campaign, serialize_collection
 
 
 class CommonBeforeHooks:
@@ -27,10 +28,10 @@ class CampaignBeforeHooks:
     def validate_campaign(self, context: PinfluencerContext):
         try:
             self.__campaign_validator.validate_campaign(payload=context.body)
-        except ValidationError as e:
+        except PayloadValidationException as e:
             print_exception(e)
             context.short_circuit = True
-            context.response.body = {}
+            context.response.body = {"errors": e.errors}
             context.response.status_code = 400
 
     def validate_id(self, context: PinfluencerContext):
@@ -45,32 +46,11 @@ class CampaignBeforeHooks:
 
 class CampaignAfterHooks:
 
-    def tag_bucket_url_to_images(self, context: PinfluencerContext):
-        context.response.body["product_image1"] = f"{S3_URL}/{context.response.body['product_image1']}"
-        context.response.body["product_image2"] = f"{S3_URL}/{context.response.body['product_image2']}"
-        context.response.body["product_image3"] = f"{S3_URL}/{context.response.body['product_image3']}"
-
-    def format_values_and_categories(self, context: PinfluencerContext):
-        context.response.body["campaign_values"] = list(map(lambda x: x.name, context.response.body["campaign_values"]))
-        context.response.body["campaign_categories"] = list(map(lambda x: x.name, context.response.body["campaign_categories"]))
-
-    def tag_bucket_url_to_images_collection(self, context: PinfluencerContext):
-        for campaign in context.response.body:
-            campaign["product_image1"] = f"{S3_URL}/{campaign['product_image1']}"
-            campaign["product_image2"] = f"{S3_URL}/{campaign['product_image2']}"
-            campaign["product_image3"] = f"{S3_URL}/{campaign['product_image3']}"
-
-    def format_values_and_categories_collection(self, context: PinfluencerContext):
-        for campaign in context.response.body:
-            campaign["campaign_values"] = list(map(lambda x: x.name, campaign["campaign_values"]))
-            campaign["campaign_categories"] = list(map(lambda x: x.name, campaign["campaign_categories"]))
-
-    def format_campaign_state_collection(self, context: PinfluencerContext):
-        for campaign in context.response.body:
-            campaign["campaign_state"] = campaign["campaign_state"].name
+    def serialize(self, context: PinfluencerContext):
+        context.response.body = CamelCaseBody(serialize_campaign(context.response.body))
 
-    def format_campaign_state(self, context: PinfluencerContext):
-        context.response.body["campaign_state"] = context.response.body["campaign_state"].name
+    def serialize_collection(self, context: PinfluencerContext):
+        context.response.body = serialize_collection(body=context.response.body, serialize=serialize_campaign)
 
 
 class InfluencerBeforeHooks:
@@ -91,10 +71,10 @@ class InfluencerBeforeHooks:
     def validate_influencer(self, context: PinfluencerContext):
         try:
             self.__influencer_validator.validate_influencer(payload=context.body)
-        except ValidationError as e:
+        except PayloadValidationException as e:
             print_exception(e)
             context.short_circuit = True
-            context.response.body = {}
+            context.response.body = {"errors": e.errors}
             context.response.status_code = 400
 
 
@@ -126,10 +106,10 @@ class BrandBeforeHooks:
     def validate_brand(self, context: PinfluencerContext):
         try:
             self.__brand_validator.validate_brand(payload=context.body)
-        except ValidationError as e:
+        except PayloadValidationException as e:
             print_exception(e)
             context.short_circuit = True
-            context.response.body = {}
+            context.response.body = {"errors": e.errors}
             context.response.status_code = 400
 
 
@@ -145,14 +125,11 @@ class BrandAfterHooks:
                      auth_user_id=context.auth_user_id)
         self.__auth_user_repository.update_brand_claims(user=user)
 
-    def tag_bucket_url_to_images(self, context: PinfluencerContext):
-        context.response.body["header_image"] = f"{S3_URL}/{context.response.body['header_image']}"
-        context.response.body["logo"] = f"{S3_URL}/{context.response.body['logo']}"
+    def serialize(self, context: PinfluencerContext):
+        context.response.body = CamelCaseBody(serialize_brand(context.response.body))
 
-    def tag_bucket_url_to_images_collection(self, context: PinfluencerContext):
-        for brand in context.response.body:
-            brand["header_image"] = f"{S3_URL}/{brand['header_image']}"
-            brand["logo"] = f"{S3_URL}/{brand['logo']}"
+    def serialize_collection(self, context: PinfluencerContext):
+        context.response.body = serialize_collection(body=context.response.body, serialize=serialize_brand)
 
 
 class InfluencerAfterHooks:
@@ -167,12 +144,11 @@ class InfluencerAfterHooks:
                      auth_user_id=context.auth_user_id)
         self.__auth_user_repository.update_influencer_claims(user=user)
 
-    def tag_bucket_url_to_images(self, context: PinfluencerContext):
-        context.response.body["image"] = f"{S3_URL}/{context.response.body['image']}"
+    def serialize(self, context: PinfluencerContext):
+        context.response.body = CamelCaseBody(serialize_influencer(context.response.body))
 
-    def tag_bucket_url_to_images_collection(self, context: PinfluencerContext):
-        for influencer in context.response.body:
-            influencer["image"] = f"{S3_URL}/{influencer['image']}"
+    def serialize_collection(self, context: PinfluencerContext):
+        context.response.body = serialize_collection(body=context.response.body, serialize=serialize_influencer)
 
 
 class UserBeforeHooks:
@@ -183,43 +159,107 @@ class UserBeforeHooks:
 
 class UserAfterHooks:
 
-    def __init__(self, auth_user_repository: AuthUserRepository):
+    def __init__(self, auth_user_repository: AuthUserRepository,
+                 executor: Optional[ConcurrentExecutor] = None):
         self.__auth_user_repository = auth_user_repository
+        self.__executor = executor
 
     def tag_auth_user_claims_to_response(self, context: PinfluencerContext):
+        if self.__has_claims(user=context.response.body):
+            return
         auth_user = self.__auth_user_repository.get_by_id(_id=context.response.body["auth_user_id"])
         context.response.body["first_name"] = auth_user.first_name
         context.response.body["last_name"] = auth_user.last_name
         context.response.body["email"] = auth_user.email
 
     def tag_auth_user_claims_to_response_collection(self, context: PinfluencerContext):
-        for user in context.response.body:
-            auth_user = self.__auth_user_repository.get_by_id(_id=user["auth_user_id"])
+        ids = [user["auth_user_id"] for user in context.response.body["items"] if not self.__has_claims(user=user)]
+        if not ids:
+            return
+        if self.__executor is None:
+            auth_users = self.__auth_user_repository.get_by_ids(ids=ids)
+        else:
+            auth_users = self.__get_by_ids_concurrently(ids=ids)
+        for user in context.response.body["items"]:
+            if self.__has_claims(user=user):
+                continue
+            auth_user = auth_users.get(user["auth_user_id"])
+            if auth_user is None:
+                continue
             user["first_name"] = auth_user.first_name
             user["last_name"] = auth_user.last_name
             user["email"] = auth_user.email
 
-    def format_values_and_categories(self, context: PinfluencerContext):
-        context.response.body["values"] = list(map(lambda x: x.name, context.response.body["values"]))
-        context.response.body["categories"] = list(map(lambda x: x.name, context.response.body["categories"]))
+    @staticmethod
+    def __has_claims(user: dict) -> bool:
+        # users stored before the claims were copied into the database still need cognito
+        return bool(user.get("first_name") and user.get("last_name") and user.get("email"))
 
-    def format_values_and_categories_collection(self, context: PinfluencerContext):
-        for user in context.response.body:
-            user["values"] = list(map(lambda x: x.name, user["values"]))
-            user["categories"] = list(map(lambda x: x.name, user["categories"]))
+    def __get_by_ids_concurrently(self, ids: list[str]) -> dict:
+        ids = list(dict.fromkeys(ids))
+        auth_users = self.__executor.map(lambda _id: self.__auth_user_repository.get_by_id(_id=_id), ids)
+        return {_id: auth_user for _id, auth_user in zip(ids, auth_users) if auth_user is not None}
 
 
-class HooksFacade:
+class FeedAfterHooks:
+    """
+    the feed holds campaigns or influencers depending on who asked, so it is serialized with the matching hooks
+    """
 
-    def __init__(self, common_hooks: CommonBeforeHooks,
-                 brand_after_hooks: BrandAfterHooks,
-                 influencer_after_hooks: InfluencerAfterHooks,
-                 user_before_hooks: UserBeforeHooks,
+    def __init__(self, campaign_after_hooks: CampaignAfterHooks,
                  user_after_hooks: UserAfterHooks,
-                 influencer_before_hooks: InfluencerBeforeHooks,
-                 brand_before_hooks: BrandBeforeHooks,
-                 campaign_before_hooks: CampaignBeforeHooks,
-                 campaign_after_hooks: CampaignAfterHooks):
+                 influencer_after_hooks: InfluencerAfterHooks):
+        self.__campaign_after_hooks = campaign_after_hooks
+        self.__user_after_hooks = user_after_hooks
+        self.__influencer_after_hooks = influencer_after_hooks
+
+    def format_feed(self, context: PinfluencerContext):
+        if context.response.body["feed"] == FEED_CAMPAIGNS:
+            self.__campaign_after_hooks.serialize_collection(context=context)
+        else:
+            self.__user_after_hooks.tag_auth_user_claims_to_response_collection(context=context)
+            self.__influencer_after_hooks.serialize_collection(context=context)
+
+
+class CacheAfterHooks:
+
+    def __init__(self, serializer: Serializer):
+        self.__serializer = serializer
+
+    def set_etag(self, context: PinfluencerContext):
+        """
+        strong etag over the serialized body, a client already holding it gets a 304 without the body.
+        runs last so the body it hashes is the body that is sent
+        """
+        if context.response.status_code != 200:
+            return
+        serialized_body = self.__serializer.serialize(context.response.body)
+        etag = strong_etag(body=serialized_body)
+        context.response.headers["ETag"] = etag
+        context.response.serialized_body = serialized_body
+        if etag_matches(if_none_match=get_header(event=context.event, name="If-None-Match"), etag=etag):
+            context.response.status_code = 304
+            context.response.body = {}
+
+
+class HooksFacade:
+    """
+    hooks are handed over as providers so a route only builds the hooks it actually uses
+    """
+
+    def __init__(self, common_hooks: Callable[[], CommonBeforeHooks],
+                 brand_after_hooks: Callable[[], BrandAfterHooks],
+                 influencer_after_hooks: Callable[[], InfluencerAfterHooks],
+                 user_before_hooks: Callable[[], UserBeforeHooks],
+                 user_after_hooks: Callable[[], UserAfterHooks],
+                 influencer_before_hooks: Callable[[], InfluencerBeforeHooks],
+                 brand_before_hooks: Callable[[], BrandBeforeHooks],
+                 campaign_before_hooks: Callable[[], CampaignBeforeHooks],
+                 campaign_after_hooks: Callable[[], CampaignAfterHooks],
+                 feed_after_hooks: Callable[[], FeedAfterHooks],
+                 cache_after_hooks: Callable[[], CacheAfterHooks]):
+        self.__cache_after_hooks = cache_after_hooks
+        self.__feed_after_hooks = feed_after_hooks
         self.__campaign_before_hooks = campaign_before_hooks
         self.__brand_before_hooks = brand_before_hooks
         self.__influencer_before_hooks = influencer_before_hooks
@@ -231,28 +271,34 @@ class HooksFacade:
         self.__campaign_after_hooks = campaign_after_hooks
 
     def get_campaign_after_hooks(self) -> CampaignAfterHooks:
-        return self.__campaign_after_hooks
+        return self.__campaign_after_hooks()
 
     def get_campaign_before_hooks(self) -> CampaignBeforeHooks:
-        return self.__campaign_before_hooks
+        return self.__campaign_before_hooks()
 
     def get_brand_before_hooks(self) -> BrandBeforeHooks:
-        return self.__brand_before_hooks
+        return self.__brand_before_hooks()
 
     def get_influencer_before_hooks(self) -> InfluencerBeforeHooks:
-        return self.__influencer_before_hooks
+        return self.__influencer_before_hooks()
 
     def get_user_after_hooks(self) -> UserAfterHooks:
-        return self.__user_after_hooks
+        return self.__user_after_hooks()
 
     def get_influencer_after_hooks(self) -> InfluencerAfterHooks:
-        return self.__influencer_after_hooks
+        return self.__influencer_after_hooks()
 
     def get_user_before_hooks(self) -> UserBeforeHooks:
-        return self.__user_before_hooks
+        return self.__user_before_hooks()
 
     def get_brand_after_hooks(self) -> BrandAfterHooks:
-        return self.__brand_after_hooks
+        return self.__brand_after_hooks()
 
     def get_before_common_hooks(self) -> CommonBeforeHooks:
-        return self.__common_before_hooks
+        return self.__common_before_hooks()
+
+    def get_feed_after_hooks(self) -> FeedAfterHooks:
+        return self.__feed_after_hooks()
+
+    def get_cache_after_hooks(self) -> CacheAfterHooks:
+        return self.__cache_after_hooks()
@@ -1,80 +1,245 @@
+import os
+import time
+from typing import Callable, TypeVar, Optional
+
 from mapper.object_mapper import ObjectMapper
 
-from src.crosscutting import JsonCamelToSnakeCaseDeserializer, JsonSnakeToCamelSerializer
+from src.crosscutting import JsonCamelToSnakeCaseDeserializer, JsonSnakeToCamelSerializer, ConcurrentExecutor, \
+    FailurePolicy, TtlLruCache, JsonEncoder, JsonEncoderEnum, new_json_encoder
 from src.data import SqlAlchemyDataManager
 from src.data.repositories import S3ImageRepository, SqlAlchemyBrandRepository, SqlAlchemyInfluencerRepository, \
-    CognitoAuthUserRepository, CognitoAuthService, SqlAlchemyCampaignRepository
+    CognitoAuthUserRepository, CognitoAuthService, SqlAlchemyCampaignRepository, CachingAuthUserRepository, \
+    AUDIENCE_INDEX_MAX_AGE_SECONDS, CAMPAIGN_INDEX_MAX_AGE_SECONDS, IMAGE_MAX_SIZE_BYTES, \
+    IMAGE_MULTIPART_THRESHOLD_BYTES, IMAGE_UPLOAD_MAX_WORKERS, SqsImageVariantQueue
 from src.domain.validation import BrandValidator, InfluencerValidator, CampaignValidator
 from src.types import DataManager, ImageRepository, ObjectMapperAdapter, BrandRepository, \
-    InfluencerRepository, Deserializer, Serializer, AuthUserRepository, CampaignRepository
-from src.web.controllers import BrandController, InfluencerController, CampaignController
+    InfluencerRepository, Deserializer, Serializer, AuthUserRepository, CampaignRepository, ImageVariantQueue
+from src.web.compression import ResponseCompressor, DEFAULT_MIN_SIZE_BYTES, DEFAULT_GZIP_LEVEL, DEFAULT_BROTLI_QUALITY
+from src.web.controllers import BrandController, InfluencerController, CampaignController, FeedController
 from src.web.hooks import HooksFacade, CommonBeforeHooks, BrandAfterHooks, InfluencerAfterHooks, UserBeforeHooks, \
-    UserAfterHooks, InfluencerBeforeHooks, BrandBeforeHooks, CampaignBeforeHooks, CampaignAfterHooks
+    UserAfterHooks, InfluencerBeforeHooks, BrandBeforeHooks, CampaignBeforeHooks, CampaignAfterHooks, FeedAfterHooks, \
+    CacheAfterHooks
 from src.web.middleware import MiddlewarePipeline
 
+T = TypeVar('T')
 
-class ServiceLocator:
-
-    def get_new_data_manager(self) -> DataManager:
-        return SqlAlchemyDataManager()
 
-    def get_new_image_repository(self) -> ImageRepository:
-        return S3ImageRepository()
-
-    def get_new_brand_validator(self) -> BrandValidator:
-        return BrandValidator()
+class ServiceLocator:
+    """
+    lazy, memoizing container: nothing is built until something asks for it,
+    and everything is built at most once per locator (so once per warm container)
+    """
+
+    def __init__(self):
+        self.__instances = {}
+        self.__resolutions: list[tuple[str, float]] = []
+
+    def _resolve(self, name: str, factory: Callable[[], T]) -> T:
+        if name not in self.__instances:
+            start = time.perf_counter()
+            self.__instances[name] = factory()
+            self.__resolutions.append((name, time.perf_counter() - start))
+        return self.__instances[name]
+
+    def get_resolutions(self) -> list[tuple[str, float]]:
+        """
+        services built so far in the order they finished building, with the seconds each took
+        including the dependencies it built on the way
+        """
+        return list(self.__resolutions)
+
+    def end_request(self) -> None:
+        if 'data_manager' in self.__instances:
+            self.__instances['data_manager'].end_session()
+        if 'auth_user_cache' in self.__instances:
+            print(f"auth user cache: {self.__instances['auth_user_cache'].get_stats()}")
+
+    def get_data_manager(self) -> DataManager:
+        return self._resolve('data_manager', SqlAlchemyDataManager)
+
+    def get_image_repository(self) -> ImageRepository:
+        return self._resolve('image_repository',
+                             lambda: S3ImageRepository(
+                                 max_size_bytes=int(os.environ.get('IMAGE_MAX_SIZE_BYTES', IMAGE_MAX_SIZE_BYTES)),
+                                 multipart_threshold_bytes=int(os.environ.get('IMAGE_MULTIPART_THRESHOLD_BYTES',
+                                                                              IMAGE_MULTIPART_THRESHOLD_BYTES)),
+                                 variant_queue=self.get_image_variant_queue()))
+
+    def get_image_variant_queue(self) -> Optional[ImageVariantQueue]:
+        # without IMAGE_VARIANT_QUEUE_URL images are stored as they are and clients only get the originals
+        return self._resolve('image_variant_queue',
+                             lambda: SqsImageVariantQueue(queue_url=os.environ['IMAGE_VARIANT_QUEUE_URL'])
+                             if os.environ.get('IMAGE_VARIANT_QUEUE_URL') else None)
+
+    def get_brand_validator(self) -> BrandValidator:
+        return self._resolve('brand_validator', BrandValidator)
+
+    def get_influencer_validator(self) -> InfluencerValidator:
+        return self._resolve('influencer_validator', InfluencerValidator)
+
+    def get_campaign_validator(self) -> CampaignValidator:
+        return self._resolve('campaign_validator', CampaignValidator)
 
     def get_new_object_mapper(self) -> ObjectMapperAdapter:
+        # not memoized, every repository registers its own mappings on the mapper it is given
         return ObjectMapper()
 
-    def get_new_brand_repository(self) -> BrandRepository:
-        return SqlAlchemyBrandRepository(data_manager=self.get_new_data_manager(),
-                                         image_repository=self.get_new_image_repository(),
-                                         object_mapper=self.get_new_object_mapper())
-
-    def get_new_influencer_repository(self) -> InfluencerRepository:
-        return SqlAlchemyInfluencerRepository(data_manager=self.get_new_data_manager(),
-                                              image_repository=self.get_new_image_repository(),
-                                              object_mapper=self.get_new_object_mapper())
-
-    def get_new_deserializer(self) -> Deserializer:
-        return JsonCamelToSnakeCaseDeserializer()
-
-    def get_new_brand_controller(self) -> BrandController:
-        return BrandController(
-            brand_repository=self.get_new_brand_repository())
-
-    def get_new_influencer_controller(self) -> InfluencerController:
-        return InfluencerController(influencer_repository=self.get_new_influencer_repository())
-
-    def get_new_campaign_controller(self) -> CampaignController:
-        return CampaignController(repository=self.get_new_campaign_repository())
-
-    def get_new_serializer(self) -> Serializer:
-        return JsonSnakeToCamelSerializer()
-
-    def get_new_auth_user_repository(self) -> AuthUserRepository:
-        return CognitoAuthUserRepository(auth_service=CognitoAuthService())
-
-    def get_new_influencer_validator(self) -> InfluencerValidator:
-        return InfluencerValidator()
-
-    def get_new_middlware_pipeline(self) -> MiddlewarePipeline:
-        return MiddlewarePipeline()
-
-    def get_new_hooks_facade(self) -> HooksFacade:
-        return HooksFacade(common_hooks=CommonBeforeHooks(deserializer=self.get_new_deserializer()),
-                           brand_after_hooks=BrandAfterHooks(auth_user_repository=self.get_new_auth_user_repository()),
-                           influencer_after_hooks=InfluencerAfterHooks(auth_user_repository=self.get_new_auth_user_repository()),
-                           user_before_hooks=UserBeforeHooks(),
-                           user_after_hooks=UserAfterHooks(auth_user_repository=self.get_new_auth_user_repository()),
-                           influencer_before_hooks=InfluencerBeforeHooks(influencer_validator=self.get_new_influencer_validator()),
-                           brand_before_hooks=BrandBeforeHooks(brand_validator=self.get_new_brand_validator(),
-                                                               brand_repository=self.get_new_brand_repository()),
-                           campaign_before_hooks=CampaignBeforeHooks(campaign_validator=CampaignValidator()),
-                           campaign_after_hooks=CampaignAfterHooks())
-
-    def get_new_campaign_repository(self) -> CampaignRepository:
-        return SqlAlchemyCampaignRepository(data_manager=self.get_new_data_manager(),
-                                            object_mapper=self.get_new_object_mapper(),
-                                            image_repository=self.get_new_image_repository())
\ No newline at end of file
+    def get_brand_repository(self) -> BrandRepository:
+        return self._resolve('brand_repository',
+                             lambda: SqlAlchemyBrandRepository(data_manager=self.get_data_manager(),
+                                                               image_repository=self.get_image_repository(),
+                                                               object_mapper=self.get_new_object_mapper()))
+
+    def get_influencer_repository(self) -> InfluencerRepository:
+        return self._resolve('influencer_repository',
+                             lambda: SqlAlchemyInfluencerRepository(
+                                 data_manager=self.get_data_manager(),
+                                 image_repository=self.get_image_repository(),
+                                 object_mapper=self.get_new_object_mapper(),
+                                 audience_index_max_age_seconds=float(
+                                     os.environ.get('AUDIENCE_INDEX_MAX_AGE_SECONDS',
+                                                    AUDIENCE_INDEX_MAX_AGE_SECONDS))))
+
+    def get_campaign_repository(self) -> CampaignRepository:
+        return self._resolve('campaign_repository',
+                             lambda: SqlAlchemyCampaignRepository(
+                                 data_manager=self.get_data_manager(),
+                                 object_mapper=self.get_new_object_mapper(),
+                                 image_repository=self.get_image_repository(),
+                                 campaign_index_max_age_seconds=float(
+                                     os.environ.get('CAMPAIGN_INDEX_MAX_AGE_SECONDS',
+                                                    CAMPAIGN_INDEX_MAX_AGE_SECONDS)),
+                                 image_executor=self.get_image_upload_executor()))
+
+    def get_image_upload_executor(self) -> ConcurrentExecutor:
+        # one worker per product image, a failed upload fails the request so nothing is half set
+        return self._resolve('image_upload_executor',
+                             lambda: ConcurrentExecutor(max_workers=int(os.environ.get('IMAGE_UPLOAD_MAX_WORKERS',
+                                                                                       IMAGE_UPLOAD_MAX_WORKERS)),
+                                                        failure_policy=FailurePolicy.RAISE))
+
+    def get_auth_user_cache(self) -> TtlLruCache:
+        return self._resolve('auth_user_cache',
+                             lambda: TtlLruCache(max_size=int(os.environ.get('AUTH_USER_CACHE_MAX_SIZE', 1024)),
+                                                 ttl_seconds=float(os.environ.get('AUTH_USER_CACHE_TTL_SECONDS', 300))))
+
+    def get_auth_user_repository(self) -> AuthUserRepository:
+        return self._resolve('auth_user_repository',
+                             lambda: CachingAuthUserRepository(
+                                 auth_user_repository=CognitoAuthUserRepository(auth_service=CognitoAuthService()),
+                                 cache=self.get_auth_user_cache()))
+
+    def get_auth_user_executor(self) -> Optional[ConcurrentExecutor]:
+        # claim lookups run one after another unless AUTH_USER_MAX_WORKERS is set
+        return self._resolve('auth_user_executor', self.__new_auth_user_executor)
+
+    @staticmethod
+    def __new_auth_user_executor() -> Optional[ConcurrentExecutor]:
+        max_workers = int(os.environ.get('AUTH_USER_MAX_WORKERS', 0))
+        if max_workers <= 0:
+            return None
+        timeout_seconds = os.environ.get('AUTH_USER_TIMEOUT_SECONDS')
+        return ConcurrentExecutor(max_workers=max_workers,
+                                  timeout_seconds=float(timeout_seconds) if timeout_seconds else None,
+                                  failure_policy=FailurePolicy(os.environ.get('AUTH_USER_FAILURE_POLICY', 'skip')))
+
+    def get_deserializer(self) -> Deserializer:
+        return self._resolve('deserializer', JsonCamelToSnakeCaseDeserializer)
+
+    def get_json_encoder(self) -> JsonEncoder:
+        # picked once per container, orjson when it is installed unless JSON_ENCODER=stdlib
+        return self._resolve('json_encoder',
+                             lambda: new_json_encoder(preferred=JsonEncoderEnum(os.environ['JSON_ENCODER'])
+                                                      if os.environ.get('JSON_ENCODER') else None))
+
+    def get_serializer(self) -> Serializer:
+        return self._resolve('serializer', lambda: JsonSnakeToCamelSerializer(encoder=self.get_json_encoder()))
+
+    def get_response_compressor(self) -> ResponseCompressor:
+        return self._resolve('response_compressor',
+                             lambda: ResponseCompressor(
+                                 min_size_bytes=int(os.environ.get('RESPONSE_COMPRESSION_MIN_SIZE_BYTES',
+                                                                   DEFAULT_MIN_SIZE_BYTES)),
+                                 gzip_level=int(os.environ.get('RESPONSE_GZIP_LEVEL', DEFAULT_GZIP_LEVEL)),
+                                 brotli_quality=int(os.environ.get('RESPONSE_BROTLI_QUALITY',
+                                                                   DEFAULT_BROTLI_QUALITY))))
+
+    def get_brand_controller(self) -> BrandController:
+        return self._resolve('brand_controller',
+                             lambda: BrandController(brand_repository=self.get_brand_repository()))
+
+    def get_influencer_controller(self) -> InfluencerController:
+        return self._resolve('influencer_controller',
+                             lambda: InfluencerController(influencer_repository=self.get_influencer_repository()))
+
+    def get_campaign_controller(self) -> CampaignController:
+        return self._resolve('campaign_controller',
+                             lambda: CampaignController(repository=self.get_campaign_repository()))
+
+    def get_feed_controller(self) -> FeedController:
+        return self._resolve('feed_controller',
+                             lambda: FeedController(campaign_repository=self.get_campaign_repository(),
+                                                    brand_repository=self.get_brand_repository(),
+                                                    influencer_repository=self.get_influencer_repository()))
+
+    def get_middlware_pipeline(self) -> MiddlewarePipeline:
+        return self._resolve('middleware_pipeline', MiddlewarePipeline)
+
+    def get_common_before_hooks(self) -> CommonBeforeHooks:
+        return self._resolve('common_before_hooks',
+                             lambda: CommonBeforeHooks(deserializer=self.get_deserializer()))
+
+    def get_brand_before_hooks(self) -> BrandBeforeHooks:
+        return self._resolve('brand_before_hooks',
+                             lambda: BrandBeforeHooks(brand_validator=self.get_brand_validator(),
+                                                      brand_repository=self.get_brand_repository()))
+
+    def get_brand_after_hooks(self) -> BrandAfterHooks:
+        return self._resolve('brand_after_hooks',
+                             lambda: BrandAfterHooks(auth_user_repository=self.get_auth_user_repository()))
+
+    def get_influencer_before_hooks(self) -> InfluencerBeforeHooks:
+        return self._resolve('influencer_before_hooks',
+                             lambda: InfluencerBeforeHooks(influencer_validator=self.get_influencer_validator()))
+
+    def get_influencer_after_hooks(self) -> InfluencerAfterHooks:
+        return self._resolve('influencer_after_hooks',
+                             lambda: InfluencerAfterHooks(auth_user_repository=self.get_auth_user_repository()))
+
+    def get_user_before_hooks(self) -> UserBeforeHooks:
+        return self._resolve('user_before_hooks', UserBeforeHooks)
+
+    def get_user_after_hooks(self) -> UserAfterHooks:
+        return self._resolve('user_after_hooks',
+                             lambda: UserAfterHooks(auth_user_repository=self.get_auth_user_repository(),
+                                                    executor=self.get_auth_user_executor()))
+
+    def get_campaign_before_hooks(self) -> CampaignBeforeHooks:
+        return self._resolve('campaign_before_hooks',
+                             lambda: CampaignBeforeHooks(campaign_validator=self.get_campaign_validator()))
+
+    def get_campaign_after_hooks(self) -> CampaignAfterHooks:
+        return self._resolve('campaign_after_hooks', CampaignAfterHooks)
+
+    def get_cache_after_hooks(self) -> CacheAfterHooks:
+        return self._resolve('cache_after_hooks', lambda: CacheAfterHooks(serializer=self.get_serializer()))
+
+    def get_feed_after_hooks(self) -> FeedAfterHooks:
+        return self._resolve('feed_after_hooks',
+                             lambda: FeedAfterHooks(campaign_after_hooks=self.get_campaign_after_hooks(),
+                                                    user_after_hooks=self.get_user_after_hooks(),
+                                                    influencer_after_hooks=self.get_influencer_after_hooks()))
+
+    def get_hooks_facade(self) -> HooksFacade:
+        return self._resolve('hooks_facade',
+                             lambda: HooksFacade(common_hooks=self.get_common_before_hooks,
+                                                 brand_after_hooks=self.get_brand_after_hooks,
+                                                 influencer_after_hooks=self.get_influencer_after_hooks,
+                                                 user_before_hooks=self.get_user_before_hooks,
+                                                 user_after_hooks=self.get_user_after_hooks,
+                                                 influencer_before_hooks=self.get_influencer_before_hooks,
+                                                 brand_before_hooks=self.get_brand_before_hooks,
+                                                 campaign_before_hooks=self.get_campaign_before_hooks,
+                                                 campaign_after_hooks=self.get_campaign_after_hooks,
+                                                 feed_after_hooks=self.get_feed_after_hooks,
+                                                 cache_after_hooks=self.get_cache_after_hooks))
@@ -1,10 +1,12 @@
+from typing import Sequence
+
 from src.web import PinfluencerContext, PinfluencerAction
 
 
 class MiddlewarePipeline:
 
     def execute_middleware(self, context: PinfluencerContext,
-                           middleware: list[PinfluencerAction]):
+                           middleware: Sequence[PinfluencerAction]):
         for action in middleware:
             action(context)
             if context.short_circuit:
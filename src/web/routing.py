@@ -1,15 +1,63 @@
 from collections import OrderedDict
+from types import MappingProxyType
+from typing import Callable, Optional, Mapping
 
 from src.web import Route, PinfluencerContext
+from src.web.caching import PUBLIC_CACHE_CONTROL, PRIVATE_CACHE_CONTROL
+from src.web.controllers import BrandController, InfluencerController, CampaignController, FeedController
+from src.web.hooks import HooksFacade
 from src.web.ioc import ServiceLocator
 
 
 class Dispatcher:
+    """
+    routes are declared as factories and only built the first time they are dispatched,
+    so a request only resolves the controllers and hooks its own route depends on
+    """
+
     def __init__(self, service_locator: ServiceLocator):
-        self.__campaign_ctr = service_locator.get_new_campaign_controller()
-        self.__brand_ctr = service_locator.get_new_brand_controller()
-        self.__influencer_ctr = service_locator.get_new_influencer_controller()
-        self.__hooks_facade = service_locator.get_new_hooks_facade()
+        self.__service_locator = service_locator
+        self.__route_factories = self.__declare_routes()
+        self.__routes: dict[str, Route] = {}
+        self.__route_table: Optional[Mapping[str, Route]] = None
+
+    @property
+    def __campaign_ctr(self) -> CampaignController:
+        return self.__service_locator.get_campaign_controller()
+
+    @property
+    def __brand_ctr(self) -> BrandController:
+        return self.__service_locator.get_brand_controller()
+
+    @property
+    def __influencer_ctr(self) -> InfluencerController:
+        return self.__service_locator.get_influencer_controller()
+
+    @property
+    def __feed_ctr(self) -> FeedController:
+        return self.__service_locator.get_feed_controller()
+
+    @property
+    def __hooks_facade(self) -> HooksFacade:
+        return self.__service_locator.get_hooks_facade()
+
+    @property
+    def route_keys(self) -> list[str]:
+        return list(self.__route_factories)
+
+    def get_route(self, route_key: str) -> Optional[Route]:
+        if route_key not in self.__route_factories:
+            return None
+        if route_key not in self.__routes:
+            self.__routes[route_key] = self.__route_factories[route_key]()
+        return self.__routes[route_key]
+
+    @property
+    def dispatch_route_to_ctr(self) -> Mapping[str, Route]:
+        if self.__route_table is None:
+            self.__route_table = MappingProxyType({route_key: self.get_route(route_key)
+                                                   for route_key in self.__route_factories})
+        return self.__route_table
 
     def get_not_implemented_method(self, route: str) -> Route:
         return Route(action=lambda context: self.not_implemented(context=context,
@@ -20,66 +68,91 @@ class Dispatcher:
         context.response.status_code = 405
         context.response.body = {"message": f"{route} is not implemented"}
 
-    @property
-    def dispatch_route_to_ctr(self) -> dict[dict[str, Route]]:
+    def __declare_routes(self) -> dict[str, Callable[[], Route]]:
         feed = OrderedDict(
-            {'GET /feed': self.get_not_implemented_method('GET /feed')}
+            {'GET /feed': lambda: Route(
+                before_hooks=[
+                    self.__hooks_facade.get_user_before_hooks().set_auth_user_id
+                ],
+                action=self.__feed_ctr.get,
+                after_hooks=[
+                    self.__hooks_facade.get_feed_after_hooks().format_feed,
+                    self.__hooks_facade.get_cache_after_hooks().set_etag
+                ],
+                cache_control=PRIVATE_CACHE_CONTROL)}
         )
 
         users = OrderedDict(
             {
-                'GET /brands': Route(
+                'GET /brands': lambda: Route(
                     action=self.__brand_ctr.get_all,
                     after_hooks=[
                         self.__hooks_facade.get_user_after_hooks().tag_auth_user_claims_to_response_collection,
-                        self.__hooks_facade.get_brand_after_hooks().tag_bucket_url_to_images_collection,
-                        self.__hooks_facade.get_user_after_hooks().format_values_and_categories_collection
-                    ]),
+                        self.__hooks_facade.get_brand_after_hooks().serialize_collection,
+                        self.__hooks_facade.get_cache_after_hooks().set_etag
+                    ],
+                    cache_control=PUBLIC_CACHE_CONTROL),
 
-                'GET /influencers': Route(
+                'GET /influencers': lambda: Route(
                     action=self.__influencer_ctr.get_all,
                     after_hooks=[
                         self.__hooks_facade.get_user_after_hooks().tag_auth_user_claims_to_response_collection,
-                        self.__hooks_facade.get_influencer_after_hooks().tag_bucket_url_to_images_collection,
-                        self.__hooks_facade.get_user_after_hooks().format_values_and_categories_collection
-                    ]),
+                        self.__hooks_facade.get_influencer_after_hooks().serialize_collection,
+                        self.__hooks_facade.get_cache_after_hooks().set_etag
+                    ],
+                    cache_control=PUBLIC_CACHE_CONTROL),
 
-                'GET /brands/{brand_id}': Route(
+                'GET /brands/{brand_id}': lambda: Route(
                     before_hooks=[
                         self.__hooks_facade.get_brand_before_hooks().validate_uuid
                     ],
                     action=self.__brand_ctr.get_by_id,
                     after_hooks=[
                         self.__hooks_facade.get_user_after_hooks().tag_auth_user_claims_to_response,
-                        self.__hooks_facade.get_brand_after_hooks().tag_bucket_url_to_images,
-                        self.__hooks_facade.get_user_after_hooks().format_values_and_categories
-                    ]),
+                        self.__hooks_facade.get_brand_after_hooks().serialize,
+                        self.__hooks_facade.get_cache_after_hooks().set_etag
+                    ],
+                    cache_control=PUBLIC_CACHE_CONTROL),
 
-                'GET /influencers/{influencer_id}': Route(
+                'GET /influencers/{influencer_id}': lambda: Route(
                     before_hooks=[
                         self.__hooks_facade.get_influencer_before_hooks().validate_uuid
                     ],
                     action=self.__influencer_ctr.get_by_id,
                     after_hooks=[
                         self.__hooks_facade.get_user_after_hooks().tag_auth_user_claims_to_response,
-                        self.__hooks_facade.get_influencer_after_hooks().tag_bucket_url_to_images,
-                        self.__hooks_facade.get_user_after_hooks().format_values_and_categories
-                    ]),
+                        self.__hooks_facade.get_influencer_after_hooks().serialize,
+                        self.__hooks_facade.get_cache_after_hooks().set_etag
+                    ],
+                    cache_control=PUBLIC_CACHE_CONTROL),
+
+                'GET /influencers/{influencer_id}/similar': lambda: Route(
+                    before_hooks=[
+                        self.__hooks_facade.get_influencer_before_hooks().validate_uuid
+                    ],
+                    action=self.__influencer_ctr.get_similar,
+                    after_hooks=[
+                        self.__hooks_facade.get_user_after_hooks().tag_auth_user_claims_to_response_collection,
+                        self.__hooks_facade.get_influencer_after_hooks().serialize_collection,
+                        self.__hooks_facade.get_cache_after_hooks().set_etag
+                    ],
+                    cache_control=PUBLIC_CACHE_CONTROL),
 
                 # authenticated brand endpoints
-                'GET /brands/me': Route(
+                'GET /brands/me': lambda: Route(
                     before_hooks=[
                         self.__hooks_facade.get_user_before_hooks().set_auth_user_id
                     ],
                     action=self.__brand_ctr.get,
                     after_hooks=[
                         self.__hooks_facade.get_user_after_hooks().tag_auth_user_claims_to_response,
-                        self.__hooks_facade.get_brand_after_hooks().tag_bucket_url_to_images,
-                        self.__hooks_facade.get_user_after_hooks().format_values_and_categories
-                    ]
+                        self.__hooks_facade.get_brand_after_hooks().serialize,
+                        self.__hooks_facade.get_cache_after_hooks().set_etag
+                    ],
+                    cache_control=PRIVATE_CACHE_CONTROL
                 ),
 
-                'POST /brands/me': Route(
+                'POST /brands/me': lambda: Route(
                     before_hooks=[
                         self.__hooks_facade.get_before_common_hooks().set_body,
                         self.__hooks_facade.get_user_before_hooks().set_auth_user_id,
@@ -89,12 +162,11 @@ class Dispatcher:
                     after_hooks=[
                         self.__hooks_facade.get_brand_after_hooks().set_brand_claims,
                         self.__hooks_facade.get_user_after_hooks().tag_auth_user_claims_to_response,
-                        self.__hooks_facade.get_brand_after_hooks().tag_bucket_url_to_images,
-                        self.__hooks_facade.get_user_after_hooks().format_values_and_categories
+                        self.__hooks_facade.get_brand_after_hooks().serialize
                     ]
                 ),
 
-                'PUT /brands/me': Route(
+                'PUT /brands/me': lambda: Route(
                     before_hooks=[
                         self.__hooks_facade.get_before_common_hooks().set_body,
                         self.__hooks_facade.get_user_before_hooks().set_auth_user_id,
@@ -103,12 +175,11 @@ class Dispatcher:
                     action=self.__brand_ctr.update,
                     after_hooks=[
                         self.__hooks_facade.get_user_after_hooks().tag_auth_user_claims_to_response,
-                        self.__hooks_facade.get_brand_after_hooks().tag_bucket_url_to_images,
-                        self.__hooks_facade.get_user_after_hooks().format_values_and_categories
+                        self.__hooks_facade.get_brand_after_hooks().serialize
                     ]
                 ),
 
-                'POST /brands/me/header-image': Route(
+                'POST /brands/me/header-image': lambda: Route(
                     before_hooks=[
                         self.__hooks_facade.get_before_common_hooks().set_body,
                         self.__hooks_facade.get_user_before_hooks().set_auth_user_id
@@ -116,12 +187,11 @@ class Dispatcher:
                     action=self.__brand_ctr.update_header_image,
                     after_hooks=[
                         self.__hooks_facade.get_user_after_hooks().tag_auth_user_claims_to_response,
-                        self.__hooks_facade.get_brand_after_hooks().tag_bucket_url_to_images,
-                        self.__hooks_facade.get_user_after_hooks().format_values_and_categories
+                        self.__hooks_facade.get_brand_after_hooks().serialize
                     ]
                 ),
 
-                'POST /brands/me/logo': Route(
+                'POST /brands/me/logo': lambda: Route(
                     before_hooks=[
                         self.__hooks_facade.get_before_common_hooks().set_body,
                         self.__hooks_facade.get_user_before_hooks().set_auth_user_id
@@ -129,25 +199,57 @@ class Dispatcher:
                     action=self.__brand_ctr.update_logo,
                     after_hooks=[
                         self.__hooks_facade.get_user_after_hooks().tag_auth_user_claims_to_response,
-                        self.__hooks_facade.get_brand_after_hooks().tag_bucket_url_to_images,
-                        self.__hooks_facade.get_user_after_hooks().format_values_and_categories
+                        self.__hooks_facade.get_brand_after_hooks().serialize
+                    ]
+                ),
+
+                'POST /brands/me/image-uploads': lambda: Route(
+                    before_hooks=[
+                        self.__hooks_facade.get_before_common_hooks().set_body,
+                        self.__hooks_facade.get_user_before_hooks().set_auth_user_id
+                    ],
+                    action=self.__brand_ctr.create_image_upload
+                ),
+
+                'PUT /brands/me/logo': lambda: Route(
+                    before_hooks=[
+                        self.__hooks_facade.get_before_common_hooks().set_body,
+                        self.__hooks_facade.get_user_before_hooks().set_auth_user_id
+                    ],
+                    action=self.__brand_ctr.confirm_logo,
+                    after_hooks=[
+                        self.__hooks_facade.get_user_after_hooks().tag_auth_user_claims_to_response,
+                        self.__hooks_facade.get_brand_after_hooks().serialize
+                    ]
+                ),
+
+                'PUT /brands/me/header-image': lambda: Route(
+                    before_hooks=[
+                        self.__hooks_facade.get_before_common_hooks().set_body,
+                        self.__hooks_facade.get_user_before_hooks().set_auth_user_id
+                    ],
+                    action=self.__brand_ctr.confirm_header_image,
+                    after_hooks=[
+                        self.__hooks_facade.get_user_after_hooks().tag_auth_user_claims_to_response,
+                        self.__hooks_facade.get_brand_after_hooks().serialize
                     ]
                 ),
 
                 # authenticated influencer endpoints
-                'GET /influencers/me': Route(
+                'GET /influencers/me': lambda: Route(
                     before_hooks=[
                         self.__hooks_facade.get_user_before_hooks().set_auth_user_id
                     ],
                     action=self.__influencer_ctr.get,
                     after_hooks=[
                         self.__hooks_facade.get_user_after_hooks().tag_auth_user_claims_to_response,
-                        self.__hooks_facade.get_influencer_after_hooks().tag_bucket_url_to_images,
-                        self.__hooks_facade.get_user_after_hooks().format_values_and_categories
-                    ]
+                        self.__hooks_facade.get_influencer_after_hooks().serialize,
+                        self.__hooks_facade.get_cache_after_hooks().set_etag
+                    ],
+                    cache_control=PRIVATE_CACHE_CONTROL
                 ),
 
-                'POST /influencers/me': Route(
+                'POST /influencers/me': lambda: Route(
                     before_hooks=[
                         self.__hooks_facade.get_before_common_hooks().set_body,
                         self.__hooks_facade.get_user_before_hooks().set_auth_user_id,
@@ -157,12 +259,11 @@ class Dispatcher:
                     after_hooks=[
                         self.__hooks_facade.get_influencer_after_hooks().set_influencer_claims,
                         self.__hooks_facade.get_user_after_hooks().tag_auth_user_claims_to_response,
-                        self.__hooks_facade.get_influencer_after_hooks().tag_bucket_url_to_images,
-                        self.__hooks_facade.get_user_after_hooks().format_values_and_categories
+                        self.__hooks_facade.get_influencer_after_hooks().serialize
                     ]
                 ),
 
-                'PUT /influencers/me': Route(
+                'PUT /influencers/me': lambda: Route(
                     before_hooks=[
                         self.__hooks_facade.get_before_common_hooks().set_body,
                         self.__hooks_facade.get_user_before_hooks().set_auth_user_id,
@@ -171,12 +272,11 @@ class Dispatcher:
                     action=self.__influencer_ctr.update,
                     after_hooks=[
                         self.__hooks_facade.get_user_after_hooks().tag_auth_user_claims_to_response,
-                        self.__hooks_facade.get_influencer_after_hooks().tag_bucket_url_to_images,
-                        self.__hooks_facade.get_user_after_hooks().format_values_and_categories
+                        self.__hooks_facade.get_influencer_after_hooks().serialize
                     ]
                 ),
 
-                'POST /influencers/me/image': Route(
+                'POST /influencers/me/image': lambda: Route(
                     before_hooks=[
                         self.__hooks_facade.get_before_common_hooks().set_body,
                         self.__hooks_facade.get_user_before_hooks().set_auth_user_id,
@@ -184,8 +284,27 @@ class Dispatcher:
                     action=self.__influencer_ctr.update_profile_image,
                     after_hooks=[
                         self.__hooks_facade.get_user_after_hooks().tag_auth_user_claims_to_response,
-                        self.__hooks_facade.get_influencer_after_hooks().tag_bucket_url_to_images,
-                        self.__hooks_facade.get_user_after_hooks().format_values_and_categories
+                        self.__hooks_facade.get_influencer_after_hooks().serialize
+                    ]
+                ),
+
+                'POST /influencers/me/image-uploads': lambda: Route(
+                    before_hooks=[
+                        self.__hooks_facade.get_before_common_hooks().set_body,
+                        self.__hooks_facade.get_user_before_hooks().set_auth_user_id
+                    ],
+                    action=self.__influencer_ctr.create_image_upload
+                ),
+
+                'PUT /influencers/me/image': lambda: Route(
+                    before_hooks=[
+                        self.__hooks_facade.get_before_common_hooks().set_body,
+                        self.__hooks_facade.get_user_before_hooks().set_auth_user_id
+                    ],
+                    action=self.__influencer_ctr.confirm_profile_image,
+                    after_hooks=[
+                        self.__hooks_facade.get_user_after_hooks().tag_auth_user_claims_to_response,
+                        self.__hooks_facade.get_influencer_after_hooks().serialize
                     ]
                 ),
             }
@@ -194,34 +313,43 @@ class Dispatcher:
 
         campaigns = OrderedDict(
             {
-                'GET /brands/me/campaigns': Route(
+                'GET /brands/me/campaigns': lambda: Route(
                     before_hooks=[
                         self.__hooks_facade.get_user_before_hooks().set_auth_user_id
                     ],
                     action=self.__campaign_ctr.get_for_brand,
                     after_hooks=[
-                        self.__hooks_facade.get_campaign_after_hooks().format_values_and_categories_collection,
-                        self.__hooks_facade.get_campaign_after_hooks().tag_bucket_url_to_images_collection,
-                        self.__hooks_facade.get_campaign_after_hooks().format_campaign_state_collection
-                    ]
+                        self.__hooks_facade.get_campaign_after_hooks().serialize_collection,
+                        self.__hooks_facade.get_cache_after_hooks().set_etag
+                    ],
+                    cache_control=PRIVATE_CACHE_CONTROL
                 ),
 
                 'DELETE /brands/me/campaigns/{campaign_id}':
-                    self.get_not_implemented_method('DELETE brands/me/campaigns/{campaign_id}'),
+                    lambda: self.get_not_implemented_method('DELETE brands/me/campaigns/{campaign_id}'),
+
+                'GET /campaigns': lambda: Route(
+                    action=self.__campaign_ctr.get_all,
+                    after_hooks=[
+                        self.__hooks_facade.get_campaign_after_hooks().serialize_collection,
+                        self.__hooks_facade.get_cache_after_hooks().set_etag
+                    ],
+                    cache_control=PUBLIC_CACHE_CONTROL
+                ),
 
-                'GET /campaigns/{campaign_id}': Route(
+                'GET /campaigns/{campaign_id}': lambda: Route(
                     before_hooks=[
                         self.__hooks_facade.get_campaign_before_hooks().validate_id
                     ],
                     action=self.__campaign_ctr.get_by_id,
                     after_hooks=[
-                        self.__hooks_facade.get_campaign_after_hooks().format_values_and_categories,
-                        self.__hooks_facade.get_campaign_after_hooks().tag_bucket_url_to_images,
-                        self.__hooks_facade.get_campaign_after_hooks().format_campaign_state
-                    ]
+                        self.__hooks_facade.get_campaign_after_hooks().serialize,
+                        self.__hooks_facade.get_cache_after_hooks().set_etag
+                    ],
+                    cache_control=PUBLIC_CACHE_CONTROL
                 ),
 
-                'POST /brands/me/campaigns': Route(
+                'POST /brands/me/campaigns': lambda: Route(
                     before_hooks=[
                         self.__hooks_facade.get_before_common_hooks().set_body,
                         self.__hooks_facade.get_user_before_hooks().set_auth_user_id,
@@ -229,13 +357,11 @@ class Dispatcher:
                     ],
                     action=self.__campaign_ctr.create,
                     after_hooks=[
-                        self.__hooks_facade.get_campaign_after_hooks().format_values_and_categories,
-                        self.__hooks_facade.get_campaign_after_hooks().tag_bucket_url_to_images,
-                        self.__hooks_facade.get_campaign_after_hooks().format_campaign_state
+                        self.__hooks_facade.get_campaign_after_hooks().serialize
                     ]
                 ),
 
-                'PATCH /brands/me/campaigns/{campaign_id}': Route(
+                'PATCH /brands/me/campaigns/{campaign_id}': lambda: Route(
                     before_hooks=[
                         self.__hooks_facade.get_before_common_hooks().set_body,
                         self.__hooks_facade.get_user_before_hooks().set_auth_user_id,
@@ -244,13 +370,11 @@ class Dispatcher:
                     ],
                     action=self.__campaign_ctr.update_campaign_state,
                     after_hooks=[
-                        self.__hooks_facade.get_campaign_after_hooks().format_values_and_categories,
-                        self.__hooks_facade.get_campaign_after_hooks().tag_bucket_url_to_images,
-                        self.__hooks_facade.get_campaign_after_hooks().format_campaign_state
+                        self.__hooks_facade.get_campaign_after_hooks().serialize
                     ]
                 ),
 
-                'PUT /brands/me/campaigns/{campaign_id}': Route(
+                'PUT /brands/me/campaigns/{campaign_id}': lambda: Route(
                     before_hooks=[
                         self.__hooks_facade.get_before_common_hooks().set_body,
                         self.__hooks_facade.get_user_before_hooks().set_auth_user_id,
@@ -260,13 +384,11 @@ class Dispatcher:
                     ],
                     action=self.__campaign_ctr.update,
                     after_hooks=[
-                        self.__hooks_facade.get_campaign_after_hooks().format_values_and_categories,
-                        self.__hooks_facade.get_campaign_after_hooks().tag_bucket_url_to_images,
-                        self.__hooks_facade.get_campaign_after_hooks().format_campaign_state
+                        self.__hooks_facade.get_campaign_after_hooks().serialize
                     ]
                 ),
 
-                'POST /brands/me/campaigns/{campaign_id}/product-image1': Route(
+                'POST /brands/me/campaigns/{campaign_id}/product-image1': lambda: Route(
                     before_hooks=[
                         self.__hooks_facade.get_before_common_hooks().set_body,
                         self.__hooks_facade.get_user_before_hooks().set_auth_user_id,
@@ -275,12 +397,10 @@ class Dispatcher:
                     ],
                     action=self.__campaign_ctr.update_product_image1,
                     after_hooks=[
-                        self.__hooks_facade.get_campaign_after_hooks().format_values_and_categories,
-                        self.__hooks_facade.get_campaign_after_hooks().tag_bucket_url_to_images,
-                        self.__hooks_facade.get_campaign_after_hooks().format_campaign_state
+                        self.__hooks_facade.get_campaign_after_hooks().serialize
                     ]
                 ),
-                'POST /brands/me/campaigns/{campaign_id}/product-image2': Route(
+                'POST /brands/me/campaigns/{campaign_id}/product-image2': lambda: Route(
                     before_hooks=[
                         self.__hooks_facade.get_before_common_hooks().set_body,
                         self.__hooks_facade.get_user_before_hooks().set_auth_user_id,
@@ -289,12 +409,10 @@ class Dispatcher:
                     ],
                     action=self.__campaign_ctr.update_product_image2,
                     after_hooks=[
-                        self.__hooks_facade.get_campaign_after_hooks().format_values_and_categories,
-                        self.__hooks_facade.get_campaign_after_hooks().tag_bucket_url_to_images,
-                        self.__hooks_facade.get_campaign_after_hooks().format_campaign_state
+                        self.__hooks_facade.get_campaign_after_hooks().serialize
                     ]
                 ),
-                'POST /brands/me/campaigns/{campaign_id}/product-image3': Route(
+                'POST /brands/me/campaigns/{campaign_id}/product-image3': lambda: Route(
                     before_hooks=[
                         self.__hooks_facade.get_before_common_hooks().set_body,
                         self.__hooks_facade.get_user_before_hooks().set_auth_user_id,
@@ -303,9 +421,64 @@ class Dispatcher:
                     ],
                     action=self.__campaign_ctr.update_product_image3,
                     after_hooks=[
-                        self.__hooks_facade.get_campaign_after_hooks().format_values_and_categories,
-                        self.__hooks_facade.get_campaign_after_hooks().tag_bucket_url_to_images,
-                        self.__hooks_facade.get_campaign_after_hooks().format_campaign_state
+                        self.__hooks_facade.get_campaign_after_hooks().serialize
+                    ]
+                ),
+                'POST /brands/me/campaigns/{campaign_id}/product-images': lambda: Route(
+                    before_hooks=[
+                        self.__hooks_facade.get_before_common_hooks().set_body,
+                        self.__hooks_facade.get_user_before_hooks().set_auth_user_id,
+                        self.__hooks_facade.get_campaign_before_hooks().validate_id,
+                        self.__hooks_facade.get_brand_before_hooks().validate_auth_brand
+                    ],
+                    action=self.__campaign_ctr.update_product_images,
+                    after_hooks=[
+                        self.__hooks_facade.get_campaign_after_hooks().serialize
+                    ]
+                ),
+                'POST /brands/me/campaigns/{campaign_id}/image-uploads': lambda: Route(
+                    before_hooks=[
+                        self.__hooks_facade.get_before_common_hooks().set_body,
+                        self.__hooks_facade.get_user_before_hooks().set_auth_user_id,
+                        self.__hooks_facade.get_campaign_before_hooks().validate_id,
+                        self.__hooks_facade.get_brand_before_hooks().validate_auth_brand
+                    ],
+                    action=self.__campaign_ctr.create_image_upload
+                ),
+                'PUT /brands/me/campaigns/{campaign_id}/product-image1': lambda: Route(
+                    before_hooks=[
+                        self.__hooks_facade.get_before_common_hooks().set_body,
+                        self.__hooks_facade.get_user_before_hooks().set_auth_user_id,
+                        self.__hooks_facade.get_campaign_before_hooks().validate_id,
+                        self.__hooks_facade.get_brand_before_hooks().validate_auth_brand
+                    ],
+                    action=self.__campaign_ctr.confirm_product_image1,
+                    after_hooks=[
+                        self.__hooks_facade.get_campaign_after_hooks().serialize
+                    ]
+                ),
+                'PUT /brands/me/campaigns/{campaign_id}/product-image2': lambda: Route(
+                    before_hooks=[
+                        self.__hooks_facade.get_before_common_hooks().set_body,
+                        self.__hooks_facade.get_user_before_hooks().set_auth_user_id,
+                        self.__hooks_facade.get_campaign_before_hooks().validate_id,
+                        self.__hooks_facade.get_brand_before_hooks().validate_auth_brand
+                    ],
+                    action=self.__campaign_ctr.confirm_product_image2,
+                    after_hooks=[
+                        self.__hooks_facade.get_campaign_after_hooks().serialize
+                    ]
+                ),
+                'PUT /brands/me/campaigns/{campaign_id}/product-image3': lambda: Route(
+                    before_hooks=[
+                        self.__hooks_facade.get_before_common_hooks().set_body,
+                        self.__hooks_facade.get_user_before_hooks().set_auth_user_id,
+                        self.__hooks_facade.get_campaign_before_hooks().validate_id,
+                        self.__hooks_facade.get_brand_before_hooks().validate_auth_brand
+                    ],
+                    action=self.__campaign_ctr.confirm_product_image3,
+                    after_hooks=[
+                        self.__hooks_facade.get_campaign_after_hooks().serialize
                     ]
                 )
             }
@@ -0,0 +1,81 @@
+import typing
+from dataclasses import fields
+from datetime import datetime
+from enum import Enum
+from typing import Callable, Optional
+
+from src.crosscutting import CamelCaseBody, snake_case_key_to_camel_case, translate_snake_case_key
+from src.domain.images import IMAGE_VARIANT_WIDTHS, ImageVariantFormatEnum, has_variants, variant_key
+from src.domain.models import Brand, Influencer, Campaign
+
+S3_URL = "https://pinfluencer-product-images.s3.eu-west-2.amazonaws.com"
+
+
+def image_srcset(key: str) -> Optional[dict[str, str]]:
+    """
+    a srcset of the resized variants of an uploaded image per format, None for images without variants
+    """
+    if not has_variants(key=key):
+        return None
+    return {variant_format.value: ", ".join(f"{S3_URL}/{variant_key(key, width, variant_format)} {width}w"
+                                            for width in IMAGE_VARIANT_WIDTHS)
+            for variant_format in ImageVariantFormatEnum}
+
+
+def _field_expression(name: str, type_, image_fields: tuple[str, ...]) -> str:
+    value = f"model[{name!r}]"
+    if name in image_fields:
+        return f'f"{{s3_url}}/{{{value}}}"'
+    if type_ is datetime:
+        return f"{value} and {value}.isoformat()"
+    if isinstance(type_, type) and issubclass(type_, Enum):
+        return f"{value} and {value}.name"
+    if typing.get_origin(type_) is list and all(isinstance(arg, type) and issubclass(arg, Enum)
+                                                for arg in typing.get_args(type_)):
+        return f"[member.name for member in {value}]"
+    return value
+
+
+def compile_serializer(model_type: type, image_fields: tuple[str, ...] = ()) -> Callable[[dict], dict]:
+    """
+    generates a function turning the __dict__ of a model_type into its response: camelCase keys, enum names,
+    iso datetimes and image keys prefixed with the bucket url each followed by the srcset of its variants,
+    all in one dict literal.
+    keys that are not fields, like a score added by the controller, are carried over with their key translated
+    """
+    hints = typing.get_type_hints(model_type)
+    names = [model_field.name for model_field in fields(model_type)]
+    entries = ",\n        ".join(f"{snake_case_key_to_camel_case(name)!r}: "
+                                 f"{_field_expression(name, hints[name], image_fields)}" +
+                                 (f",\n        {snake_case_key_to_camel_case(name) + 'Srcset'!r}: "
+                                  f"srcset(model[{name!r}])" if name in image_fields else "")
+                                 for name in names)
+    source = (f"def serialize_{model_type.__name__.lower()}(model):\n"
+              f"    serialized = {{\n        {entries}\n    }}\n"
+              f"    if len(model) != field_count:\n"
+              f"        for key, value in model.items():\n"
+              f"            if key not in field_names:\n"
+              f"                serialized[translate(key)] = value\n"
+              f"    return serialized\n")
+    namespace = {"s3_url": S3_URL,
+                 "field_count": len(names),
+                 "field_names": frozenset(names),
+                 "translate": translate_snake_case_key,
+                 "srcset": image_srcset}
+    exec(source, namespace)
+    return namespace[f"serialize_{model_type.__name__.lower()}"]
+
+
+def serialize_collection(body: dict, serialize: Callable[[dict], dict]) -> CamelCaseBody:
+    """
+    a page of models: every item through serialize, the keys around it like nextCursor translated
+    """
+    return CamelCaseBody({translate_snake_case_key(key): [serialize(item) for item in value]
+                          if key == "items" else value
+                          for key, value in body.items()})
+
+
+serialize_brand = compile_serializer(model_type=Brand, image_fields=("logo", "header_image"))
+serialize_influencer = compile_serializer(model_type=Influencer, image_fields=("image",))
+serialize_campaign = compile_serializer(model_type=Campaign,
+                                        image_fields=("product_image1", "product_image2", "product_image3"))
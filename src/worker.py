@@ -0,0 +1,69 @@
+"""
+makes the resized variants of uploaded images, fed by the image variant queue the api writes to.
+run locally, against S3_ENDPOINT_URL when it is set, for the given keys or every uploaded image in the bucket
+
+    python -m src.worker [key ...]
+"""
+import json
+import sys
+from typing import Optional
+
+from src.crosscutting import print_exception
+from src.data.repositories import S3ImageRepository
+from src.domain.images import has_variants, render_variants, variant_key
+from src.types import ImageRepository
+
+
+class ImageVariantWorker:
+
+    def __init__(self, image_repository: ImageRepository):
+        self.__image_repository = image_repository
+
+    def process(self, key: str) -> int:
+        """
+        the number of variants written, none for keys that are not uploaded images
+        """
+        if not has_variants(key=key):
+            print(f'{key} is not an uploaded image, skipping')
+            return 0
+        variants = render_variants(data=self.__image_repository.download(key=key))
+        for variant in variants:
+            self.__image_repository.upload_variant(key=variant_key(key=key,
+                                                                   width=variant.width,
+                                                                   variant_format=variant.format),
+                                                   data=variant.data,
+                                                   content_type=variant.format.content_type)
+        print(f'{len(variants)} variants written for {key}')
+        return len(variants)
+
+    def handle(self, event: dict, context: dict) -> dict:
+        # only the messages that failed go back on the queue, not the whole batch
+        failures = []
+        for record in event.get('Records', []):
+            try:
+                self.process(key=json.loads(record['body'])['key'])
+            except Exception as e:
+                print_exception(e)
+                failures.append({'itemIdentifier': record['messageId']})
+        return {'batchItemFailures': failures}
+
+
+_worker: Optional[ImageVariantWorker] = None
+
+
+def get_worker() -> ImageVariantWorker:
+    global _worker
+    if _worker is None:
+        _worker = ImageVariantWorker(image_repository=S3ImageRepository())
+    return _worker
+
+
+def lambda_handler(event, context):
+    return get_worker().handle(event=event, context=context)
+
+
+if __name__ == '__main__':
+    image_repository = S3ImageRepository()
+    worker = ImageVariantWorker(image_repository=image_repository)
+    keys = sys.argv[1:] or [key for key, _ in image_repository.list_images() if has_variants(key=key)]
+    print(f'{sum(worker.process(key=key) for key in keys)} variants written for {len(keys)} images')
@@ -1,7 +1,10 @@
+import time
+from collections import defaultdict
 from enum import Enum
 from unittest.mock import Mock
 
-from sqlalchemy import create_engine
+from botocore.exceptions import ClientError
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from src.crosscutting import JsonSnakeToCamelSerializer
@@ -39,6 +42,10 @@ def influencer_generator(dto, mapper):
     return influencer
 
 
+def page_body(items: list, next_cursor: str = None) -> dict:
+    return {"items": items, "next_cursor": next_cursor}
+
+
 def get_as_json(status_code: int,
                 body: str = "{}") -> dict:
     return {
@@ -67,14 +74,14 @@ def user_dto_generator(num: int) -> User:
 def brand_dto_generator(num, repo: RepoEnum = RepoEnum.NO_REPO):
     if num == 1:
         values = [ValueEnum.VALUE5, ValueEnum.VALUE6, ValueEnum.VALUE7]
-        categories = [CategoryEnum.CATEGORY6, CategoryEnum.CATEGORY5, CategoryEnum.CATEGORY7]
+        categories = [CategoryEnum.CATEGORY5, CategoryEnum.CATEGORY6, CategoryEnum.CATEGORY7]
     elif num == 2:
-        values = [ValueEnum.VALUE5, ValueEnum.RECYCLED, ValueEnum.VALUE7, ValueEnum.SUSTAINABLE]
-        categories = [CategoryEnum.CATEGORY6, CategoryEnum.CATEGORY9, CategoryEnum.CATEGORY8, CategoryEnum.FASHION]
+        values = [ValueEnum.SUSTAINABLE, ValueEnum.RECYCLED, ValueEnum.VALUE5, ValueEnum.VALUE7]
+        categories = [CategoryEnum.FASHION, CategoryEnum.CATEGORY6, CategoryEnum.CATEGORY8, CategoryEnum.CATEGORY9]
     else:
-        values = [ValueEnum.VALUE5, ValueEnum.RECYCLED, ValueEnum.VALUE7, ValueEnum.SUSTAINABLE, ValueEnum.VEGAN]
-        categories = [CategoryEnum.CATEGORY6, CategoryEnum.CATEGORY9, CategoryEnum.CATEGORY8, CategoryEnum.FASHION,
-                      CategoryEnum.PET]
+        values = [ValueEnum.SUSTAINABLE, ValueEnum.RECYCLED, ValueEnum.VEGAN, ValueEnum.VALUE5, ValueEnum.VALUE7]
+        categories = [CategoryEnum.FASHION, CategoryEnum.PET, CategoryEnum.CATEGORY6, CategoryEnum.CATEGORY8,
+                      CategoryEnum.CATEGORY9]
     first_name = f"first_name{num}"
     last_name = f"last_name{num}"
     email = f"email{num}"
@@ -112,14 +119,14 @@ def brand_dto_generator(num, repo: RepoEnum = RepoEnum.NO_REPO):
 def influencer_dto_generator(num, repo: RepoEnum = RepoEnum.NO_REPO):
     if num == 1:
         values = [ValueEnum.VALUE5, ValueEnum.VALUE6, ValueEnum.VALUE7]
-        categories = [CategoryEnum.CATEGORY6, CategoryEnum.CATEGORY5, CategoryEnum.CATEGORY7]
+        categories = [CategoryEnum.CATEGORY5, CategoryEnum.CATEGORY6, CategoryEnum.CATEGORY7]
     elif num == 2:
-        values = [ValueEnum.VALUE5, ValueEnum.RECYCLED, ValueEnum.VALUE7, ValueEnum.SUSTAINABLE]
-        categories = [CategoryEnum.CATEGORY6, CategoryEnum.CATEGORY9, CategoryEnum.CATEGORY8, CategoryEnum.FASHION]
+        values = [ValueEnum.SUSTAINABLE, ValueEnum.RECYCLED, ValueEnum.VALUE5, ValueEnum.VALUE7]
+        categories = [CategoryEnum.FASHION, CategoryEnum.CATEGORY6, CategoryEnum.CATEGORY8, CategoryEnum.CATEGORY9]
     else:
-        values = [ValueEnum.VALUE5, ValueEnum.RECYCLED, ValueEnum.VALUE7, ValueEnum.SUSTAINABLE, ValueEnum.VEGAN]
-        categories = [CategoryEnum.CATEGORY6, CategoryEnum.CATEGORY9, CategoryEnum.CATEGORY8, CategoryEnum.FASHION,
-                      CategoryEnum.PET]
+        values = [ValueEnum.SUSTAINABLE, ValueEnum.RECYCLED, ValueEnum.VEGAN, ValueEnum.VALUE5, ValueEnum.VALUE7]
+        categories = [CategoryEnum.FASHION, CategoryEnum.PET, CategoryEnum.CATEGORY6, CategoryEnum.CATEGORY8,
+                      CategoryEnum.CATEGORY9]
     first_name = f"first_name{num}"
     last_name = f"last_name{num}"
     email = f"email{num}"
@@ -181,17 +188,17 @@ def influencer_dto_generator(num, repo: RepoEnum = RepoEnum.NO_REPO):
 def campaign_dto_generator(num: int) -> Campaign:
     if num == 1:
         campaign_values = [ValueEnum.VALUE5, ValueEnum.VALUE6, ValueEnum.VALUE7]
-        campaign_categories = [CategoryEnum.CATEGORY6, CategoryEnum.CATEGORY5, CategoryEnum.CATEGORY7]
+        campaign_categories = [CategoryEnum.CATEGORY5, CategoryEnum.CATEGORY6, CategoryEnum.CATEGORY7]
     elif num == 2:
-        campaign_values = [ValueEnum.VALUE5, ValueEnum.RECYCLED, ValueEnum.VALUE7, ValueEnum.SUSTAINABLE]
-        campaign_categories = [CategoryEnum.CATEGORY6, CategoryEnum.CATEGORY9, CategoryEnum.CATEGORY8,
-                               CategoryEnum.FASHION]
+        campaign_values = [ValueEnum.SUSTAINABLE, ValueEnum.RECYCLED, ValueEnum.VALUE5, ValueEnum.VALUE7]
+        campaign_categories = [CategoryEnum.FASHION, CategoryEnum.CATEGORY6, CategoryEnum.CATEGORY8,
+                               CategoryEnum.CATEGORY9]
     else:
-        campaign_values = [ValueEnum.VALUE5, ValueEnum.RECYCLED, ValueEnum.VALUE7, ValueEnum.SUSTAINABLE,
-                           ValueEnum.VEGAN]
-        campaign_categories = [CategoryEnum.CATEGORY6, CategoryEnum.CATEGORY9, CategoryEnum.CATEGORY8,
-                               CategoryEnum.FASHION,
-                               CategoryEnum.PET]
+        campaign_values = [ValueEnum.SUSTAINABLE, ValueEnum.RECYCLED, ValueEnum.VEGAN, ValueEnum.VALUE5,
+                           ValueEnum.VALUE7]
+        campaign_categories = [CategoryEnum.FASHION, CategoryEnum.PET, CategoryEnum.CATEGORY6,
+                               CategoryEnum.CATEGORY8,
+                               CategoryEnum.CATEGORY9]
 
     return Campaign(
         brand_id=f"brand_id{num}",
@@ -216,7 +223,7 @@ class InMemorySqliteDataManager:
 
     def __init__(self):
         self.__engine = create_engine('sqlite:///:memory:')
-        session = sessionmaker(bind=self.__engine)
+        session = sessionmaker(bind=self.__engine, expire_on_commit=False)
         self.__session = session()
         Base.metadata.create_all(self.__engine)
 
@@ -228,10 +235,87 @@ class InMemorySqliteDataManager:
     def session(self):
         return self.__session
 
+    def end_session(self):
+        self.__session.close()
+
     def create_fake_data(self, objects):
         self.__session.bulk_save_objects(objects=objects)
 
 
+
+class QueryCounter:
+    """
+    records every sql statement run on the engine while it is entered
+    """
+
+    def __init__(self, engine):
+        self.__engine = engine
+        self.statements: list[str] = []
+
+    def __enter__(self) -> 'QueryCounter':
+        event.listen(self.__engine, 'before_cursor_execute', self.__record)
+        return self
+
+    def __exit__(self, *args) -> None:
+        event.remove(self.__engine, 'before_cursor_execute', self.__record)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __record(self, connection, cursor, statement, parameters, context, executemany) -> None:
+        self.statements.append(statement)
+
+class StubCognitoClient:
+    """
+    in memory stand in for the cognito-idp client, counts calls and can add latency per call
+    """
+
+    def __init__(self, users: dict[str, User], page_size: int = 60, latency_seconds: float = 0):
+        self.__users = users
+        self.__page_size = page_size
+        self.__latency_seconds = latency_seconds
+        self.calls = defaultdict(int)
+
+    def __call(self, name: str):
+        self.calls[name] += 1
+        if self.__latency_seconds:
+            time.sleep(self.__latency_seconds)
+
+    @staticmethod
+    def __attributes(user: User) -> list[dict]:
+        return [
+            {'Name': 'given_name', 'Value': user.first_name},
+            {'Name': 'family_name', 'Value': user.last_name},
+            {'Name': 'email', 'Value': user.email}
+        ]
+
+    def admin_get_user(self, UserPoolId: str, Username: str) -> dict:
+        self.__call('admin_get_user')
+        if Username not in self.__users:
+            raise ClientError(error_response={'Error': {'Code': 'UserNotFoundException'}},
+                              operation_name='AdminGetUser')
+        return {'Username': Username, 'UserAttributes': self.__attributes(self.__users[Username])}
+
+    def list_users(self, UserPoolId: str, AttributesToGet: list[str], Limit: int, PaginationToken: str = None) -> dict:
+        self.__call('list_users')
+        usernames = list(self.__users)
+        start = int(PaginationToken) if PaginationToken else 0
+        end = start + min(Limit, self.__page_size)
+        page = {'Users': [{'Username': username, 'Attributes': self.__attributes(self.__users[username])}
+                          for username in usernames[start:end]]}
+        if end < len(usernames):
+            page['PaginationToken'] = str(end)
+        return page
+
+    def describe_user_pool(self, UserPoolId: str) -> dict:
+        self.__call('describe_user_pool')
+        return {'UserPool': {'Id': UserPoolId, 'EstimatedNumberOfUsers': len(self.__users)}}
+
+    def admin_update_user_attributes(self, UserPoolId: str, Username: str, UserAttributes: list[dict]) -> None:
+        self.__call('admin_update_user_attributes')
+
+
 class StubDataManager:
     @property
     def engine(self):
@@ -241,6 +325,9 @@ class StubDataManager:
     def session(self):
         return Mock()
 
+    def end_session(self):
+        pass
+
 
 def assert_brand_user_generated_fields_are_equal(brand1, brand2):
     brand1.pop("id")
@@ -316,7 +403,10 @@ def brand_db_fields():
             'header_image',
             'values',
             'categories',
-            'auth_user_id']
+            'auth_user_id',
+            'first_name',
+            'last_name',
+            'email']
 
 
 def campaign_db_fields():
@@ -351,7 +441,10 @@ def influencer_db_fields():
             'audience_female_split',
             'insta_handle',
             'values',
-            'categories']
+            'categories',
+            'first_name',
+            'last_name',
+            'email']
 
 
 def influencer_update_db_fields():
@@ -467,7 +560,7 @@ def create_brand_dto():
                  website="https://website.com",
                  insta_handle="instahandle",
                  values=[ValueEnum.VALUE7, ValueEnum.VALUE8, ValueEnum.VALUE9],
-                 categories=[CategoryEnum.CATEGORY7, CategoryEnum.CATEGORY6, CategoryEnum.CATEGORY5],
+                 categories=[CategoryEnum.CATEGORY5, CategoryEnum.CATEGORY6, CategoryEnum.CATEGORY7],
                  auth_user_id="1234")
 
 
@@ -486,7 +579,7 @@ def update_brand_return_dto():
                  website="https://website.com",
                  insta_handle="instahandle",
                  values=[ValueEnum.VALUE7, ValueEnum.VALUE8, ValueEnum.VALUE9],
-                 categories=[CategoryEnum.CATEGORY7, CategoryEnum.CATEGORY6, CategoryEnum.CATEGORY5])
+                 categories=[CategoryEnum.CATEGORY5, CategoryEnum.CATEGORY6, CategoryEnum.CATEGORY7])
 
 
 def update_brand_expected_dto():
@@ -498,7 +591,7 @@ def update_brand_expected_dto():
                  website="https://website.com",
                  insta_handle="instahandle",
                  values=[ValueEnum.VALUE7, ValueEnum.VALUE8, ValueEnum.VALUE9],
-                 categories=[CategoryEnum.CATEGORY7, CategoryEnum.CATEGORY6, CategoryEnum.CATEGORY5])
+                 categories=[CategoryEnum.CATEGORY5, CategoryEnum.CATEGORY6, CategoryEnum.CATEGORY7])
 
 
 def create_for_auth_user_event(auth_id, payload):
@@ -516,7 +609,7 @@ def create_influencer_dto():
                       website="https://website.com",
                       insta_handle="instahandle",
                       values=[ValueEnum.VALUE7, ValueEnum.VALUE8, ValueEnum.VALUE9],
-                      categories=[CategoryEnum.CATEGORY7, CategoryEnum.CATEGORY6, CategoryEnum.CATEGORY5],
+                      categories=[CategoryEnum.CATEGORY5, CategoryEnum.CATEGORY6, CategoryEnum.CATEGORY7],
                       auth_user_id="1234",
                       audience_male_split=0.5,
                       audience_female_split=0.5,
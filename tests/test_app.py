@@ -1,18 +1,24 @@
+import base64
+import gzip
+import json
 import os
 from typing import Union
 from unittest import TestCase
-from unittest.mock import Mock, MagicMock
+from unittest.mock import Mock, MagicMock, patch
 
 from callee import Any, Captor
 from cfn_tools import load_yaml
 
-from src.app import bootstrap
+from src.app import bootstrap, PinfluencerApplication, get_application
 from src.crosscutting import JsonSnakeToCamelSerializer
 from src.types import Serializer
 from src.web import PinfluencerContext, PinfluencerResponse
-from src.web.controllers import BrandController, InfluencerController, CampaignController
+from src.web.caching import PUBLIC_CACHE_CONTROL, PRIVATE_CACHE_CONTROL
+from src.web.compression import ResponseCompressor
+from src.web.controllers import BrandController, InfluencerController, CampaignController, FeedController
 from src.web.hooks import HooksFacade, CommonBeforeHooks, UserAfterHooks, BrandAfterHooks, UserBeforeHooks, \
-    BrandBeforeHooks, InfluencerAfterHooks, InfluencerBeforeHooks, CampaignBeforeHooks, CampaignAfterHooks
+    BrandBeforeHooks, InfluencerAfterHooks, InfluencerBeforeHooks, CampaignBeforeHooks, CampaignAfterHooks, \
+    FeedAfterHooks, CacheAfterHooks
 from src.web.ioc import ServiceLocator
 from src.web.middleware import MiddlewarePipeline
 from src.web.routing import Dispatcher
@@ -25,13 +31,15 @@ class TestRoutes(TestCase):
         # controllers
         self.__mock_service_locator: ServiceLocator = Mock()
         self.__mock_brand_controller: BrandController = Mock()
-        self.__mock_service_locator.get_new_brand_controller = MagicMock(return_value=self.__mock_brand_controller)
+        self.__mock_service_locator.get_brand_controller = MagicMock(return_value=self.__mock_brand_controller)
         self.__mock_campaign_controller: CampaignController = Mock()
-        self.__mock_service_locator.get_new_campaign_controller = MagicMock(
+        self.__mock_service_locator.get_campaign_controller = MagicMock(
             return_value=self.__mock_campaign_controller)
         self.__mock_influencer_controller: InfluencerController = Mock()
-        self.__mock_service_locator.get_new_influencer_controller = MagicMock(
+        self.__mock_service_locator.get_influencer_controller = MagicMock(
             return_value=self.__mock_influencer_controller)
+        self.__mock_feed_controller: FeedController = Mock()
+        self.__mock_service_locator.get_feed_controller = MagicMock(return_value=self.__mock_feed_controller)
 
         # hooks
         self.__hooks_facade: HooksFacade = Mock()
@@ -44,6 +52,10 @@ class TestRoutes(TestCase):
         self.__influencer_before_hooks: InfluencerBeforeHooks = Mock()
         self.__campaign_before_hooks: CampaignBeforeHooks = Mock()
         self.__campaign_after_hooks: CampaignAfterHooks = Mock()
+        self.__feed_after_hooks: FeedAfterHooks = Mock()
+        self.__cache_after_hooks: CacheAfterHooks = Mock()
+        self.__hooks_facade.get_cache_after_hooks = MagicMock(return_value=self.__cache_after_hooks)
+        self.__hooks_facade.get_feed_after_hooks = MagicMock(return_value=self.__feed_after_hooks)
         self.__hooks_facade.get_campaign_after_hooks = MagicMock(return_value=self.__campaign_after_hooks)
         self.__hooks_facade.get_campaign_before_hooks = MagicMock(return_value=self.__campaign_before_hooks)
         self.__hooks_facade.get_before_common_hooks = MagicMock(return_value=self.__common_hooks)
@@ -53,15 +65,16 @@ class TestRoutes(TestCase):
         self.__hooks_facade.get_brand_before_hooks = MagicMock(return_value=self.__brand_before_hooks)
         self.__hooks_facade.get_influencer_after_hooks = MagicMock(return_value=self.__influencer_after_hooks)
         self.__hooks_facade.get_influencer_before_hooks = MagicMock(return_value=self.__influencer_before_hooks)
-        self.__mock_service_locator.get_new_hooks_facade = MagicMock(return_value=self.__hooks_facade)
+        self.__mock_service_locator.get_hooks_facade = MagicMock(return_value=self.__hooks_facade)
 
         # crosscutting
         self.__serializer: Serializer = JsonSnakeToCamelSerializer()
-        self.__mock_service_locator.get_new_serializer = MagicMock(return_value=self.__serializer)
+        self.__mock_service_locator.get_serializer = MagicMock(return_value=self.__serializer)
+        self.__mock_service_locator.get_response_compressor = MagicMock(return_value=None)
 
         # middleware
         self.__mock_middleware_pipeline: MiddlewarePipeline = Mock()
-        self.__mock_service_locator.get_new_middlware_pipeline = MagicMock(return_value=self.__mock_middleware_pipeline)
+        self.__mock_service_locator.get_middlware_pipeline = MagicMock(return_value=self.__mock_middleware_pipeline)
 
     def test_server_error(self):
         # arrange
@@ -74,15 +87,32 @@ class TestRoutes(TestCase):
 
         # assert
         assert response == get_as_json(status_code=500,
-                                       body="""{"message": "unexpected server error, please try later :("}""")
+                                       body="""{"message":"unexpected server error, please try later :("}""")
 
     def test_route_that_does_not_exist(self):
         self.__assert_non_service_layer_route(route_key="GET /random",
-                                              expected_body="""{"message": "route: GET /random not found"}""",
+                                              expected_body="""{"message":"route: GET /random not found"}""",
                                               expected_status_code=404)
 
     def test_feed(self):
-        self.__assert_not_implemented(route="GET /feed")
+        # arrange
+        self.__mock_middleware_pipeline.execute_middleware = MagicMock()
+
+        # act
+        bootstrap(event={"routeKey": "GET /feed"},
+                  context={},
+                  service_locator=self.__mock_service_locator)
+
+        # assert
+        self.__mock_middleware_pipeline \
+            .execute_middleware \
+            .assert_called_once_with(context=Any(),
+                                     middleware=(
+                                         self.__user_before_hooks.set_auth_user_id,
+                                         self.__mock_feed_controller.get,
+                                         self.__feed_after_hooks.format_feed,
+                                         self.__cache_after_hooks.set_etag
+                                     ))
 
     def test_get_all_brands(self):
         # arrange
@@ -97,12 +127,33 @@ class TestRoutes(TestCase):
         self.__mock_middleware_pipeline \
             .execute_middleware \
             .assert_called_once_with(context=Any(),
-                                     middleware=[
+                                     middleware=(
                                          self.__mock_brand_controller.get_all,
                                          self.__user_after_hooks.tag_auth_user_claims_to_response_collection,
-                                         self.__brand_after_hooks.tag_bucket_url_to_images_collection,
-                                         self.__user_after_hooks.format_values_and_categories_collection
-                                     ])
+                                         self.__brand_after_hooks.serialize_collection,
+                                         self.__cache_after_hooks.set_etag
+                                     ))
+
+    def test_get_similar_influencers(self):
+        # arrange
+        self.__mock_middleware_pipeline.execute_middleware = MagicMock()
+
+        # act
+        bootstrap(event={"routeKey": "GET /influencers/{influencer_id}/similar"},
+                  context={},
+                  service_locator=self.__mock_service_locator)
+
+        # assert
+        self.__mock_middleware_pipeline \
+            .execute_middleware \
+            .assert_called_once_with(context=Any(),
+                                     middleware=(
+                                         self.__influencer_before_hooks.validate_uuid,
+                                         self.__mock_influencer_controller.get_similar,
+                                         self.__user_after_hooks.tag_auth_user_claims_to_response_collection,
+                                         self.__influencer_after_hooks.serialize_collection,
+                                         self.__cache_after_hooks.set_etag
+                                     ))
 
     def test_get_brand_by_id(self):
         # arrange
@@ -117,13 +168,13 @@ class TestRoutes(TestCase):
         self.__mock_middleware_pipeline \
             .execute_middleware \
             .assert_called_once_with(context=Any(),
-                                     middleware=[
+                                     middleware=(
                                          self.__brand_before_hooks.validate_uuid,
                                          self.__mock_brand_controller.get_by_id,
                                          self.__user_after_hooks.tag_auth_user_claims_to_response,
-                                         self.__brand_after_hooks.tag_bucket_url_to_images,
-                                         self.__user_after_hooks.format_values_and_categories
-                                     ])
+                                         self.__brand_after_hooks.serialize,
+                                         self.__cache_after_hooks.set_etag
+                                     ))
 
     def test_get_all_influencers(self):
         # arrange
@@ -138,12 +189,12 @@ class TestRoutes(TestCase):
         self.__mock_middleware_pipeline \
             .execute_middleware \
             .assert_called_once_with(context=Any(),
-                                     middleware=[
+                                     middleware=(
                                          self.__mock_influencer_controller.get_all,
                                          self.__user_after_hooks.tag_auth_user_claims_to_response_collection,
-                                         self.__influencer_after_hooks.tag_bucket_url_to_images_collection,
-                                         self.__user_after_hooks.format_values_and_categories_collection
-                                     ])
+                                         self.__influencer_after_hooks.serialize_collection,
+                                         self.__cache_after_hooks.set_etag
+                                     ))
 
     def test_get_influencer_by_id(self):
         # arrange
@@ -158,13 +209,13 @@ class TestRoutes(TestCase):
         self.__mock_middleware_pipeline \
             .execute_middleware \
             .assert_called_once_with(context=Any(),
-                                     middleware=[
+                                     middleware=(
                                          self.__influencer_before_hooks.validate_uuid,
                                          self.__mock_influencer_controller.get_by_id,
                                          self.__user_after_hooks.tag_auth_user_claims_to_response,
-                                         self.__influencer_after_hooks.tag_bucket_url_to_images,
-                                         self.__user_after_hooks.format_values_and_categories
-                                     ])
+                                         self.__influencer_after_hooks.serialize,
+                                         self.__cache_after_hooks.set_etag
+                                     ))
 
     def test_get_auth_brand(self):
         # arrange
@@ -179,13 +230,13 @@ class TestRoutes(TestCase):
         self.__mock_middleware_pipeline \
             .execute_middleware \
             .assert_called_once_with(context=Any(),
-                                     middleware=[
+                                     middleware=(
                                          self.__user_before_hooks.set_auth_user_id,
                                          self.__mock_brand_controller.get,
                                          self.__user_after_hooks.tag_auth_user_claims_to_response,
-                                         self.__brand_after_hooks.tag_bucket_url_to_images,
-                                         self.__user_after_hooks.format_values_and_categories
-                                     ])
+                                         self.__brand_after_hooks.serialize,
+                                         self.__cache_after_hooks.set_etag
+                                     ))
 
     def test_create_auth_brand(self):
         # arrange
@@ -200,16 +251,15 @@ class TestRoutes(TestCase):
         self.__mock_middleware_pipeline \
             .execute_middleware \
             .assert_called_once_with(context=Any(),
-                                     middleware=[
+                                     middleware=(
                                          self.__common_hooks.set_body,
                                          self.__user_before_hooks.set_auth_user_id,
                                          self.__brand_before_hooks.validate_brand,
                                          self.__mock_brand_controller.create,
                                          self.__brand_after_hooks.set_brand_claims,
                                          self.__user_after_hooks.tag_auth_user_claims_to_response,
-                                         self.__brand_after_hooks.tag_bucket_url_to_images,
-                                         self.__user_after_hooks.format_values_and_categories
-                                     ])
+                                         self.__brand_after_hooks.serialize
+                                     ))
 
     def test_update_auth_brand(self):
         # arrange
@@ -224,15 +274,14 @@ class TestRoutes(TestCase):
         self.__mock_middleware_pipeline \
             .execute_middleware \
             .assert_called_once_with(context=Any(),
-                                     middleware=[
+                                     middleware=(
                                          self.__common_hooks.set_body,
                                          self.__user_before_hooks.set_auth_user_id,
                                          self.__brand_before_hooks.validate_brand,
                                          self.__mock_brand_controller.update,
                                          self.__user_after_hooks.tag_auth_user_claims_to_response,
-                                         self.__brand_after_hooks.tag_bucket_url_to_images,
-                                         self.__user_after_hooks.format_values_and_categories
-                                     ])
+                                         self.__brand_after_hooks.serialize
+                                     ))
 
     def test_create_or_replace_auth_brand_header_image(self):
         # arrange
@@ -247,14 +296,13 @@ class TestRoutes(TestCase):
         self.__mock_middleware_pipeline \
             .execute_middleware \
             .assert_called_once_with(context=Any(),
-                                     middleware=[
+                                     middleware=(
                                          self.__common_hooks.set_body,
                                          self.__user_before_hooks.set_auth_user_id,
                                          self.__mock_brand_controller.update_header_image,
                                          self.__user_after_hooks.tag_auth_user_claims_to_response,
-                                         self.__brand_after_hooks.tag_bucket_url_to_images,
-                                         self.__user_after_hooks.format_values_and_categories
-                                     ])
+                                         self.__brand_after_hooks.serialize
+                                     ))
 
     def test_create_or_replace_auth_brand_logo(self):
         # arrange
@@ -269,14 +317,13 @@ class TestRoutes(TestCase):
         self.__mock_middleware_pipeline \
             .execute_middleware \
             .assert_called_once_with(context=Any(),
-                                     middleware=[
+                                     middleware=(
                                          self.__common_hooks.set_body,
                                          self.__user_before_hooks.set_auth_user_id,
                                          self.__mock_brand_controller.update_logo,
                                          self.__user_after_hooks.tag_auth_user_claims_to_response,
-                                         self.__brand_after_hooks.tag_bucket_url_to_images,
-                                         self.__user_after_hooks.format_values_and_categories
-                                     ])
+                                         self.__brand_after_hooks.serialize
+                                     ))
 
     def test_get_auth_influencer(self):
         # arrange
@@ -291,13 +338,13 @@ class TestRoutes(TestCase):
         self.__mock_middleware_pipeline \
             .execute_middleware \
             .assert_called_once_with(context=Any(),
-                                     middleware=[
+                                     middleware=(
                                          self.__user_before_hooks.set_auth_user_id,
                                          self.__mock_influencer_controller.get,
                                          self.__user_after_hooks.tag_auth_user_claims_to_response,
-                                         self.__influencer_after_hooks.tag_bucket_url_to_images,
-                                         self.__user_after_hooks.format_values_and_categories
-                                     ])
+                                         self.__influencer_after_hooks.serialize,
+                                         self.__cache_after_hooks.set_etag
+                                     ))
 
     def test_create_auth_influencer(self):
         # arrange
@@ -312,16 +359,15 @@ class TestRoutes(TestCase):
         self.__mock_middleware_pipeline \
             .execute_middleware \
             .assert_called_once_with(context=Any(),
-                                     middleware=[
+                                     middleware=(
                                          self.__common_hooks.set_body,
                                          self.__user_before_hooks.set_auth_user_id,
                                          self.__influencer_before_hooks.validate_influencer,
                                          self.__mock_influencer_controller.create,
                                          self.__influencer_after_hooks.set_influencer_claims,
                                          self.__user_after_hooks.tag_auth_user_claims_to_response,
-                                         self.__influencer_after_hooks.tag_bucket_url_to_images,
-                                         self.__user_after_hooks.format_values_and_categories
-                                     ])
+                                         self.__influencer_after_hooks.serialize
+                                     ))
 
     def test_update_auth_influencer_image(self):
         # arrange
@@ -336,14 +382,13 @@ class TestRoutes(TestCase):
         self.__mock_middleware_pipeline \
             .execute_middleware \
             .assert_called_once_with(context=Any(),
-                                     middleware=[
+                                     middleware=(
                                          self.__common_hooks.set_body,
                                          self.__user_before_hooks.set_auth_user_id,
                                          self.__mock_influencer_controller.update_profile_image,
                                          self.__user_after_hooks.tag_auth_user_claims_to_response,
-                                         self.__influencer_after_hooks.tag_bucket_url_to_images,
-                                         self.__user_after_hooks.format_values_and_categories
-                                     ])
+                                         self.__influencer_after_hooks.serialize
+                                     ))
 
     def test_update_auth_influencer(self):
         # arrange
@@ -358,15 +403,14 @@ class TestRoutes(TestCase):
         self.__mock_middleware_pipeline \
             .execute_middleware \
             .assert_called_once_with(context=Any(),
-                                     middleware=[
+                                     middleware=(
                                          self.__common_hooks.set_body,
                                          self.__user_before_hooks.set_auth_user_id,
                                          self.__influencer_before_hooks.validate_influencer,
                                          self.__mock_influencer_controller.update,
                                          self.__user_after_hooks.tag_auth_user_claims_to_response,
-                                         self.__influencer_after_hooks.tag_bucket_url_to_images,
-                                         self.__user_after_hooks.format_values_and_categories
-                                     ])
+                                         self.__influencer_after_hooks.serialize
+                                     ))
 
     def test_create_auth_brand_campaign(self):
         # arrange
@@ -381,15 +425,32 @@ class TestRoutes(TestCase):
         self.__mock_middleware_pipeline \
             .execute_middleware \
             .assert_called_once_with(context=Any(),
-                                     middleware=[
+                                     middleware=(
                                          self.__common_hooks.set_body,
                                          self.__user_before_hooks.set_auth_user_id,
                                          self.__campaign_before_hooks.validate_campaign,
                                          self.__mock_campaign_controller.create,
-                                         self.__campaign_after_hooks.format_values_and_categories,
-                                         self.__campaign_after_hooks.tag_bucket_url_to_images,
-                                         self.__campaign_after_hooks.format_campaign_state
-                                     ])
+                                         self.__campaign_after_hooks.serialize
+                                     ))
+
+    def test_get_all_campaigns(self):
+        # arrange
+        self.__mock_middleware_pipeline.execute_middleware = MagicMock()
+
+        # act
+        bootstrap(event={"routeKey": "GET /campaigns"},
+                  context={},
+                  service_locator=self.__mock_service_locator)
+
+        # assert
+        self.__mock_middleware_pipeline \
+            .execute_middleware \
+            .assert_called_once_with(context=Any(),
+                                     middleware=(
+                                         self.__mock_campaign_controller.get_all,
+                                         self.__campaign_after_hooks.serialize_collection,
+                                         self.__cache_after_hooks.set_etag
+                                     ))
 
     def test_get_campaign_by_id(self):
         # arrange
@@ -404,13 +465,12 @@ class TestRoutes(TestCase):
         self.__mock_middleware_pipeline \
             .execute_middleware \
             .assert_called_once_with(context=Any(),
-                                     middleware=[
+                                     middleware=(
                                          self.__campaign_before_hooks.validate_id,
                                          self.__mock_campaign_controller.get_by_id,
-                                         self.__campaign_after_hooks.format_values_and_categories,
-                                         self.__campaign_after_hooks.tag_bucket_url_to_images,
-                                         self.__campaign_after_hooks.format_campaign_state
-                                     ])
+                                         self.__campaign_after_hooks.serialize,
+                                         self.__cache_after_hooks.set_etag
+                                     ))
 
     def test_get_auth_brand_campaigns(self):
         # arrange
@@ -425,13 +485,12 @@ class TestRoutes(TestCase):
         self.__mock_middleware_pipeline \
             .execute_middleware \
             .assert_called_once_with(context=Any(),
-                                     middleware=[
+                                     middleware=(
                                          self.__user_before_hooks.set_auth_user_id,
                                          self.__mock_campaign_controller.get_for_brand,
-                                         self.__campaign_after_hooks.format_values_and_categories_collection,
-                                         self.__campaign_after_hooks.tag_bucket_url_to_images_collection,
-                                         self.__campaign_after_hooks.format_campaign_state_collection
-                                     ])
+                                         self.__campaign_after_hooks.serialize_collection,
+                                         self.__cache_after_hooks.set_etag
+                                     ))
 
     def test_update_brand_auth_campaign_by_id(self):
         # arrange
@@ -446,17 +505,15 @@ class TestRoutes(TestCase):
         self.__mock_middleware_pipeline \
             .execute_middleware \
             .assert_called_once_with(context=Any(),
-                                     middleware=[
+                                     middleware=(
                                          self.__common_hooks.set_body,
                                          self.__user_before_hooks.set_auth_user_id,
                                          self.__campaign_before_hooks.validate_id,
                                          self.__campaign_before_hooks.validate_campaign,
                                          self.__brand_before_hooks.validate_auth_brand,
                                          self.__mock_campaign_controller.update,
-                                         self.__campaign_after_hooks.format_values_and_categories,
-                                         self.__campaign_after_hooks.tag_bucket_url_to_images,
-                                         self.__campaign_after_hooks.format_campaign_state
-                                     ])
+                                         self.__campaign_after_hooks.serialize
+                                     ))
 
     def test_update_brand_auth_campaign_state_by_id(self):
         # arrange
@@ -471,16 +528,14 @@ class TestRoutes(TestCase):
         self.__mock_middleware_pipeline \
             .execute_middleware \
             .assert_called_once_with(context=Any(),
-                                     middleware=[
+                                     middleware=(
                                          self.__common_hooks.set_body,
                                          self.__user_before_hooks.set_auth_user_id,
                                          self.__campaign_before_hooks.validate_id,
                                          self.__brand_before_hooks.validate_auth_brand,
                                          self.__mock_campaign_controller.update_campaign_state,
-                                         self.__campaign_after_hooks.format_values_and_categories,
-                                         self.__campaign_after_hooks.tag_bucket_url_to_images,
-                                         self.__campaign_after_hooks.format_campaign_state
-                                     ])
+                                         self.__campaign_after_hooks.serialize
+                                     ))
 
     def test_delete_brand_auth_campaign_by_id(self):
         self.__assert_not_implemented(route="DELETE /brands/me/campaigns/{campaign_id}")
@@ -498,16 +553,14 @@ class TestRoutes(TestCase):
         self.__mock_middleware_pipeline \
             .execute_middleware \
             .assert_called_once_with(context=Any(),
-                                     middleware=[
+                                     middleware=(
                                          self.__common_hooks.set_body,
                                          self.__user_before_hooks.set_auth_user_id,
                                          self.__campaign_before_hooks.validate_id,
                                          self.__brand_before_hooks.validate_auth_brand,
                                          self.__mock_campaign_controller.update_product_image1,
-                                         self.__campaign_after_hooks.format_values_and_categories,
-                                         self.__campaign_after_hooks.tag_bucket_url_to_images,
-                                         self.__campaign_after_hooks.format_campaign_state
-                                     ])
+                                         self.__campaign_after_hooks.serialize
+                                     ))
 
     def test_create_campaign_product_image2(self):
         # arrange
@@ -522,16 +575,14 @@ class TestRoutes(TestCase):
         self.__mock_middleware_pipeline \
             .execute_middleware \
             .assert_called_once_with(context=Any(),
-                                     middleware=[
+                                     middleware=(
                                          self.__common_hooks.set_body,
                                          self.__user_before_hooks.set_auth_user_id,
                                          self.__campaign_before_hooks.validate_id,
                                          self.__brand_before_hooks.validate_auth_brand,
                                          self.__mock_campaign_controller.update_product_image2,
-                                         self.__campaign_after_hooks.format_values_and_categories,
-                                         self.__campaign_after_hooks.tag_bucket_url_to_images,
-                                         self.__campaign_after_hooks.format_campaign_state
-                                     ])
+                                         self.__campaign_after_hooks.serialize
+                                     ))
 
     def test_create_campaign_product_image3(self):
         # arrange
@@ -546,16 +597,224 @@ class TestRoutes(TestCase):
         self.__mock_middleware_pipeline \
             .execute_middleware \
             .assert_called_once_with(context=Any(),
-                                     middleware=[
+                                     middleware=(
                                          self.__common_hooks.set_body,
                                          self.__user_before_hooks.set_auth_user_id,
                                          self.__campaign_before_hooks.validate_id,
                                          self.__brand_before_hooks.validate_auth_brand,
                                          self.__mock_campaign_controller.update_product_image3,
-                                         self.__campaign_after_hooks.format_values_and_categories,
-                                         self.__campaign_after_hooks.tag_bucket_url_to_images,
-                                         self.__campaign_after_hooks.format_campaign_state
-                                     ])
+                                         self.__campaign_after_hooks.serialize
+                                     ))
+
+    def test_create_campaign_product_images(self):
+        # arrange
+        self.__mock_middleware_pipeline.execute_middleware = MagicMock()
+
+        # act
+        bootstrap(event={"routeKey": "POST /brands/me/campaigns/{campaign_id}/product-images"},
+                  context={},
+                  service_locator=self.__mock_service_locator)
+
+        # assert
+        self.__mock_middleware_pipeline \
+            .execute_middleware \
+            .assert_called_once_with(context=Any(),
+                                     middleware=(
+                                         self.__common_hooks.set_body,
+                                         self.__user_before_hooks.set_auth_user_id,
+                                         self.__campaign_before_hooks.validate_id,
+                                         self.__brand_before_hooks.validate_auth_brand,
+                                         self.__mock_campaign_controller.update_product_images,
+                                         self.__campaign_after_hooks.serialize
+                                     ))
+
+    def test_create_auth_brand_image_upload(self):
+        # arrange
+        self.__mock_middleware_pipeline.execute_middleware = MagicMock()
+
+        # act
+        bootstrap(event={"routeKey": "POST /brands/me/image-uploads"},
+                  context={},
+                  service_locator=self.__mock_service_locator)
+
+        # assert
+        self.__mock_middleware_pipeline \
+            .execute_middleware \
+            .assert_called_once_with(context=Any(),
+                                     middleware=(
+                                         self.__common_hooks.set_body,
+                                         self.__user_before_hooks.set_auth_user_id,
+                                         self.__mock_brand_controller.create_image_upload
+                                     ))
+
+    def test_confirm_auth_brand_logo(self):
+        # arrange
+        self.__mock_middleware_pipeline.execute_middleware = MagicMock()
+
+        # act
+        bootstrap(event={"routeKey": "PUT /brands/me/logo"},
+                  context={},
+                  service_locator=self.__mock_service_locator)
+
+        # assert
+        self.__mock_middleware_pipeline \
+            .execute_middleware \
+            .assert_called_once_with(context=Any(),
+                                     middleware=(
+                                         self.__common_hooks.set_body,
+                                         self.__user_before_hooks.set_auth_user_id,
+                                         self.__mock_brand_controller.confirm_logo,
+                                         self.__user_after_hooks.tag_auth_user_claims_to_response,
+                                         self.__brand_after_hooks.serialize
+                                     ))
+
+    def test_confirm_auth_brand_header_image(self):
+        # arrange
+        self.__mock_middleware_pipeline.execute_middleware = MagicMock()
+
+        # act
+        bootstrap(event={"routeKey": "PUT /brands/me/header-image"},
+                  context={},
+                  service_locator=self.__mock_service_locator)
+
+        # assert
+        self.__mock_middleware_pipeline \
+            .execute_middleware \
+            .assert_called_once_with(context=Any(),
+                                     middleware=(
+                                         self.__common_hooks.set_body,
+                                         self.__user_before_hooks.set_auth_user_id,
+                                         self.__mock_brand_controller.confirm_header_image,
+                                         self.__user_after_hooks.tag_auth_user_claims_to_response,
+                                         self.__brand_after_hooks.serialize
+                                     ))
+
+    def test_create_auth_influencer_image_upload(self):
+        # arrange
+        self.__mock_middleware_pipeline.execute_middleware = MagicMock()
+
+        # act
+        bootstrap(event={"routeKey": "POST /influencers/me/image-uploads"},
+                  context={},
+                  service_locator=self.__mock_service_locator)
+
+        # assert
+        self.__mock_middleware_pipeline \
+            .execute_middleware \
+            .assert_called_once_with(context=Any(),
+                                     middleware=(
+                                         self.__common_hooks.set_body,
+                                         self.__user_before_hooks.set_auth_user_id,
+                                         self.__mock_influencer_controller.create_image_upload
+                                     ))
+
+    def test_confirm_auth_influencer_image(self):
+        # arrange
+        self.__mock_middleware_pipeline.execute_middleware = MagicMock()
+
+        # act
+        bootstrap(event={"routeKey": "PUT /influencers/me/image"},
+                  context={},
+                  service_locator=self.__mock_service_locator)
+
+        # assert
+        self.__mock_middleware_pipeline \
+            .execute_middleware \
+            .assert_called_once_with(context=Any(),
+                                     middleware=(
+                                         self.__common_hooks.set_body,
+                                         self.__user_before_hooks.set_auth_user_id,
+                                         self.__mock_influencer_controller.confirm_profile_image,
+                                         self.__user_after_hooks.tag_auth_user_claims_to_response,
+                                         self.__influencer_after_hooks.serialize
+                                     ))
+
+    def test_create_campaign_image_upload(self):
+        # arrange
+        self.__mock_middleware_pipeline.execute_middleware = MagicMock()
+
+        # act
+        bootstrap(event={"routeKey": "POST /brands/me/campaigns/{campaign_id}/image-uploads"},
+                  context={},
+                  service_locator=self.__mock_service_locator)
+
+        # assert
+        self.__mock_middleware_pipeline \
+            .execute_middleware \
+            .assert_called_once_with(context=Any(),
+                                     middleware=(
+                                         self.__common_hooks.set_body,
+                                         self.__user_before_hooks.set_auth_user_id,
+                                         self.__campaign_before_hooks.validate_id,
+                                         self.__brand_before_hooks.validate_auth_brand,
+                                         self.__mock_campaign_controller.create_image_upload
+                                     ))
+
+    def test_confirm_campaign_product_image1(self):
+        # arrange
+        self.__mock_middleware_pipeline.execute_middleware = MagicMock()
+
+        # act
+        bootstrap(event={"routeKey": "PUT /brands/me/campaigns/{campaign_id}/product-image1"},
+                  context={},
+                  service_locator=self.__mock_service_locator)
+
+        # assert
+        self.__mock_middleware_pipeline \
+            .execute_middleware \
+            .assert_called_once_with(context=Any(),
+                                     middleware=(
+                                         self.__common_hooks.set_body,
+                                         self.__user_before_hooks.set_auth_user_id,
+                                         self.__campaign_before_hooks.validate_id,
+                                         self.__brand_before_hooks.validate_auth_brand,
+                                         self.__mock_campaign_controller.confirm_product_image1,
+                                         self.__campaign_after_hooks.serialize
+                                     ))
+
+    def test_confirm_campaign_product_image2(self):
+        # arrange
+        self.__mock_middleware_pipeline.execute_middleware = MagicMock()
+
+        # act
+        bootstrap(event={"routeKey": "PUT /brands/me/campaigns/{campaign_id}/product-image2"},
+                  context={},
+                  service_locator=self.__mock_service_locator)
+
+        # assert
+        self.__mock_middleware_pipeline \
+            .execute_middleware \
+            .assert_called_once_with(context=Any(),
+                                     middleware=(
+                                         self.__common_hooks.set_body,
+                                         self.__user_before_hooks.set_auth_user_id,
+                                         self.__campaign_before_hooks.validate_id,
+                                         self.__brand_before_hooks.validate_auth_brand,
+                                         self.__mock_campaign_controller.confirm_product_image2,
+                                         self.__campaign_after_hooks.serialize
+                                     ))
+
+    def test_confirm_campaign_product_image3(self):
+        # arrange
+        self.__mock_middleware_pipeline.execute_middleware = MagicMock()
+
+        # act
+        bootstrap(event={"routeKey": "PUT /brands/me/campaigns/{campaign_id}/product-image3"},
+                  context={},
+                  service_locator=self.__mock_service_locator)
+
+        # assert
+        self.__mock_middleware_pipeline \
+            .execute_middleware \
+            .assert_called_once_with(context=Any(),
+                                     middleware=(
+                                         self.__common_hooks.set_body,
+                                         self.__user_before_hooks.set_auth_user_id,
+                                         self.__campaign_before_hooks.validate_id,
+                                         self.__brand_before_hooks.validate_auth_brand,
+                                         self.__mock_campaign_controller.confirm_product_image3,
+                                         self.__campaign_after_hooks.serialize
+                                     ))
 
     def test_template_matches_routes(self):
         template_file_path = f"./../template.yaml"
@@ -624,3 +883,164 @@ class TestRoutes(TestCase):
                                                                                    middleware=captor)
         captor.arg[0](context)
         assert context.response.status_code == 405
+
+
+class TestPinfluencerApplication(TestCase):
+
+    def setUp(self) -> None:
+        self.__mock_service_locator: ServiceLocator = Mock()
+        self.__mock_middleware_pipeline: MiddlewarePipeline = Mock()
+        self.__mock_middleware_pipeline.execute_middleware = MagicMock()
+        self.__mock_service_locator.get_middlware_pipeline = MagicMock(return_value=self.__mock_middleware_pipeline)
+        self.__mock_service_locator.get_serializer = MagicMock(return_value=JsonSnakeToCamelSerializer())
+        self.__mock_service_locator.get_response_compressor = MagicMock(return_value=ResponseCompressor())
+        self.__sut = PinfluencerApplication(service_locator=self.__mock_service_locator)
+
+    def test_handle_reuses_dependencies_across_invocations(self):
+        # act
+        self.__sut.handle(event={"routeKey": "GET /brands"}, context={})
+        brand_controller_resolutions = self.__mock_service_locator.get_brand_controller.call_count
+        hooks_facade_resolutions = self.__mock_service_locator.get_hooks_facade.call_count
+        self.__sut.handle(event={"routeKey": "GET /brands"}, context={})
+
+        # assert
+        assert self.__mock_service_locator.get_brand_controller.call_count == brand_controller_resolutions == 1
+        assert self.__mock_service_locator.get_hooks_facade.call_count == hooks_facade_resolutions
+        self.__mock_service_locator.get_middlware_pipeline.assert_called_once()
+        self.__mock_service_locator.get_serializer.assert_called_once()
+        assert self.__mock_middleware_pipeline.execute_middleware.call_count == 2
+
+    def test_handle_only_resolves_dependencies_of_route(self):
+        # act
+        self.__sut.handle(event={"routeKey": "GET /campaigns/{campaign_id}"}, context={})
+
+        # assert
+        self.__mock_service_locator.get_campaign_controller.assert_called_once()
+        self.__mock_service_locator.get_brand_controller.assert_not_called()
+        self.__mock_service_locator.get_influencer_controller.assert_not_called()
+
+    def test_handle_creates_new_context_per_invocation(self):
+        # act
+        self.__sut.handle(event={"routeKey": "GET /brands"}, context={})
+        self.__sut.handle(event={"routeKey": "GET /brands"}, context={})
+
+        # assert
+        [first_call, second_call] = self.__mock_middleware_pipeline.execute_middleware.call_args_list
+        assert first_call.kwargs["context"] is not second_call.kwargs["context"]
+        assert first_call.kwargs["context"].response is not second_call.kwargs["context"].response
+
+    def test_handle_closes_session_after_each_invocation(self):
+        # act
+        self.__sut.handle(event={"routeKey": "GET /brands"}, context={})
+
+        # assert
+        self.__mock_service_locator.end_request.assert_called_once()
+
+    def test_handle_closes_session_when_request_fails(self):
+        # arrange
+        self.__mock_middleware_pipeline.execute_middleware = MagicMock(side_effect=Exception("some exception"))
+
+        # act
+        response = self.__sut.handle(event={"routeKey": "GET /brands"}, context={})
+
+        # assert
+        assert response["statusCode"] == 500
+        self.__mock_service_locator.end_request.assert_called_once()
+
+    def test_handle_compresses_large_body_when_accepted(self):
+        # arrange
+        body = {"items": [{"brand_name": "brand"}] * 200}
+        self.__mock_middleware_pipeline.execute_middleware = MagicMock(
+            side_effect=lambda context, middleware: setattr(context.response, "body", body))
+
+        # act
+        response = self.__sut.handle(event={"routeKey": "GET /brands",
+                                            "headers": {"accept-encoding": "gzip, deflate"}},
+                                     context={})
+
+        # assert
+        assert response["isBase64Encoded"] is True
+        assert response["headers"]["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(base64.b64decode(response["body"]))) == \
+               {"items": [{"brandName": "brand"}] * 200}
+
+    def test_handle_does_not_compress_when_not_accepted(self):
+        # arrange
+        body = {"items": [{"brand_name": "brand"}] * 200}
+        self.__mock_middleware_pipeline.execute_middleware = MagicMock(
+            side_effect=lambda context, middleware: setattr(context.response, "body", body))
+
+        # act
+        response = self.__sut.handle(event={"routeKey": "GET /brands"}, context={})
+
+        # assert
+        assert "isBase64Encoded" not in response
+        assert response["headers"]["Vary"] == "Accept-Encoding"
+        assert json.loads(response["body"]) == {"items": [{"brandName": "brand"}] * 200}
+
+    def test_handle_sets_cache_control_of_route(self):
+        # act
+        response = self.__sut.handle(event={"routeKey": "GET /brands"}, context={})
+
+        # assert
+        assert response["headers"]["Cache-Control"] == PUBLIC_CACHE_CONTROL
+
+    def test_handle_sets_cache_control_when_not_modified(self):
+        # arrange
+        self.__mock_middleware_pipeline.execute_middleware = MagicMock(
+            side_effect=lambda context, middleware: setattr(context.response, "status_code", 304))
+
+        # act
+        response = self.__sut.handle(event={"routeKey": "GET /brands/me"}, context={})
+
+        # assert
+        assert response["statusCode"] == 304
+        assert response["headers"]["Cache-Control"] == PRIVATE_CACHE_CONTROL
+
+    def test_handle_not_modified_sends_the_etag_and_vary_of_the_compressed_response(self):
+        # arrange
+        cache_after_hooks = CacheAfterHooks(serializer=JsonSnakeToCamelSerializer())
+
+        def execute_middleware(context: PinfluencerContext, middleware):
+            context.response.body = {"items": [{"brand_name": "brand"}] * 200}
+            cache_after_hooks.set_etag(context=context)
+
+        self.__mock_middleware_pipeline.execute_middleware = MagicMock(side_effect=execute_middleware)
+        ok = self.__sut.handle(event={"routeKey": "GET /brands", "headers": {"accept-encoding": "gzip"}}, context={})
+
+        # act
+        not_modified = self.__sut.handle(event={"routeKey": "GET /brands",
+                                                "headers": {"accept-encoding": "gzip",
+                                                            "if-none-match": ok["headers"]["ETag"]}},
+                                         context={})
+
+        # assert
+        assert ok["statusCode"] == 200
+        assert ok["headers"]["Content-Encoding"] == "gzip"
+        assert not_modified["statusCode"] == 304
+        assert not_modified["body"] == ""
+        assert "Content-Encoding" not in not_modified["headers"]
+        assert not_modified["headers"]["ETag"] == ok["headers"]["ETag"]
+        assert not_modified["headers"]["ETag"].endswith('-gzip"')
+        assert not_modified["headers"]["Vary"] == ok["headers"]["Vary"] == "Accept-Encoding"
+
+    def test_handle_does_not_set_cache_control_when_not_ok(self):
+        # arrange
+        self.__mock_middleware_pipeline.execute_middleware = MagicMock(
+            side_effect=lambda context, middleware: setattr(context.response, "status_code", 404))
+
+        # act
+        response = self.__sut.handle(event={"routeKey": "GET /brands"}, context={})
+
+        # assert
+        assert "Cache-Control" not in response["headers"]
+
+    def test_get_application_is_built_once_per_container(self):
+        with patch('src.app.ServiceLocator') as mock_service_locator_type, patch('src.app._application', None):
+            # act
+            first = get_application()
+            second = get_application()
+
+            # assert
+            assert first is second
+            mock_service_locator_type.assert_called_once()
@@ -0,0 +1,32 @@
+from unittest import TestCase
+
+from src.web.caching import strong_etag, encoded_etag, etag_matches
+
+
+class TestEtags(TestCase):
+
+    def test_strong_etag(self):
+        # act
+        etag = strong_etag(body='{"id":"1"}')
+
+        # assert
+        assert etag.startswith('"') and etag.endswith('"')
+        assert len(etag) == 34
+        assert etag == strong_etag(body='{"id":"1"}')
+        assert etag != strong_etag(body='{"id":"2"}')
+
+    def test_encoded_etag(self):
+        assert encoded_etag(etag='"abc"', encoding="gzip") == '"abc-gzip"'
+
+    def test_etag_matches(self):
+        assert etag_matches(if_none_match='"abc"', etag='"abc"')
+        assert etag_matches(if_none_match='"xyz", "abc"', etag='"abc"')
+        assert etag_matches(if_none_match='W/"abc"', etag='"abc"')
+        assert etag_matches(if_none_match='*', etag='"abc"')
+        assert etag_matches(if_none_match='"abc-br"', etag='"abc"')
+
+    def test_etag_does_not_match(self):
+        assert not etag_matches(if_none_match=None, etag='"abc"')
+        assert not etag_matches(if_none_match='', etag='"abc"')
+        assert not etag_matches(if_none_match='"abd"', etag='"abc"')
+        assert not etag_matches(if_none_match='"ab"', etag='"abc"')
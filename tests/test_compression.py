@@ -0,0 +1,77 @@
+import gzip
+import random
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+
+from src.web.compression import ResponseCompressor, ContentEncodingEnum, accepted_encodings, brotli
+
+BODY = b'{"items":[' + b','.join([b'{"brandName":"brand","brandDescription":"description"}'] * 100) + b']}'
+
+
+class TestAcceptedEncodings(TestCase):
+
+    def test_qualities(self):
+        assert accepted_encodings("gzip, br;q=0.5, *;q=0, identity; q=0.1") == \
+               {"gzip": 1.0, "br": 0.5, "*": 0.0, "identity": 0.1}
+
+    def test_when_missing(self):
+        assert accepted_encodings(None) == {}
+        assert accepted_encodings("") == {}
+
+    def test_when_quality_is_not_a_number(self):
+        assert accepted_encodings("gzip;q=high") == {"gzip": 0.0}
+
+
+class TestResponseCompressor(TestCase):
+
+    def setUp(self) -> None:
+        self.__sut = ResponseCompressor(min_size_bytes=1024)
+
+    def test_negotiate_gzip(self):
+        assert self.__sut.negotiate("gzip, deflate") == ContentEncodingEnum.GZIP
+
+    def test_negotiate_nothing_in_common(self):
+        assert self.__sut.negotiate("deflate") is None
+        assert self.__sut.negotiate("gzip;q=0") is None
+        assert self.__sut.negotiate(None) is None
+
+    def test_negotiate_wildcard(self):
+        assert self.__sut.negotiate("*") is not None
+        assert self.__sut.negotiate("*, gzip;q=0") != ContentEncodingEnum.GZIP
+
+    @skipUnless(brotli, "brotli is not installed")
+    def test_negotiate_prefers_brotli(self):
+        assert self.__sut.negotiate("gzip, deflate, br") == ContentEncodingEnum.BROTLI
+        assert self.__sut.negotiate("gzip, br;q=0.8") == ContentEncodingEnum.GZIP
+
+    def test_negotiate_when_brotli_not_installed(self):
+        with patch('src.web.compression.brotli', None):
+            assert ResponseCompressor().negotiate("br, gzip;q=0.5") == ContentEncodingEnum.GZIP
+
+    def test_compress_gzip(self):
+        # act
+        compressed = self.__sut.compress(body=BODY, accept_encoding="gzip")
+
+        # assert
+        assert compressed.encoding == ContentEncodingEnum.GZIP
+        assert len(compressed.data) < len(BODY)
+        assert gzip.decompress(compressed.data) == BODY
+
+    @skipUnless(brotli, "brotli is not installed")
+    def test_compress_brotli(self):
+        # act
+        compressed = self.__sut.compress(body=BODY, accept_encoding="br")
+
+        # assert
+        assert compressed.encoding == ContentEncodingEnum.BROTLI
+        assert brotli.decompress(compressed.data) == BODY
+
+    def test_compress_below_min_size(self):
+        assert self.__sut.compress(body=BODY[:1023], accept_encoding="gzip") is None
+
+    def test_compress_when_not_smaller(self):
+        # arrange
+        incompressible = random.Random(0).randbytes(2048)
+
+        # act/assert
+        assert self.__sut.compress(body=incompressible, accept_encoding="gzip") is None
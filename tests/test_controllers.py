@@ -2,14 +2,19 @@ import uuid
 from unittest import TestCase
 from unittest.mock import Mock, MagicMock
 
+import numpy as np
 from callee import Captor
 
-from src.crosscutting import valid_uuid
-from src.domain.models import Influencer, Campaign, CategoryEnum, ValueEnum, CampaignStateEnum
-from src.exceptions import AlreadyExistsException, NotFoundException
+from src.crosscutting import valid_uuid, JsonCamelToSnakeCaseDeserializer
+from src.domain.filtering import CampaignFilter
+from src.domain.matching import MatchCandidates, to_bitmask, rank
+from src.domain.models import Influencer, Campaign, CategoryEnum, ValueEnum, CampaignStateEnum, Page
+from src.domain.similarity import SimilarityMetric
+from src.exceptions import AlreadyExistsException, NotFoundException, InvalidCursorException, ImageException, \
+    ImageTooLargeException
 from src.types import BrandRepository, InfluencerRepository, CampaignRepository
-from src.web import PinfluencerContext, PinfluencerResponse
-from src.web.controllers import BrandController, InfluencerController, CampaignController
+from src.web import PinfluencerContext, PinfluencerResponse, DEFAULT_PAGE_LIMIT
+from src.web.controllers import BrandController, InfluencerController, CampaignController, FeedController
 from tests import brand_dto_generator, assert_brand_updatable_fields_are_equal, TEST_DEFAULT_BRAND_LOGO, \
     TEST_DEFAULT_BRAND_HEADER_IMAGE, influencer_dto_generator, RepoEnum, \
     assert_brand_creatable_generated_fields_are_equal, TEST_DEFAULT_INFLUENCER_PROFILE_IMAGE, \
@@ -17,7 +22,7 @@ from tests import brand_dto_generator, assert_brand_updatable_fields_are_equal,
     update_brand_payload, create_brand_dto, \
     update_image_payload, update_brand_return_dto, create_influencer_dto, \
     update_influencer_payload, TEST_DEFAULT_PRODUCT_IMAGE1, TEST_DEFAULT_PRODUCT_IMAGE2, \
-    TEST_DEFAULT_PRODUCT_IMAGE3, campaign_dto_generator
+    TEST_DEFAULT_PRODUCT_IMAGE3, campaign_dto_generator, page_body
 
 
 class TestInfluencerController(TestCase):
@@ -62,7 +67,8 @@ class TestInfluencerController(TestCase):
             influencer_dto_generator(num=3, repo=RepoEnum.STD_REPO),
             influencer_dto_generator(num=4, repo=RepoEnum.STD_REPO)
         ]
-        self.__influencer_repository.load_collection = MagicMock(return_value=influencers_from_db)
+        self.__influencer_repository.load_page = MagicMock(return_value=Page(items=influencers_from_db,
+                                                                             next_cursor="cursor"))
         pinfluencer_response = PinfluencerResponse()
 
         # act
@@ -70,7 +76,9 @@ class TestInfluencerController(TestCase):
                                               event={}))
 
         # assert
-        assert pinfluencer_response.body == list(map(lambda x: x.__dict__, influencers_from_db))
+        self.__influencer_repository.load_page.assert_called_once_with(limit=DEFAULT_PAGE_LIMIT, cursor=None)
+        assert pinfluencer_response.body == page_body(list(map(lambda x: x.__dict__, influencers_from_db)),
+                                                      next_cursor="cursor")
         assert pinfluencer_response.status_code == 200
 
     def test_create(self):
@@ -131,6 +139,20 @@ class TestInfluencerController(TestCase):
         assert response.status_code == 201
         assert response.body == expected_influencer.__dict__
 
+    def test_confirm_profile_image_when_not_found(self):
+        # arrange
+        self.__influencer_repository.confirm_image_for_auth_user = MagicMock(side_effect=NotFoundException())
+        context = PinfluencerContext(body={"image_key": "influencer/image.png"}, auth_user_id="12341",
+                                     response=PinfluencerResponse())
+
+        # act
+        self.__sut.confirm_profile_image(context)
+
+        # assert
+        assert context.response.status_code == 404
+        assert context.response.body == {}
+        assert context.short_circuit == True
+
     def test_update(self):
         # arrange
         influencer_in_db = create_influencer_dto()
@@ -174,6 +196,64 @@ class TestInfluencerController(TestCase):
         assert return_value.status_code == 404
         assert context.short_circuit == True
 
+    def test_get_similar(self):
+        # arrange
+        influencer = influencer_dto_generator(num=2)
+        self.__influencer_repository.load_similar = MagicMock(return_value=[(influencer, 0.5)])
+        context = PinfluencerContext(response=PinfluencerResponse(),
+                                     id="1234",
+                                     event={"queryStringParameters": {"limit": "5", "metric": "l1"}})
+
+        # act
+        self.__sut.get_similar(context=context)
+
+        # assert
+        self.__influencer_repository.load_similar.assert_called_once_with(id_="1234",
+                                                                          limit=5,
+                                                                          metric=SimilarityMetric.L1)
+        assert context.response.status_code == 200
+        assert context.response.body == {"items": [{**influencer.__dict__, "similarity": 0.5}],
+                                         "next_cursor": None}
+
+    def test_get_similar_defaults_to_cosine(self):
+        # arrange
+        self.__influencer_repository.load_similar = MagicMock(return_value=[])
+        context = PinfluencerContext(response=PinfluencerResponse(), id="1234")
+
+        # act
+        self.__sut.get_similar(context=context)
+
+        # assert
+        self.__influencer_repository.load_similar.assert_called_once_with(id_="1234",
+                                                                          limit=DEFAULT_PAGE_LIMIT,
+                                                                          metric=SimilarityMetric.COSINE)
+
+    def test_get_similar_when_metric_is_unknown(self):
+        # arrange
+        context = PinfluencerContext(response=PinfluencerResponse(),
+                                     id="1234",
+                                     event={"queryStringParameters": {"metric": "euclidean"}})
+
+        # act
+        self.__sut.get_similar(context=context)
+
+        # assert
+        assert context.response.status_code == 400
+        assert context.short_circuit == True
+
+    def test_get_similar_when_not_found(self):
+        # arrange
+        self.__influencer_repository.load_similar = MagicMock(side_effect=NotFoundException())
+        context = PinfluencerContext(response=PinfluencerResponse(), id="1234")
+
+        # act
+        self.__sut.get_similar(context=context)
+
+        # assert
+        assert context.response.status_code == 404
+        assert context.response.body == {}
+        assert context.short_circuit == True
+
 
 class TestBrandController(TestCase):
 
@@ -220,18 +300,46 @@ class TestBrandController(TestCase):
             brand_dto_generator(num=3, repo=RepoEnum.STD_REPO),
             brand_dto_generator(num=4, repo=RepoEnum.STD_REPO)
         ]
-        self.__brand_repository.load_collection = MagicMock(return_value=brands_from_db)
+        self.__brand_repository.load_page = MagicMock(return_value=Page(items=brands_from_db))
         pinfluencer_response = PinfluencerResponse()
 
         # act
-        self.__sut.get_all(PinfluencerContext(event={},
+        self.__sut.get_all(PinfluencerContext(event={"queryStringParameters": {"limit": "4", "cursor": "abc"}},
                                               response=pinfluencer_response))
 
         # assert
-        self.__brand_repository.load_collection.assert_called_once()
-        assert pinfluencer_response.body == list(map(lambda x: x.__dict__, brands_from_db))
+        self.__brand_repository.load_page.assert_called_once_with(limit=4, cursor="abc")
+        assert pinfluencer_response.body == page_body(list(map(lambda x: x.__dict__, brands_from_db)))
         assert pinfluencer_response.status_code == 200
 
+    def test_get_all_when_limit_invalid(self):
+        for limit in ["0", "101", "ten"]:
+            # arrange
+            context = PinfluencerContext(event={"queryStringParameters": {"limit": limit}},
+                                         response=PinfluencerResponse())
+
+            # act
+            self.__sut.get_all(context)
+
+            # assert
+            assert context.short_circuit == True
+            assert context.response.status_code == 400
+        self.__brand_repository.load_page.assert_not_called()
+
+    def test_get_all_when_cursor_invalid(self):
+        # arrange
+        self.__brand_repository.load_page = MagicMock(side_effect=InvalidCursorException())
+        context = PinfluencerContext(event={"queryStringParameters": {"cursor": "random"}},
+                                     response=PinfluencerResponse())
+
+        # act
+        self.__sut.get_all(context)
+
+        # assert
+        assert context.short_circuit == True
+        assert context.response.status_code == 400
+        assert context.response.body == {}
+
     def test_get(self):
         # arrange
         db_brand = brand_dto_generator(num=1, repo=RepoEnum.STD_REPO)
@@ -413,6 +521,80 @@ class TestBrandController(TestCase):
         assert response.body == {}
         assert context.short_circuit == True
 
+    def test_create_image_upload(self):
+        # arrange
+        upload = {"url": "https://bucket", "fields": {"key": "brand/image.png"}, "key": "brand/image.png"}
+        self.__brand_repository.create_image_upload_for_auth_user = MagicMock(return_value=upload)
+        context = PinfluencerContext(body={"content_type": "image/png"}, auth_user_id="12341",
+                                     response=PinfluencerResponse())
+
+        # act
+        self.__sut.create_image_upload(context)
+
+        # assert
+        self.__brand_repository.create_image_upload_for_auth_user.assert_called_once_with("12341", "image/png")
+        assert context.response.status_code == 201
+        assert context.response.body == upload
+        assert context.short_circuit == False
+
+    def test_create_image_upload_of_unsupported_type(self):
+        # arrange
+        self.__brand_repository.create_image_upload_for_auth_user = MagicMock(side_effect=ImageException())
+        context = PinfluencerContext(body={"content_type": "text/html"}, auth_user_id="12341",
+                                     response=PinfluencerResponse())
+
+        # act
+        self.__sut.create_image_upload(context)
+
+        # assert
+        assert context.response.status_code == 400
+        assert context.response.body == {}
+        assert context.short_circuit == True
+
+    def test_confirm_logo(self):
+        # arrange
+        expected_brand = brand_dto_generator(num=1)
+        self.__brand_repository.confirm_logo_for_auth_user = MagicMock(return_value=expected_brand)
+        context = PinfluencerContext(body={"image_key": "brand/image.png"}, auth_user_id="12341",
+                                     response=PinfluencerResponse())
+
+        # act
+        self.__sut.confirm_logo(context)
+
+        # assert
+        self.__brand_repository.confirm_logo_for_auth_user.assert_called_once_with("12341", "brand/image.png")
+        assert context.response.status_code == 200
+        assert context.response.body == expected_brand.__dict__
+
+    def test_confirm_header_image_when_not_uploaded(self):
+        # arrange
+        self.__brand_repository.confirm_header_image_for_auth_user = MagicMock(side_effect=ImageException())
+        context = PinfluencerContext(body={"image_key": "brand/image.png"}, auth_user_id="12341",
+                                     response=PinfluencerResponse())
+
+        # act
+        self.__sut.confirm_header_image(context)
+
+        # assert
+        assert context.response.status_code == 400
+        assert context.response.body == {}
+        assert context.short_circuit == True
+
+    def test_update_header_image_when_too_large(self):
+        # arrange
+        payload = update_image_payload()
+        self.__brand_repository.update_header_image_for_auth_user = MagicMock(side_effect=ImageTooLargeException())
+        response = PinfluencerResponse()
+
+        # act
+        context = PinfluencerContext(body=payload, auth_user_id="12341", response=response)
+        self.__sut.update_header_image(context)
+
+        # assert
+        assert response.status_code == 413
+        assert response.body == {}
+        assert context.short_circuit == True
+
 
 def create_campaign_from_db() -> Campaign:
     return Campaign(objective="objective1",
@@ -435,7 +617,7 @@ def create_or_update_campaign_body() -> dict:
         "success_description": "success_description1",
         "campaign_title": "campaign_title1",
         "campaign_description": "campaign_description1",
-        "campaign_categories": ["CATEGORY6", "CATEGORY5", "CATEGORY7"],
+        "campaign_categories": ["CATEGORY5", "CATEGORY6", "CATEGORY7"],
         "campaign_values": ["VALUE5", "VALUE6", "VALUE7"],
         "campaign_product_link": "campaign_product_link1",
         "campaign_hashtag": "campaign_hashtag1",
@@ -545,24 +727,63 @@ class TestCampaignController(TestCase):
         context = PinfluencerContext(auth_user_id=auth_user_id,
                                      response=PinfluencerResponse(),
                                      short_circuit=False)
-        self.__campaign_repository.load_for_auth_brand = MagicMock(return_value=campaigns)
+        self.__campaign_repository.load_page_for_auth_brand = MagicMock(return_value=Page(items=campaigns))
 
         # act
         self.__sut.get_for_brand(context=context)
 
         # assert
-        self.__campaign_repository.load_for_auth_brand.assert_called_once_with(auth_user_id=auth_user_id)
+        self.__campaign_repository.load_page_for_auth_brand.assert_called_once_with(auth_user_id=auth_user_id,
+                                                                                   limit=DEFAULT_PAGE_LIMIT,
+                                                                                   cursor=None)
         assert context.short_circuit == False
-        assert context.response.body == list(map(lambda x: x.__dict__, campaigns))
+        assert context.response.body == page_body(list(map(lambda x: x.__dict__, campaigns)))
+        assert context.response.status_code == 200
+
+    def test_get_all(self):
+        # arrange
+        campaigns = [campaign_dto_generator(num=1)]
+        context = PinfluencerContext(response=PinfluencerResponse(),
+                                     event={"queryStringParameters": {"categories": "FASHION",
+                                                                      "values": "VEGAN,RECYCLED",
+                                                                      "limit": "5",
+                                                                      "cursor": "cursor"}})
+        self.__campaign_repository.load_page_filtered = MagicMock(return_value=Page(items=campaigns,
+                                                                                    next_cursor="next"))
+
+        # act
+        self.__sut.get_all(context=context)
+
+        # assert
+        self.__campaign_repository.load_page_filtered.assert_called_once_with(
+            campaign_filter=CampaignFilter(categories=(CategoryEnum.FASHION,),
+                                           values=(ValueEnum.VEGAN, ValueEnum.RECYCLED)),
+            limit=5,
+            cursor="cursor")
+        assert context.response.body == page_body(list(map(lambda x: x.__dict__, campaigns)), next_cursor="next")
         assert context.response.status_code == 200
 
+    def test_get_all_when_filter_is_invalid(self):
+        # arrange
+        context = PinfluencerContext(response=PinfluencerResponse(),
+                                     event={"queryStringParameters": {"state": "FINISHED"}})
+        self.__campaign_repository.load_page_filtered = MagicMock()
+
+        # act
+        self.__sut.get_all(context=context)
+
+        # assert
+        self.__campaign_repository.load_page_filtered.assert_not_called()
+        assert context.response.status_code == 400
+        assert context.short_circuit == True
+
     def test_get_for_brand_when_brand_not_found(self):
 
         # arrange
         context = PinfluencerContext(response=PinfluencerResponse(),
                                      short_circuit=False,
                                      auth_user_id="12341")
-        self.__campaign_repository.load_for_auth_brand = MagicMock(side_effect=NotFoundException())
+        self.__campaign_repository.load_page_for_auth_brand = MagicMock(side_effect=NotFoundException())
 
         # act
         self.__sut.get_for_brand(context=context)
@@ -588,6 +809,90 @@ class TestCampaignController(TestCase):
                                                                                  image_bytes="random_bytes")
         assert context.response.body == expected_campaign.__dict__
 
+    def test_update_product_images(self):
+        # arrange
+        expected_campaign = campaign_dto_generator(num=1)
+        self.__campaign_repository.update_product_images = MagicMock(return_value=expected_campaign)
+        context = PinfluencerContext(body=JsonCamelToSnakeCaseDeserializer().deserialize(
+                                         data='{"productImage1": "bytes1", "productImage3": "bytes3"}'),
+                                     id="12341",
+                                     response=PinfluencerResponse())
+
+        # act
+        self.__sut.update_product_images(context)
+
+        # assert
+        self.__campaign_repository.update_product_images.assert_called_once_with(
+            id="12341",
+            images={"product_image1": "bytes1", "product_image3": "bytes3"})
+        assert context.response.status_code == 201
+        assert context.response.body == expected_campaign.__dict__
+        assert context.short_circuit == False
+
+    def test_update_product_images_when_body_is_invalid(self):
+        for body in [{}, {"product_image_4": "bytes"}, {"product_image_1": "bytes", "image_bytes": "bytes"},
+                     {"product_image_1": 1}, {"product_image_2": ""}, {"product_image1": "bytes"}]:
+            with self.subTest(body=body):
+                # arrange
+                self.__campaign_repository.update_product_images = MagicMock()
+                context = PinfluencerContext(body=body, id="12341", response=PinfluencerResponse())
+
+                # act
+                self.__sut.update_product_images(context)
+
+                # assert
+                self.__campaign_repository.update_product_images.assert_not_called()
+                assert context.response.status_code == 400
+                assert context.short_circuit == True
+
+    def test_update_product_images_when_upload_fails(self):
+        for exception, status_code in [(NotFoundException(), 404),
+                                       (ImageTooLargeException(), 413),
+                                       (ImageException(), 400)]:
+            with self.subTest(exception=exception):
+                # arrange
+                self.__campaign_repository.update_product_images = MagicMock(side_effect=exception)
+                context = PinfluencerContext(body={"product_image_1": "bytes1"},
+                                             id="12341",
+                                             response=PinfluencerResponse())
+
+                # act
+                self.__sut.update_product_images(context)
+
+                # assert
+                assert context.response.status_code == status_code
+                assert context.response.body == {}
+                assert context.short_circuit == True
+
+    def test_confirm_product_image1(self):
+        # arrange
+        expected_campaign = campaign_dto_generator(num=1)
+        self.__campaign_repository.confirm_product_image1 = MagicMock(return_value=expected_campaign)
+        context = PinfluencerContext(body={"image_key": "campaign/image.png"},
+                                     id="12341",
+                                     response=PinfluencerResponse())
+
+        # act
+        self.__sut.confirm_product_image1(context)
+
+        # assert
+        self.__campaign_repository.confirm_product_image1.assert_called_once_with("12341", "campaign/image.png")
+        assert context.response.body == expected_campaign.__dict__
+
+    def test_create_image_upload_when_campaign_not_found(self):
+        # arrange
+        self.__campaign_repository.create_image_upload = MagicMock(side_effect=NotFoundException())
+        context = PinfluencerContext(body={"content_type": "image/png"},
+                                     id="12341",
+                                     response=PinfluencerResponse())
+
+        # act
+        self.__sut.create_image_upload(context)
+
+        # assert
+        assert context.response.status_code == 404
+        assert context.short_circuit == True
+
     def test_update_product_image2(self):
         # arrange
         expected_campaign = campaign_dto_generator(num=1)
@@ -706,4 +1011,91 @@ class TestCampaignController(TestCase):
         # assert
         assert context.response.body == {}
         assert context.response.status_code == 404
-        assert context.short_circuit == True
\ No newline at end of file
+        assert context.short_circuit == True
+
+class TestFeedController(TestCase):
+
+    def setUp(self) -> None:
+        self.__campaign_repository: CampaignRepository = Mock()
+        self.__brand_repository: BrandRepository = Mock()
+        self.__influencer_repository: InfluencerRepository = Mock()
+        self.__sut = FeedController(campaign_repository=self.__campaign_repository,
+                                    brand_repository=self.__brand_repository,
+                                    influencer_repository=self.__influencer_repository)
+
+    def test_get_for_influencer_ranks_campaigns(self):
+        # arrange
+        influencer = influencer_dto_generator(num=3)
+        best = campaign_dto_generator(num=3)
+        other = campaign_dto_generator(num=1)
+        self.__influencer_repository.load_for_auth_user = MagicMock(return_value=influencer)
+        candidates = MatchCandidates(
+            ids=[other.id, best.id],
+            value_masks=np.array([to_bitmask(other.campaign_values), to_bitmask(best.campaign_values)],
+                                 dtype=np.uint16),
+            category_masks=np.array([to_bitmask(other.campaign_categories), to_bitmask(best.campaign_categories)],
+                                    dtype=np.uint16))
+        self.__campaign_repository.rank_active_candidates = MagicMock(
+            side_effect=lambda value_mask, category_mask, k: rank(value_mask, category_mask, candidates, k))
+        self.__campaign_repository.load_by_ids = MagicMock(return_value=[best, other])
+        context = PinfluencerContext(response=PinfluencerResponse(), auth_user_id=influencer.auth_user_id)
+
+        # act
+        self.__sut.get(context=context)
+
+        # assert
+        self.__influencer_repository.load_for_auth_user.assert_called_once_with(auth_user_id=influencer.auth_user_id)
+        self.__campaign_repository.load_by_ids.assert_called_once_with([best.id, other.id])
+        assert context.response.status_code == 200
+        assert context.response.body["feed"] == "campaigns"
+        assert context.response.body["next_cursor"] is None
+        assert [item["id"] for item in context.response.body["items"]] == [best.id, other.id]
+        assert [item["match_score"] for item in context.response.body["items"]] == [10, 3]
+
+    def test_get_for_brand_ranks_influencers(self):
+        # arrange
+        brand = brand_dto_generator(num=1)
+        influencer = influencer_dto_generator(num=1)
+        self.__influencer_repository.load_for_auth_user = MagicMock(side_effect=NotFoundException())
+        self.__brand_repository.load_for_auth_user = MagicMock(return_value=brand)
+        candidates = MatchCandidates(ids=[influencer.id],
+                                     value_masks=np.array([to_bitmask(influencer.values)], dtype=np.uint16),
+                                     category_masks=np.array([to_bitmask(influencer.categories)], dtype=np.uint16))
+        self.__influencer_repository.rank_candidates = MagicMock(
+            side_effect=lambda value_mask, category_mask, k: rank(value_mask, category_mask, candidates, k))
+        self.__influencer_repository.load_by_ids = MagicMock(return_value=[influencer])
+        context = PinfluencerContext(response=PinfluencerResponse(), auth_user_id=brand.auth_user_id)
+
+        # act
+        self.__sut.get(context=context)
+
+        # assert
+        assert context.response.status_code == 200
+        assert context.response.body["feed"] == "influencers"
+        assert context.response.body["items"] == [{**influencer.__dict__, "match_score": 6}]
+
+    def test_get_when_limit_is_invalid(self):
+        # arrange
+        context = PinfluencerContext(response=PinfluencerResponse(),
+                                     event={"queryStringParameters": {"limit": "0"}})
+
+        # act
+        self.__sut.get(context=context)
+
+        # assert
+        assert context.response.status_code == 400
+        assert context.short_circuit == True
+
+    def test_get_when_user_is_neither_influencer_nor_brand(self):
+        # arrange
+        self.__influencer_repository.load_for_auth_user = MagicMock(side_effect=NotFoundException())
+        self.__brand_repository.load_for_auth_user = MagicMock(side_effect=NotFoundException())
+        context = PinfluencerContext(response=PinfluencerResponse(), auth_user_id="1234")
+
+        # act
+        self.__sut.get(context=context)
+
+        # assert
+        assert context.response.status_code == 404
+        assert context.response.body == {}
+        assert context.short_circuit == True
@@ -1,11 +1,19 @@
-from unittest import TestCase
-
-from src.crosscutting import JsonSnakeToCamelSerializer, JsonCamelToSnakeCaseDeserializer
-
-TEST_DICT_JSON = "{\"name\": \"adam raymond\", \"snakeInValue\": \"snake_in_value\", \"value2To3Values\": 2}"
-TEST_LIST_SERIALIZATION_JSON = "[{\"name\": \"adam raymond\", \"snakeInValue\": \"snake_in_value\", \"value2To3Values\": 2}, {\"name\": \"adam raymond\", \"snakeInValue\": \"snake_in_value\", \"value2To3Values\": 2}, {\"name\": \"adam raymond\", \"snakeInValue\": \"snake_in_value\", \"value2To3Values\": 2}]"
+import threading
+import time
+from datetime import datetime
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+
+from src.crosscutting import JsonSnakeToCamelSerializer, JsonCamelToSnakeCaseDeserializer, ConcurrentExecutor, \
+    FailurePolicy, TtlLruCache, KeyTranslationCache, transform_keys, snake_case_key_to_camel_case, \
+    camel_case_key_to_snake_case, CamelCaseBody, StdlibJsonEncoder, OrjsonJsonEncoder, JsonEncoderEnum, \
+    new_json_encoder, orjson
+from src.domain.models import Influencer, ValueEnum
+
+TEST_DICT_JSON = "{\"name\":\"adam raymond\",\"snakeInValue\":\"snake_in_value\",\"value2To3Values\":2}"
+TEST_LIST_SERIALIZATION_JSON = "[{\"name\":\"adam raymond\",\"snakeInValue\":\"snake_in_value\",\"value2To3Values\":2},{\"name\":\"adam raymond\",\"snakeInValue\":\"snake_in_value\",\"value2To3Values\":2},{\"name\":\"adam raymond\",\"snakeInValue\":\"snake_in_value\",\"value2To3Values\":2}]"
 TEST_LIST_SERIALIZATION_EMPTY_JSON = "[]"
-TEST_DICT_NESTED_JSON = "{\"name\": \"adam raymond\", \"snakeInValue\": \"snake_in_value\", \"value2To3Values\": 2, \"nestedObject\": {\"name\": \"dennis reynolds\", \"snakeValue\": 3}, \"arrayValue\": [\"apples\", \"pears\", \"oranges\"]}"
+TEST_DICT_NESTED_JSON = "{\"name\":\"adam raymond\",\"snakeInValue\":\"snake_in_value\",\"value2To3Values\":2,\"nestedObject\":{\"name\":\"dennis reynolds\",\"snakeValue\":3},\"arrayValue\":[\"apples\",\"pears\",\"oranges\"]}"
 TEST_DICT_JSON_WITH_CAPS_KEY = "{\"name\": \"adam raymond\", \"snakeInValue\": \"snake_in_value\", \"value2To3Values\": 2, \"capitalLETTERSValue\": 1}"
 
 TEST_DICT = {
@@ -105,6 +113,49 @@ class TestJsonSnakeToCamelSerializer(TestCase):
         # assert
         assert expected == actual
 
+    def test_serialize_camel_case_body_as_it_is(self):
+
+        # arrange
+        input_data = CamelCaseBody({"some_key": "value"})
+
+        # act
+        actual = self.__json_snake_to_camel_serializer.serialize(input_data)
+
+        # assert
+        assert actual == '{"some_key":"value"}'
+
+
+class TestJsonEncoders(TestCase):
+
+    def setUp(self):
+        self.__encoders = [StdlibJsonEncoder()] + ([OrjsonJsonEncoder()] if orjson is not None else [])
+
+    def test_values_outside_json(self):
+        # arrange
+        data = {"created": datetime(2022, 6, 1, 9, 30), "state": ValueEnum.VEGAN, 1: "non string key",
+                "name": "Zoë", "split": 0.1 + 0.2}
+        expected = '{"created":"2022-06-01 09:30:00","state":"VEGAN","1":"non string key","name":"Zoë",' \
+                   '"split":0.30000000000000004}'
+
+        for encoder in self.__encoders:
+            # act
+            actual = encoder.encode(data)
+
+            # assert
+            assert actual == expected, type(encoder)
+
+    def test_new_json_encoder_when_stdlib_preferred(self):
+        assert isinstance(new_json_encoder(preferred=JsonEncoderEnum.STDLIB), StdlibJsonEncoder)
+
+    @skipUnless(orjson, "orjson is not installed")
+    def test_new_json_encoder_prefers_orjson(self):
+        assert isinstance(new_json_encoder(), OrjsonJsonEncoder)
+
+    def test_new_json_encoder_when_orjson_not_installed(self):
+        with patch('src.crosscutting.orjson', None):
+            assert isinstance(new_json_encoder(preferred=JsonEncoderEnum.ORJSON), StdlibJsonEncoder)
+
+
 class TestJsonCamelToSnakeCaseDeserializer(TestCase):
 
     def setUp(self):
@@ -157,3 +208,205 @@ class TestJsonCamelToSnakeCaseDeserializer(TestCase):
 
         # assert
         assert expected == actual
+
+
+class TestConcurrentExecutor(TestCase):
+
+    def test_map_keeps_order(self):
+        # arrange
+        sut = ConcurrentExecutor(max_workers=4)
+
+        # act
+        actual = sut.map(lambda x: time.sleep((5 - x) / 1000) or x * 2, [1, 2, 3, 4])
+
+        # assert
+        assert actual == [2, 4, 6, 8]
+
+    def test_map_runs_concurrently_up_to_max_workers(self):
+        # arrange
+        sut = ConcurrentExecutor(max_workers=3)
+        lock = threading.Lock()
+        in_flight = [0]
+        peak = [0]
+
+        def action(_):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.02)
+            with lock:
+                in_flight[0] -= 1
+
+        # act
+        sut.map(action, range(9))
+
+        # assert
+        assert peak[0] == 3
+
+    def test_map_when_call_fails_and_policy_is_raise(self):
+        # arrange
+        sut = ConcurrentExecutor(max_workers=2, failure_policy=FailurePolicy.RAISE)
+
+        # act/assert
+        self.assertRaises(ValueError, lambda: sut.map(lambda x: int(x), ["1", "two"]))
+
+    def test_map_when_call_fails_and_policy_is_skip(self):
+        # arrange
+        sut = ConcurrentExecutor(max_workers=2, failure_policy=FailurePolicy.SKIP)
+
+        # act
+        actual = sut.map(lambda x: int(x), ["1", "two", "3"])
+
+        # assert
+        assert actual == [1, None, 3]
+
+    def test_map_when_call_times_out_and_policy_is_skip(self):
+        # arrange
+        sut = ConcurrentExecutor(max_workers=2, timeout_seconds=0.01, failure_policy=FailurePolicy.SKIP)
+
+        # act
+        actual = sut.map(lambda x: time.sleep(x) or x, [0, 0.2])
+
+        # assert
+        assert actual == [0, None]
+
+    def test_map_waits_for_one_deadline_across_the_batch(self):
+        # arrange
+        sut = ConcurrentExecutor(max_workers=8, timeout_seconds=0.05, failure_policy=FailurePolicy.SKIP)
+        started = time.monotonic()
+
+        # act
+        actual = sut.map(lambda x: time.sleep(x) or x, [0.5] * 8)
+
+        # assert
+        assert actual == [None] * 8
+        assert time.monotonic() - started < 0.25
+
+
+class TestTtlLruCache(TestCase):
+
+    def setUp(self) -> None:
+        self.__now = [0.0]
+        self.__sut = TtlLruCache(max_size=2, ttl_seconds=10, clock=lambda: self.__now[0])
+
+    def test_get_when_put(self):
+        # arrange
+        self.__sut.put("a", 1)
+
+        # act
+        actual = self.__sut.get("a")
+
+        # assert
+        assert actual == 1
+        assert self.__sut.get_stats() == {"hits": 1, "misses": 0, "size": 1}
+
+    def test_get_when_expired(self):
+        # arrange
+        self.__sut.put("a", 1)
+        self.__now[0] = 10
+
+        # act
+        actual = self.__sut.get("a")
+
+        # assert
+        assert actual is None
+        assert self.__sut.get_stats() == {"hits": 0, "misses": 1, "size": 0}
+
+    def test_put_evicts_least_recently_used(self):
+        # arrange
+        self.__sut.put("a", 1)
+        self.__sut.put("b", 2)
+        self.__sut.get("a")
+
+        # act
+        self.__sut.put("c", 3)
+
+        # assert
+        assert self.__sut.get("a") == 1
+        assert self.__sut.get("b") is None
+        assert self.__sut.get("c") == 3
+
+    def test_invalidate(self):
+        # arrange
+        self.__sut.put("a", 1)
+
+        # act
+        self.__sut.invalidate("a")
+        self.__sut.invalidate("random")
+
+        # assert
+        assert self.__sut.get("a") is None
+
+
+class TestKeyTranslationCache(TestCase):
+
+    def setUp(self) -> None:
+        self.__translations = []
+        self.__sut = KeyTranslationCache(translate=self.__translate, max_size=2, seed=["seeded"])
+
+    def __translate(self, key: str) -> str:
+        self.__translations.append(key)
+        return key.upper()
+
+    def test_translates_each_key_once(self):
+        # act
+        first = self.__sut("key")
+        second = self.__sut("key")
+
+        # assert
+        assert first == second == "KEY"
+        assert self.__translations == ["seeded", "key"]
+
+    def test_seeded_keys_are_not_translated_again(self):
+        # act
+        self.__sut("seeded")
+
+        # assert
+        assert self.__translations == ["seeded"]
+
+    def test_does_not_grow_past_max_size(self):
+        # act
+        self.__sut("a")
+        self.__sut("b")
+        self.__sut("b")
+
+        # assert
+        assert len(self.__sut) == 2
+        assert self.__translations == ["seeded", "a", "b", "b"]
+
+
+class TestTransformKeys(TestCase):
+
+    def test_keeps_structure_and_order(self):
+        # arrange
+        data = {"a_b": [1, {"c_d": {"e": []}}, [2, {"f_g": 3}]], "h": "i_j"}
+
+        # act
+        actual = transform_keys(data=data, translate=snake_case_key_to_camel_case)
+
+        # assert
+        assert actual == {"aB": [1, {"cD": {"e": []}}, [2, {"fG": 3}]], "h": "i_j"}
+        assert list(actual) == ["aB", "h"]
+
+    def test_nesting_deeper_than_the_recursion_limit(self):
+        # arrange
+        data = {}
+        for _ in range(5000):
+            data = {"nested_object": data}
+
+        # act
+        actual = transform_keys(data=data, translate=snake_case_key_to_camel_case)
+
+        # assert
+        depth = 0
+        while actual:
+            actual = actual["nestedObject"]
+            depth += 1
+        assert depth == 5000
+
+    def test_scalars_are_returned_as_they_are(self):
+        assert transform_keys(data=1, translate=snake_case_key_to_camel_case) == 1
+
+    def test_model_keys_round_trip(self):
+        for key in Influencer().__dict__:
+            assert camel_case_key_to_snake_case(snake_case_key_to_camel_case(key)) == key
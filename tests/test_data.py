@@ -0,0 +1,338 @@
+import os
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+from unittest.mock import patch, Mock, MagicMock
+
+from mapper.object_mapper import ObjectMapper
+from sqlalchemy import create_engine, inspect, MetaData, Table, Column, String, PickleType
+
+from src.data import get_engine, get_pool_options, SqlAlchemyDataManager
+from src.data.backfill import add_claim_columns, backfill_claims
+from src.data.sweep import orphaned_keys, sweep
+from src.data.entities import create_mappings, SqlAlchemyBrandEntity, SqlAlchemyCampaignEntity
+from src.data.migrations.enum_bitmasks import upgrade, downgrade
+from src.data.migrations.pagination_indexes import create_pagination_indexes
+from src.domain.images import content_key, variant_key, ImageVariantFormatEnum
+from src.domain.models import ValueEnum, CategoryEnum, CampaignStateEnum
+from src.types import AuthUserRepository, ImageRepository
+from tests import InMemorySqliteDataManager, brand_dto_generator, RepoEnum, influencer_dto_generator, \
+    brand_generator, influencer_generator, user_dto_generator, campaign_dto_generator, campaign_generator
+
+
+class TestEngineRegistry(TestCase):
+
+    def test_get_engine_returns_same_engine_for_url(self):
+        # act
+        first = get_engine("sqlite:///:memory:")
+        second = get_engine("sqlite:///:memory:")
+
+        # assert
+        assert first is second
+
+    def test_get_engine_returns_different_engine_per_url(self):
+        # act
+        first = get_engine("sqlite:///:memory:")
+        second = get_engine("sqlite://")
+
+        # assert
+        assert first is not second
+
+    def test_get_pool_options_defaults(self):
+        with patch.dict(os.environ, {}, clear=True):
+            # act
+            options = get_pool_options()
+
+        # assert
+        assert options == {"pool_size": 1,
+                           "max_overflow": 2,
+                           "pool_recycle": 280,
+                           "pool_pre_ping": True}
+
+    def test_get_pool_options_from_environment(self):
+        with patch.dict(os.environ, {"DB_POOL_SIZE": "5",
+                                     "DB_POOL_MAX_OVERFLOW": "10",
+                                     "DB_POOL_RECYCLE_SECONDS": "60",
+                                     "DB_POOL_PRE_PING": "false"}, clear=True):
+            # act
+            options = get_pool_options()
+
+        # assert
+        assert options == {"pool_size": 5,
+                           "max_overflow": 10,
+                           "pool_recycle": 60,
+                           "pool_pre_ping": False}
+
+
+class TestSqlAlchemyDataManager(TestCase):
+
+    def setUp(self) -> None:
+        self.__engine = get_engine("sqlite:///:memory:")
+        self.__sut = SqlAlchemyDataManager(engine=self.__engine)
+
+    def test_session_is_shared_within_request(self):
+        assert self.__sut.session is self.__sut.session
+
+    def test_end_session_starts_new_session_for_next_request(self):
+        # arrange
+        first = self.__sut.session
+
+        # act
+        self.__sut.end_session()
+
+        # assert
+        assert self.__sut.session is not first
+
+    def test_end_session_when_no_session_was_opened(self):
+        self.__sut.end_session()
+
+    def test_data_managers_share_engine(self):
+        # act
+        other = SqlAlchemyDataManager(engine=get_engine("sqlite:///:memory:"))
+
+        # assert
+        assert other.engine is self.__sut.engine
+
+
+class TestBackfill(TestCase):
+
+    def test_add_claim_columns(self):
+        # arrange
+        engine = create_engine('sqlite:///:memory:')
+        engine.execute('CREATE TABLE brand (id VARCHAR(36) PRIMARY KEY, auth_user_id VARCHAR(64))')
+        engine.execute('CREATE TABLE influencer (id VARCHAR(36) PRIMARY KEY, auth_user_id VARCHAR(64), '
+                       'email VARCHAR(254))')
+
+        # act
+        added = add_claim_columns(engine=engine)
+        added_again = add_claim_columns(engine=engine)
+
+        # assert
+        assert added == ['brand.first_name', 'brand.last_name', 'brand.email',
+                         'influencer.first_name', 'influencer.last_name']
+        assert added_again == []
+
+    def test_backfill_claims(self):
+        # arrange
+        mapper = ObjectMapper()
+        create_mappings(mapper)
+        data_manager = InMemorySqliteDataManager()
+        brands = [brand_dto_generator(num=num, repo=RepoEnum.STD_REPO) for num in range(1, 4)]
+        influencer = influencer_dto_generator(num=1)
+        entities = [brand_generator(brand, mapper=mapper) for brand in brands]
+        for entity in entities:
+            entity.first_name, entity.last_name, entity.email = None, None, None
+        data_manager.create_fake_data(entities + [influencer_generator(influencer, mapper=mapper)])
+        auth_users = {brands[0].auth_user_id: user_dto_generator(num=1),
+                      brands[2].auth_user_id: user_dto_generator(num=3)}
+        auth_user_repository: AuthUserRepository = Mock()
+        auth_user_repository.get_by_ids = MagicMock(
+            side_effect=lambda ids: {_id: auth_users[_id] for _id in ids if _id in auth_users})
+
+        # act
+        updated = backfill_claims(data_manager=data_manager, auth_user_repository=auth_user_repository,
+                                  batch_size=2)
+
+        # assert
+        assert updated == 2
+        stored = {brand.auth_user_id: brand for brand in data_manager.session.query(SqlAlchemyBrandEntity).all()}
+        assert stored[brands[0].auth_user_id].first_name == auth_users[brands[0].auth_user_id].first_name
+        assert stored[brands[1].auth_user_id].email is None
+        assert stored[brands[2].auth_user_id].last_name == auth_users[brands[2].auth_user_id].last_name
+        assert auth_user_repository.get_by_ids.call_count == 2
+
+
+
+SHARED_IMAGE = content_key(digest="a" * 64, extension="png")
+LOGO = content_key(digest="b" * 64, extension="jpg")
+ORPHAN = content_key(digest="c" * 64, extension="png")
+POSTED_ORPHAN = "7e9b0a38-1b2c-4d5e-8f90-0a1b2c3d4e5f/0d1e2f3a-4b5c-4d6e-8f70-8192a3b4c5d6.png"
+
+
+class TestSweep(TestCase):
+
+    def setUp(self):
+        mapper = ObjectMapper()
+        create_mappings(mapper)
+        self.__data_manager = InMemorySqliteDataManager()
+        brand = brand_dto_generator(num=1)
+        brand.logo = LOGO
+        campaigns = [campaign_dto_generator(num=num) for num in range(1, 3)]
+        for campaign in campaigns:
+            campaign.product_image1 = SHARED_IMAGE
+        self.__data_manager.create_fake_data([brand_generator(brand, mapper=mapper)] +
+                                             [campaign_generator(campaign, mapper=mapper) for campaign in campaigns])
+        self.__data_manager.session.commit()
+        self.__mapper = mapper
+        self.__old = datetime.now(timezone.utc) - timedelta(days=2)
+        self.__image_repository: ImageRepository = Mock()
+        self.__image_repository.list_images = MagicMock(return_value=[
+            (SHARED_IMAGE, self.__old),
+            (variant_key(SHARED_IMAGE, 64, ImageVariantFormatEnum.WEBP), self.__old),
+            (LOGO, self.__old),
+            (ORPHAN, self.__old),
+            (variant_key(ORPHAN, 256, ImageVariantFormatEnum.JPEG), self.__old),
+            (POSTED_ORPHAN, self.__old),
+            ("default_brand_logo.png", self.__old)])
+
+    def test_sweep_finds_images_nothing_refers_to(self):
+        # act
+        orphans = sweep(data_manager=self.__data_manager, image_repository=self.__image_repository)
+
+        # assert
+        assert orphans == [ORPHAN, variant_key(ORPHAN, 256, ImageVariantFormatEnum.JPEG), POSTED_ORPHAN]
+        self.__image_repository.delete.assert_not_called()
+
+    def test_sweep_deletes_when_asked(self):
+        # act
+        orphans = sweep(data_manager=self.__data_manager, image_repository=self.__image_repository, delete=True)
+
+        # assert
+        self.__image_repository.delete.assert_called_once_with(keys=orphans)
+
+    def test_sweep_keeps_an_image_referenced_after_the_bucket_was_listed(self):
+        # arrange
+        listed = self.__image_repository.list_images.return_value
+
+        def list_images():
+            campaign = campaign_dto_generator(num=3)
+            campaign.product_image2 = ORPHAN
+            self.__data_manager.create_fake_data([campaign_generator(campaign, mapper=self.__mapper)])
+            self.__data_manager.session.commit()
+            return listed
+
+        self.__image_repository.list_images = MagicMock(side_effect=list_images)
+
+        # act
+        deleted = sweep(data_manager=self.__data_manager, image_repository=self.__image_repository, delete=True)
+
+        # assert
+        assert deleted == [POSTED_ORPHAN]
+        self.__image_repository.delete.assert_called_once_with(keys=[POSTED_ORPHAN])
+
+    def test_variants_are_kept_while_their_image_is_recent(self):
+        # arrange
+        now = datetime.now(timezone.utc)
+        images = [(variant_key(ORPHAN, 64, ImageVariantFormatEnum.WEBP), now - timedelta(days=30)),
+                  (ORPHAN, now - timedelta(hours=1))]
+
+        # act
+        orphans = orphaned_keys(images=images, referenced=set(), now=now)
+
+        # assert
+        assert orphans == []
+
+    def test_recent_images_are_kept(self):
+        # arrange
+        now = datetime.now(timezone.utc)
+
+        # act
+        orphans = orphaned_keys(images=[(ORPHAN, now - timedelta(hours=1))], referenced=set(), now=now)
+
+        # assert
+        assert orphans == []
+
+
+class TestPaginationIndexMigration(TestCase):
+
+    def test_create_pagination_indexes(self):
+        # arrange
+        engine = create_engine('sqlite:///:memory:')
+        engine.execute('CREATE TABLE brand (id VARCHAR(36) PRIMARY KEY, created DATETIME)')
+        engine.execute('CREATE TABLE influencer (id VARCHAR(36) PRIMARY KEY, created DATETIME)')
+        engine.execute('CREATE TABLE campaign (id VARCHAR(36) PRIMARY KEY, brand_id VARCHAR(360), created DATETIME)')
+        engine.execute('CREATE INDEX ix_brand_created_id ON brand (created, id)')
+
+        # act
+        created = create_pagination_indexes(engine=engine)
+        created_again = create_pagination_indexes(engine=engine)
+
+        # assert
+        assert created == ['ix_influencer_created_id', 'ix_campaign_brand_id_created_id']
+        assert created_again == []
+        assert [(index['name'], index['column_names']) for index in inspect(engine).get_indexes('campaign')] == \
+               [('ix_campaign_brand_id_created_id', ['brand_id', 'created', 'id'])]
+
+
+class TestEnumBitmaskMigration(TestCase):
+
+    def setUp(self) -> None:
+        self.__engine = create_engine('sqlite://')
+        metadata = MetaData()
+        self.__tables = {
+            name: Table(name, metadata, Column('id', String(36), primary_key=True),
+                        *[Column(column_name, PickleType) for column_name in columns])
+            for name, columns in [('brand', ['values', 'categories']),
+                                  ('influencer', ['values', 'categories']),
+                                  ('campaign', ['campaign_values', 'campaign_categories', 'campaign_state'])]
+        }
+        metadata.create_all(self.__engine)
+        self.__engine.execute(self.__tables['brand'].insert(),
+                              {'id': '1', 'values': [ValueEnum.VALUE7, ValueEnum.ORGANIC],
+                               'categories': [CategoryEnum.PET]})
+        self.__engine.execute(self.__tables['campaign'].insert(),
+                              {'id': '1', 'campaign_values': [], 'campaign_categories': [CategoryEnum.FOOD],
+                               'campaign_state': CampaignStateEnum.ACTIVE})
+
+    def test_upgrade(self):
+        # act
+        converted = upgrade(engine=self.__engine)
+        converted_again = upgrade(engine=self.__engine)
+
+        # assert
+        assert len(converted) == 7
+        assert converted_again == []
+        brand = self.__engine.execute(SqlAlchemyBrandEntity.__table__.select()
+                                      .with_only_columns([SqlAlchemyBrandEntity.values,
+                                                          SqlAlchemyBrandEntity.categories])).first()
+        assert brand['values'] == [ValueEnum.ORGANIC, ValueEnum.VALUE7]
+        assert brand['categories'] == [CategoryEnum.PET]
+        campaign = self.__engine.execute(SqlAlchemyCampaignEntity.__table__.select()
+                                         .with_only_columns([SqlAlchemyCampaignEntity.campaign_values,
+                                                             SqlAlchemyCampaignEntity.campaign_state])).first()
+        assert campaign['campaign_values'] == []
+        assert campaign['campaign_state'] == CampaignStateEnum.ACTIVE
+
+    def test_upgrade_resumes_after_the_column_was_added(self):
+        # arrange
+        self.__engine.execute('ALTER TABLE brand ADD COLUMN values_migrating INTEGER NULL')
+
+        # act
+        converted = upgrade(engine=self.__engine)
+
+        # assert
+        assert len(converted) == 7
+        brand = self.__engine.execute(SqlAlchemyBrandEntity.__table__.select()
+                                      .with_only_columns([SqlAlchemyBrandEntity.values])).first()
+        assert brand['values'] == [ValueEnum.ORGANIC, ValueEnum.VALUE7]
+
+    def test_upgrade_resumes_after_the_old_column_was_dropped(self):
+        # arrange
+        self.__engine.execute('ALTER TABLE brand ADD COLUMN values_migrating INTEGER NULL')
+        self.__engine.execute('UPDATE brand SET values_migrating = 66')
+        self.__engine.execute('ALTER TABLE brand DROP COLUMN "values"')
+
+        # act
+        converted = upgrade(engine=self.__engine)
+        converted_again = upgrade(engine=self.__engine)
+
+        # assert
+        assert 'brand.values' in converted
+        assert len(converted) == 7
+        assert converted_again == []
+        brand = self.__engine.execute(SqlAlchemyBrandEntity.__table__.select()
+                                      .with_only_columns([SqlAlchemyBrandEntity.values])).first()
+        assert brand['values'] == [ValueEnum.ORGANIC, ValueEnum.VALUE7]
+
+    def test_downgrade(self):
+        # arrange
+        upgrade(engine=self.__engine)
+
+        # act
+        converted = downgrade(engine=self.__engine)
+
+        # assert
+        assert len(converted) == 7
+        brand = self.__engine.execute(self.__tables['brand'].select()).first()
+        assert brand['values'] == [ValueEnum.ORGANIC, ValueEnum.VALUE7]
+        campaign = self.__engine.execute(self.__tables['campaign'].select()).first()
+        assert campaign['campaign_state'] == CampaignStateEnum.ACTIVE
@@ -3,10 +3,11 @@ from unittest import TestCase
 from mapper.object_mapper import ObjectMapper
 
 from src.data.entities import create_mappings, SqlAlchemyBrandEntity, SqlAlchemyInfluencerEntity, \
-    SqlAlchemyCampaignEntity
-from src.domain.models import Brand, Influencer, Campaign, CampaignStateEnum
+    SqlAlchemyCampaignEntity, EnumBitmask
+from src.domain.models import Brand, Influencer, Campaign, CampaignStateEnum, ValueEnum, CategoryEnum
 from tests import brand_dto_generator, get_entity_dict, influencer_dto_generator, assert_brand_db_fields_are_equal, \
-    assert_influencer_db_fields_are_equal, campaign_dto_generator, assert_campaign_db_fields_are_equal
+    assert_influencer_db_fields_are_equal, campaign_dto_generator, assert_campaign_db_fields_are_equal, \
+    InMemorySqliteDataManager
 
 
 class TestMappings(TestCase):
@@ -93,3 +94,55 @@ class TestCampaignMappings(TestMappings):
         # assert
         assert_campaign_db_fields_are_equal(campaign1=campaign.__dict__,
                                             campaign2=campaign_back.__dict__)
+
+
+class TestEnumBitmask(TestCase):
+
+    def setUp(self) -> None:
+        self.__mapper = ObjectMapper()
+        create_mappings(mapper=self.__mapper)
+        self.__data_manager = InMemorySqliteDataManager()
+
+    def test_round_trip_is_in_declaration_order(self):
+        # arrange
+        bitmask = EnumBitmask(ValueEnum)
+
+        # act
+        mask = bitmask.to_bitmask([ValueEnum.VALUE10, ValueEnum.SUSTAINABLE, ValueEnum.VALUE10])
+
+        # assert
+        assert mask == 0b1000000001
+        assert bitmask.from_bitmask(mask) == [ValueEnum.SUSTAINABLE, ValueEnum.VALUE10]
+        assert bitmask.from_bitmask(0) == []
+
+    def test_set_lists_are_in_declaration_order(self):
+        # arrange
+        campaign = self.__mapper.map(from_obj=campaign_dto_generator(num=1), to_type=SqlAlchemyCampaignEntity)
+
+        # act
+        campaign.campaign_values = [ValueEnum.VALUE10, ValueEnum.SUSTAINABLE, ValueEnum.VALUE10]
+        campaign.campaign_categories = None
+
+        # assert
+        assert campaign.campaign_values == [ValueEnum.SUSTAINABLE, ValueEnum.VALUE10]
+        assert campaign.campaign_categories is None
+
+    def test_contains_any_and_contains_all(self):
+        # arrange
+        brands = [brand_dto_generator(num=num) for num in range(1, 4)]
+        for num, brand in enumerate(brands):
+            brand.auth_user_id = f"auth_user_{num}"
+        self.__data_manager.create_fake_data([self.__mapper.map(from_obj=brand, to_type=SqlAlchemyBrandEntity)
+                                              for brand in brands])
+        query = self.__data_manager.session.query(SqlAlchemyBrandEntity.id)
+
+        # act
+        any_vegan_or_value6 = query.filter(
+            SqlAlchemyBrandEntity.values.contains_any([ValueEnum.VEGAN, ValueEnum.VALUE6])).all()
+        all_recycled_and_fashion = query.filter(
+            SqlAlchemyBrandEntity.values.contains_all([ValueEnum.RECYCLED, ValueEnum.SUSTAINABLE])).filter(
+            SqlAlchemyBrandEntity.categories.contains_all([CategoryEnum.FASHION])).all()
+
+        # assert
+        assert sorted(row.id for row in any_vegan_or_value6) == sorted([brands[0].id, brands[2].id])
+        assert sorted(row.id for row in all_recycled_and_fashion) == sorted([brands[1].id, brands[2].id])
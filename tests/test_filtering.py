@@ -0,0 +1,151 @@
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+import numpy as np
+
+from src.domain.filtering import CampaignIndex, CampaignIndexRows, CampaignFilter, FIRST_CHUNK_ROWS
+from src.domain.matching import to_bitmask
+from src.domain.models import ValueEnum, CategoryEnum, CampaignStateEnum
+
+START = datetime(2022, 1, 1)
+
+
+def index_rows(campaigns: list[tuple[list, list, CampaignStateEnum]]) -> CampaignIndexRows:
+    return CampaignIndexRows(ids=[f"{num:08d}" for num in range(len(campaigns))],
+                             created=np.array([START + timedelta(seconds=num) for num in range(len(campaigns))],
+                                              dtype='datetime64[us]'),
+                             value_masks=np.array([to_bitmask(values) for values, _, _ in campaigns],
+                                                  dtype=np.uint16),
+                             category_masks=np.array([to_bitmask(categories) for _, categories, _ in campaigns],
+                                                     dtype=np.uint16),
+                             states=[state for _, _, state in campaigns])
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCampaignIndex(TestCase):
+
+    def setUp(self) -> None:
+        self.__loads = 0
+        self.__rows = index_rows([
+            ([ValueEnum.VEGAN], [CategoryEnum.FASHION], CampaignStateEnum.ACTIVE),
+            ([ValueEnum.VEGAN, ValueEnum.RECYCLED], [CategoryEnum.FOOD], CampaignStateEnum.ACTIVE),
+            ([ValueEnum.VEGAN], [CategoryEnum.FASHION, CategoryEnum.FOOD], CampaignStateEnum.DRAFT),
+            ([ValueEnum.RECYCLED], [CategoryEnum.FASHION], CampaignStateEnum.ACTIVE),
+        ])
+        self.__clock = FakeClock()
+        self.__sut = CampaignIndex(loader=self.__loader, max_age_seconds=60, clock=self.__clock)
+
+    def __loader(self) -> CampaignIndexRows:
+        self.__loads += 1
+        return self.__rows
+
+    def __ids(self, campaign_filter: CampaignFilter, limit: int = 10, before=None) -> list[str]:
+        return [id_ for id_, _ in self.__sut.query(campaign_filter=campaign_filter, limit=limit, before=before)]
+
+    def test_query_defaults_to_active_campaigns_newest_first(self):
+        assert self.__ids(CampaignFilter()) == ["00000003", "00000001", "00000000"]
+
+    def test_query_intersects_categories_and_values(self):
+        # act
+        ids = self.__ids(CampaignFilter(categories=(CategoryEnum.FASHION,), values=(ValueEnum.VEGAN,)))
+
+        # assert
+        assert ids == ["00000000"]
+
+    def test_query_unions_members_of_the_same_field(self):
+        # act
+        ids = self.__ids(CampaignFilter(categories=(CategoryEnum.FASHION, CategoryEnum.FOOD),
+                                        states=(CampaignStateEnum.ACTIVE, CampaignStateEnum.DRAFT)))
+
+        # assert
+        assert ids == ["00000003", "00000002", "00000001", "00000000"]
+
+    def test_query_match_all(self):
+        # act
+        ids = self.__ids(CampaignFilter(values=(ValueEnum.VEGAN, ValueEnum.RECYCLED), match_all=True))
+
+        # assert
+        assert ids == ["00000001"]
+
+    def test_query_before(self):
+        # act
+        ids = self.__ids(CampaignFilter(), before=(START + timedelta(seconds=1), "00000001"))
+
+        # assert
+        assert ids == ["00000000"]
+
+    def test_query_returns_created(self):
+        # act
+        matches = self.__sut.query(campaign_filter=CampaignFilter(), limit=1)
+
+        # assert
+        assert matches == [("00000003", START + timedelta(seconds=3))]
+
+    def test_query_across_chunks(self):
+        # arrange
+        self.__rows = index_rows([([ValueEnum.VEGAN], [], CampaignStateEnum.ACTIVE)]
+                                 + [([], [], CampaignStateEnum.ACTIVE)] * (FIRST_CHUNK_ROWS * 5)
+                                 + [([ValueEnum.VEGAN], [], CampaignStateEnum.ACTIVE)])
+
+        # act
+        ids = self.__ids(CampaignFilter(values=(ValueEnum.VEGAN,)))
+
+        # assert
+        assert ids == [f"{FIRST_CHUNK_ROWS * 5 + 1:08d}", "00000000"]
+
+    def test_index_is_built_once_until_it_is_too_old(self):
+        # act
+        self.__ids(CampaignFilter())
+        self.__ids(CampaignFilter())
+        self.__clock.now = 60
+        self.__ids(CampaignFilter())
+
+        # assert
+        assert self.__loads == 2
+
+    def test_upsert_updates_a_row_in_place(self):
+        # arrange
+        self.__ids(CampaignFilter())
+
+        # act
+        self.__sut.upsert(id_="00000002", created=START + timedelta(seconds=2),
+                          values=[ValueEnum.VEGAN], categories=[CategoryEnum.FASHION],
+                          state=CampaignStateEnum.ACTIVE)
+
+        # assert
+        assert self.__ids(CampaignFilter(values=(ValueEnum.VEGAN,))) == ["00000002", "00000001", "00000000"]
+        assert self.__loads == 1
+
+    def test_upsert_appends_new_campaigns(self):
+        # arrange
+        self.__ids(CampaignFilter())
+
+        # act
+        for num in range(4, 40):
+            self.__sut.upsert(id_=f"{num:08d}", created=START + timedelta(seconds=num),
+                              values=[ValueEnum.VALUE9], categories=[], state=CampaignStateEnum.ACTIVE)
+
+        # assert
+        assert self.__ids(CampaignFilter(values=(ValueEnum.VALUE9,)), limit=2) == ["00000039", "00000038"]
+        assert len(self.__sut) == 40
+        assert self.__loads == 1
+
+    def test_upsert_out_of_order_rebuilds(self):
+        # arrange
+        self.__ids(CampaignFilter())
+
+        # act
+        self.__sut.upsert(id_="older", created=START - timedelta(days=1),
+                          values=[], categories=[], state=CampaignStateEnum.ACTIVE)
+        self.__ids(CampaignFilter())
+
+        # assert
+        assert self.__loads == 2
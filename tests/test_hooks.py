@@ -1,19 +1,21 @@
 from unittest import TestCase
-from unittest.mock import Mock, MagicMock, call
+from unittest.mock import Mock, MagicMock
 from uuid import uuid4
 
 from callee import Captor
 
-from src.crosscutting import JsonCamelToSnakeCaseDeserializer
-from src.domain.models import User, Brand, Influencer, ValueEnum, CategoryEnum, CampaignStateEnum
+from src.crosscutting import JsonCamelToSnakeCaseDeserializer, ConcurrentExecutor, FailurePolicy, CamelCaseBody, \
+    JsonSnakeToCamelSerializer
+from src.domain.models import User, Brand, Influencer, ValueEnum, CategoryEnum, CampaignStateEnum, Campaign
 from src.domain.validation import InfluencerValidator, BrandValidator, CampaignValidator
 from src.exceptions import NotFoundException
 from src.types import AuthUserRepository, BrandRepository
 from src.web import PinfluencerContext, PinfluencerResponse
 from src.web.hooks import UserAfterHooks, UserBeforeHooks, BrandAfterHooks, InfluencerAfterHooks, CommonBeforeHooks, \
-    InfluencerBeforeHooks, BrandBeforeHooks, CampaignBeforeHooks, CampaignAfterHooks
+    InfluencerBeforeHooks, BrandBeforeHooks, CampaignBeforeHooks, CampaignAfterHooks, FeedAfterHooks, CacheAfterHooks
+from src.web.caching import strong_etag
 from tests import brand_dto_generator, RepoEnum, get_auth_user_event, create_for_auth_user_event, get_brand_id_event, \
-    get_influencer_id_event, get_campaign_id_event
+    get_influencer_id_event, get_campaign_id_event, page_body
 
 TEST_S3_URL = "https://pinfluencer-product-images.s3.eu-west-2.amazonaws.com"
 
@@ -82,7 +84,7 @@ class TestBrandBeforeHooks(TestCase):
         # assert
         assert context.short_circuit == True
         assert context.response.status_code == 400
-        assert context.response.body == {}
+        assert [error["field"] for error in context.response.body["errors"]] == ['website']
 
     def test_validate_auth_brand(self):
 
@@ -176,7 +178,7 @@ class TestInfluencerBeforeHooks(TestCase):
         # assert
         assert context.short_circuit == True
         assert context.response.status_code == 400
-        assert context.response.body == {}
+        assert [error["field"] for error in context.response.body["errors"]] == ['website']
 
 
 class TestCampaignBeforeHooks(TestCase):
@@ -209,7 +211,7 @@ class TestCampaignBeforeHooks(TestCase):
         # assert
         assert context.short_circuit == True
         assert context.response.status_code == 400
-        assert context.response.body == {}
+        assert [error["field"] for error in context.response.body["errors"]] == ['campaignHashtag']
 
     def test_validate_id(self):
 
@@ -296,43 +298,35 @@ class TestBrandAfterHooks(TestCase):
         assert user_payload_arg.email == email
         assert user_payload_arg.auth_user_id == auth_user_id
 
-    def test_tag_bucket_url_to_images(self):
+    def test_serialize(self):
         # arrange
-        image_key1 = "path1"
-        image_key2 = "path2"
-        context = PinfluencerContext(response=PinfluencerResponse(body={
-            "header_image": image_key1,
-            "logo": image_key2
-        }))
+        brand = Brand(logo="path1", header_image="path2", values=[ValueEnum.VEGAN])
+        context = PinfluencerContext(response=PinfluencerResponse(body=brand.__dict__))
 
         # act
-        self.__sut.tag_bucket_url_to_images(context=context)
+        self.__sut.serialize(context=context)
 
         # assert
-        assert context.response.body["header_image"] == f"{TEST_S3_URL}/{image_key1}"
-        assert context.response.body["logo"] == f"{TEST_S3_URL}/{image_key2}"
+        assert isinstance(context.response.body, CamelCaseBody)
+        assert context.response.body["logo"] == f"{TEST_S3_URL}/path1"
+        assert context.response.body["headerImage"] == f"{TEST_S3_URL}/path2"
+        assert context.response.body["values"] == ["VEGAN"]
 
-    def test_tag_bucket_url_to_images_collection(self):
+    def test_serialize_collection(self):
         # arrange
-        image_key1 = "path1"
-        image_key2 = "path2"
-        image_key3 = "path3"
-        image_key4 = "path4"
-        context = PinfluencerContext(response=PinfluencerResponse(body=[
-            {"header_image": image_key1,
-             "logo": image_key2},
-            {"header_image": image_key3,
-             "logo": image_key4}
-        ]))
+        brands = [Brand(logo="path1", header_image="path2"), Brand(logo="path3", header_image="path4")]
+        context = PinfluencerContext(response=PinfluencerResponse(body=page_body([brand.__dict__
+                                                                                  for brand in brands],
+                                                                                 next_cursor="cursor")))
 
         # act
-        self.__sut.tag_bucket_url_to_images_collection(context=context)
+        self.__sut.serialize_collection(context=context)
 
         # assert
-        assert context.response.body[0]["header_image"] == f"{TEST_S3_URL}/{image_key1}"
-        assert context.response.body[0]["logo"] == f"{TEST_S3_URL}/{image_key2}"
-        assert context.response.body[1]["header_image"] == f"{TEST_S3_URL}/{image_key3}"
-        assert context.response.body[1]["logo"] == f"{TEST_S3_URL}/{image_key4}"
+        assert isinstance(context.response.body, CamelCaseBody)
+        assert context.response.body["nextCursor"] == "cursor"
+        assert context.response.body["items"][0]["logo"] == f"{TEST_S3_URL}/path1"
+        assert context.response.body["items"][1]["headerImage"] == f"{TEST_S3_URL}/path4"
 
 
 class TestInfluencerAfterHooks(TestCase):
@@ -368,37 +362,31 @@ class TestInfluencerAfterHooks(TestCase):
         assert user_payload_arg.email == email
         assert user_payload_arg.auth_user_id == auth_user_id
 
-    def test_tag_bucket_url_to_images(self):
+    def test_serialize(self):
         # arrange
-        image_key = "path"
-        context = PinfluencerContext(response=PinfluencerResponse(body={
-            "image": image_key
-        }))
+        influencer = Influencer(image="path", categories=[CategoryEnum.PET])
+        context = PinfluencerContext(response=PinfluencerResponse(body=influencer.__dict__))
 
         # act
-        self.__sut.tag_bucket_url_to_images(context=context)
+        self.__sut.serialize(context=context)
 
         # assert
-        assert context.response.body["image"] == f"{TEST_S3_URL}/{image_key}"
+        assert isinstance(context.response.body, CamelCaseBody)
+        assert context.response.body["image"] == f"{TEST_S3_URL}/path"
+        assert context.response.body["categories"] == ["PET"]
 
-    def test_tag_bucket_url_to_images_collection(self):
+    def test_serialize_collection(self):
         # arrange
-        image_key = "path1"
-        image_key2 = "path2"
-        image_key3 = "path3"
-        context = PinfluencerContext(response=PinfluencerResponse(body=[
-            {"image": image_key},
-            {"image": image_key2},
-            {"image": image_key3}
-        ]))
+        influencers = [Influencer(image="path1"), Influencer(image="path2")]
+        context = PinfluencerContext(response=PinfluencerResponse(body=page_body([influencer.__dict__
+                                                                                  for influencer in influencers])))
 
         # act
-        self.__sut.tag_bucket_url_to_images_collection(context=context)
+        self.__sut.serialize_collection(context=context)
 
         # assert
-        assert context.response.body[0]["image"] == f"{TEST_S3_URL}/{image_key}"
-        assert context.response.body[1]["image"] == f"{TEST_S3_URL}/{image_key2}"
-        assert context.response.body[2]["image"] == f"{TEST_S3_URL}/{image_key3}"
+        assert context.response.body["items"][0]["image"] == f"{TEST_S3_URL}/path1"
+        assert context.response.body["items"][1]["image"] == f"{TEST_S3_URL}/path2"
 
 
 class TestCampaignAfterHooks(TestCase):
@@ -406,128 +394,38 @@ class TestCampaignAfterHooks(TestCase):
     def setUp(self) -> None:
         self.__sut = CampaignAfterHooks()
 
-    def test_tag_bucket_url_to_images(self):
-        # arrange
-        image_key = "path1"
-        image_key2 = "path2"
-        image_key3 = "path3"
-        context = PinfluencerContext(response=PinfluencerResponse(body={
-            "product_image1": image_key,
-            "product_image2": image_key2,
-            "product_image3": image_key3
-        }))
-
-        # act
-        self.__sut.tag_bucket_url_to_images(context=context)
-
-        # assert
-        assert context.response.body["product_image1"] == f"{TEST_S3_URL}/{image_key}"
-        assert context.response.body["product_image2"] == f"{TEST_S3_URL}/{image_key2}"
-        assert context.response.body["product_image3"] == f"{TEST_S3_URL}/{image_key3}"
-
-    def test_format_values_and_categories(self):
-
+    def test_serialize(self):
         # arrange
-        expected_values = ["VALUE9", "VALUE8", "VALUE7"]
-        expected_categories = ["PET", "FASHION", "FITNESS"]
-        context = PinfluencerContext(response=PinfluencerResponse(body={
-            "campaign_values": [ValueEnum.VALUE9, ValueEnum.VALUE8, ValueEnum.VALUE7],
-            "campaign_categories": [CategoryEnum.PET, CategoryEnum.FASHION, CategoryEnum.FITNESS]
-        }))
+        campaign = Campaign(product_image1="path1",
+                            campaign_values=[ValueEnum.VALUE9, ValueEnum.VALUE8],
+                            campaign_categories=[CategoryEnum.PET],
+                            campaign_state=CampaignStateEnum.ACTIVE)
+        context = PinfluencerContext(response=PinfluencerResponse(body=campaign.__dict__))
 
         # act
-        self.__sut.format_values_and_categories(context=context)
+        self.__sut.serialize(context=context)
 
         # assert
-        assert context.response.body["campaign_categories"] == expected_categories
-        assert context.response.body["campaign_values"] == expected_values
+        assert isinstance(context.response.body, CamelCaseBody)
+        assert context.response.body["productImage1"] == f"{TEST_S3_URL}/path1"
+        assert context.response.body["campaignValues"] == ["VALUE9", "VALUE8"]
+        assert context.response.body["campaignCategories"] == ["PET"]
+        assert context.response.body["campaignState"] == "ACTIVE"
 
-    def test_format_values_and_categories_collection(self):
+    def test_serialize_collection(self):
         # arrange
-        expected_values = ["VALUE9", "VALUE8", "VALUE7"]
-        expected_categories = ["PET", "FASHION", "FITNESS"]
-        expected_values2 = ["VALUE10", "VALUE8", "VALUE7"]
-        expected_categories2 = ["PET", "FASHION", "CATEGORY9"]
-        context = PinfluencerContext(response=PinfluencerResponse(body=[
-            {
-                "campaign_values": [ValueEnum.VALUE9, ValueEnum.VALUE8, ValueEnum.VALUE7],
-                "campaign_categories": [CategoryEnum.PET, CategoryEnum.FASHION, CategoryEnum.FITNESS]
-            },
-            {
-                "campaign_values": [ValueEnum.VALUE10, ValueEnum.VALUE8, ValueEnum.VALUE7],
-                "campaign_categories": [CategoryEnum.PET, CategoryEnum.FASHION, CategoryEnum.CATEGORY9]
-            }
-        ]))
+        campaigns = [Campaign(campaign_state=CampaignStateEnum.DRAFT),
+                     Campaign(campaign_state=CampaignStateEnum.CLOSED, product_image3="path3")]
+        context = PinfluencerContext(response=PinfluencerResponse(body=page_body([campaign.__dict__
+                                                                                  for campaign in campaigns])))
 
         # act
-        self.__sut.format_values_and_categories_collection(context=context)
+        self.__sut.serialize_collection(context=context)
 
         # assert
-        assert context.response.body[0]["campaign_categories"] == expected_categories
-        assert context.response.body[0]["campaign_values"] == expected_values
-        assert context.response.body[1]["campaign_categories"] == expected_categories2
-        assert context.response.body[1]["campaign_values"] == expected_values2
-
-    def test_tag_bucket_url_to_images_collection(self):
-        # arrange
-        image_key = "path1"
-        image_key2 = "path2"
-        image_key3 = "path3"
-        image_key4 = "path4"
-        image_key5 = "path5"
-        image_key6 = "path6"
-        context = PinfluencerContext(response=PinfluencerResponse(body=[
-            {
-                "product_image1": image_key,
-                "product_image2": image_key2,
-                "product_image3": image_key3
-            },
-            {
-                "product_image1": image_key4,
-                "product_image2": image_key5,
-                "product_image3": image_key6
-            }
-        ]))
-
-        # act
-        self.__sut.tag_bucket_url_to_images_collection(context=context)
-
-        # assert
-        assert context.response.body[0]["product_image1"] == f"{TEST_S3_URL}/{image_key}"
-        assert context.response.body[0]["product_image2"] == f"{TEST_S3_URL}/{image_key2}"
-        assert context.response.body[0]["product_image3"] == f"{TEST_S3_URL}/{image_key3}"
-        assert context.response.body[1]["product_image1"] == f"{TEST_S3_URL}/{image_key4}"
-        assert context.response.body[1]["product_image2"] == f"{TEST_S3_URL}/{image_key5}"
-        assert context.response.body[1]["product_image3"] == f"{TEST_S3_URL}/{image_key6}"
-
-    def test_format_campaign_state(self):
-
-        # arrange
-        context = context = PinfluencerContext(
-            response=PinfluencerResponse(body={"campaign_state": CampaignStateEnum.DRAFT}))
-
-        # act
-        self.__sut.format_campaign_state(context)
-
-        # assert
-        assert context.response.body["campaign_state"] == "DRAFT"
-
-    def test_format_campaign_state_collection(self):
-        # arrange
-        context = context = PinfluencerContext(
-            response=PinfluencerResponse(body=[
-                {"campaign_state": CampaignStateEnum.DRAFT},
-                {"campaign_state": CampaignStateEnum.ACTIVE},
-                {"campaign_state": CampaignStateEnum.CLOSED}
-            ]))
-
-        # act
-        self.__sut.format_campaign_state_collection(context)
-
-        # assert
-        assert context.response.body[0]["campaign_state"] == "DRAFT"
-        assert context.response.body[1]["campaign_state"] == "ACTIVE"
-        assert context.response.body[2]["campaign_state"] == "CLOSED"
+        assert context.response.body["items"][0]["campaignState"] == "DRAFT"
+        assert context.response.body["items"][1]["campaignState"] == "CLOSED"
+        assert context.response.body["items"][1]["productImage3"] == f"{TEST_S3_URL}/path3"
 
 
 class TestUserBeforeHooks(TestCase):
@@ -586,71 +484,219 @@ class TestUserAfterHooks(TestCase):
                  last_name="cognito_last_name3",
                  email="cognito_email3")
         ]
+        brands = [
+            brand_dto_generator(num=1, repo=RepoEnum.STD_REPO).__dict__,
+            brand_dto_generator(num=2, repo=RepoEnum.STD_REPO).__dict__,
+            brand_dto_generator(num=3, repo=RepoEnum.STD_REPO).__dict__
+        ]
+        self.__auth_user_repository.get_by_ids = MagicMock(return_value={
+            brands[0]["auth_user_id"]: users[0],
+            brands[1]["auth_user_id"]: users[1],
+            brands[2]["auth_user_id"]: users[2]
+        })
+        response = PinfluencerResponse(body=page_body(brands))
+
+        # act
+        self.__sut.tag_auth_user_claims_to_response_collection(context=PinfluencerContext(response=response,
+                                                                                          event={}))
+
+        # assert
+        assert response.body["items"][0]["first_name"] == users[0].first_name
+        assert response.body["items"][0]["last_name"] == users[0].last_name
+        assert response.body["items"][0]["email"] == users[0].email
+
+        assert response.body["items"][1]["first_name"] == users[1].first_name
+        assert response.body["items"][1]["last_name"] == users[1].last_name
+        assert response.body["items"][1]["email"] == users[1].email
+
+        assert response.body["items"][2]["first_name"] == users[2].first_name
+        assert response.body["items"][2]["last_name"] == users[2].last_name
+        assert response.body["items"][2]["email"] == users[2].email
+
+        self.__auth_user_repository.get_by_ids.assert_called_once_with(ids=[brands[0]["auth_user_id"],
+                                                                            brands[1]["auth_user_id"],
+                                                                            brands[2]["auth_user_id"]])
+
+    def test_tag_auth_user_claims_to_response_collection_when_auth_user_not_found(self):
+        # arrange
+        user = User(first_name="cognito_first_name1",
+                    last_name="cognito_last_name1",
+                    email="cognito_email1")
+        brands = [
+            brand_dto_generator(num=1, repo=RepoEnum.STD_REPO).__dict__,
+            brand_dto_generator(num=2, repo=RepoEnum.STD_REPO).__dict__
+        ]
+        self.__auth_user_repository.get_by_ids = MagicMock(return_value={brands[0]["auth_user_id"]: user})
+        response = PinfluencerResponse(body=page_body(brands))
+
+        # act
+        self.__sut.tag_auth_user_claims_to_response_collection(context=PinfluencerContext(response=response,
+                                                                                          event={}))
+
+        # assert
+        assert response.body["items"][0]["first_name"] == user.first_name
+        assert response.body["items"][1]["first_name"] == ""
+
+    def test_tag_auth_user_claims_to_response_when_claims_stored(self):
+        # arrange
+        brand = brand_dto_generator(num=1)
+        response = PinfluencerResponse(body=brand.__dict__)
+
+        # act
+        self.__sut.tag_auth_user_claims_to_response(context=PinfluencerContext(response=response,
+                                                                               event={}))
+
+        # assert
+        assert response.body["first_name"] == brand.first_name
+        self.__auth_user_repository.get_by_id.assert_not_called()
+
+    def test_tag_auth_user_claims_to_response_collection_only_looks_up_missing_claims(self):
+        # arrange
+        user = User(first_name="cognito_first_name2",
+                    last_name="cognito_last_name2",
+                    email="cognito_email2")
         brands = [
             brand_dto_generator(num=1).__dict__,
-            brand_dto_generator(num=2).__dict__,
-            brand_dto_generator(num=3).__dict__
+            brand_dto_generator(num=2, repo=RepoEnum.STD_REPO).__dict__
         ]
-        self.__auth_user_repository.get_by_id = MagicMock(side_effect=users)
-        response = PinfluencerResponse(body=brands)
+        self.__auth_user_repository.get_by_ids = MagicMock(return_value={brands[1]["auth_user_id"]: user})
+        response = PinfluencerResponse(body=page_body(brands))
 
         # act
         self.__sut.tag_auth_user_claims_to_response_collection(context=PinfluencerContext(response=response,
                                                                                           event={}))
 
         # assert
-        assert response.body[0]["first_name"] == users[0].first_name
-        assert response.body[0]["last_name"] == users[0].last_name
-        assert response.body[0]["email"] == users[0].email
+        assert response.body["items"][0]["first_name"] == brand_dto_generator(num=1).first_name
+        assert response.body["items"][1]["first_name"] == user.first_name
+        self.__auth_user_repository.get_by_ids.assert_called_once_with(ids=[brands[1]["auth_user_id"]])
 
-        assert response.body[1]["first_name"] == users[1].first_name
-        assert response.body[1]["last_name"] == users[1].last_name
-        assert response.body[1]["email"] == users[1].email
+    def test_tag_auth_user_claims_to_response_collection_when_all_claims_stored(self):
+        # arrange
+        response = PinfluencerResponse(body=page_body([brand_dto_generator(num=1).__dict__]))
 
-        assert response.body[2]["first_name"] == users[2].first_name
-        assert response.body[2]["last_name"] == users[2].last_name
-        assert response.body[2]["email"] == users[2].email
+        # act
+        self.__sut.tag_auth_user_claims_to_response_collection(context=PinfluencerContext(response=response,
+                                                                                          event={}))
 
-        self.__auth_user_repository.get_by_id.assert_has_calls(calls=[
-            call(_id=brands[0]["auth_user_id"]),
-            call(_id=brands[1]["auth_user_id"]),
-            call(_id=brands[2]["auth_user_id"])
-        ])
+        # assert
+        self.__auth_user_repository.get_by_ids.assert_not_called()
 
-    def test_format_values_and_categories(self):
+    def test_tag_auth_user_claims_to_response_collection_when_concurrent(self):
         # arrange
-        expected_values = ["VALUE9", "VALUE8", "VALUE7"]
-        expected_categories = ["PET", "FASHION", "FITNESS"]
-        context = PinfluencerContext(response=PinfluencerResponse(body={
-            "values": [ValueEnum.VALUE9, ValueEnum.VALUE8, ValueEnum.VALUE7],
-            "categories": [CategoryEnum.PET, CategoryEnum.FASHION, CategoryEnum.FITNESS]
-        }))
+        users = {
+            "1": User(first_name="cognito_first_name1",
+                      last_name="cognito_last_name1",
+                      email="cognito_email1"),
+            "2": User(first_name="cognito_first_name2",
+                      last_name="cognito_last_name2",
+                      email="cognito_email2")
+        }
+        self.__auth_user_repository.get_by_id = MagicMock(side_effect=lambda _id: users[_id])
+        sut = UserAfterHooks(auth_user_repository=self.__auth_user_repository,
+                             executor=ConcurrentExecutor(max_workers=2, failure_policy=FailurePolicy.SKIP))
+        response = PinfluencerResponse(body=page_body([{"auth_user_id": "1"}, {"auth_user_id": "2"},
+                                             {"auth_user_id": "1"}, {"auth_user_id": "3"}]))
 
         # act
-        self.__sut.format_values_and_categories(context=context)
+        sut.tag_auth_user_claims_to_response_collection(context=PinfluencerContext(response=response,
+                                                                                     event={}))
 
         # assert
-        assert context.response.body["values"] == expected_values
-        assert context.response.body["categories"] == expected_categories
+        assert response.body["items"][0]["first_name"] == users["1"].first_name
+        assert response.body["items"][1]["email"] == users["2"].email
+        assert response.body["items"][2]["last_name"] == users["1"].last_name
+        assert response.body["items"][3] == {"auth_user_id": "3"}
+        assert self.__auth_user_repository.get_by_id.call_count == 3
+        self.__auth_user_repository.get_by_ids.assert_not_called()
 
-    def test_format_values_and_categories_collection(self):
+class TestFeedAfterHooks(TestCase):
+
+    def setUp(self) -> None:
+        self.__campaign_after_hooks: CampaignAfterHooks = Mock()
+        self.__user_after_hooks: UserAfterHooks = Mock()
+        self.__influencer_after_hooks: InfluencerAfterHooks = Mock()
+        self.__sut = FeedAfterHooks(campaign_after_hooks=self.__campaign_after_hooks,
+                                    user_after_hooks=self.__user_after_hooks,
+                                    influencer_after_hooks=self.__influencer_after_hooks)
+
+    def test_format_feed_of_campaigns(self):
         # arrange
-        expected_values = ["VALUE9", "VALUE8", "VALUE7"]
-        expected_categories = ["PET", "FASHION", "FITNESS"]
-        expected_values2 = ["VALUE9", "VALUE8", "VALUE5"]
-        expected_categories2 = ["PET", "FASHION", "CATEGORY5"]
-        context = PinfluencerContext(response=PinfluencerResponse(body=[
-            {"values": [ValueEnum.VALUE9, ValueEnum.VALUE8, ValueEnum.VALUE7],
-            "categories": [CategoryEnum.PET, CategoryEnum.FASHION, CategoryEnum.FITNESS]},
-            {"values": [ValueEnum.VALUE9, ValueEnum.VALUE8, ValueEnum.VALUE5],
-             "categories": [CategoryEnum.PET, CategoryEnum.FASHION, CategoryEnum.CATEGORY5]}
-        ]))
+        context = PinfluencerContext(response=PinfluencerResponse(body={"feed": "campaigns", "items": []}))
 
         # act
-        self.__sut.format_values_and_categories_collection(context=context)
+        self.__sut.format_feed(context=context)
 
         # assert
-        assert context.response.body[0]["values"] == expected_values
-        assert context.response.body[0]["categories"] == expected_categories
-        assert context.response.body[1]["values"] == expected_values2
-        assert context.response.body[1]["categories"] == expected_categories2
\ No newline at end of file
+        self.__campaign_after_hooks.serialize_collection.assert_called_once_with(context=context)
+        self.__user_after_hooks.tag_auth_user_claims_to_response_collection.assert_not_called()
+
+    def test_format_feed_of_influencers(self):
+        # arrange
+        context = PinfluencerContext(response=PinfluencerResponse(body={"feed": "influencers", "items": []}))
+
+        # act
+        self.__sut.format_feed(context=context)
+
+        # assert
+        self.__user_after_hooks.tag_auth_user_claims_to_response_collection.assert_called_once_with(context=context)
+        self.__influencer_after_hooks.serialize_collection.assert_called_once_with(context=context)
+        self.__campaign_after_hooks.serialize_collection.assert_not_called()
+
+
+class TestCacheAfterHooks(TestCase):
+
+    def setUp(self) -> None:
+        self.__serializer = JsonSnakeToCamelSerializer()
+        self.__sut = CacheAfterHooks(serializer=self.__serializer)
+
+    def test_set_etag(self):
+        # arrange
+        context = PinfluencerContext(response=PinfluencerResponse(body={"brand_name": "brand"}), event={})
+
+        # act
+        self.__sut.set_etag(context=context)
+
+        # assert
+        assert context.response.status_code == 200
+        assert context.response.headers["ETag"] == strong_etag(body='{"brandName":"brand"}')
+        assert context.response.serialized_body == '{"brandName":"brand"}'
+
+    def test_set_etag_when_client_has_it(self):
+        # arrange
+        etag = strong_etag(body='{"brandName":"brand"}')
+        context = PinfluencerContext(response=PinfluencerResponse(body={"brand_name": "brand"}),
+                                     event={"headers": {"if-none-match": etag}})
+
+        # act
+        self.__sut.set_etag(context=context)
+
+        # assert
+        assert context.response.status_code == 304
+        assert context.response.body == {}
+        assert context.response.headers["ETag"] == etag
+        assert context.response.serialized_body == '{"brandName":"brand"}'
+
+    def test_set_etag_when_client_has_an_old_one(self):
+        # arrange
+        context = PinfluencerContext(response=PinfluencerResponse(body={"brand_name": "brand"}),
+                                     event={"headers": {"if-none-match": strong_etag(body="{}")}})
+
+        # act
+        self.__sut.set_etag(context=context)
+
+        # assert
+        assert context.response.status_code == 200
+        assert context.response.body == {"brand_name": "brand"}
+
+    def test_set_etag_when_not_ok(self):
+        # arrange
+        context = PinfluencerContext(response=PinfluencerResponse(status_code=404, body={}),
+                                     event={"headers": {"if-none-match": "*"}})
+
+        # act
+        self.__sut.set_etag(context=context)
+
+        # assert
+        assert context.response.status_code == 404
+        assert "ETag" not in context.response.headers
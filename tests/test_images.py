@@ -0,0 +1,81 @@
+import io
+from unittest import TestCase
+
+from PIL import Image
+
+from src.domain.images import ImageVariantFormatEnum, has_variants, variant_key, render_variants, \
+    IMAGE_VARIANT_WIDTHS, content_key, image_stem
+
+UPLOADED_KEY = "7e9b0a38-1b2c-4d5e-8f90-0a1b2c3d4e5f/0d1e2f3a-4b5c-4d6e-8f70-8192a3b4c5d6.png"
+
+
+def encoded_image(size: tuple[int, int], mode: str = "RGB", image_format: str = "PNG", color=(200, 30, 30)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new(mode, size, color).save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+class TestImageVariantKeys(TestCase):
+
+    def test_only_uploaded_images_have_variants(self):
+        assert has_variants(UPLOADED_KEY)
+        for key in ["default_brand_logo.png",
+                    "logo.png",
+                    variant_key(UPLOADED_KEY, 64, ImageVariantFormatEnum.WEBP),
+                    "",
+                    None]:
+            with self.subTest(key=key):
+                assert not has_variants(key)
+
+    def test_variant_key(self):
+        assert variant_key(UPLOADED_KEY, 256, ImageVariantFormatEnum.JPEG) == \
+               "7e9b0a38-1b2c-4d5e-8f90-0a1b2c3d4e5f/0d1e2f3a-4b5c-4d6e-8f70-8192a3b4c5d6-256w.jpeg"
+
+    def test_content_keys_have_variants(self):
+        key = content_key(digest="ab" * 32, extension="jpg")
+        assert key == f"images/{'ab' * 32}.jpg"
+        assert has_variants(key)
+
+    def test_image_stem(self):
+        key = content_key(digest="ab" * 32, extension="jpg")
+        for candidate, stem in [(key, f"images/{'ab' * 32}"),
+                                (variant_key(key, 64, ImageVariantFormatEnum.WEBP), f"images/{'ab' * 32}"),
+                                (UPLOADED_KEY, UPLOADED_KEY.rpartition(".")[0]),
+                                ("default_brand_logo.png", None),
+                                ("images/logo.png", None),
+                                (None, None)]:
+            with self.subTest(key=candidate):
+                assert image_stem(candidate) == stem
+
+
+class TestRenderVariants(TestCase):
+
+    def test_every_width_in_every_format(self):
+        # act
+        variants = render_variants(encoded_image(size=(2000, 1000), image_format="JPEG"))
+
+        # assert
+        assert [(variant.width, variant.format) for variant in variants] == \
+               [(width, variant_format) for width in sorted(IMAGE_VARIANT_WIDTHS, reverse=True)
+                for variant_format in ImageVariantFormatEnum]
+        for variant in variants:
+            with self.subTest(width=variant.width, format=variant.format):
+                with Image.open(io.BytesIO(variant.data)) as image:
+                    assert image.format == variant.format.name
+                    assert image.size == (variant.width, variant.width // 2)
+
+    def test_small_images_are_not_enlarged(self):
+        # act
+        variants = render_variants(encoded_image(size=(100, 50)))
+
+        # assert
+        assert {Image.open(io.BytesIO(variant.data)).size for variant in variants} == {(100, 50), (64, 32)}
+
+    def test_transparency_is_kept_in_webp_and_white_in_jpeg(self):
+        # act
+        variants = render_variants(encoded_image(size=(10, 10), mode="RGBA", color=(0, 0, 0, 0)), widths=(64,))
+
+        # assert
+        [webp, jpeg] = [Image.open(io.BytesIO(variant.data)) for variant in variants]
+        assert webp.mode == "RGBA" and webp.getpixel((5, 5))[3] == 0
+        assert jpeg.mode == "RGB" and min(jpeg.getpixel((5, 5))) > 250
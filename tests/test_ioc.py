@@ -0,0 +1,166 @@
+import os
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+
+from src.crosscutting import StdlibJsonEncoder, OrjsonJsonEncoder, orjson
+from src.web.ioc import ServiceLocator
+from src.web.routing import Dispatcher
+
+
+class TestServiceLocator(TestCase):
+
+    def setUp(self) -> None:
+        self.__patches = [patch('src.web.ioc.SqlAlchemyDataManager'),
+                          patch('src.web.ioc.S3ImageRepository'),
+                          patch('src.web.ioc.CognitoAuthService')]
+        [self.__data_manager_type, self.__image_repository_type, self.__auth_service_type] = \
+            [p.start() for p in self.__patches]
+        self.__sut = ServiceLocator()
+
+    def tearDown(self) -> None:
+        for p in self.__patches:
+            p.stop()
+
+    def test_services_are_memoized(self):
+        assert self.__sut.get_brand_repository() is self.__sut.get_brand_repository()
+        assert self.__sut.get_brand_controller() is self.__sut.get_brand_controller()
+        self.__data_manager_type.assert_called_once()
+
+    def test_repositories_share_data_manager(self):
+        # act
+        self.__sut.get_brand_repository()
+        self.__sut.get_influencer_repository()
+        self.__sut.get_campaign_repository()
+
+        # assert
+        self.__data_manager_type.assert_called_once()
+
+    def test_auth_service_is_shared_by_user_hooks(self):
+        # act
+        self.__sut.get_brand_after_hooks()
+        self.__sut.get_influencer_after_hooks()
+        self.__sut.get_user_after_hooks()
+
+        # assert
+        self.__auth_service_type.assert_called_once()
+
+    def test_hooks_facade_does_not_build_hooks(self):
+        # act
+        self.__sut.get_hooks_facade()
+
+        # assert
+        assert [name for name, _ in self.__sut.get_resolutions()] == ['hooks_facade']
+
+    def test_route_only_resolves_its_dependencies(self):
+        # act
+        Dispatcher(service_locator=self.__sut).get_route('GET /campaigns/{campaign_id}')
+
+        # assert
+        resolved = [name for name, _ in self.__sut.get_resolutions()]
+        assert 'campaign_controller' in resolved
+        assert 'campaign_before_hooks' in resolved
+        assert 'campaign_after_hooks' in resolved
+        assert 'auth_user_repository' not in resolved
+        assert 'brand_controller' not in resolved
+        self.__auth_service_type.assert_not_called()
+
+    def test_end_request_when_data_manager_not_resolved(self):
+        # act
+        self.__sut.end_request()
+
+        # assert
+        self.__data_manager_type.assert_not_called()
+
+    def test_end_request_ends_session(self):
+        # arrange
+        data_manager = self.__sut.get_data_manager()
+
+        # act
+        self.__sut.end_request()
+
+        # assert
+        data_manager.end_session.assert_called_once()
+
+    def test_auth_user_executor_when_not_configured(self):
+        # arrange
+        with patch.dict(os.environ, {}, clear=False):
+            os.environ.pop('AUTH_USER_MAX_WORKERS', None)
+
+            # act/assert
+            assert self.__sut.get_auth_user_executor() is None
+
+    def test_auth_user_executor_when_configured(self):
+        # arrange
+        with patch.dict(os.environ, {'AUTH_USER_MAX_WORKERS': '8'}):
+
+            # act
+            executor = self.__sut.get_auth_user_executor()
+
+        # assert
+        assert executor.max_workers == 8
+        assert executor is self.__sut.get_auth_user_executor()
+
+    def test_image_upload_executor(self):
+        # arrange
+        with patch.dict(os.environ, {}, clear=False):
+            os.environ.pop('IMAGE_UPLOAD_MAX_WORKERS', None)
+
+            # act
+            self.__sut.get_campaign_repository()
+
+        # assert
+        assert self.__sut.get_image_upload_executor().max_workers == 3
+
+    def test_auth_user_cache_is_shared_across_requests(self):
+        # arrange
+        repository = self.__sut.get_auth_user_repository()
+
+        # act
+        self.__sut.end_request()
+
+        # assert
+        assert self.__sut.get_auth_user_repository() is repository
+        assert repository.cache is self.__sut.get_auth_user_cache()
+
+    def test_json_encoder_when_stdlib_configured(self):
+        # arrange
+        with patch.dict(os.environ, {'JSON_ENCODER': 'stdlib'}):
+
+            # act
+            encoder = self.__sut.get_json_encoder()
+
+        # assert
+        assert isinstance(encoder, StdlibJsonEncoder)
+        assert encoder is self.__sut.get_json_encoder()
+
+    @skipUnless(orjson, "orjson is not installed")
+    def test_json_encoder_when_not_configured(self):
+        # arrange
+        with patch.dict(os.environ, {}, clear=False):
+            os.environ.pop('JSON_ENCODER', None)
+
+            # act/assert
+            assert isinstance(self.__sut.get_json_encoder(), OrjsonJsonEncoder)
+
+    def test_image_variant_queue_when_not_configured(self):
+        # arrange
+        with patch.dict(os.environ, {}, clear=False):
+            os.environ.pop('IMAGE_VARIANT_QUEUE_URL', None)
+
+            # act
+            self.__sut.get_image_repository()
+
+        # assert
+        assert self.__image_repository_type.call_args.kwargs['variant_queue'] is None
+
+    def test_image_variant_queue_when_configured(self):
+        # arrange
+        with patch.dict(os.environ, {'IMAGE_VARIANT_QUEUE_URL': 'https://sqs/queue'}), \
+                patch('src.web.ioc.SqsImageVariantQueue') as queue_type:
+
+            # act
+            self.__sut.get_image_repository()
+
+        # assert
+        queue_type.assert_called_once_with(queue_url='https://sqs/queue')
+        assert self.__image_repository_type.call_args.kwargs['variant_queue'] is queue_type.return_value
@@ -0,0 +1,153 @@
+from unittest import TestCase
+
+import numpy as np
+
+from src.domain.matching import MatchCandidates, to_bitmask, popcount, score_overlap, top_k, rank, CandidateIndex
+from src.domain.models import ValueEnum, CategoryEnum
+
+
+class TestMatching(TestCase):
+
+    def test_to_bitmask_follows_declaration_order(self):
+        # arrange
+        members = [ValueEnum.RECYCLED, ValueEnum.VEGAN]
+
+        # act
+        mask = to_bitmask(members)
+
+        # assert
+        assert mask == (1 << list(ValueEnum).index(ValueEnum.VEGAN)) | (1 << list(ValueEnum).index(ValueEnum.RECYCLED))
+
+    def test_popcount(self):
+        # arrange
+        masks = np.array([0, 1, 3, 0b1010101010], dtype=np.uint16)
+
+        # act
+        counts = popcount(masks)
+
+        # assert
+        assert counts.tolist() == [0, 1, 2, 5]
+
+    def test_score_overlap(self):
+        # arrange
+        candidates = MatchCandidates(ids=["a", "b", "c"],
+                                     value_masks=np.array([0b011, 0b100, 0b111], dtype=np.uint16),
+                                     category_masks=np.array([0b1, 0b0, 0b1], dtype=np.uint16))
+
+        # act
+        scores = score_overlap(value_mask=0b011, category_mask=0b1, candidates=candidates)
+
+        # assert
+        assert scores.tolist() == [3, 0, 3]
+
+    def test_top_k_breaks_ties_by_position(self):
+        # arrange
+        scores = np.array([1, 3, 2, 3, 0], dtype=np.uint8)
+
+        # act
+        best = top_k(scores=scores, k=3)
+
+        # assert
+        assert best.tolist() == [1, 3, 2]
+
+    def test_top_k_when_k_exceeds_candidates(self):
+        # arrange
+        scores = np.array([1, 2], dtype=np.uint8)
+
+        # act
+        best = top_k(scores=scores, k=10)
+
+        # assert
+        assert best.tolist() == [1, 0]
+
+    def test_top_k_when_nothing_to_rank(self):
+        assert top_k(scores=np.zeros(0, dtype=np.uint8), k=5).tolist() == []
+
+    def test_rank_leaves_out_candidates_without_overlap(self):
+        # arrange
+        vegan = to_bitmask([ValueEnum.VEGAN])
+        food = to_bitmask([CategoryEnum.FOOD])
+        candidates = MatchCandidates(ids=["both", "none", "value"],
+                                     value_masks=np.array([vegan, 0, vegan], dtype=np.uint16),
+                                     category_masks=np.array([food, 0, 0], dtype=np.uint16))
+
+        # act
+        ranked = rank(value_mask=vegan, category_mask=food, candidates=candidates, k=3)
+
+        # assert
+        assert ranked == [("both", 2), ("value", 1)]
+
+
+VEGAN = to_bitmask([ValueEnum.VEGAN])
+FOOD = to_bitmask([CategoryEnum.FOOD])
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCandidateIndex(TestCase):
+
+    def setUp(self) -> None:
+        self.__loads = 0
+        self.__clock = FakeClock()
+        self.__sut = CandidateIndex(loader=self.__loader, max_age_seconds=60, clock=self.__clock)
+
+    def __loader(self) -> MatchCandidates:
+        self.__loads += 1
+        return MatchCandidates(ids=["a", "b", "c"],
+                               value_masks=np.array([VEGAN, VEGAN, 0], dtype=np.uint16),
+                               category_masks=np.array([FOOD, 0, FOOD], dtype=np.uint16))
+
+    def test_rank(self):
+        assert self.__sut.rank(value_mask=VEGAN, category_mask=FOOD, k=2) == [("a", 2), ("b", 1)]
+
+    def test_index_is_built_once_until_it_is_too_old(self):
+        # act
+        self.__sut.rank(value_mask=VEGAN, category_mask=FOOD, k=1)
+        self.__sut.rank(value_mask=VEGAN, category_mask=FOOD, k=1)
+        self.__clock.now = 61
+        self.__sut.rank(value_mask=VEGAN, category_mask=FOOD, k=1)
+
+        # assert
+        assert self.__loads == 2
+
+    def test_upsert_before_the_first_build_is_left_to_the_build(self):
+        # act
+        self.__sut.upsert(id_="d", value_mask=VEGAN, category_mask=FOOD)
+
+        # assert
+        assert len(self.__sut) == 0
+        assert [id_ for id_, _ in self.__sut.rank(value_mask=VEGAN, category_mask=FOOD, k=5)] == ["a", "b", "c"]
+
+    def test_upsert_adds_and_updates_candidates(self):
+        # arrange
+        self.__sut.rank(value_mask=VEGAN, category_mask=FOOD, k=1)
+
+        # act
+        for num in range(100):
+            self.__sut.upsert(id_=f"new{num}", value_mask=0, category_mask=0)
+        self.__sut.upsert(id_="c", value_mask=VEGAN, category_mask=FOOD)
+
+        # assert
+        assert len(self.__sut) == 103
+        assert self.__sut.rank(value_mask=VEGAN, category_mask=FOOD, k=5) == [("a", 2), ("c", 2), ("b", 1)]
+        assert self.__loads == 1
+
+    def test_remove_moves_the_last_candidate_into_the_gap(self):
+        # arrange
+        self.__sut.rank(value_mask=VEGAN, category_mask=FOOD, k=1)
+
+        # act
+        self.__sut.remove(id_="a")
+        self.__sut.remove(id_="missing")
+        self.__sut.upsert(id_="c", value_mask=VEGAN, category_mask=0)
+
+        # assert
+        assert len(self.__sut) == 2
+        assert sorted(self.__sut.rank(value_mask=VEGAN, category_mask=FOOD, k=5)) == [("b", 1), ("c", 1)]
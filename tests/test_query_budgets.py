@@ -0,0 +1,179 @@
+from unittest import TestCase
+from unittest.mock import Mock, MagicMock
+
+from mapper.object_mapper import ObjectMapper
+
+from src.app import PinfluencerApplication
+from src.crosscutting import JsonSnakeToCamelSerializer
+from src.data.entities import create_mappings
+from src.types import DataManager, ImageRepository, AuthUserRepository
+from src.web.ioc import ServiceLocator
+from src.web.routing import Dispatcher
+from tests import InMemorySqliteDataManager, QueryCounter, brand_dto_generator, brand_generator, \
+    campaign_dto_generator, campaign_generator, influencer_dto_generator, influencer_generator, \
+    update_brand_payload, update_influencer_payload
+
+BRAND_AUTH_USER_ID = "brand_auth_user"
+INFLUENCER_AUTH_USER_ID = "influencer_auth_user"
+NEW_BRAND_AUTH_USER_ID = "new_brand_auth_user"
+NEW_INFLUENCER_AUTH_USER_ID = "new_influencer_auth_user"
+
+# the most sql statements each route may run on a cold container, a change that needs more has to raise the budget here
+QUERY_BUDGETS = {
+    'GET /feed': 4,
+    'GET /brands': 1,
+    'GET /influencers': 1,
+    'GET /brands/{brand_id}': 1,
+    'GET /influencers/{influencer_id}': 1,
+    'GET /influencers/{influencer_id}/similar': 2,
+    'GET /brands/me': 1,
+    'POST /brands/me': 2,
+    'PUT /brands/me': 2,
+    'POST /brands/me/header-image': 2,
+    'POST /brands/me/logo': 2,
+    'POST /brands/me/image-uploads': 1,
+    'PUT /brands/me/logo': 2,
+    'PUT /brands/me/header-image': 2,
+    'GET /influencers/me': 1,
+    'POST /influencers/me': 2,
+    'PUT /influencers/me': 2,
+    'POST /influencers/me/image': 2,
+    'POST /influencers/me/image-uploads': 1,
+    'PUT /influencers/me/image': 2,
+    'GET /brands/me/campaigns': 2,
+    'DELETE /brands/me/campaigns/{campaign_id}': 0,
+    'GET /campaigns': 1,
+    'GET /campaigns/{campaign_id}': 1,
+    'POST /brands/me/campaigns': 2,
+    'PATCH /brands/me/campaigns/{campaign_id}': 3,
+    'PUT /brands/me/campaigns/{campaign_id}': 3,
+    'POST /brands/me/campaigns/{campaign_id}/product-image1': 3,
+    'POST /brands/me/campaigns/{campaign_id}/product-image2': 3,
+    'POST /brands/me/campaigns/{campaign_id}/product-image3': 3,
+    'POST /brands/me/campaigns/{campaign_id}/product-images': 3,
+    'POST /brands/me/campaigns/{campaign_id}/image-uploads': 2,
+    'PUT /brands/me/campaigns/{campaign_id}/product-image1': 3,
+    'PUT /brands/me/campaigns/{campaign_id}/product-image2': 3,
+    'PUT /brands/me/campaigns/{campaign_id}/product-image3': 3,
+}
+
+# routes that answer with something other than a 2xx for a well formed request
+EXPECTED_STATUS_CODES = {
+    'DELETE /brands/me/campaigns/{campaign_id}': 405,
+}
+
+
+class QueryBudgetServiceLocator(ServiceLocator):
+    """
+    the real container over an in memory database, with s3 and cognito stubbed out
+    """
+
+    def __init__(self, data_manager: DataManager, image_repository: ImageRepository,
+                 auth_user_repository: AuthUserRepository):
+        super().__init__()
+        self.__data_manager = data_manager
+        self.__image_repository = image_repository
+        self.__auth_user_repository = auth_user_repository
+
+    def get_data_manager(self) -> DataManager:
+        return self._resolve('data_manager', lambda: self.__data_manager)
+
+    def get_image_repository(self) -> ImageRepository:
+        return self._resolve('image_repository', lambda: self.__image_repository)
+
+    def get_auth_user_repository(self) -> AuthUserRepository:
+        return self._resolve('auth_user_repository', lambda: self.__auth_user_repository)
+
+
+class TestQueryBudgets(TestCase):
+
+    def setUp(self) -> None:
+        self.__mapper = ObjectMapper()
+        create_mappings(mapper=self.__mapper)
+        self.__brand = brand_dto_generator(num=1)
+        self.__brand.auth_user_id = BRAND_AUTH_USER_ID
+        self.__influencer = influencer_dto_generator(num=1)
+        self.__influencer.auth_user_id = INFLUENCER_AUTH_USER_ID
+        self.__campaign = campaign_dto_generator(num=1)
+        self.__campaign.brand_id = self.__brand.id
+
+    def __application_over_seeded_data(self) -> tuple[InMemorySqliteDataManager, PinfluencerApplication]:
+        """
+        a fresh database and container per route, so no route runs against what an earlier one wrote
+        """
+        data_manager = InMemorySqliteDataManager()
+        data_manager.create_fake_data([brand_generator(dto=self.__brand, mapper=self.__mapper),
+                                       influencer_generator(dto=self.__influencer, mapper=self.__mapper),
+                                       campaign_generator(dto=self.__campaign, mapper=self.__mapper)])
+        data_manager.session.commit()
+        image_repository: ImageRepository = Mock()
+        image_repository.upload = MagicMock(return_value=f"images/{'a' * 64}.png")
+        image_repository.confirm_upload = MagicMock(return_value=f"{self.__brand.id}/uploaded.png")
+        image_repository.create_upload = MagicMock(return_value={"url": "https://bucket.s3.amazonaws.com/",
+                                                                 "fields": {},
+                                                                 "key": f"{self.__brand.id}/uploaded.png"})
+        auth_user_repository: AuthUserRepository = Mock()
+        auth_user_repository.get_by_ids = MagicMock(return_value={})
+        return data_manager, PinfluencerApplication(service_locator=QueryBudgetServiceLocator(
+            data_manager=data_manager,
+            image_repository=image_repository,
+            auth_user_repository=auth_user_repository))
+
+    def test_every_route_has_a_query_budget(self):
+        assert sorted(QUERY_BUDGETS) == sorted(Dispatcher(service_locator=Mock()).route_keys)
+
+    def test_routes_stay_within_their_query_budget(self):
+        for route_key, budget in QUERY_BUDGETS.items():
+            with self.subTest(route=route_key):
+                # arrange
+                data_manager, application = self.__application_over_seeded_data()
+                event = self.__event(route_key=route_key)
+
+                # act
+                with QueryCounter(engine=data_manager.engine) as queries:
+                    response = application.handle(event=event, context={})
+
+                # assert
+                if route_key in EXPECTED_STATUS_CODES:
+                    assert response["statusCode"] == EXPECTED_STATUS_CODES[route_key], response
+                else:
+                    assert 200 <= response["statusCode"] < 300, response
+                assert queries.count <= budget, "\n".join(queries.statements)
+
+    def __event(self, route_key: str) -> dict:
+        if route_key == 'POST /brands/me':
+            auth_user_id = NEW_BRAND_AUTH_USER_ID
+        elif route_key == 'POST /influencers/me':
+            auth_user_id = NEW_INFLUENCER_AUTH_USER_ID
+        elif "/influencers/me" in route_key:
+            auth_user_id = INFLUENCER_AUTH_USER_ID
+        else:
+            auth_user_id = BRAND_AUTH_USER_ID
+        if route_key in ['POST /brands/me', 'PUT /brands/me']:
+            body = {**update_brand_payload(), "first_name": "first", "last_name": "last", "email": "brand@example.com"}
+        elif route_key in ['POST /influencers/me', 'PUT /influencers/me']:
+            body = update_influencer_payload()
+        elif route_key in ['POST /brands/me/campaigns', 'PUT /brands/me/campaigns/{campaign_id}']:
+            campaign = campaign_dto_generator(num=2)
+            body = {**campaign.__dict__,
+                    "campaign_categories": [category.name for category in campaign.campaign_categories],
+                    "campaign_values": [value.name for value in campaign.campaign_values],
+                    "campaign_state": campaign.campaign_state.name}
+        elif route_key == 'PATCH /brands/me/campaigns/{campaign_id}':
+            body = {"campaign_state": "ACTIVE"}
+        elif route_key.endswith('/image-uploads'):
+            body = {"content_type": "image/png"}
+        elif route_key.endswith('/product-images'):
+            body = {"product_image_1": "aW1hZ2U=", "product_image_2": "aW1hZ2U="}
+        elif route_key.startswith('POST'):
+            body = {"image_bytes": "aW1hZ2U="}
+        elif route_key.startswith('PUT'):
+            body = {"image_key": "uploaded.png"}
+        else:
+            body = {}
+        return {"routeKey": route_key,
+                "pathParameters": {"brand_id": self.__brand.id,
+                                   "influencer_id": self.__influencer.id,
+                                   "campaign_id": self.__campaign.id},
+                "requestContext": {"authorizer": {"jwt": {"claims": {"username": auth_user_id}}}},
+                "body": JsonSnakeToCamelSerializer().serialize(body)}
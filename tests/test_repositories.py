@@ -1,19 +1,37 @@
-from unittest import TestCase
+import base64
+import hashlib
+import json
+import os
+import urllib.error
+import urllib.request
+import uuid
+from datetime import datetime, timedelta
+from unittest import TestCase, skipUnless
 from unittest.mock import Mock, MagicMock
 
+import boto3
+import numpy as np
+from botocore.exceptions import ClientError
 from callee import Captor
 from mapper.object_mapper import ObjectMapper
 
+from src.crosscutting import TtlLruCache, ConcurrentExecutor
 from src.data.repositories import SqlAlchemyBrandRepository, SqlAlchemyInfluencerRepository, CognitoAuthUserRepository, \
-    CognitoAuthService, SqlAlchemyCampaignRepository
-from src.domain.models import Campaign, CampaignStateEnum
-from src.exceptions import AlreadyExistsException, NotFoundException
-from src.types import ImageRepository
+    CognitoAuthService, SqlAlchemyCampaignRepository, CachingAuthUserRepository, S3ImageRepository, \
+    SqsImageVariantQueue, base64_decoded_size, iter_base64_decode
+from src.domain.filtering import CampaignFilter
+from src.domain.matching import to_bitmask
+from src.domain.models import Campaign, CampaignStateEnum, ValueEnum, CategoryEnum
+from src.domain.similarity import AUDIENCE_FIELDS, SimilarityMetric, audience_vector
+from src.exceptions import AlreadyExistsException, NotFoundException, InvalidCursorException, ImageException, \
+    ImageTooLargeException
+from src.types import ImageRepository, AuthUserRepository
 from tests import InMemorySqliteDataManager, brand_generator, brand_dto_generator, TEST_DEFAULT_BRAND_LOGO, \
     TEST_DEFAULT_BRAND_HEADER_IMAGE, TEST_DEFAULT_INFLUENCER_PROFILE_IMAGE, influencer_dto_generator, \
     assert_brand_updatable_fields_are_equal_for_three, assert_brand_db_fields_are_equal, \
     assert_collection_brand_db_fields_are_equal, assert_brand_db_fields_are_equal_for_three, influencer_generator, \
-    assert_influencer_db_fields_are_equal_for_three, campaign_dto_generator, campaign_generator
+    assert_influencer_db_fields_are_equal_for_three, campaign_dto_generator, campaign_generator, StubCognitoClient, \
+    user_dto_generator, RepoEnum
 
 
 class BrandRepositoryTestCase(TestCase):
@@ -64,6 +82,40 @@ class TestBaseRepository(BrandRepositoryTestCase):
         assert [] == actual_brands
 
 
+    def test_load_page_walks_every_brand_newest_first(self):
+        # arrange
+        brands = [brand_dto_generator(num=num) for num in range(1, 6)]
+        for num, brand in enumerate(brands):
+            brand.auth_user_id = f"auth_user_{num}"
+            brand.created = datetime(2022, 1, 1) + timedelta(days=num // 2)
+        self._data_manager.create_fake_data(list(map(lambda x: brand_generator(x, mapper=self._object_mapper),
+                                                     brands)))
+        expected = sorted(brands, key=lambda x: (x.created, x.id), reverse=True)
+
+        # act
+        pages = [self._sut.load_page(limit=2)]
+        while pages[-1].next_cursor:
+            pages.append(self._sut.load_page(limit=2, cursor=pages[-1].next_cursor))
+
+        # assert
+        assert [len(page.items) for page in pages] == [2, 2, 1]
+        assert [brand.id for page in pages for brand in page.items] == [brand.id for brand in expected]
+
+    def test_load_page_when_page_is_exactly_full(self):
+        # arrange
+        self._data_manager.create_fake_data([brand_generator(brand_dto_generator(num=1), mapper=self._object_mapper)])
+
+        # act
+        page = self._sut.load_page(limit=1)
+
+        # assert
+        assert len(page.items) == 1
+        assert page.next_cursor is None
+
+    def test_load_page_when_cursor_invalid(self):
+        self.assertRaises(InvalidCursorException, lambda: self._sut.load_page(limit=2, cursor="random"))
+
+
 class TestUserRepository(BrandRepositoryTestCase):
 
     def test_load_for_auth_user(self):
@@ -122,6 +174,30 @@ class TestBrandRepository(BrandRepositoryTestCase):
         assert actual.logo == TEST_DEFAULT_BRAND_LOGO
         assert actual.header_image == TEST_DEFAULT_BRAND_HEADER_IMAGE
 
+    def test_write_new_for_auth_user_returns_created_as_stored(self):
+        # arrange
+        payload = brand_dto_generator(num=1)
+
+        # act
+        returned = self._sut.write_new_for_auth_user(auth_user_id="12341", payload=payload)
+        self._data_manager.session.expire_all()
+        loaded = self._sut.load_by_id(id_=payload.id)
+
+        # assert
+        assert payload.created.microsecond == 0
+        assert returned.created == loaded.created == payload.created
+
+    def test_created_set_on_an_entity_keeps_whole_seconds(self):
+        # arrange
+        brand = brand_dto_generator(num=1)
+        brand.created = datetime(2022, 6, 1, 9, 35, 15, 123456)
+
+        # act
+        entity = brand_generator(dto=brand, mapper=self._object_mapper)
+
+        # assert
+        assert entity.created == datetime(2022, 6, 1, 9, 35, 15)
+
     def test_update_for_auth_user(self):
         # arrange
         existing_brand = brand_dto_generator(num=1)
@@ -139,6 +215,35 @@ class TestBrandRepository(BrandRepositoryTestCase):
         assert actual.values == expected.values
         assert actual.categories == expected.categories
 
+    def test_update_for_auth_user_keeps_claims_when_not_sent(self):
+        # arrange
+        existing_brand = brand_dto_generator(num=1)
+        payload = brand_dto_generator(num=2, repo=RepoEnum.STD_REPO)
+        self._data_manager.create_fake_data([brand_generator(existing_brand, mapper=self._object_mapper)])
+
+        # act
+        returned_brand = self._sut.update_for_auth_user(auth_user_id=existing_brand.auth_user_id,
+                                                        payload=payload)
+
+        # assert
+        assert returned_brand.first_name == existing_brand.first_name
+        assert returned_brand.last_name == existing_brand.last_name
+        assert returned_brand.email == existing_brand.email
+
+    def test_update_for_auth_user_updates_claims_when_sent(self):
+        # arrange
+        existing_brand = brand_dto_generator(num=1)
+        payload = brand_dto_generator(num=2)
+        self._data_manager.create_fake_data([brand_generator(existing_brand, mapper=self._object_mapper)])
+
+        # act
+        self._sut.update_for_auth_user(auth_user_id=existing_brand.auth_user_id, payload=payload)
+        actual = self._sut.load_for_auth_user(auth_user_id=existing_brand.auth_user_id)
+
+        # assert
+        assert actual.first_name == payload.first_name
+        assert actual.email == payload.email
+
     def test_update_for_auth_user_when_not_found(self):
         # arrange
         expected = brand_dto_generator(num=1)
@@ -191,6 +296,54 @@ class TestBrandRepository(BrandRepositoryTestCase):
         self.assertRaises(NotFoundException, lambda: self._sut.update_header_image_for_auth_user(auth_user_id="12345",
                                                                                                  image_bytes="imagebytes"))
 
+    def test_create_image_upload_for_auth_user(self):
+        # arrange
+        brand = brand_dto_generator(num=1)
+        upload = {"url": "https://bucket", "fields": {}, "key": f"{brand.id}/image.png"}
+        self._image_repository.create_upload = MagicMock(return_value=upload)
+        self._data_manager.create_fake_data([brand_generator(brand, mapper=self._object_mapper)])
+
+        # act
+        returned_upload = self._sut.create_image_upload_for_auth_user(auth_user_id=brand.auth_user_id,
+                                                                      content_type="image/png")
+
+        # assert
+        self._image_repository.create_upload.assert_called_once_with(path=brand.id, content_type="image/png")
+        assert returned_upload == upload
+
+    def test_create_image_upload_for_auth_user_when_not_found(self):
+        self.assertRaises(NotFoundException,
+                          lambda: self._sut.create_image_upload_for_auth_user(auth_user_id="12345",
+                                                                              content_type="image/png"))
+
+    def test_confirm_logo_for_auth_user(self):
+        # arrange
+        brand = brand_dto_generator(num=1)
+        image_key = f"{brand.id}/logo.png"
+        self._image_repository.confirm_upload = MagicMock(return_value=image_key)
+        self._data_manager.create_fake_data([brand_generator(brand, mapper=self._object_mapper)])
+
+        # act
+        returned_brand = self._sut.confirm_logo_for_auth_user(auth_user_id=brand.auth_user_id, image_key=image_key)
+
+        # assert
+        self._image_repository.confirm_upload.assert_called_once_with(path=brand.id, key=image_key)
+        assert returned_brand.logo == image_key == self._sut.load_by_id(id_=brand.id).logo
+
+    def test_confirm_header_image_for_auth_user_when_not_uploaded(self):
+        # arrange
+        brand = brand_dto_generator(num=1)
+        self._image_repository.confirm_upload = MagicMock(side_effect=ImageException())
+        self._data_manager.create_fake_data([brand_generator(brand, mapper=self._object_mapper)])
+
+        # act
+        self.assertRaises(ImageException,
+                          lambda: self._sut.confirm_header_image_for_auth_user(auth_user_id=brand.auth_user_id,
+                                                                               image_key="key"))
+
+        # assert
+        assert self._sut.load_by_id(id_=brand.id).header_image == brand.header_image
+
 
 class TestInfluencerRepository(TestCase):
 
@@ -232,6 +385,21 @@ class TestInfluencerRepository(TestCase):
         actual_image = self.__sut.load_by_id(id_=influencer.id).image
         assert returned_influencer.image == expected_profile_image == actual_image
 
+    def test_confirm_image_for_auth_user(self):
+        # arrange
+        influencer = influencer_dto_generator(num=1)
+        image_key = f"{influencer.id}/image.png"
+        self.__image_repository.confirm_upload = MagicMock(return_value=image_key)
+        self.__data_manager.create_fake_data([influencer_generator(influencer, mapper=self._object_mapper)])
+
+        # act
+        returned_influencer = self.__sut.confirm_image_for_auth_user(auth_user_id=influencer.auth_user_id,
+                                                                     image_key=image_key)
+
+        # assert
+        self.__image_repository.confirm_upload.assert_called_once_with(path=influencer.id, key=image_key)
+        assert returned_influencer.image == image_key == self.__sut.load_by_id(id_=influencer.id).image
+
     def test_update_influencer(self):
         # arrange
         influencer_already_in_db = influencer_dto_generator(num=1)
@@ -249,6 +417,84 @@ class TestInfluencerRepository(TestCase):
                                                         influencer2=queried_influencer.__dict__,
                                                         influencer3=influencer_from_payload.__dict__)
 
+    def test_load_candidates(self):
+        # arrange
+        influencers = [influencer_dto_generator(num=num) for num in range(1, 3)]
+        self.__data_manager.create_fake_data(
+            [influencer_generator(dto=influencer, mapper=self._object_mapper) for influencer in influencers])
+
+        # act
+        candidates = self.__sut.load_candidates()
+
+        # assert
+        assert sorted(candidates.ids) == sorted(influencer.id for influencer in influencers)
+        for influencer in influencers:
+            index = candidates.ids.index(influencer.id)
+            assert candidates.value_masks[index] == to_bitmask(influencer.values)
+            assert candidates.category_masks[index] == to_bitmask(influencer.categories)
+
+    def test_load_by_ids_keeps_the_order_and_skips_missing(self):
+        # arrange
+        influencers = [influencer_dto_generator(num=num) for num in range(1, 4)]
+        self.__data_manager.create_fake_data(
+            [influencer_generator(dto=influencer, mapper=self._object_mapper) for influencer in influencers])
+
+        # act
+        loaded = self.__sut.load_by_ids(ids=[influencers[2].id, "missing", influencers[0].id])
+
+        # assert
+        assert [influencer.id for influencer in loaded] == [influencers[2].id, influencers[0].id]
+
+    def test_load_audience_vectors(self):
+        # arrange
+        influencer = influencer_dto_generator(num=1)
+        self.__data_manager.create_fake_data([influencer_generator(dto=influencer, mapper=self._object_mapper)])
+
+        # act
+        ids, vectors = self.__sut.load_audience_vectors()
+
+        # assert
+        assert ids == [influencer.id]
+        assert vectors.dtype == np.float32
+        assert vectors.shape == (1, len(AUDIENCE_FIELDS))
+        np.testing.assert_allclose(vectors[0], audience_vector(influencer))
+
+    def test_load_similar(self):
+        # arrange
+        influencers = [influencer_dto_generator(num=num) for num in range(1, 4)]
+        influencers[0].audience_male_split, influencers[0].audience_female_split = 0.9, 0.1
+        influencers[1].audience_male_split, influencers[1].audience_female_split = 0.1, 0.9
+        influencers[2].audience_male_split, influencers[2].audience_female_split = 0.8, 0.2
+        self.__data_manager.create_fake_data(
+            [influencer_generator(dto=influencer, mapper=self._object_mapper) for influencer in influencers])
+
+        # act
+        similar = self.__sut.load_similar(id_=influencers[0].id, limit=1, metric=SimilarityMetric.L1)
+
+        # assert
+        assert [(influencer.id, round(score, 4)) for influencer, score in similar] == [(influencers[2].id, 0.2)]
+
+    def test_load_similar_sees_updates_made_through_the_repository(self):
+        # arrange
+        influencers = [influencer_dto_generator(num=num) for num in range(1, 4)]
+        influencers[0].audience_male_split, influencers[0].audience_female_split = 0.9, 0.1
+        influencers[1].audience_male_split, influencers[1].audience_female_split = 0.1, 0.9
+        influencers[2].audience_male_split, influencers[2].audience_female_split = 0.8, 0.2
+        self.__data_manager.create_fake_data(
+            [influencer_generator(dto=influencer, mapper=self._object_mapper) for influencer in influencers])
+        self.__sut.load_similar(id_=influencers[0].id, limit=1)
+        influencers[1].audience_male_split, influencers[1].audience_female_split = 0.9, 0.1
+
+        # act
+        self.__sut.update_for_auth_user(auth_user_id=influencers[1].auth_user_id, payload=influencers[1])
+        similar = self.__sut.load_similar(id_=influencers[0].id, limit=1, metric=SimilarityMetric.L1)
+
+        # assert
+        assert similar[0][0].id == influencers[1].id
+
+    def test_load_similar_when_not_found(self):
+        self.assertRaises(NotFoundException, lambda: self.__sut.load_similar(id_="1234", limit=1))
+
     def test_update_influencer_when_not_found(self):
         self.assertRaises(NotFoundException, lambda: self.__sut.update_for_auth_user(auth_user_id="1234",
                                                                                      payload=influencer_dto_generator(
@@ -361,6 +607,132 @@ class TestAuthUserRepository(TestCase):
         assert actual_brand.email == expected_brand.email
 
 
+
+class TestAuthUserRepositoryBatch(TestCase):
+
+    def setUp(self) -> None:
+        os.environ["USER_POOL_ID"] = "eu-west-2_test"
+        self.__users = {f"auth_user_{num}": user_dto_generator(num=num) for num in range(150)}
+        self.__client = StubCognitoClient(users=self.__users)
+        self.__sut = CognitoAuthUserRepository(auth_service=CognitoAuthService(client=self.__client))
+
+    def test_get_by_ids_when_few_ids(self):
+        # act
+        actual = self.__sut.get_by_ids(ids=["auth_user_1", "auth_user_2"])
+
+        # assert
+        assert actual["auth_user_1"].first_name == self.__users["auth_user_1"].first_name
+        assert actual["auth_user_2"].email == self.__users["auth_user_2"].email
+        assert self.__client.calls["admin_get_user"] == 2
+        assert self.__client.calls["list_users"] == 0
+
+    def test_get_by_ids_when_many_ids(self):
+        # arrange
+        ids = [f"auth_user_{num}" for num in range(100)]
+
+        # act
+        actual = self.__sut.get_by_ids(ids=ids)
+
+        # assert
+        assert len(actual) == 100
+        assert actual["auth_user_99"].last_name == self.__users["auth_user_99"].last_name
+        assert self.__client.calls["admin_get_user"] == 0
+        assert self.__client.calls["list_users"] == 2
+
+    def test_get_by_ids_when_some_not_found(self):
+        # act
+        few = self.__sut.get_by_ids(ids=["auth_user_1", "random"])
+        many = self.__sut.get_by_ids(ids=["random"] + [f"auth_user_{num}" for num in range(10)])
+
+        # assert
+        assert list(few) == ["auth_user_1"]
+        assert len(many) == 10
+        assert "random" not in many
+
+    def test_get_by_ids_estimates_pool_size_once(self):
+        # act
+        self.__sut.get_by_ids(ids=["auth_user_1"])
+        self.__sut.get_by_ids(ids=["auth_user_2"])
+
+        # assert
+        assert self.__client.calls["describe_user_pool"] == 1
+
+    def test_get_by_ids_when_empty(self):
+        # act
+        actual = self.__sut.get_by_ids(ids=[])
+
+        # assert
+        assert actual == {}
+        assert sum(self.__client.calls.values()) == 0
+
+
+
+class TestCachingAuthUserRepository(TestCase):
+
+    def setUp(self) -> None:
+        self.__auth_user_repository: AuthUserRepository = Mock()
+        self.__sut = CachingAuthUserRepository(auth_user_repository=self.__auth_user_repository,
+                                               cache=TtlLruCache(max_size=10, ttl_seconds=60))
+
+    def test_get_by_id_is_cached(self):
+        # arrange
+        user = user_dto_generator(num=1)
+        self.__auth_user_repository.get_by_id = MagicMock(return_value=user)
+
+        # act
+        first = self.__sut.get_by_id(_id="1")
+        second = self.__sut.get_by_id(_id="1")
+
+        # assert
+        assert first is user
+        assert second is user
+        self.__auth_user_repository.get_by_id.assert_called_once_with(_id="1")
+        assert self.__sut.cache.hits == 1
+        assert self.__sut.cache.misses == 1
+
+    def test_get_by_ids_only_fetches_misses(self):
+        # arrange
+        users = {"1": user_dto_generator(num=1), "2": user_dto_generator(num=2)}
+        self.__auth_user_repository.get_by_id = MagicMock(return_value=users["1"])
+        self.__auth_user_repository.get_by_ids = MagicMock(return_value={"2": users["2"]})
+        self.__sut.get_by_id(_id="1")
+
+        # act
+        actual = self.__sut.get_by_ids(ids=["1", "2", "3"])
+
+        # assert
+        assert actual == users
+        self.__auth_user_repository.get_by_ids.assert_called_once_with(ids=["2", "3"])
+
+    def test_update_brand_claims_invalidates(self):
+        # arrange
+        brand = brand_dto_generator(num=1)
+        self.__auth_user_repository.get_by_id = MagicMock(return_value=user_dto_generator(num=1))
+        self.__sut.get_by_id(_id=brand.auth_user_id)
+
+        # act
+        self.__sut.update_brand_claims(user=brand)
+        self.__sut.get_by_id(_id=brand.auth_user_id)
+
+        # assert
+        self.__auth_user_repository.update_brand_claims.assert_called_once_with(user=brand)
+        assert self.__auth_user_repository.get_by_id.call_count == 2
+
+    def test_update_influencer_claims_invalidates(self):
+        # arrange
+        influencer = influencer_dto_generator(num=1)
+        self.__auth_user_repository.get_by_id = MagicMock(return_value=user_dto_generator(num=1))
+        self.__sut.get_by_id(_id=influencer.auth_user_id)
+
+        # act
+        self.__sut.update_influencer_claims(user=influencer)
+        self.__sut.get_by_id(_id=influencer.auth_user_id)
+
+        # assert
+        self.__auth_user_repository.update_influencer_claims.assert_called_once_with(user=influencer)
+        assert self.__auth_user_repository.get_by_id.call_count == 2
+
+
 class TestCampaignRepository(TestCase):
 
     def setUp(self) -> None:
@@ -420,9 +792,9 @@ class TestCampaignRepository(TestCase):
             campaign_dto_generator(num=2),
             campaign_dto_generator(num=3)
         ]
-        campaigns[0].brand_id = brand.id
-        campaigns[1].brand_id = brand.id
-        campaigns[2].brand_id = brand.id
+        for second, campaign in enumerate(campaigns):
+            campaign.brand_id = brand.id
+            campaign.created = datetime(2022, 6, 1, 9, 0, second)
         self.__data_manager.create_fake_data([brand_generator(dto=brand, mapper=self.__object_mapper)])
         self.__data_manager.create_fake_data(
             list(map(lambda x: campaign_generator(dto=x, mapper=self.__object_mapper), campaigns))
@@ -434,9 +806,116 @@ class TestCampaignRepository(TestCase):
         # assert
         assert list(map(lambda x: x.__dict__, campaigns)) == list(map(lambda x: x.__dict__, returned_campaigns))
 
+    def test_load_active_candidates(self):
+        # arrange
+        campaigns = [campaign_dto_generator(num=num) for num in range(1, 4)]
+        campaigns[0].campaign_state = CampaignStateEnum.ACTIVE
+        campaigns[2].campaign_state = CampaignStateEnum.ACTIVE
+        self.__data_manager.create_fake_data(
+            [campaign_generator(dto=campaign, mapper=self.__object_mapper) for campaign in campaigns])
+
+        # act
+        candidates = self.__sut.load_active_candidates()
+
+        # assert
+        assert sorted(candidates.ids) == sorted([campaigns[0].id, campaigns[2].id])
+        index = candidates.ids.index(campaigns[2].id)
+        assert candidates.value_masks[index] == to_bitmask(campaigns[2].campaign_values)
+        assert candidates.category_masks[index] == to_bitmask(campaigns[2].campaign_categories)
+
+    def test_rank_active_candidates_follows_writes(self):
+        # arrange
+        campaigns = [campaign_dto_generator(num=num) for num in range(1, 3)]
+        for campaign in campaigns:
+            campaign.campaign_state = CampaignStateEnum.ACTIVE
+        self.__data_manager.create_fake_data(
+            [campaign_generator(dto=campaign, mapper=self.__object_mapper) for campaign in campaigns])
+        value_mask = to_bitmask(campaigns[0].campaign_values)
+        category_mask = to_bitmask(campaigns[0].campaign_categories)
+        before = self.__sut.rank_active_candidates(value_mask=value_mask, category_mask=category_mask, k=5)
+
+        # act
+        self.__sut.update_campaign_state(_id=campaigns[0].id, payload=CampaignStateEnum.CLOSED)
+        after = self.__sut.rank_active_candidates(value_mask=value_mask, category_mask=category_mask, k=5)
+
+        # assert
+        assert sorted(id_ for id_, _ in before) == sorted(campaign.id for campaign in campaigns)
+        assert [id_ for id_, _ in after] == [campaigns[1].id]
+
+    def test_load_page_filtered(self):
+        # arrange
+        campaigns = [campaign_dto_generator(num=num) for num in range(1, 4)]
+        for num, campaign in enumerate(campaigns):
+            campaign.created = datetime(2022, 1, 1) + timedelta(seconds=num)
+            campaign.campaign_state = CampaignStateEnum.ACTIVE
+        campaigns[1].campaign_state = CampaignStateEnum.DRAFT
+        self.__data_manager.create_fake_data(
+            [campaign_generator(dto=campaign, mapper=self.__object_mapper) for campaign in campaigns])
+        campaign_filter = CampaignFilter(values=(ValueEnum.VALUE5,))
+
+        # act
+        first_page = self.__sut.load_page_filtered(campaign_filter=campaign_filter, limit=1)
+        second_page = self.__sut.load_page_filtered(campaign_filter=campaign_filter,
+                                                    limit=1,
+                                                    cursor=first_page.next_cursor)
+
+        # assert
+        assert [campaign.id for campaign in first_page.items] == [campaigns[2].id]
+        assert [campaign.id for campaign in second_page.items] == [campaigns[0].id]
+        assert second_page.next_cursor is None
+
+    def test_load_page_filtered_sees_writes_made_through_the_repository(self):
+        # arrange
+        brand = brand_dto_generator(num=1)
+        self.__data_manager.create_fake_data([brand_generator(dto=brand, mapper=self.__object_mapper)])
+        campaign_filter = CampaignFilter(categories=(CategoryEnum.CATEGORY5,))
+        assert self.__sut.load_page_filtered(campaign_filter=campaign_filter, limit=10).items == []
+        campaign = self.__sut.write_new_for_brand(payload=campaign_dto_generator(num=1),
+                                                  auth_user_id=brand.auth_user_id)
+
+        # act
+        self.__sut.update_campaign_state(_id=campaign.id, payload=CampaignStateEnum.ACTIVE)
+        page = self.__sut.load_page_filtered(campaign_filter=campaign_filter, limit=10)
+
+        # assert
+        assert [loaded.id for loaded in page.items] == [campaign.id]
+
+    def test_load_page_filtered_when_cursor_is_invalid(self):
+        self.assertRaises(InvalidCursorException,
+                          lambda: self.__sut.load_page_filtered(campaign_filter=CampaignFilter(),
+                                                                limit=1,
+                                                                cursor="not a cursor"))
+
     def test_load_for_brand_when_brand_not_found(self):
         self.assertRaises(NotFoundException, lambda: self.__sut.load_for_auth_brand(auth_user_id="1234"))
 
+    def test_load_page_for_brand(self):
+        # arrange
+        brand = brand_dto_generator(num=1)
+        campaigns = [campaign_dto_generator(num=num) for num in range(1, 4)]
+        for campaign in campaigns:
+            campaign.brand_id = brand.id
+        other_campaign = campaign_dto_generator(num=4)
+        other_campaign.brand_id = "other_brand"
+        self.__data_manager.create_fake_data([brand_generator(dto=brand, mapper=self.__object_mapper)])
+        self.__data_manager.create_fake_data(
+            list(map(lambda x: campaign_generator(dto=x, mapper=self.__object_mapper), campaigns + [other_campaign]))
+        )
+
+        # act
+        first = self.__sut.load_page_for_auth_brand(auth_user_id=brand.auth_user_id, limit=2)
+        second = self.__sut.load_page_for_auth_brand(auth_user_id=brand.auth_user_id, limit=2,
+                                                     cursor=first.next_cursor)
+
+        # assert
+        returned_ids = [campaign.id for campaign in first.items + second.items]
+        assert sorted(returned_ids) == sorted(campaign.id for campaign in campaigns)
+        assert second.next_cursor is None
+
+    def test_load_page_for_brand_when_brand_not_found(self):
+        self.assertRaises(NotFoundException,
+                          lambda: self.__sut.load_page_for_auth_brand(auth_user_id="1234", limit=2))
+
     def test_update_product_image1(self):
         # arrange
         campaign = campaign_dto_generator(num=1)
@@ -461,6 +940,98 @@ class TestCampaignRepository(TestCase):
         self.assertRaises(NotFoundException, lambda: self.__sut.update_product_image1(id="12345",
                                                                                       image_bytes="imagebytes"))
 
+    def test_update_product_images(self):
+        for executor in [None, ConcurrentExecutor(max_workers=3)]:
+            with self.subTest(executor=executor):
+                # arrange
+                data_manager = InMemorySqliteDataManager()
+                object_mapper = ObjectMapper()
+                sut = SqlAlchemyCampaignRepository(data_manager=data_manager,
+                                                   object_mapper=object_mapper,
+                                                   image_repository=self.__image_repository,
+                                                   image_executor=executor)
+                campaign = campaign_dto_generator(num=1)
+                data_manager.create_fake_data([campaign_generator(dto=campaign, mapper=object_mapper)])
+                self.__image_repository.upload = MagicMock(side_effect=lambda path, image_base64_encoded:
+                                                           f"{path}/{image_base64_encoded}.png")
+
+                # act
+                returned_campaign = sut.update_product_images(id=campaign.id,
+                                                              images={"product_image3": "three",
+                                                                      "product_image1": "one"})
+
+                # assert
+                assert self.__image_repository.upload.call_count == 2
+                assert returned_campaign.product_image1 == f"{campaign.id}/one.png"
+                assert returned_campaign.product_image2 == campaign.product_image2
+                assert returned_campaign.product_image3 == f"{campaign.id}/three.png"
+                assert sut.load_by_id(id_=campaign.id).__dict__ == returned_campaign.__dict__
+
+    def test_update_product_images_when_an_upload_fails(self):
+        # arrange
+        object_mapper = ObjectMapper()
+        sut = SqlAlchemyCampaignRepository(data_manager=self.__data_manager,
+                                           object_mapper=object_mapper,
+                                           image_repository=self.__image_repository,
+                                           image_executor=ConcurrentExecutor(max_workers=3))
+        campaign = campaign_dto_generator(num=1)
+        self.__data_manager.create_fake_data([campaign_generator(dto=campaign, mapper=object_mapper)])
+
+        def upload(path, image_base64_encoded):
+            if image_base64_encoded == "bad":
+                raise ImageException("not an image")
+            return f"{path}/{image_base64_encoded}.png"
+
+        self.__image_repository.upload = MagicMock(side_effect=upload)
+
+        # act
+        self.assertRaises(ImageException,
+                          lambda: sut.update_product_images(id=campaign.id,
+                                                            images={"product_image1": "good", "product_image2": "bad"}))
+
+        # assert
+        stored = sut.load_by_id(id_=campaign.id)
+        assert stored.product_image1 == campaign.product_image1
+        assert stored.product_image2 == campaign.product_image2
+
+    def test_update_product_images_when_not_found(self):
+        self.assertRaises(NotFoundException,
+                          lambda: self.__sut.update_product_images(id="12345", images={"product_image1": "bytes"}))
+
+    def test_create_image_upload(self):
+        # arrange
+        campaign = campaign_dto_generator(num=1)
+        self.__data_manager.create_fake_data([campaign_generator(dto=campaign, mapper=self.__object_mapper)])
+        self.__image_repository.create_upload = MagicMock(return_value={"key": "key"})
+
+        # act
+        upload = self.__sut.create_image_upload(id=campaign.id, content_type="image/jpeg")
+
+        # assert
+        self.__image_repository.create_upload.assert_called_once_with(path=campaign.id, content_type="image/jpeg")
+        assert upload == {"key": "key"}
+
+    def test_create_image_upload_when_not_found(self):
+        self.assertRaises(NotFoundException, lambda: self.__sut.create_image_upload(id="12345",
+                                                                                    content_type="image/jpeg"))
+
+    def test_confirm_product_image2(self):
+        # arrange
+        campaign = campaign_dto_generator(num=1)
+        self.__data_manager.create_fake_data([campaign_generator(dto=campaign, mapper=self.__object_mapper)])
+        image_key = f"{campaign.id}/product.jpg"
+        self.__image_repository.confirm_upload = MagicMock(return_value=image_key)
+
+        # act
+        returned_campaign = self.__sut.confirm_product_image2(id=campaign.id, image_key=image_key)
+
+        # assert
+        self.__image_repository.confirm_upload.assert_called_once_with(path=campaign.id, key=image_key)
+        assert returned_campaign.product_image2 == image_key
+        del campaign.product_image2
+        del returned_campaign.product_image2
+        assert campaign.__dict__ == returned_campaign.__dict__
+
     def test_update_product_image2(self):
         # arrange
         campaign = campaign_dto_generator(num=1)
@@ -551,3 +1122,331 @@ class TestCampaignRepository(TestCase):
         del campaign.product_image2
         del campaign.product_image3
         del campaign.created
+
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR"
+NOT_FOUND = ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject")
+
+
+class TestS3ImageRepository(TestCase):
+
+    def setUp(self):
+        self.__s3_client = Mock()
+        self.__s3_client.create_multipart_upload = MagicMock(return_value={"UploadId": "upload"})
+        self.__s3_client.upload_part = MagicMock(side_effect=lambda **kwargs: {"ETag": f"etag{kwargs['PartNumber']}"})
+        self.__s3_client.head_object = MagicMock(side_effect=NOT_FOUND)
+        self.__sut = S3ImageRepository(max_size_bytes=100,
+                                       multipart_threshold_bytes=40,
+                                       part_size_bytes=15,
+                                       s3_client=self.__s3_client)
+
+    def test_upload_small_image_in_one_put(self):
+        # arrange
+        image = PNG_HEADER + b"0" * 10
+
+        # act
+        key = self.__sut.upload(path="user", image_base64_encoded=base64.b64encode(image).decode())
+
+        # assert
+        digest = hashlib.sha256(image)
+        assert key == f"images/{digest.hexdigest()}.png"
+        self.__s3_client.head_object.assert_called_once_with(Bucket="pinfluencer-product-images", Key=key)
+        self.__s3_client.put_object.assert_called_once_with(Bucket="pinfluencer-product-images", Key=key, Body=image,
+                                                            ContentType="image/png",
+                                                            ChecksumSHA256=base64.b64encode(digest.digest()).decode(),
+                                                            Tagging="public=yes")
+        self.__s3_client.create_multipart_upload.assert_not_called()
+
+    def test_upload_of_a_stored_image_is_skipped(self):
+        # arrange
+        variant_queue = Mock()
+        self.__s3_client.head_object = MagicMock(return_value={})
+        sut = S3ImageRepository(s3_client=self.__s3_client, variant_queue=variant_queue)
+        image = base64.b64encode(PNG_HEADER).decode()
+
+        # act
+        keys = [sut.upload(path="campaign1", image_base64_encoded=image),
+                sut.upload(path="campaign2", image_base64_encoded=image)]
+
+        # assert
+        key = f"images/{hashlib.sha256(PNG_HEADER).hexdigest()}.png"
+        assert keys[0] == keys[1] == key
+        self.__s3_client.put_object.assert_not_called()
+        variant_queue.enqueue.assert_not_called()
+        assert self.__s3_client.copy_object.call_count == 2
+        copy = self.__s3_client.copy_object.call_args.kwargs
+        assert copy["Key"] == key
+        assert copy["CopySource"]["Key"] == key
+        assert copy["MetadataDirective"] == "REPLACE"
+        assert copy["ContentType"] == "image/png"
+
+    def test_upload_when_existence_check_fails(self):
+        # arrange
+        self.__s3_client.head_object = MagicMock(
+            side_effect=ClientError({"Error": {"Code": "403", "Message": "Forbidden"}}, "HeadObject"))
+
+        # act
+        self.assertRaises(ImageException,
+                          lambda: self.__sut.upload(path="user",
+                                                    image_base64_encoded=base64.b64encode(PNG_HEADER).decode()))
+
+        # assert
+        self.__s3_client.put_object.assert_not_called()
+
+    def test_upload_unknown_type_as_jpg(self):
+        # act
+        key = self.__sut.upload(path="user", image_base64_encoded=base64.b64encode(b"not an image").decode())
+
+        # assert
+        assert key.endswith(".jpg")
+        assert self.__s3_client.put_object.call_args.kwargs["ContentType"] == "image/jpg"
+
+    def test_upload_ignores_line_breaks(self):
+        # arrange
+        image = PNG_HEADER + b"0" * 10
+
+        # act
+        self.__sut.upload(path="user", image_base64_encoded=base64.encodebytes(image).decode())
+
+        # assert
+        assert self.__s3_client.put_object.call_args.kwargs["Body"] == image
+
+    def test_upload_large_image_in_parts(self):
+        # arrange
+        image = PNG_HEADER + bytes(range(50))
+
+        # act
+        key = self.__sut.upload(path="user", image_base64_encoded=base64.b64encode(image).decode())
+
+        # assert
+        assert key == f"images/{hashlib.sha256(image).hexdigest()}.png"
+        self.__s3_client.put_object.assert_not_called()
+        parts = [call.kwargs["Body"] for call in self.__s3_client.upload_part.call_args_list]
+        assert b"".join(parts) == image
+        assert [len(part) for part in parts] == [15, 15, 15, 15, 6]
+        self.__s3_client.complete_multipart_upload.assert_called_once_with(
+            Bucket="pinfluencer-product-images", Key=key, UploadId="upload",
+            MultipartUpload={"Parts": [{"ETag": f"etag{number}", "PartNumber": number} for number in range(1, 6)]})
+        self.__s3_client.abort_multipart_upload.assert_not_called()
+
+    def test_upload_aborts_failed_multipart_upload(self):
+        # arrange
+        self.__s3_client.upload_part = MagicMock(side_effect=Exception("connection reset"))
+
+        # act
+        self.assertRaises(Exception,
+                          lambda: self.__sut.upload(path="user",
+                                                    image_base64_encoded=base64.b64encode(b"0" * 60).decode()))
+
+        # assert
+        self.__s3_client.abort_multipart_upload.assert_called_once()
+        self.__s3_client.complete_multipart_upload.assert_not_called()
+
+    def test_upload_refuses_too_large_image_before_calling_s3(self):
+        # act
+        self.assertRaises(ImageTooLargeException,
+                          lambda: self.__sut.upload(path="user",
+                                                    image_base64_encoded=base64.b64encode(b"0" * 101).decode()))
+
+        # assert
+        self.__s3_client.put_object.assert_not_called()
+        self.__s3_client.create_multipart_upload.assert_not_called()
+
+    def test_upload_refuses_invalid_base64(self):
+        self.assertRaises(ImageException, lambda: self.__sut.upload(path="user", image_base64_encoded="abcde"))
+        self.__s3_client.put_object.assert_not_called()
+
+    def test_create_upload_is_scoped_to_the_path(self):
+        # arrange
+        s3_client = boto3.client("s3", region_name="eu-west-2", endpoint_url="http://localhost:9000",
+                                 aws_access_key_id="test", aws_secret_access_key="test")
+        sut = S3ImageRepository(max_size_bytes=100, s3_client=s3_client)
+
+        # act
+        upload = sut.create_upload(path="user", content_type="image/png")
+
+        # assert
+        assert upload["key"].startswith("user/") and upload["key"].endswith(".png")
+        assert upload["fields"]["key"] == upload["key"]
+        assert upload["fields"]["Content-Type"] == "image/png"
+        policy = json.loads(base64.b64decode(upload["fields"]["policy"]))
+        assert ["content-length-range", 1, 100] in policy["conditions"]
+        assert {"Content-Type": "image/png"} in policy["conditions"]
+
+    def test_create_upload_refuses_other_types(self):
+        self.assertRaises(ImageException, lambda: self.__sut.create_upload(path="user", content_type="text/html"))
+        self.__s3_client.generate_presigned_post.assert_not_called()
+
+    def test_confirm_upload(self):
+        # arrange
+        key = f"user/{uuid.uuid4()}.png"
+        self.__s3_client.head_object = MagicMock(return_value={})
+
+        # act
+        confirmed = self.__sut.confirm_upload(path="user", key=key)
+
+        # assert
+        assert confirmed == key
+        self.__s3_client.head_object.assert_called_once_with(Bucket="pinfluencer-product-images", Key=key)
+
+    def test_confirm_upload_refuses_keys_of_another_path(self):
+        for key in [f"other/{uuid.uuid4()}.png", f"user/other/{uuid.uuid4()}.png", "user/logo.png", "", None]:
+            with self.subTest(key=key):
+                self.assertRaises(ImageException, lambda: self.__sut.confirm_upload(path="user", key=key))
+        self.__s3_client.head_object.assert_not_called()
+
+    def test_confirm_upload_when_not_uploaded(self):
+        # arrange
+        self.__s3_client.head_object = MagicMock(
+            side_effect=ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject"))
+
+        # act
+        self.assertRaises(ImageException,
+                          lambda: self.__sut.confirm_upload(path="user", key=f"user/{uuid.uuid4()}.png"))
+
+    def test_stored_images_are_queued_for_variants(self):
+        # arrange
+        variant_queue = Mock()
+        self.__s3_client.head_object = MagicMock(side_effect=[NOT_FOUND, {}])
+        sut = S3ImageRepository(s3_client=self.__s3_client, variant_queue=variant_queue)
+        key = f"user/{uuid.uuid4()}.png"
+
+        # act
+        uploaded = sut.upload(path="user", image_base64_encoded=base64.b64encode(PNG_HEADER).decode())
+        confirmed = sut.confirm_upload(path="user", key=key)
+
+        # assert
+        assert [call.kwargs["key"] for call in variant_queue.enqueue.call_args_list] == [uploaded, confirmed]
+
+    def test_image_is_stored_when_it_cannot_be_queued(self):
+        # arrange
+        variant_queue = Mock()
+        variant_queue.enqueue = MagicMock(
+            side_effect=ClientError({"Error": {"Code": "500", "Message": "Unavailable"}}, "SendMessage"))
+        sut = S3ImageRepository(s3_client=self.__s3_client, variant_queue=variant_queue)
+
+        # act
+        key = sut.upload(path="user", image_base64_encoded=base64.b64encode(PNG_HEADER).decode())
+
+        # assert
+        assert self.__s3_client.put_object.call_args.kwargs["Key"] == key
+
+    def test_upload_variant(self):
+        # act
+        self.__sut.upload_variant(key="user/image-64w.webp", data=b"webp", content_type="image/webp")
+
+        # assert
+        self.__s3_client.put_object.assert_called_once_with(Bucket="pinfluencer-product-images",
+                                                            Key="user/image-64w.webp",
+                                                            Body=b"webp",
+                                                            ContentType="image/webp",
+                                                            CacheControl="public, max-age=31536000, immutable",
+                                                            Tagging="public=yes")
+
+    def test_list_images(self):
+        # arrange
+        modified = datetime(2022, 6, 1)
+        self.__s3_client.get_paginator.return_value.paginate = MagicMock(
+            return_value=[{"Contents": [{"Key": "a.png", "LastModified": modified}]}, {}])
+
+        # act
+        images = list(self.__sut.list_images())
+
+        # assert
+        self.__s3_client.get_paginator.assert_called_once_with("list_objects_v2")
+        assert images == [("a.png", modified)]
+
+    def test_delete_in_batches(self):
+        # act
+        self.__sut.delete(keys=[f"{num}.png" for num in range(1001)])
+
+        # assert
+        batches = [call.kwargs["Delete"]["Objects"] for call in self.__s3_client.delete_objects.call_args_list]
+        assert [len(batch) for batch in batches] == [1000, 1]
+        assert batches[1] == [{"Key": "1000.png"}]
+
+
+class TestSqsImageVariantQueue(TestCase):
+
+    def test_enqueue(self):
+        # arrange
+        sqs_client = Mock()
+        sut = SqsImageVariantQueue(queue_url="https://sqs/queue", sqs_client=sqs_client)
+
+        # act
+        sut.enqueue(key="user/image.png")
+
+        # assert
+        sqs_client.send_message.assert_called_once_with(QueueUrl="https://sqs/queue",
+                                                        MessageBody='{"key": "user/image.png"}')
+
+
+@skipUnless(os.environ.get("S3_ENDPOINT_URL"), "S3_ENDPOINT_URL of a local s3 like minio is not set")
+class TestS3ImageRepositoryUploadFlow(TestCase):
+
+    def setUp(self):
+        self.__s3_client = boto3.client("s3", endpoint_url=os.environ["S3_ENDPOINT_URL"])
+        try:
+            self.__s3_client.create_bucket(Bucket="pinfluencer-product-images",
+                                           CreateBucketConfiguration={"LocationConstraint": "eu-west-2"})
+        except ClientError:
+            pass
+        self.__sut = S3ImageRepository(max_size_bytes=1024, s3_client=self.__s3_client)
+
+    def test_posted_image_is_confirmed(self):
+        # arrange
+        upload = self.__sut.create_upload(path="user", content_type="image/png")
+
+        # act
+        status = self.__post(upload=upload, image=PNG_HEADER)
+        key = self.__sut.confirm_upload(path="user", key=upload["key"])
+
+        # assert
+        assert status == 204
+        assert self.__s3_client.get_object(Bucket="pinfluencer-product-images", Key=key)["Body"].read() == PNG_HEADER
+
+    def test_image_over_the_limit_is_refused_by_s3(self):
+        # arrange
+        upload = self.__sut.create_upload(path="user", content_type="image/png")
+
+        # act
+        status = self.__post(upload=upload, image=PNG_HEADER + b"0" * 1024)
+
+        # assert
+        assert status == 400
+        self.assertRaises(ImageException, lambda: self.__sut.confirm_upload(path="user", key=upload["key"]))
+
+    @staticmethod
+    def __post(upload: dict, image: bytes) -> int:
+        boundary = uuid.uuid4().hex
+        parts = [f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+                 for name, value in upload["fields"].items()]
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="image"\r\n'
+                     f'Content-Type: {upload["fields"]["Content-Type"]}\r\n\r\n'.encode() + image +
+                     f'\r\n--{boundary}--\r\n'.encode())
+        request = urllib.request.Request(upload["url"], data=b"".join(parts), method="POST",
+                                         headers={"Content-Type": f"multipart/form-data; boundary={boundary}"})
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+
+class TestBase64(TestCase):
+
+    def test_decoded_size(self):
+        for length in range(0, 10):
+            with self.subTest(length=length):
+                assert base64_decoded_size(base64.b64encode(b"0" * length).decode()) == length
+
+    def test_iter_decode(self):
+        # arrange
+        data = bytes(range(256)) * 3
+
+        # act
+        chunks = list(iter_base64_decode(data=base64.b64encode(data).decode(), chunk_size_bytes=100))
+
+        # assert
+        assert b"".join(chunks) == data
+        assert all(len(chunk) == 99 for chunk in chunks[:-1])
@@ -0,0 +1,128 @@
+import os
+from datetime import datetime
+from unittest import TestCase, skipUnless
+from unittest.mock import Mock
+
+from src.crosscutting import JsonSnakeToCamelSerializer, StdlibJsonEncoder, OrjsonJsonEncoder, orjson
+from src.domain.models import Brand, Influencer, Campaign, ValueEnum, CategoryEnum, CampaignStateEnum
+from src.web import PinfluencerResponse
+from src.web.routing import Dispatcher
+from src.web.serialization import serialize_brand, serialize_influencer, serialize_campaign, serialize_collection
+from tests import page_body
+
+GOLDEN_DIRECTORY = os.path.join(os.path.dirname(__file__), "golden")
+CREATED = datetime(2022, 6, 1, 9, 30, 15, 123456)
+
+
+def brand() -> dict:
+    return Brand(id="7e9b0a38-1b2c-4d5e-8f90-0a1b2c3d4e5f", created=CREATED, first_name="Zoë", last_name="O'Brien",
+                 email="zoe@example.com", auth_user_id="auth-brand", brand_name="Brand \"quoted\"",
+                 brand_description="line one\nline two", website="https://example.com",
+                 logo="7e9b0a38-1b2c-4d5e-8f90-0a1b2c3d4e5f/0d1e2f3a-4b5c-4d6e-8f70-8192a3b4c5d6.png",
+                 header_image="header.png", insta_handle="@brand", values=[ValueEnum.VEGAN, ValueEnum.ORGANIC],
+                 categories=[CategoryEnum.FOOD]).__dict__
+
+
+def influencer() -> dict:
+    return Influencer(id="1c2d3e4f-5a6b-4c7d-8e9f-0a1b2c3d4e5f", created=CREATED, first_name="Ana", last_name="Łukasz",
+                      email="ana@example.com", auth_user_id="auth-influencer", insta_handle="@ana", bio="☕ & 🐶",
+                      image="image.png", audience_age_13_to_17_split=0.1, audience_age_18_to_24_split=0.2 + 0.1,
+                      audience_male_split=0.45, audience_female_split=0.55, values=[ValueEnum.SUSTAINABLE],
+                      categories=[CategoryEnum.FITNESS, CategoryEnum.PET]).__dict__
+
+
+def campaign() -> dict:
+    return Campaign(id="9f8e7d6c-5b4a-4392-8170-6f5e4d3c2b1a", created=CREATED, brand_id="brand",
+                    objective="awareness", campaign_title="Summer", campaign_categories=[CategoryEnum.FASHION],
+                    campaign_values=[ValueEnum.RECYCLED], campaign_state=CampaignStateEnum.ACTIVE,
+                    campaign_hashtag="#summer", product_image1="1.png", product_image2="2.png").__dict__
+
+
+# the body every route responds with, after its after hooks have run
+RESPONSE_SHAPES = {
+    "brand": lambda: serialize_brand(brand()),
+    "brands": lambda: serialize_collection(body=page_body([brand(), brand()], next_cursor="cursor"),
+                                           serialize=serialize_brand),
+    "influencer": lambda: serialize_influencer(influencer()),
+    "influencers": lambda: serialize_collection(body=page_body([influencer()], next_cursor="cursor"),
+                                                serialize=serialize_influencer),
+    "similar_influencers": lambda: serialize_collection(body=page_body([{**influencer(), "similarity": 0.9876}]),
+                                                        serialize=serialize_influencer),
+    "campaign": lambda: serialize_campaign(campaign()),
+    "campaigns": lambda: serialize_collection(body=page_body([campaign(), campaign()], next_cursor="cursor"),
+                                              serialize=serialize_campaign),
+    "feed": lambda: serialize_collection(body={"feed": "campaigns",
+                                               "items": [{**campaign(), "match_score": 2}],
+                                               "next_cursor": None},
+                                         serialize=serialize_campaign),
+    "image_upload": lambda: {"url": "https://pinfluencer-product-images.s3.amazonaws.com/",
+                             "fields": {"Content-Type": "image/png",
+                                        "key": "7e9b0a38-1b2c-4d5e-8f90-0a1b2c3d4e5f/image.png",
+                                        "x-amz-algorithm": "AWS4-HMAC-SHA256",
+                                        "policy": "eyJleHBpcmF0aW9uIjogIjIwMjItMDYtMDFUMDk6MzU6MTVaIn0="},
+                             "key": "7e9b0a38-1b2c-4d5e-8f90-0a1b2c3d4e5f/image.png"},
+    "not_implemented": lambda: {"message": "DELETE brands/me/campaigns/{campaign_id} is not implemented"},
+    "error": lambda: PinfluencerResponse.as_500_error().body,
+}
+
+ROUTE_SHAPES = {
+    'GET /feed': "feed",
+    'GET /brands': "brands",
+    'GET /influencers': "influencers",
+    'GET /brands/{brand_id}': "brand",
+    'GET /influencers/{influencer_id}': "influencer",
+    'GET /influencers/{influencer_id}/similar': "similar_influencers",
+    'GET /brands/me': "brand",
+    'POST /brands/me': "brand",
+    'PUT /brands/me': "brand",
+    'POST /brands/me/header-image': "brand",
+    'POST /brands/me/logo': "brand",
+    'POST /brands/me/image-uploads': "image_upload",
+    'PUT /brands/me/logo': "brand",
+    'PUT /brands/me/header-image': "brand",
+    'GET /influencers/me': "influencer",
+    'POST /influencers/me': "influencer",
+    'PUT /influencers/me': "influencer",
+    'POST /influencers/me/image': "influencer",
+    'POST /influencers/me/image-uploads': "image_upload",
+    'PUT /influencers/me/image': "influencer",
+    'GET /brands/me/campaigns': "campaigns",
+    'DELETE /brands/me/campaigns/{campaign_id}': "not_implemented",
+    'GET /campaigns': "campaigns",
+    'GET /campaigns/{campaign_id}': "campaign",
+    'POST /brands/me/campaigns': "campaign",
+    'PATCH /brands/me/campaigns/{campaign_id}': "campaign",
+    'PUT /brands/me/campaigns/{campaign_id}': "campaign",
+    'POST /brands/me/campaigns/{campaign_id}/product-image1': "campaign",
+    'POST /brands/me/campaigns/{campaign_id}/product-image2': "campaign",
+    'POST /brands/me/campaigns/{campaign_id}/product-image3': "campaign",
+    'POST /brands/me/campaigns/{campaign_id}/product-images': "campaign",
+    'POST /brands/me/campaigns/{campaign_id}/image-uploads': "image_upload",
+    'PUT /brands/me/campaigns/{campaign_id}/product-image1': "campaign",
+    'PUT /brands/me/campaigns/{campaign_id}/product-image2': "campaign",
+    'PUT /brands/me/campaigns/{campaign_id}/product-image3': "campaign",
+}
+
+
+def golden(shape: str) -> str:
+    with open(os.path.join(GOLDEN_DIRECTORY, f"{shape}.json"), encoding="utf-8") as file:
+        return file.read().rstrip("\n")
+
+
+class TestResponseGoldenFiles(TestCase):
+
+    def test_every_route_has_a_response_shape(self):
+        assert sorted(ROUTE_SHAPES) == sorted(Dispatcher(service_locator=Mock()).route_keys)
+        assert set(ROUTE_SHAPES.values()) <= set(RESPONSE_SHAPES)
+
+    def test_stdlib_encoder_matches_golden_files(self):
+        self.__assert_matches_golden_files(serializer=JsonSnakeToCamelSerializer(encoder=StdlibJsonEncoder()))
+
+    @skipUnless(orjson, "orjson is not installed")
+    def test_orjson_encoder_matches_golden_files(self):
+        self.__assert_matches_golden_files(serializer=JsonSnakeToCamelSerializer(encoder=OrjsonJsonEncoder()))
+
+    def __assert_matches_golden_files(self, serializer: JsonSnakeToCamelSerializer):
+        for shape, body in RESPONSE_SHAPES.items():
+            with self.subTest(shape=shape):
+                assert serializer.serialize(body()) == golden(shape=shape)
@@ -1,8 +1,11 @@
+from dataclasses import FrozenInstanceError
 from unittest import TestCase
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, Mock
 
-from src.web import PinfluencerContext
+from src.web import PinfluencerContext, Route
+from src.web.ioc import ServiceLocator
 from src.web.middleware import MiddlewarePipeline
+from src.web.routing import Dispatcher
 
 
 class TestMiddlewarePipeline(TestCase):
@@ -55,4 +58,56 @@ class TestMiddlewarePipeline(TestCase):
 
         # assert
         print(context.body["invocations"])
-        assert context.body["invocations"] == [1, 2, 3]
\ No newline at end of file
+        assert context.body["invocations"] == [1, 2, 3]
+
+
+class TestRoute(TestCase):
+
+    def test_pipeline_is_flattened_once(self):
+        # arrange
+        before, action, after = MagicMock(), MagicMock(), MagicMock()
+
+        # act
+        route = Route(action=action, before_hooks=[before], after_hooks=[after])
+
+        # assert
+        assert route.pipeline == (before, action, after)
+        assert route.before_hooks == (before,)
+        assert route.after_hooks == (after,)
+
+    def test_route_is_immutable(self):
+        # arrange
+        route = Route(action=MagicMock())
+
+        # act/assert
+        self.assertRaises(FrozenInstanceError, lambda: setattr(route, 'action', MagicMock()))
+
+
+class TestDispatcher(TestCase):
+
+    def setUp(self) -> None:
+        self.__service_locator: ServiceLocator = Mock()
+        self.__sut = Dispatcher(service_locator=self.__service_locator)
+
+    def test_get_route_is_compiled_once(self):
+        # act
+        first = self.__sut.get_route('GET /brands')
+        second = self.__sut.get_route('GET /brands')
+
+        # assert
+        assert first is second
+        self.__service_locator.get_brand_controller.assert_called_once()
+
+    def test_get_route_when_route_does_not_exist(self):
+        assert self.__sut.get_route('GET /random') is None
+
+    def test_route_table_is_built_once_and_immutable(self):
+        # act
+        first = self.__sut.dispatch_route_to_ctr
+        second = self.__sut.dispatch_route_to_ctr
+
+        # assert
+        assert first is second
+        assert first['GET /brands'] is self.__sut.get_route('GET /brands')
+        with self.assertRaises(TypeError):
+            first['GET /random'] = Route(action=MagicMock())
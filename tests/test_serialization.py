@@ -0,0 +1,158 @@
+from datetime import datetime
+from unittest import TestCase
+
+from src.crosscutting import CamelCaseBody, JsonSnakeToCamelSerializer
+from src.domain.models import Brand, Influencer, Campaign, ValueEnum, CategoryEnum, CampaignStateEnum
+from src.web.serialization import compile_serializer, serialize_collection, serialize_brand, \
+    serialize_influencer, serialize_campaign, image_srcset, S3_URL
+from tests import page_body
+
+
+class TestCompileSerializer(TestCase):
+
+    def test_serializes_every_field(self):
+        # arrange
+        created = datetime(2022, 5, 1, 12, 30)
+        campaign = Campaign(created=created,
+                            brand_id="brand",
+                            campaign_values=[ValueEnum.VEGAN, ValueEnum.ORGANIC],
+                            campaign_categories=[CategoryEnum.FOOD],
+                            campaign_state=CampaignStateEnum.ACTIVE,
+                            product_image1="image1")
+
+        # act
+        serialized = serialize_campaign(campaign.__dict__)
+
+        # assert
+        assert list(serialized) == ["id", "created", "brandId", "objective", "successDescription", "campaignTitle",
+                                    "campaignDescription", "campaignCategories", "campaignValues", "campaignState",
+                                    "campaignProductLink", "campaignHashtag", "campaignDiscountCode",
+                                    "productTitle", "productDescription", "productImage1", "productImage1Srcset",
+                                    "productImage2", "productImage2Srcset", "productImage3", "productImage3Srcset"]
+        assert serialized["id"] == campaign.id
+        assert serialized["created"] == "2022-05-01T12:30:00"
+        assert serialized["brandId"] == "brand"
+        assert serialized["campaignValues"] == ["VEGAN", "ORGANIC"]
+        assert serialized["campaignCategories"] == ["FOOD"]
+        assert serialized["campaignState"] == "ACTIVE"
+        assert serialized["productImage1"] == f"{S3_URL}/image1"
+
+    def test_user_images_are_tagged_with_the_bucket_url(self):
+        # arrange
+        brand = Brand(logo="logo", header_image="header")
+        influencer = Influencer(image="image")
+
+        # act
+        serialized_brand = serialize_brand(brand.__dict__)
+        serialized_influencer = serialize_influencer(influencer.__dict__)
+
+        # assert
+        assert serialized_brand["logo"] == f"{S3_URL}/logo"
+        assert serialized_brand["headerImage"] == f"{S3_URL}/header"
+        assert serialized_influencer["image"] == f"{S3_URL}/image"
+        assert serialized_influencer["audienceAge13To17Split"] == 0.0
+
+    def test_uploaded_images_come_with_the_srcset_of_their_variants(self):
+        # arrange
+        influencer = Influencer(image="user/0d1e2f3a-4b5c-4d6e-8f70-8192a3b4c5d6.jpg")
+
+        # act
+        serialized = serialize_influencer(influencer.__dict__)
+
+        # assert
+        assert list(serialized).index("imageSrcset") == list(serialized).index("image") + 1
+        assert serialized["imageSrcset"] == {
+            "webp": f"{S3_URL}/user/0d1e2f3a-4b5c-4d6e-8f70-8192a3b4c5d6-64w.webp 64w, "
+                    f"{S3_URL}/user/0d1e2f3a-4b5c-4d6e-8f70-8192a3b4c5d6-256w.webp 256w, "
+                    f"{S3_URL}/user/0d1e2f3a-4b5c-4d6e-8f70-8192a3b4c5d6-1024w.webp 1024w",
+            "jpeg": f"{S3_URL}/user/0d1e2f3a-4b5c-4d6e-8f70-8192a3b4c5d6-64w.jpeg 64w, "
+                    f"{S3_URL}/user/0d1e2f3a-4b5c-4d6e-8f70-8192a3b4c5d6-256w.jpeg 256w, "
+                    f"{S3_URL}/user/0d1e2f3a-4b5c-4d6e-8f70-8192a3b4c5d6-1024w.jpeg 1024w"}
+
+    def test_default_images_have_no_srcset(self):
+        # act
+        serialized = serialize_brand(Brand().__dict__)
+
+        # assert
+        assert serialized["logoSrcset"] is None
+        assert serialized["headerImageSrcset"] is None
+        assert image_srcset("") is None
+
+    def test_keys_that_are_not_fields_are_kept(self):
+        # arrange
+        influencer = dict(Influencer().__dict__, match_score=3)
+
+        # act
+        serialized = serialize_influencer(influencer)
+
+        # assert
+        assert serialized["matchScore"] == 3
+
+    def test_missing_created_stays_none(self):
+        # arrange
+        brand = Brand(created=None)
+
+        # act
+        serialized = serialize_brand(brand.__dict__)
+
+        # assert
+        assert serialized["created"] is None
+
+    def test_does_not_change_the_model(self):
+        # arrange
+        brand = Brand(values=[ValueEnum.VEGAN])
+
+        # act
+        serialize_brand(brand.__dict__)
+
+        # assert
+        assert brand.values == [ValueEnum.VEGAN]
+        assert not brand.logo.startswith(S3_URL)
+
+    def test_compiles_any_dataclass(self):
+        # arrange
+        serialize = compile_serializer(model_type=Brand)
+
+        # act
+        serialized = serialize(Brand(logo="logo").__dict__)
+
+        # assert
+        assert serialized["logo"] == "logo"
+
+
+class TestSerializeCollection(TestCase):
+
+    def test_serializes_items_and_keeps_the_page(self):
+        # arrange
+        body = page_body([Brand(logo="1").__dict__, Brand(logo="2").__dict__], next_cursor="cursor")
+
+        # act
+        serialized = serialize_collection(body=body, serialize=serialize_brand)
+
+        # assert
+        assert isinstance(serialized, CamelCaseBody)
+        assert serialized["nextCursor"] == "cursor"
+        assert [item["logo"] for item in serialized["items"]] == [f"{S3_URL}/1", f"{S3_URL}/2"]
+
+    def test_same_json_as_the_generic_serializer(self):
+        # arrange
+        serializer = JsonSnakeToCamelSerializer()
+        campaign = Campaign(campaign_values=[ValueEnum.VEGAN], campaign_state=CampaignStateEnum.DRAFT)
+        generic = {}
+        for key, value in dict(campaign.__dict__,
+                               created=campaign.created.isoformat(),
+                               campaign_values=["VEGAN"],
+                               campaign_categories=[],
+                               campaign_state="DRAFT",
+                               product_image1=f"{S3_URL}/",
+                               product_image2=f"{S3_URL}/",
+                               product_image3=f"{S3_URL}/").items():
+            generic[key] = value
+            if key.startswith("product_image"):
+                generic[f"{key}_srcset"] = None
+
+        # act
+        compiled = serialize_collection(body=page_body([campaign.__dict__]), serialize=serialize_campaign)
+
+        # assert
+        assert serializer.serialize(compiled) == serializer.serialize(page_body([generic]))
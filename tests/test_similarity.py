@@ -0,0 +1,109 @@
+from unittest import TestCase
+
+import numpy as np
+
+from src.domain.models import Influencer
+from src.domain.similarity import AudienceIndex, SimilarityMetric, audience_vector, AUDIENCE_FIELDS
+
+
+def vector(*values) -> np.ndarray:
+    return np.array(list(values) + [0.0] * (len(AUDIENCE_FIELDS) - len(values)), dtype=np.float32)
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestAudienceIndex(TestCase):
+
+    def setUp(self) -> None:
+        self.__loads = 0
+        self.__ids = ["a", "b", "c"]
+        self.__vectors = np.stack([vector(1.0, 0.0), vector(0.9, 0.1), vector(0.0, 1.0)])
+        self.__clock = FakeClock()
+        self.__sut = AudienceIndex(loader=self.__loader, max_age_seconds=60, clock=self.__clock)
+
+    def __loader(self):
+        self.__loads += 1
+        return list(self.__ids), self.__vectors.copy()
+
+    def test_audience_vector_treats_missing_splits_as_zero(self):
+        # arrange
+        influencer = Influencer(audience_male_split=0.75, audience_female_split=None)
+
+        # act
+        actual = audience_vector(influencer)
+
+        # assert
+        assert actual.dtype == np.float32
+        assert actual[AUDIENCE_FIELDS.index("audience_male_split")] == 0.75
+        assert actual[AUDIENCE_FIELDS.index("audience_female_split")] == 0.0
+
+    def test_nearest_by_cosine(self):
+        # act
+        nearest = self.__sut.nearest(vector=vector(1.0, 0.0), k=2, metric=SimilarityMetric.COSINE)
+
+        # assert
+        assert [id_ for id_, _ in nearest] == ["a", "b"]
+        assert nearest[0][1] == 1.0
+
+    def test_nearest_by_l1(self):
+        # act
+        nearest = self.__sut.nearest(vector=vector(0.0, 0.9), k=3, metric=SimilarityMetric.L1)
+
+        # assert
+        assert [id_ for id_, _ in nearest] == ["c", "b", "a"]
+        self.assertAlmostEqual(nearest[0][1], 0.1, places=5)
+
+    def test_nearest_excludes_the_given_id(self):
+        # act
+        nearest = self.__sut.nearest(vector=vector(1.0, 0.0), k=2, exclude="a")
+
+        # assert
+        assert [id_ for id_, _ in nearest] == ["b", "c"]
+
+    def test_index_is_built_once_until_it_is_too_old(self):
+        # act
+        self.__sut.nearest(vector=vector(1.0), k=1)
+        self.__sut.nearest(vector=vector(1.0), k=1)
+        self.__clock.now = 61
+        self.__sut.nearest(vector=vector(1.0), k=1)
+
+        # assert
+        assert self.__loads == 2
+
+    def test_upsert_updates_a_row_in_place(self):
+        # arrange
+        self.__sut.nearest(vector=vector(1.0), k=1)
+
+        # act
+        self.__sut.upsert(id_="c", vector=vector(1.0, 0.0))
+
+        # assert
+        nearest = self.__sut.nearest(vector=vector(1.0, 0.0), k=2, exclude="a")
+        assert nearest[0] == ("c", 1.0)
+        assert len(self.__sut) == 3
+
+    def test_upsert_appends_new_rows(self):
+        # arrange
+        self.__sut.nearest(vector=vector(1.0), k=1)
+
+        # act
+        self.__sut.upsert(id_="d", vector=vector(0.0, 0.0, 1.0))
+
+        # assert
+        assert self.__sut.nearest(vector=vector(0.0, 0.0, 1.0), k=1) == [("d", 1.0)]
+        assert len(self.__sut) == 4
+        assert self.__loads == 1
+
+    def test_upsert_before_first_build_is_left_to_the_build(self):
+        # act
+        self.__sut.upsert(id_="d", vector=vector(1.0))
+
+        # assert
+        assert len(self.__sut) == 0
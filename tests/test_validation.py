@@ -0,0 +1,64 @@
+from unittest import TestCase
+
+from jsonschema import Draft7Validator
+
+from src.domain.validation import SchemaValidator, BrandValidator, brand_payload_schema, \
+    influencer_payload_schema, campaign_payload_schema
+from src.exceptions import PayloadValidationException
+
+PAYLOADS = [
+    {"brand_name": "brand", "brand_description": "description", "website": "https://brand.com"},
+    {"brand_name": "brand", "brand_description": "description", "website": "brand.com", "email": "a@b.com",
+     "insta_handle": "@brand", "something_else": 1},
+    {"brand_name": "", "brand_description": "description", "website": "https://brand.com"},
+    {"brand_name": "brand", "brand_description": "line\nbreak", "website": "https://brand.com"},
+    {"brand_name": "brand", "brand_description": "description", "website": "invalid website"},
+    {"brand_name": None, "brand_description": "description", "website": "https://brand.com"},
+    {"brand_name": 1, "brand_description": "description"},
+    {"bio": "bio", "website": "https://influencer.com", "email": "not an email"},
+    {"bio": "bio", "website": "https://influencer.com", "insta_handle": "x" * 31},
+    {"campaign_hashtag": "x" * 120},
+    {"campaign_hashtag": "x" * 121},
+    {},
+    [],
+    "brand",
+    None,
+]
+
+
+class TestSchemaValidator(TestCase):
+
+    def test_agrees_with_jsonschema(self):
+        for schema in (brand_payload_schema, influencer_payload_schema, campaign_payload_schema):
+            sut = SchemaValidator(schema=schema)
+            for payload in PAYLOADS:
+                with self.subTest(payload=payload):
+                    assert (sut.errors(payload) == []) == Draft7Validator(schema).is_valid(payload)
+
+    def test_collects_every_error(self):
+        # arrange
+        sut = SchemaValidator(schema=brand_payload_schema)
+
+        # act
+        errors = sut.errors({"brand_name": "", "website": "invalid website", "insta_handle": "x" * 31})
+
+        # assert
+        assert [error["field"] for error in errors] == ["brandDescription", "brandName", "instaHandle", "website"]
+        assert errors[0]["message"] == "'brand_description' is a required property"
+
+    def test_schema_outside_fast_check(self):
+        # arrange
+        sut = SchemaValidator(schema={"type": "object",
+                                      "properties": {"count": {"type": "integer", "minimum": 1}}})
+
+        # act/assert
+        assert sut.errors({"count": 2}) == []
+        assert [error["field"] for error in sut.errors({"count": 0})] == ["count"]
+
+    def test_validate_raises_with_errors(self):
+        # act
+        with self.assertRaises(PayloadValidationException) as raised:
+            BrandValidator().validate_brand(payload={"brand_name": "brand", "brand_description": "description"})
+
+        # assert
+        assert raised.exception.errors == [{"field": "website", "message": "'website' is a required property"}]
@@ -1,7 +1,13 @@
+import base64
+import gzip
 from unittest import TestCase
+from unittest.mock import Mock
 
 from src.crosscutting import JsonSnakeToCamelSerializer
-from src.web import PinfluencerResponse
+from src.domain.filtering import CampaignFilter
+from src.domain.models import CategoryEnum, ValueEnum, CampaignStateEnum
+from src.web import PinfluencerResponse, campaign_filter_parameters
+from src.web.compression import ResponseCompressor
 
 
 class TestPinfluencerResponse(TestCase):
@@ -30,7 +36,140 @@ class TestPinfluencerResponse(TestCase):
             "last_name": "Gannon",
             "years_old": 22
         })
-        expected_json = {"statusCode": 200, "body": """{"firstName": "Aidan", "lastName": "Gannon", "yearsOld": 22}""", "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*", "Access-Control-Allow-Headers": "*", "Access-Control-Allow-Methods": "*"}}
+        expected_json = {"statusCode": 200, "body": """{"firstName":"Aidan","lastName":"Gannon","yearsOld":22}""", "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*", "Access-Control-Allow-Headers": "*", "Access-Control-Allow-Methods": "*"}}
 
         # act/assert
         assert pinf_response.as_json(serializer=JsonSnakeToCamelSerializer()) == expected_json
+
+    def test_to_json_compressed(self):
+
+        # arrange
+        pinf_response = PinfluencerResponse(body={"items": [{"first_name": "Aidan"}] * 100})
+
+        # act
+        response = pinf_response.as_json(serializer=JsonSnakeToCamelSerializer(),
+                                         compressor=ResponseCompressor(min_size_bytes=1024),
+                                         accept_encoding="gzip")
+
+        # assert
+        assert response["isBase64Encoded"] is True
+        assert response["headers"]["Content-Encoding"] == "gzip"
+        assert response["headers"]["Vary"] == "Accept-Encoding"
+        assert gzip.decompress(base64.b64decode(response["body"])).decode() == \
+               '{"items":[' + ','.join(['{"firstName":"Aidan"}'] * 100) + ']}'
+
+    def test_to_json_below_compression_size(self):
+
+        # arrange
+        pinf_response = PinfluencerResponse(body={"first_name": "Aidan"})
+
+        # act
+        response = pinf_response.as_json(serializer=JsonSnakeToCamelSerializer(),
+                                         compressor=ResponseCompressor(min_size_bytes=1024),
+                                         accept_encoding="gzip")
+
+        # assert
+        assert response["body"] == '{"firstName":"Aidan"}'
+        assert "Vary" not in response["headers"]
+        assert "isBase64Encoded" not in response
+
+    def test_to_json_not_modified(self):
+
+        # arrange
+        pinf_response = PinfluencerResponse(status_code=304, headers={"ETag": '"abc"'})
+
+        # act
+        response = pinf_response.as_json(serializer=JsonSnakeToCamelSerializer(),
+                                         compressor=ResponseCompressor(min_size_bytes=0),
+                                         accept_encoding="gzip")
+
+        # assert
+        assert response["statusCode"] == 304
+        assert response["body"] == ""
+        assert response["headers"]["ETag"] == '"abc"'
+        assert "isBase64Encoded" not in response
+
+    def test_to_json_not_modified_etag_of_compressed_body(self):
+
+        # arrange
+        pinf_response = PinfluencerResponse(status_code=304, headers={"ETag": '"abc"'})
+        pinf_response.serialized_body = '{"items":[' + ','.join(['{"firstName":"Aidan"}'] * 100) + ']}'
+
+        # act
+        response = pinf_response.as_json(serializer=JsonSnakeToCamelSerializer(),
+                                         compressor=ResponseCompressor(min_size_bytes=1024),
+                                         accept_encoding="gzip")
+
+        # assert
+        assert response["body"] == ""
+        assert response["headers"]["ETag"] == '"abc-gzip"'
+        assert response["headers"]["Vary"] == "Accept-Encoding"
+        assert "Content-Encoding" not in response["headers"]
+
+    def test_to_json_uses_serialized_body(self):
+
+        # arrange
+        serializer = Mock()
+        pinf_response = PinfluencerResponse(body={"first_name": "Aidan"})
+        pinf_response.serialized_body = '{"firstName":"Aidan"}'
+
+        # act
+        response = pinf_response.as_json(serializer=serializer)
+
+        # assert
+        assert response["body"] == '{"firstName":"Aidan"}'
+        serializer.serialize.assert_not_called()
+
+    def test_to_json_compressed_etag(self):
+
+        # arrange
+        pinf_response = PinfluencerResponse(body={"items": [{"first_name": "Aidan"}] * 100},
+                                            headers={"ETag": '"abc"'})
+
+        # act
+        response = pinf_response.as_json(serializer=JsonSnakeToCamelSerializer(),
+                                         compressor=ResponseCompressor(min_size_bytes=1024),
+                                         accept_encoding="gzip")
+
+        # assert
+        assert response["headers"]["ETag"] == '"abc-gzip"'
+        assert pinf_response.headers["ETag"] == '"abc"'
+
+    def test_default_body_is_not_shared_between_responses(self):
+        # arrange
+        first = PinfluencerResponse()
+        second = PinfluencerResponse()
+
+        # act
+        first.body["message"] = "mutated"
+
+        # assert
+        assert second.body == {}
+
+
+class TestCampaignFilterParameters(TestCase):
+
+    def test_defaults_to_active_campaigns(self):
+        assert campaign_filter_parameters(event={}) == CampaignFilter()
+
+    def test_comma_separated_members(self):
+        # arrange
+        event = {"queryStringParameters": {"categories": "FASHION,FOOD",
+                                           "values": "VEGAN",
+                                           "state": "DRAFT",
+                                           "match": "all"}}
+
+        # act
+        campaign_filter = campaign_filter_parameters(event=event)
+
+        # assert
+        assert campaign_filter == CampaignFilter(categories=(CategoryEnum.FASHION, CategoryEnum.FOOD),
+                                                 values=(ValueEnum.VEGAN,),
+                                                 states=(CampaignStateEnum.DRAFT,),
+                                                 match_all=True)
+
+    def test_unknown_member(self):
+        assert campaign_filter_parameters(event={"queryStringParameters": {"categories": "SHOES"}}) is None
+
+    def test_unknown_match(self):
+        assert campaign_filter_parameters(event={"queryStringParameters": {"match": "some"}}) is None
@@ -0,0 +1,61 @@
+import io
+import json
+from unittest import TestCase
+from unittest.mock import Mock, MagicMock
+
+from PIL import Image
+
+from src.domain.images import ImageVariantFormatEnum, variant_key, IMAGE_VARIANT_WIDTHS
+from src.types import ImageRepository
+from src.worker import ImageVariantWorker
+
+UPLOADED_KEY = "7e9b0a38-1b2c-4d5e-8f90-0a1b2c3d4e5f/0d1e2f3a-4b5c-4d6e-8f70-8192a3b4c5d6.png"
+
+
+def record(message_id: str, key: str) -> dict:
+    return {"messageId": message_id, "body": json.dumps({"key": key})}
+
+
+class TestImageVariantWorker(TestCase):
+
+    def setUp(self):
+        buffer = io.BytesIO()
+        Image.new("RGB", (1200, 600)).save(buffer, format="PNG")
+        self.__image_repository: ImageRepository = Mock()
+        self.__image_repository.download = MagicMock(return_value=buffer.getvalue())
+        self.__sut = ImageVariantWorker(image_repository=self.__image_repository)
+
+    def test_process_writes_every_variant(self):
+        # act
+        written = self.__sut.process(key=UPLOADED_KEY)
+
+        # assert
+        self.__image_repository.download.assert_called_once_with(key=UPLOADED_KEY)
+        calls = self.__image_repository.upload_variant.call_args_list
+        assert written == len(calls) == len(IMAGE_VARIANT_WIDTHS) * len(ImageVariantFormatEnum)
+        assert {(call.kwargs["key"], call.kwargs["content_type"]) for call in calls} == \
+               {(variant_key(UPLOADED_KEY, width, variant_format), variant_format.content_type)
+                for width in IMAGE_VARIANT_WIDTHS for variant_format in ImageVariantFormatEnum}
+
+    def test_process_skips_images_that_are_not_uploads(self):
+        # act
+        written = self.__sut.process(key="default_brand_logo.png")
+
+        # assert
+        assert written == 0
+        self.__image_repository.download.assert_not_called()
+
+    def test_handle_reports_only_failed_messages(self):
+        # arrange
+        self.__image_repository.download = MagicMock(side_effect=[Exception("no such key"),
+                                                                  self.__image_repository.download.return_value])
+
+        # act
+        response = self.__sut.handle(event={"Records": [record("1", UPLOADED_KEY),
+                                                        record("2", UPLOADED_KEY)]},
+                                     context={})
+
+        # assert
+        assert response == {"batchItemFailures": [{"itemIdentifier": "1"}]}
+        assert self.__image_repository.upload_variant.call_count == \
+               len(IMAGE_VARIANT_WIDTHS) * len(ImageVariantFormatEnum)